@@ -17,11 +17,13 @@ LICENSE = "MIT"
 # Kit identifiers
 KIT_DEV = "dev"
 KIT_MULTIAGENT = "multiagent"
-KITS_ALL = [KIT_DEV, KIT_MULTIAGENT]
+KIT_HOOKS = "hooks"
+KITS_ALL = [KIT_DEV, KIT_MULTIAGENT, KIT_HOOKS]
 
 # Kit descriptions
 KIT_DESC_DEV = "Solo development essentials: /orient, /commit, /pr, /review, /cleanup, /audit, /stats"
 KIT_DESC_MULTIAGENT = "Multi-agent coordination: /sync, collaboration dirs, memory guides (EXPERIMENTAL)"
+KIT_DESC_HOOKS = "Pre-commit checks: parallel, per-hook timeouts, cached by staged tree"
 
 # Directory paths
 DIR_CLAUDE_COMMANDS = r".claude\commands"
@@ -46,9 +48,11 @@ __all__ = [
     "LICENSE",
     "KIT_DEV",
     "KIT_MULTIAGENT",
+    "KIT_HOOKS",
     "KITS_ALL",
     "KIT_DESC_DEV",
     "KIT_DESC_MULTIAGENT",
+    "KIT_DESC_HOOKS",
     "DIR_CLAUDE_COMMANDS",
     "DIR_GITHUB_PROMPTS",
     "DIR_SPECIFY_MEMORY",
@@ -5,7 +5,9 @@ CLI for lite-kits
 Lightweight enhancement kits for spec-driven development.
 """
 
+import json
 import sys
+from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
@@ -22,9 +24,11 @@ from . import (
     LICENSE,
     KIT_DEV,
     KIT_MULTIAGENT,
+    KIT_HOOKS,
     KITS_ALL,
     KIT_DESC_DEV,
     KIT_DESC_MULTIAGENT,
+    KIT_DESC_HOOKS,
     DIR_CLAUDE_COMMANDS,
     DIR_GITHUB_PROMPTS,
     DIR_SPECIFY_MEMORY,
@@ -34,7 +38,41 @@ from . import (
     ERROR_NOT_SPEC_KIT,
     ERROR_SPEC_KIT_HINT,
 )
-from .core import diagonal_reveal_banner, show_loading_spinner, show_static_banner, Installer
+from .core import (
+    diagonal_reveal_banner,
+    show_loading_spinner,
+    show_static_banner,
+    AgentContextUpdater,
+    AttributionIndex,
+    AuditScanner,
+    BranchAnalyzer,
+    CheckpointStore,
+    CollabArchiver,
+    CollabIndex,
+    DiffSummarizer,
+    FeatureAllocator,
+    HookRunner,
+    Installer,
+    KitManifest,
+    KITS_DIR,
+    OrientBuilder,
+    ProjectStats,
+    RecordWriter,
+    ReleaseBuilder,
+    SearchIndex,
+    SpecIndex,
+)
+from .core.audit import SEVERITIES, to_sarif
+from .core.collab import parse_since
+from .core.diffsum import render_summary
+from .core.fingerprints import FINGERPRINTS_FILE, build_table, load_table, write_table
+from .core.git import GitError
+from .core.hooks import HOOKS_CONFIG, install_git_hook
+from .core.lock import LockTimeoutError
+from .core.overlap import OverlapAnalyzer
+from .core.stress import run_stress
+from .core.watch import CollabWatcher
+from .core.worktrees import KitStore, has_linked_worktrees, install_worktrees, provision_worktree
 
 app = typer.Typer(
     name=APP_NAME,
@@ -45,6 +83,41 @@ app = typer.Typer(
 )
 console = Console()
 
+collab_app = typer.Typer(
+    help="Query and maintain multiagent collaboration records (sessions, handoffs, decisions).",
+    no_args_is_help=True,
+    rich_markup_mode="rich",
+)
+app.add_typer(collab_app, name="collab")
+
+checkpoint_app = typer.Typer(
+    help="Snapshot and restore the working tree without touching the index or branches.",
+    no_args_is_help=True,
+    rich_markup_mode="rich",
+)
+app.add_typer(checkpoint_app, name="checkpoint")
+
+hooks_app = typer.Typer(
+    help="Run the hooks kit's pre-commit checks (parallel, cached by staged tree).",
+    no_args_is_help=True,
+    rich_markup_mode="rich",
+)
+app.add_typer(hooks_app, name="hooks")
+
+feature_app = typer.Typer(
+    help="Allocate spec-kit features (multiagent-kit)",
+    no_args_is_help=True,
+    rich_markup_mode="rich",
+)
+app.add_typer(feature_app, name="feature")
+
+worktree_app = typer.Typer(
+    help="Provision per-agent git worktrees (multiagent-kit)",
+    no_args_is_help=True,
+    rich_markup_mode="rich",
+)
+app.add_typer(worktree_app, name="worktree")
+
 def print_help_hint():
     console.print(f"[dim]See [bold cyan]--help[/bold cyan] for all options and commands.[/dim]\n")
 
@@ -59,6 +132,13 @@ def print_quick_start():
     console.print(f"  [cyan]2. {APP_NAME} status[/cyan]       # Check installation")
     console.print(f"  [cyan]3. {APP_NAME} validate[/cyan]     # Validate kit files\n")
 
+def print_manifest_warnings(manifest: KitManifest):
+    """Print problems found while discovering kit packs."""
+    from rich.markup import escape
+
+    for warning in manifest.warnings:
+        console.print(f"[yellow]Warning:[/yellow] {escape(warning)}")
+
 def print_spec_kit_error():
     """Print standardized spec-kit not found error message with installation instructions."""
     console.print()
@@ -134,11 +214,15 @@ def _build_kit_breakdown_table(target_dir: Path, kits: list[str]) -> Table:
 
     return table
 
-def print_kit_info(target_dir: Path, is_spec_kit: bool, installed_kits: list):
+def print_kit_info(target_dir: Path, is_spec_kit: bool, installed_kits: list,
+                   spec_kit: Optional[dict] = None):
     """Print kit installation info with agent/shell breakdown."""
     console.print()
     if is_spec_kit:
-        console.print(f"[bold green][OK] Spec-kit project detected in {target_dir}.[/bold green]\n")
+        console.print(f"[bold green][OK] Spec-kit project detected in {target_dir}.[/bold green]")
+        if spec_kit:
+            _print_spec_kit_version(spec_kit)
+        console.print()
         if installed_kits:
             table = _build_kit_breakdown_table(target_dir, installed_kits)
             console.print(table)
@@ -149,6 +233,44 @@ def print_kit_info(target_dir: Path, is_spec_kit: bool, installed_kits: list):
         console.print(f"  {ERROR_SPEC_KIT_HINT}", style="dim")
     console.print()
 
+def _print_spec_kit_version(spec_kit: dict):
+    """Print the fingerprinted spec-kit release and drift from vanilla."""
+    if not spec_kit.get("version"):
+        console.print("[dim]  Spec-kit version: unknown (no vanilla fingerprint matched)[/dim]")
+        return
+
+    console.print(f"  Spec-kit version: {spec_kit['version']} ({spec_kit['flavor']})")
+    modified = spec_kit.get("modified", [])
+    missing = spec_kit.get("missing", [])
+    if modified:
+        more = " ..." if len(modified) > 3 else ""
+        console.print(f"[dim]  Modified from vanilla: {', '.join(modified[:3])}{more}[/dim]")
+    if missing:
+        console.print(f"[dim]  Missing from vanilla: {len(missing)} files[/dim]")
+
+def _print_worktree_status(rows: list):
+    """Print per-worktree kit status from the shared store."""
+    table = Table(show_header=True, header_style="bold cyan", title="Worktrees")
+    table.add_column("Worktree", style="cyan", overflow="fold")
+    table.add_column("Branch")
+    table.add_column("Kits")
+    table.add_column("Files")
+    for row in rows:
+        name = row["path"] + (" [bold](current)[/bold]" if row["current"] else "")
+        if not row["files"]:
+            files = "[dim]not installed via store[/dim]"
+        else:
+            files = f"{row['cloned']} cloned, {row['copied']} copied"
+            if row["missing"]:
+                files += f", [red]{len(row['missing'])} missing[/red]"
+            if row["modified"]:
+                files += f", [yellow]{len(row['modified'])} modified[/yellow]"
+        table.add_row(
+            name, row["branch"] or "[dim](detached)[/dim]", ", ".join(row["kits"]) or "-", files
+        )
+    console.print(table)
+    console.print()
+
 def version_callback(value: bool):
     """Print version and exit."""
     if value:
@@ -231,7 +353,7 @@ def add_kits(
     kit: Optional[str] = typer.Option(
         None,
         "--kit",
-        help=f"Comma-separated list of kits to add: {','.join(KITS_ALL)}",
+        help=f"Comma-separated list of kits to add: {','.join(KITS_ALL)} or a pack kit",
     ),
     all_kits: bool = typer.Option(
         False,
@@ -248,6 +370,16 @@ def add_kits(
         "--shell",
         help="Explicit shell preference (bash, powershell)",
     ),
+    compact: Optional[str] = typer.Option(
+        None,
+        "--compact",
+        help="Command prompt compaction level: none, light, full (default from kits.yaml)",
+    ),
+    all_worktrees: bool = typer.Option(
+        False,
+        "--all-worktrees",
+        help="Install into every git worktree of the repository (cloned from one shared store)",
+    ),
     verbose: bool = typer.Option(
         False,
         "--verbose",
@@ -269,13 +401,22 @@ def add_kits(
     Shows a preview of changes before installation and asks for confirmation.
     Use --verbose/-v to see detailed file listings.
     Use --force to skip preview and install immediately.
+    Use --compact light|full to shrink command prompts; shell variants for
+    shells that are not installed are always dropped.
+    In a repository with several git worktrees, kit files are cloned
+    (reflinked where supported) from one store in the git common dir;
+    --all-worktrees installs into all of them at once.
     """
     target_dir = Path.cwd() if target is None else target
+    store = None
+    if all_worktrees or has_linked_worktrees(target_dir):
+        store = KitStore.for_project(target_dir)
 
     # Determine which kits to install
+    manifest = KitManifest(KITS_DIR)
     kits = None
     if all_kits:
-        kits = KITS_ALL
+        kits = manifest.get_valid_kit_names()
     elif kit:
         kits = [k.strip() for k in kit.split(',')]
     # else: kits=None will use default from manifest
@@ -290,13 +431,18 @@ def add_kits(
             kits=kits,
             force=force,
             agents=agents,
-            shells=shells
+            shells=shells,
+            compaction=compact,
+            store=store,
+            manifest=manifest,
         )
     except ValueError as e:
+        print_manifest_warnings(manifest)
         console.print()
         console.print(f"[red]Error:[/red] {e}", style="bold")
         console.print()
         raise typer.Exit(1)
+    print_manifest_warnings(manifest)
 
     # Validate target is a spec-kit project
     if not installer.is_spec_kit_project():
@@ -344,6 +490,13 @@ def add_kits(
             for conflict in preview["conflicts"]:
                 console.print(f"  ⚠ {conflict['path']}")
 
+        if preview.get("incompatible"):
+            console.print("\n[bold red]Incompatible:[/bold red]")
+            for problem in preview["incompatible"]:
+                console.print(f"  ✗ {problem}")
+            console.print("\n[dim]Use --force to install anyway[/dim]\n")
+            raise typer.Exit(1)
+
         # Ask for confirmation
         console.print()
         if not typer.confirm("Proceed with installation?"):
@@ -358,9 +511,28 @@ def add_kits(
             kits=kits,
             force=True,  # Skip conflict checks after user confirmed
             agents=agents,
-            shells=shells
+            shells=shells,
+            compaction=compact,
+            store=store,
         )
 
+    if all_worktrees:
+        console.print(
+            f"\n[bold green]Installing kits to every worktree of {target_dir}[/bold green]\n"
+        )
+        rows = install_worktrees(
+            target_dir,
+            kits=kits,
+            force=installer.force,
+            agents=agents,
+            shells=shells,
+            compaction=compact,
+        )
+        _display_worktree_installs(rows)
+        if any("result" in row and not row["result"]["success"] for row in rows):
+            raise typer.Exit(1)
+        return
+
     # Install
     console.print(f"\n[bold green]Installing kits to {target_dir}[/bold green]\n")
     show_loading_spinner("Installing...")
@@ -379,7 +551,7 @@ def remove(
     kit: Optional[str] = typer.Option(
         None,
         "--kit",
-        help=f"Comma-separated list of kits to remove: {','.join(KITS_ALL)}",
+        help=f"Comma-separated list of kits to remove: {','.join(KITS_ALL)} or a pack kit",
     ),
     all_kits: bool = typer.Option(
         False,
@@ -418,9 +590,10 @@ def remove(
     target_dir = Path.cwd() if target is None else target
 
     # Determine which kits to remove
+    manifest = KitManifest(KITS_DIR)
     kits = None
     if all_kits:
-        kits = KITS_ALL
+        kits = manifest.get_valid_kit_names()
     elif kit:
         kits = [k.strip() for k in kit.split(',')]
     else:
@@ -433,12 +606,14 @@ def remove(
         raise typer.Exit(1)
 
     try:
-        installer = Installer(target_dir, kits=kits)
+        installer = Installer(target_dir, kits=kits, manifest=manifest)
     except ValueError as e:
+        print_manifest_warnings(manifest)
         console.print()
         console.print(f"[red]Error:[/red] {e}", style="bold")
         console.print()
         raise typer.Exit(1)
+    print_manifest_warnings(manifest)
 
     # Filter to only actually installed kits
     installed_kits = [k for k in kits if installer.is_kit_installed(k)]
@@ -448,8 +623,9 @@ def remove(
         console.print()
         raise typer.Exit(0)
 
-    # Update installer with filtered list
-    installer = Installer(target_dir, kits=installed_kits)
+    # Update installer with filtered list (and keep the worktree store's record current)
+    store = KitStore.for_project(target_dir) if has_linked_worktrees(target_dir) else None
+    installer = Installer(target_dir, kits=installed_kits, store=store)
 
     # Show preview and confirmation unless --force is used
     if not force:
@@ -508,7 +684,9 @@ def validate(
     target_dir = Path.cwd() if target is None else target
 
     # For validation, we don't know which kits are installed yet, so check for all
-    installer = Installer(target_dir, kits=KITS_ALL)
+    installer = Installer(target_dir)
+    all_kits = installer.manifest.get_kit_names()
+    print_manifest_warnings(installer.manifest)
 
     # Check if it's a spec-kit project first
     if not installer.is_spec_kit_project():
@@ -516,7 +694,12 @@ def validate(
         raise typer.Exit(1)
 
     # Check if any kits are installed
-    any_installed = any(installer.is_kit_installed(k) for k in KITS_ALL)
+    any_installed = False
+    for kit_name in all_kits:
+        try:
+            any_installed = any_installed or installer.is_kit_installed(kit_name)
+        except ValueError:
+            pass  # Malformed pack kit, reported by validate() below
     if not any_installed:
         console.print()
         console.print("[yellow]⚠ No enhancement kits installed[/yellow]")
@@ -547,6 +730,7 @@ def status(
 
     Displays:
     - Whether directory is a spec-kit project
+    - Spec-kit version and agent flavor (fingerprinted), and drift from vanilla
     - Which kits are installed (dev, multiagent)
     - Quick summary of installation state
 
@@ -556,20 +740,34 @@ def status(
     """
     target_dir = Path.cwd() if target is None else target
 
-    # For status, check for all possible kits
-    installer = Installer(target_dir, kits=KITS_ALL)
+    from rich.markup import escape
+
+    # For status, check for all possible kits (packaged and from packs)
+    installer = Installer(target_dir)
 
     # Basic checks
     is_spec_kit = installer.is_spec_kit_project()
 
     # Check individual kits using the installer's validator
     installed_kits = []
-    for kit_name in KITS_ALL:
-        if installer.is_kit_installed(kit_name):
-            installed_kits.append(kit_name)
+    all_kits = installer.manifest.get_kit_names()
+    print_manifest_warnings(installer.manifest)
+    for kit_name in all_kits:
+        try:
+            if installer.is_kit_installed(kit_name):
+                installed_kits.append(kit_name)
+        except ValueError as e:
+            console.print(f"[yellow]Warning:[/yellow] {escape(str(e))}")
+
+    # Identify the vanilla spec-kit release (cached hashes of a few files)
+    spec_kit = installer.detector.detect_spec_kit() if is_spec_kit else None
 
     # Show kit info (skip banner to avoid Windows console Unicode issues)
-    print_kit_info(target_dir, is_spec_kit, installed_kits)
+    print_kit_info(target_dir, is_spec_kit, installed_kits, spec_kit)
+
+    # Other worktrees of the repository, from the shared kit store's record
+    if is_spec_kit and has_linked_worktrees(target_dir):
+        _print_worktree_status(KitStore.for_project(target_dir).report(target_dir))
 
 def _normalize_preview_for_display(preview: dict, operation: str = "install") -> dict:
     """Normalize preview data to standard format for display.
@@ -900,6 +1098,8 @@ def _display_installation_summary(result: dict, verbose: bool = False):
         if skipped:
             console.print(f"Skipped {len(skipped)} files (already exist)")
 
+    _display_prompt_sizes(result.get("prompts", []), verbose=verbose)
+
     console.print("\n[bold cyan]Next steps:[/bold cyan]")
     console.print(f"  1. Run: /orient (in GitHub Copilot or Claude Code)")
     console.print(r"  2. Check: .github\prompts\orient.prompt.md or .claude\commands\orient.md")
@@ -907,6 +1107,68 @@ def _display_installation_summary(result: dict, verbose: bool = False):
     console.print("\n[dim]Note: Commands are markdown prompt files that work with any compatible AI assistant.[/dim]")
     console.print()
 
+def _display_prompt_sizes(prompts: list, verbose: bool = False):
+    """Display byte and token estimates for installed command prompts.
+
+    Args:
+        prompts: Per-command size dicts from the install result
+        verbose: If True, show one row per command; if False, only the total
+    """
+    if not prompts:
+        return
+
+    if verbose:
+        table = Table(title="Command prompt sizes", show_header=True, header_style="bold cyan")
+        table.add_column("Command", style="cyan")
+        table.add_column("Bytes", justify="right")
+        table.add_column("~Tokens", justify="right")
+        table.add_column("Saved", justify="right", style="green")
+        for prompt in prompts:
+            saved = prompt["source_bytes"] - prompt["bytes"]
+            share = f"{saved * 100 // prompt['source_bytes']}%" if prompt["source_bytes"] else "-"
+            table.add_row(
+                prompt["path"],
+                f"{prompt['bytes']:,}",
+                f"{prompt['tokens']:,}",
+                share if saved else "-",
+            )
+        console.print()
+        console.print(table)
+
+    total = sum(prompt["bytes"] for prompt in prompts)
+    source_total = sum(prompt["source_bytes"] for prompt in prompts)
+    tokens = sum(prompt["tokens"] for prompt in prompts)
+    line = f"\nCommand prompts: {total / 1024:.1f} KB (~{tokens:,} tokens)"
+    if source_total > total:
+        line += f", {(source_total - total) * 100 // source_total}% smaller than uncompacted"
+    console.print(line)
+
+def _display_worktree_installs(rows: list):
+    """Per-worktree results of 'add --all-worktrees'."""
+    table = Table(show_header=True, header_style="bold cyan")
+    table.add_column("Worktree", style="cyan", overflow="fold")
+    table.add_column("Branch")
+    table.add_column("Result")
+    for row in rows:
+        if "skipped" in row:
+            outcome = f"[dim]skipped: {row['skipped']}[/dim]"
+        elif row["result"]["success"]:
+            result = row["result"]
+            outcome = (
+                f"[green]{len(result['installed'])} installed[/green] "
+                f"({result.get('stored', 0)} from store), {len(result['skipped'])} skipped"
+            )
+            check = result.get("store")
+            if check and (check["missing"] or check["modified"]):
+                mismatched = len(check["missing"]) + len(check["modified"])
+                outcome += f" [red]{mismatched} not matching store[/red]"
+        else:
+            outcome = f"[red]failed: {row['result']['error']}[/red]"
+        table.add_row(row["path"], row["branch"] or "[dim](detached)[/dim]", outcome)
+    console.print(table)
+    console.print()
+
+
 def _display_removal_summary(result: dict, verbose: bool = False):
     """Display kit removal summary.
 
@@ -939,6 +1201,8 @@ def _display_validation_results(validation_result: dict):
     Args:
         validation_result: Dict with 'valid' (bool), 'checks' (dict of kit results), and 'target_dir' (Path)
     """
+    from rich.markup import escape
+
     checks = validation_result.get("checks", {})
     target_dir = validation_result.get("target_dir", Path.cwd())
 
@@ -961,6 +1225,20 @@ def _display_validation_results(validation_result: dict):
                 console.print(f"[dim]  Corrupted: {', '.join(corrupted[:3])}" + (" ..." if len(corrupted) > 3 else "") + "[/dim]")
         else:
             console.print(f"[red][X] {kit_name} ({status})[/red]")
+            if status == "invalid":
+                console.print(f"[dim]  {escape(result.get('message', ''))}[/dim]")
+
+        # Informational: compacted commands, and commands that differ from the kit
+        compacted = result.get("compacted_files", [])
+        modified = result.get("modified_files", [])
+        if compacted:
+            console.print(f"[dim]  Compacted: {len(compacted)} command files[/dim]")
+        if modified:
+            more = " ..." if len(modified) > 3 else ""
+            console.print(
+                "[dim]  Differs from kit (local edits or older release): "
+                f"{', '.join(modified[:3])}{more}[/dim]"
+            )
 
     # Show agent/shell breakdown table for validated kits
     validated_kits = [kit_name for kit_name, result in checks.items() if result.get("status") == "installed"]
@@ -997,100 +1275,2214 @@ def _cleanup_empty_directories(target_dir: Path):
     if cleaned:
         console.print(f"\nCleaned up empty directories: [dim]{', '.join(cleaned)}[/dim]")
 
-@app.command(name="info")
-def package_info():
-    """Show package information and available kits.
+def _open_collab_index(target: Optional[Path]) -> CollabIndex:
+    """Open and refresh the collaboration index for a project."""
+    target_dir = Path.cwd() if target is None else target
+    index = CollabIndex(target_dir)
+    index.refresh()
+    return index
 
-    Displays:
-    - Package version and repository
-    - Available kits (dev, multiagent)
-    - Kit descriptions and commands
-    - Package management commands
+@collab_app.command(name="index")
+def collab_index(
+    rebuild: bool = typer.Option(
+        False,
+        "--rebuild",
+        help="Discard the existing index and reparse every record",
+    ),
+    target: Optional[Path] = typer.Argument(
+        None,
+        help="Target directory (defaults to current directory)",
+    ),
+):
+    """Update the collaboration index and show record counts.
+
+    The index lives in .specify/cache/collab.db and is refreshed
+    incrementally: only records whose size or mtime changed are reparsed.
+
+    Example:
+        lite-kits collab index              # Incremental refresh
+        lite-kits collab index --rebuild    # Reparse everything
     """
-    # Package info (banner removed to avoid duplication with --banner flag)
-    console.print()
-    console.print("[bold]Info:[/bold]")
-    info_table = Table(show_header=False, box=None, padding=(0, 2))
-    info_table.add_column("Key", style="cyan")
-    info_table.add_column("Value")
+    target_dir = Path.cwd() if target is None else target
+    index = CollabIndex(target_dir)
+    stats = index.refresh(rebuild=rebuild)
+    active = index.counts(state="active")
+    archived = index.counts(state="archive")
+    index.close()
 
-    info_table.add_row("Version", __version__)
-    info_table.add_row("Repository", REPOSITORY_URL)
-    info_table.add_row("License", LICENSE)
+    console.print()
+    console.print(
+        f"[bold green][OK] Indexed {stats['scanned']} records[/bold green] "
+        f"[dim]({stats['updated']} updated, {stats['removed']} removed)[/dim]\n"
+    )
 
-    console.print(info_table)
+    table = Table(show_header=True, header_style="bold cyan", box=None, padding=(0, 2))
+    table.add_column("Records", style="cyan")
+    table.add_column("Active", justify="right")
+    table.add_column("Archived", justify="right")
+    for key in ["features", "session", "handoff", "decision"]:
+        label = "Features" if key == "features" else f"{key.capitalize()}s"
+        table.add_row(label, str(active[key]), str(archived[key]))
+    console.print(table)
     console.print()
 
-    # Available kits
-    console.print("[bold]Available Kits:[/bold]")
-    kits_table = Table(show_header=False, box=None, padding=(0, 2))
-    kits_table.add_column("Kit", style="cyan")
-    kits_table.add_column("Description")
+@collab_app.command(name="list")
+def collab_list(
+    kind: Optional[str] = typer.Option(
+        None,
+        "--kind",
+        help="Record kind: session, handoff, decision",
+    ),
+    feature: Optional[str] = typer.Option(
+        None,
+        "--feature",
+        help="Feature number (012) or directory name (012-user-auth)",
+    ),
+    agent: Optional[str] = typer.Option(
+        None,
+        "--agent",
+        help="Agent name (matches author or handoff recipient)",
+    ),
+    record_status: Optional[str] = typer.Option(
+        None,
+        "--status",
+        help="Exact status value (pending, completed, ...)",
+    ),
+    open_only: bool = typer.Option(
+        False,
+        "--open",
+        help="Only records that are not completed/accepted/closed",
+    ),
+    since: Optional[str] = typer.Option(
+        None,
+        "--since",
+        help="Only records dated on/after this (7d, 2w, 2025-10-01)",
+    ),
+    archived: bool = typer.Option(
+        False,
+        "--archived",
+        help="Include archived records",
+    ),
+    limit: Optional[int] = typer.Option(
+        None,
+        "--limit",
+        help="Maximum number of records to show",
+    ),
+    json_output: bool = typer.Option(
+        False,
+        "--json",
+        help="Output records as JSON",
+    ),
+    target: Optional[Path] = typer.Argument(
+        None,
+        help="Target directory (defaults to current directory)",
+    ),
+):
+    """Query sessions, handoffs and decisions from the collaboration index.
 
-    kits_table.add_row(KIT_DEV, KIT_DESC_DEV)
-    kits_table.add_row(KIT_MULTIAGENT, KIT_DESC_MULTIAGENT)
+    Examples:
+        lite-kits collab list --kind handoff --feature 012 --open
+        lite-kits collab list --kind session --agent claude-code --since 7d
+        lite-kits collab list --json
+    """
+    try:
+        since_date = parse_since(since) if since else None
+        index = _open_collab_index(target)
+        records = index.query(
+            kind=kind,
+            feature=feature,
+            agent=agent,
+            status=record_status,
+            state=None if archived else "active",
+            since=since_date,
+            open_only=open_only,
+            limit=limit,
+        )
+        index.close()
+    except ValueError as e:
+        console.print()
+        console.print(f"[red]Error:[/red] {e}", style="bold")
+        console.print()
+        raise typer.Exit(1)
 
-    console.print(kits_table)
-    console.print()
+    if json_output:
+        typer.echo(json.dumps(records, indent=2))
+        return
 
-    # Package management
-    console.print("[bold]Package Management:[/bold]")
-    package_table = Table(show_header=False, box=None, padding=(0, 2))
-    package_table.add_column("Action", style="cyan")
-    package_table.add_column("Command")
-    
-    package_table.add_row("Update", f"[dim]uv tool install --upgrade {APP_NAME}[/dim]")
-    package_table.add_row("Uninstall", f"[dim]uv tool uninstall {APP_NAME}[/dim]")
-    
-    console.print(package_table)
     console.print()
+    if not records:
+        console.print("[dim]No matching collaboration records[/dim]\n")
+        return
 
-@app.command(name="uninstall")
-def package_uninstall():
-    """Instructions for uninstalling the lite-kits package."""
-    console.print()
-    console.print(f"[bold yellow]Uninstall {APP_NAME}[/bold yellow]\n")
+    table = Table(show_header=True, header_style="bold cyan")
+    table.add_column("Date", no_wrap=True)
+    table.add_column("Kind", style="cyan")
+    table.add_column("Feature")
+    table.add_column("Agent", style="green")
+    table.add_column("Status")
+    table.add_column("Path", style="dim")
+    for record in records:
+        agent_display = record["agent"] or ""
+        if record["to_agent"]:
+            agent_display = f"{agent_display} -> {record['to_agent']}".strip()
+        table.add_row(
+            record["date"] or "-",
+            record["kind"],
+            record["feature"],
+            agent_display or "-",
+            record["status"] or "-",
+            record["path"],
+        )
+    console.print(table)
+    console.print(f"\n[dim]{len(records)} record(s)[/dim]\n")
 
-    console.print("To uninstall the package, run:\n")
-    console.print(f"  [cyan]uv tool uninstall {APP_NAME}[/cyan]\n")
+@collab_app.command(name="activity")
+def collab_activity(
+    agent: Optional[str] = typer.Option(
+        None,
+        "--agent",
+        help="Agent name (substring match, e.g. claude)",
+    ),
+    feature: Optional[str] = typer.Option(
+        None,
+        "--feature",
+        help="Feature number (012) or directory name (012-user-auth)",
+    ),
+    since: Optional[str] = typer.Option(
+        "7d",
+        "--since",
+        help="Only commits on/after this (7d, 2w, 2025-10-01; 'all' for everything)",
+    ),
+    until: Optional[str] = typer.Option(
+        None,
+        "--until",
+        help="Only commits before this date (YYYY-MM-DD)",
+    ),
+    path: Optional[str] = typer.Option(
+        None,
+        "--path",
+        help="Only commits that changed this file",
+    ),
+    commits: bool = typer.Option(
+        False,
+        "--commits",
+        help="List matching commits instead of per-agent totals",
+    ),
+    limit: Optional[int] = typer.Option(
+        None,
+        "--limit",
+        help="Maximum number of commits to list",
+    ),
+    rebuild: bool = typer.Option(
+        False,
+        "--rebuild",
+        help="Discard the attribution index and reread all history",
+    ),
+    json_output: bool = typer.Option(
+        False,
+        "--json",
+        help="Output activity as JSON",
+    ),
+    target: Optional[Path] = typer.Argument(
+        None,
+        help="Target directory (defaults to current directory)",
+    ),
+):
+    """Show which agents committed what, per agent and per feature.
 
-    console.print("[dim]Or with pip:[/dim]\n")
-    console.print(f"  [dim]pip uninstall {APP_NAME}[/dim]\n")
+    Commits are attributed by their "via <model> @ <agent>" signature and
+    kept in an index under the git directory (shared by all worktrees). Each
+    run only reads commits added since the last one.
 
-    console.print("[bold]Note:[/bold] This will remove the package but NOT the kits you've added to projects.")
-    console.print(f"To remove kits from a project, first run: [cyan]{APP_NAME} remove --all[/cyan]\n")
+    Examples:
+        lite-kits collab activity                         # Last 7 days, per agent
+        lite-kits collab activity --feature 012 --since all
+        lite-kits collab activity --agent claude --commits
+        lite-kits collab activity --path src/app.py --commits --json
+    """
+    target_dir = Path.cwd() if target is None else target
+    try:
+        since_date = parse_since(since) if since and since != "all" else None
+        index = AttributionIndex(target_dir)
+        refreshed = index.refresh(rebuild=rebuild)
+        filters = {"agent": agent, "feature": feature, "since": since_date, "until": until}
+        if commits:
+            data = index.query(path=path, limit=limit, **filters)
+        else:
+            data = index.summary(**filters)
+        index.close()
+    except (GitError, ValueError) as e:
+        console.print()
+        console.print(f"[red]Error:[/red] {e}", style="bold")
+        console.print()
+        raise typer.Exit(1)
 
-@app.command(name="help")
-def show_help(
-    ctx: typer.Context,
-    command_name: Optional[str] = typer.Argument(
+    if json_output:
+        typer.echo(json.dumps(data, indent=2))
+        return
+
+    console.print()
+    window = f"since {since_date}" if since_date else "all history"
+    if commits:
+        if not data:
+            console.print(f"[dim]No matching commits ({window})[/dim]\n")
+            return
+        table = Table(show_header=True, header_style="bold cyan")
+        table.add_column("Date", no_wrap=True)
+        table.add_column("Commit", style="dim", no_wrap=True)
+        table.add_column("Agent", style="green")
+        table.add_column("Feature")
+        table.add_column("Subject")
+        table.add_column("Files", justify="right")
+        for commit in data:
+            table.add_row(
+                datetime.fromtimestamp(commit["date"]).strftime("%Y-%m-%d"),
+                commit["hash"][:8],
+                commit["agent"] or "-",
+                commit["feature"] or "-",
+                commit["subject"],
+                str(len(commit["files"])),
+            )
+        console.print(table)
+        console.print(f"\n[dim]{len(data)} commit(s), {window}[/dim]\n")
+        return
+
+    if not data["commits"]:
+        console.print(f"[dim]No commits ({window})[/dim]\n")
+        return
+    table = Table(show_header=True, header_style="bold cyan")
+    table.add_column("Agent", style="green")
+    table.add_column("Commits", justify="right")
+    table.add_column("Files", justify="right")
+    table.add_column("Last commit", no_wrap=True)
+    for row in data["agents"]:
+        table.add_row(
+            row["agent"],
+            str(row["commits"]),
+            str(row["files"]),
+            datetime.fromtimestamp(row["last"]).strftime("%Y-%m-%d %H:%M"),
+        )
+    if data["unattributed"]:
+        table.add_row("[dim](unsigned)[/dim]", str(data["unattributed"]), "", "")
+    console.print(table)
+    if data["features"]:
+        console.print()
+        for row in data["features"]:
+            agents = ", ".join(row["agents"]) or "unsigned"
+            console.print(
+                f"  [cyan]{row['feature']}[/cyan]: {row['commits']} commit(s) [dim]({agents})[/dim]"
+            )
+    console.print(
+        f"\n[dim]{data['commits']} commit(s), {window}; "
+        f"{refreshed['indexed']} newly indexed in {refreshed['seconds']}s[/dim]\n"
+    )
+
+@collab_app.command(name="watch")
+def collab_watch(
+    kind: Optional[list[str]] = typer.Option(
         None,
-        help="Command to get help for (e.g., 'add', 'remove')",
+        "--kind",
+        help="Record kind to report: session, handoff, decision (repeatable)",
+    ),
+    agent: Optional[str] = typer.Option(
+        None,
+        "--agent",
+        help="Only records by or for this agent",
+    ),
+    replay: bool = typer.Option(
+        False,
+        "--replay",
+        help="Report existing records first, as 'created' events",
+    ),
+    poll: bool = typer.Option(
+        False,
+        "--poll",
+        help="Poll instead of using filesystem notifications",
+    ),
+    interval: float = typer.Option(
+        1.0,
+        "--interval",
+        help="Poll interval in seconds (when polling)",
+    ),
+    timeout: Optional[float] = typer.Option(
+        None,
+        "--timeout",
+        help="Stop after this many seconds",
+    ),
+    count: Optional[int] = typer.Option(
+        None,
+        "--count",
+        "-n",
+        help="Stop after this many record events",
+    ),
+    json_output: bool = typer.Option(
+        False,
+        "--json",
+        help="Stream events as NDJSON (one object per line)",
+    ),
+    target: Optional[Path] = typer.Argument(
+        None,
+        help="Target directory (defaults to current directory)",
     ),
 ):
-    """Show help and available commands.
+    """Stream new and changed collaboration records from every worktree.
 
-    Usage:
-        lite-kits help           # Show general help
-        lite-kits help add       # Show help for 'add' command
-    """
-    if command_name:
-        # Show help for specific command by invoking it with --help
-        import sys
-        sys.argv = [APP_NAME, command_name, "--help"]
-        try:
-            app()
-        except SystemExit:
-            pass
-    else:
-        # Show general help
-        console.print(ctx.parent.get_help())
-    raise typer.Exit(0)
+    Watches specs/*/collaboration/ in all worktrees of the repository with
+    filesystem notifications (inotify on Linux) and reports each session,
+    handoff or decision as it is written, parsing only that file. Falls back
+    to a short poll where notifications are unavailable. The first JSON line
+    is a 'ready' event.
 
-@app.command(name="banner", hidden=True)
-def show_banner():
-    """Show the lite-kits banner (hidden easter egg command)."""
-    diagonal_reveal_banner()
+    Examples:
+        lite-kits collab watch                                  # Human-readable feed
+        lite-kits collab watch --kind handoff --json            # NDJSON for a coordinator
+        lite-kits collab watch --kind handoff --agent claude -n 1   # Wait for the next handoff
+    """
+    target_dir = Path.cwd() if target is None else target
+    watcher = CollabWatcher(target_dir, interval=interval, notify=not poll)
+    seen = 0
+    events = watcher.watch(kinds=kind or None, agent=agent, replay=replay, timeout=timeout)
+    try:
+        for event in events:
+            if json_output:
+                typer.echo(json.dumps(event))
+                sys.stdout.flush()
+            elif event["event"] == "ready":
+                console.print(
+                    f"[dim]Watching {len(event['worktrees'])} worktree(s), "
+                    f"{event['records']} record(s) ({event['mode']}) - Ctrl+C to stop[/dim]"
+                )
+            else:
+                who = event["agent"] or ""
+                if event["to_agent"]:
+                    who = f"{who} -> {event['to_agent']}".strip()
+                color = {"created": "green", "modified": "yellow", "deleted": "red"}[event["event"]]
+                console.print(
+                    f"[dim]{event['time'][11:23]}[/dim] [{color}]{event['event']:<8}[/{color}] "
+                    f"[cyan]{event['kind']:<8}[/cyan] {event['path']}"
+                    + (f" [dim]({who})[/dim]" if who else "")
+                )
+            if event["event"] != "ready":
+                seen += 1
+                if count and seen >= count:
+                    break
+    except ValueError as e:
+        console.print()
+        console.print(f"[red]Error:[/red] {e}", style="bold")
+        console.print()
+        raise typer.Exit(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        events.close()
+
+@collab_app.command(name="new")
+def collab_new(
+    kind: str = typer.Argument(
+        ...,
+        help="Record kind: session, handoff, decision",
+    ),
+    agent: str = typer.Option(
+        ...,
+        "--agent",
+        help="Agent writing the record (e.g. claude-code)",
+    ),
+    to_agent: Optional[str] = typer.Option(
+        None,
+        "--to",
+        help="Receiving agent (handoffs)",
+    ),
+    title: Optional[str] = typer.Option(
+        None,
+        "--title",
+        help="Decision title",
+    ),
+    feature: Optional[str] = typer.Option(
+        None,
+        "--feature",
+        help="Feature number (012) or directory name (default: from the current branch)",
+    ),
+    record_status: Optional[str] = typer.Option(
+        None,
+        "--status",
+        help="Status field (default: ongoing for sessions, proposed for decisions)",
+    ),
+    since: Optional[str] = typer.Option(
+        None,
+        "--since",
+        help="Only list commits after this (default: today for sessions, whole branch otherwise)",
+    ),
+    no_git: bool = typer.Option(
+        False,
+        "--no-git",
+        help="Don't fill in commits and changed files",
+    ),
+    json_output: bool = typer.Option(
+        False,
+        "--json",
+        help="Output the result as JSON",
+    ),
+    target: Optional[Path] = typer.Argument(
+        None,
+        help="Target directory (defaults to current directory)",
+    ),
+):
+    """Create a session log, handoff or decision with git context filled in.
+
+    Renders the template from .specify/templates/ with date, agent, feature,
+    the branch's commits and changed files (one git log pass), writes it
+    atomically under specs/<feature>/collaboration/active/ and updates the
+    collaboration index.
+
+    Examples:
+        lite-kits collab new session --agent claude-code
+        lite-kits collab new handoff --agent claude-code --to github-copilot
+        lite-kits collab new decision --agent claude-code --title "Use SQLite for the index"
+    """
+    target_dir = Path.cwd() if target is None else target
+    try:
+        result = RecordWriter(target_dir).create(
+            kind,
+            agent,
+            feature=feature,
+            to_agent=to_agent,
+            title=title,
+            status=record_status,
+            since=since,
+            git=not no_git,
+        )
+    except (ValueError, LockTimeoutError) as e:
+        console.print()
+        console.print(f"[red]Error:[/red] {e}", style="bold")
+        console.print()
+        raise typer.Exit(1)
+
+    if json_output:
+        typer.echo(json.dumps(result, indent=2))
+        return
+
+    console.print()
+    if result["created"]:
+        console.print(f"[bold green][OK] Created {result['kind']}:[/bold green] {result['path']}")
+    else:
+        console.print(f"[yellow]Kept existing {result['kind']}:[/yellow] {result['path']}")
+    console.print(f"[dim]{result['commits']} commit(s), {result['files']} file(s) from git[/dim]\n")
+
+@collab_app.command(name="archive")
+def collab_archive(
+    feature: Optional[str] = typer.Option(
+        None,
+        "--feature",
+        help="Comma-separated feature directories to archive (default: closed features)",
+    ),
+    base: Optional[str] = typer.Option(
+        None,
+        "--base",
+        help="Base branch for merged-feature detection (default: origin/HEAD, main or master)",
+    ),
+    pack: bool = typer.Option(
+        False,
+        "--pack",
+        help="Also pack old archived records into compressed per-feature bundles",
+    ),
+    older_than: str = typer.Option(
+        "90d",
+        "--older-than",
+        help="With --pack: pack records dated before this (90d, 12w, 2025-01-01)",
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        help="Show what would be archived without changing anything",
+    ),
+    json_output: bool = typer.Option(
+        False,
+        "--json",
+        help="Output results as JSON",
+    ),
+    target: Optional[Path] = typer.Argument(
+        None,
+        help="Target directory (defaults to current directory)",
+    ),
+):
+    """Archive collaboration records of merged or closed features.
+
+    Moves sessions, handoffs and decisions from collaboration/active/ to
+    collaboration/archive/ (staged with batched git moves). With --pack, old
+    archived records are compressed into records.jsonl.gz with an ARCHIVE.md
+    summary stub. Safe to re-run: already archived/packed records are skipped.
+
+    Examples:
+        lite-kits collab archive --dry-run
+        lite-kits collab archive --feature 012-user-auth
+        lite-kits collab archive --pack --older-than 180d
+    """
+    target_dir = Path.cwd() if target is None else target
+    features = [f.strip() for f in feature.split(',')] if feature else None
+
+    try:
+        cutoff = parse_since(older_than)
+    except ValueError:
+        console.print(
+            f"[red]Error:[/red] Invalid --older-than value: '{older_than}' "
+            "(use e.g. 90d, 12w or 2025-01-01)"
+        )
+        raise typer.Exit(2)
+
+    try:
+        archiver = CollabArchiver(target_dir, base=base)
+        result = archiver.archive(features=features, dry_run=dry_run)
+        if pack:
+            result["pack"] = archiver.pack(cutoff, dry_run=dry_run)
+        if not dry_run:
+            archiver.reindex()
+    except (ValueError, GitError) as e:
+        console.print()
+        console.print(f"[red]Error:[/red] {e}", style="bold")
+        console.print()
+        raise typer.Exit(1)
+
+    if json_output:
+        typer.echo(json.dumps(result, indent=2))
+        return
+
+    console.print()
+    if not result["features"]:
+        console.print("[dim]No merged or closed features with collaboration records[/dim]")
+    for name, reason in result["features"].items():
+        console.print(f"[cyan]{name}[/cyan] [dim]({reason})[/dim]")
+
+    verb = "Would move" if dry_run else "Moved"
+    console.print(f"\n{verb} {len(result['moved'])} record(s) to archive/")
+    for path in result["skipped"]:
+        console.print(f"  [dim]- skipped {path}[/dim]")
+
+    if pack:
+        packed = result["pack"]
+        verb = "Would pack" if dry_run else "Packed"
+        console.print(
+            f"{verb} {len(packed['packed'])} record(s) into {len(packed['bundles'])} bundle(s)"
+        )
+    console.print()
+
+@app.command(name="search")
+def search(
+    query: str = typer.Argument(
+        ...,
+        help='Search terms (words are AND-ed; use "quoted phrases" and prefix*)',
+    ),
+    limit: int = typer.Option(
+        10,
+        "--limit",
+        "-n",
+        help="Maximum number of results",
+    ),
+    rebuild: bool = typer.Option(
+        False,
+        "--rebuild",
+        help="Rebuild the search index from scratch",
+    ),
+    json_output: bool = typer.Option(
+        False,
+        "--json",
+        help="Output results as JSON",
+    ),
+):
+    """Search memory guides and collaboration records.
+
+    Indexes .specify/memory/*.md plus every session, handoff and decision
+    (including packed archives) into .specify/cache/search.db. Only files
+    that changed since the last search are re-indexed.
+
+    Examples:
+        lite-kits search "worktree cleanup"
+        lite-kits search handoff auth* --limit 5
+        lite-kits --directory path/to/project search database --json
+    """
+    from rich.markup import escape
+
+    from .core.search import MARK_END, MARK_START
+
+    index = SearchIndex(Path.cwd())
+    try:
+        index.refresh(rebuild=rebuild)
+        hits = index.search(query, limit=limit)
+    except (ValueError, RuntimeError) as e:
+        console.print()
+        console.print(f"[red]Error:[/red] {e}", style="bold")
+        console.print()
+        raise typer.Exit(1)
+    finally:
+        index.close()
+
+    if json_output:
+        for hit in hits:
+            hit["snippet"] = hit["snippet"].replace(MARK_START, "").replace(MARK_END, "")
+        typer.echo(json.dumps(hits, indent=2))
+        return
+
+    console.print()
+    if not hits:
+        console.print(f"[dim]No results for '{escape(query)}'[/dim]\n")
+        return
+
+    for hit in hits:
+        snippet = escape(hit["snippet"])
+        snippet = snippet.replace(MARK_START, "[bold yellow]").replace(MARK_END, "[/bold yellow]")
+        console.print(f"[cyan]{escape(hit['path'])}[/cyan]:[green]{hit['line']}[/green]")
+        console.print(f"  {snippet}")
+    console.print(f"\n[dim]{len(hits)} result(s)[/dim]\n")
+
+@app.command(name="specs")
+def specs(
+    feature: Optional[str] = typer.Option(
+        None,
+        "--feature",
+        help="Only show one feature (number or directory name)",
+    ),
+    json_output: bool = typer.Option(
+        False,
+        "--json",
+        help="Output feature summaries as JSON",
+    ),
+    target: Optional[Path] = typer.Argument(
+        None,
+        help="Target directory (defaults to current directory)",
+    ),
+):
+    """Show spec/plan/task progress for every feature in specs/.
+
+    Parses spec.md, plan.md and tasks.md for each specs/NNN-feature/
+    directory: status, task checkbox counts, phases and [P] parallel tasks.
+    Results are cached per file in .specify/cache/specs.json.
+
+    Examples:
+        lite-kits specs                  # Progress table
+        lite-kits specs --feature 012    # Single feature
+        lite-kits specs --json           # Machine-readable output
+    """
+    target_dir = Path.cwd() if target is None else target
+    features = SpecIndex(target_dir).scan(feature=feature)
+
+    if json_output:
+        typer.echo(json.dumps(features, indent=2))
+        return
+
+    console.print()
+    if not features:
+        console.print("[dim]No feature directories found in specs/[/dim]\n")
+        return
+
+    table = Table(show_header=True, header_style="bold cyan")
+    table.add_column("Feature", style="cyan")
+    table.add_column("Stage")
+    table.add_column("Tasks", justify="right")
+    table.add_column("Progress", justify="right")
+    table.add_column("[P] open", justify="right")
+    table.add_column("Current phase", style="dim")
+
+    for info in features:
+        tasks = info["tasks"]
+        if tasks and tasks["total"]:
+            task_display = f"{tasks['done']}/{tasks['total']}"
+            color = "green" if info["progress"] == 100 else "yellow"
+            progress_display = f"[{color}]{info['progress']}%[/{color}]"
+            parallel_display = str(tasks["parallel_open"])
+        else:
+            task_display = progress_display = parallel_display = "-"
+        table.add_row(
+            info["feature"],
+            info["stage"],
+            task_display,
+            progress_display,
+            parallel_display,
+            info["current_phase"] or "",
+        )
+
+    console.print(table)
+    console.print()
+
+@app.command(name="orient")
+def orient(
+    commits: int = typer.Option(
+        5,
+        "--commits",
+        "-n",
+        help="Number of recent commits to include",
+    ),
+    max_bytes: int = typer.Option(
+        4096,
+        "--max-bytes",
+        help="Upper bound for the rendered bundle size",
+    ),
+    max_age: float = typer.Option(
+        0,
+        "--max-age",
+        help="Reuse the cached bundle if it is younger than this many seconds",
+    ),
+    json_output: bool = typer.Option(
+        False,
+        "--json",
+        help="Output bundle data as JSON",
+    ),
+    target: Optional[Path] = typer.Argument(
+        None,
+        help="Target directory (defaults to current directory)",
+    ),
+):
+    """Print a one-shot orientation bundle for agents.
+
+    Collects git state, recent commits, the active spec and its task
+    progress, open handoffs and installed kits in a single process. The
+    bundle is cached in .specify/cache/orient.md so /orient can read one
+    file instead of running a dozen commands.
+
+    Examples:
+        lite-kits orient                  # Markdown bundle
+        lite-kits orient --json           # Structured data
+        lite-kits orient --max-age 60     # Reuse a bundle built in the last minute
+    """
+    target_dir = Path.cwd() if target is None else target
+    builder = OrientBuilder(target_dir)
+
+    data = builder.load_cached(max_age) if max_age > 0 else None
+    if data is None:
+        data = builder.build(commits=commits, max_bytes=max_bytes)
+
+    if json_output:
+        typer.echo(json.dumps(data, indent=2))
+    else:
+        typer.echo(data["markdown"], nl=False)
+
+@app.command(name="stats")
+def stats(
+    workers: Optional[int] = typer.Option(
+        None,
+        "--workers",
+        "-j",
+        help="Worker processes for line counting (default: CPU count, 1 = serial)",
+    ),
+    no_history: bool = typer.Option(
+        False,
+        "--no-history",
+        help="Skip commit history statistics",
+    ),
+    json_output: bool = typer.Option(
+        False,
+        "--json",
+        help="Output statistics as JSON",
+    ),
+    target: Optional[Path] = typer.Argument(
+        None,
+        help="Target directory (defaults to current directory)",
+    ),
+):
+    """Show code size per language and commit velocity.
+
+    Lists project files once (respecting .gitignore), counts lines in
+    parallel and reads history from a single git log pass. Per-file counts
+    are cached in .specify/cache/stats.json, so re-runs only read files
+    that changed.
+
+    Examples:
+        lite-kits stats                  # Language and history tables
+        lite-kits stats --json           # Machine-readable output
+        lite-kits stats -j 1             # Count serially
+    """
+    target_dir = Path.cwd() if target is None else target
+    data = ProjectStats(target_dir, workers=workers).collect(history=not no_history)
+
+    if json_output:
+        typer.echo(json.dumps(data, indent=2))
+        return
+
+    totals = data["totals"]
+    console.print()
+    table = Table(show_header=True, header_style="bold cyan")
+    table.add_column("Language", style="cyan")
+    table.add_column("Files", justify="right")
+    table.add_column("Lines", justify="right")
+    table.add_column("Share", justify="right")
+    for name, lang in data["languages"].items():
+        share = 100 * lang["lines"] / totals["lines"] if totals["lines"] else 0
+        table.add_row(name, f"{lang['files']:,}", f"{lang['lines']:,}", f"{share:.1f}%")
+    table.add_row(
+        "[bold]Total[/bold]",
+        f"[bold]{totals['files'] - totals['binary_files']:,}[/bold]",
+        f"[bold]{totals['lines']:,}[/bold]",
+        "",
+    )
+    console.print(table)
+    if totals["binary_files"]:
+        console.print(f"[dim]{totals['binary_files']} binary file(s) skipped[/dim]")
+
+    history = data["history"]
+    if history:
+        console.print()
+        console.print(
+            f"[bold]Commits:[/bold] {history['commits']:,} "
+            f"by {history['contributors']} contributor(s)"
+        )
+        last = history["commits_last"]
+        console.print(
+            f"[bold]Recent:[/bold] {last['7d']} (7d), {last['30d']} (30d), {last['90d']} (90d)"
+        )
+        console.print(
+            f"[bold]Velocity:[/bold] {history['per_week']}/week overall, "
+            f"{history['per_week_last_30d']}/week last 30 days"
+        )
+        if history["agents"]:
+            agents = ", ".join(
+                f"{row['agent']} {row['commits']} ({row['last_30d']} last 30d)"
+                for row in history["agents"][:5]
+            )
+            console.print(f"[bold]Agents:[/bold] {agents}")
+
+    cache = data["cache"]
+    console.print(
+        f"\n[dim]{cache['files']} files, {cache['recounted']} recounted "
+        f"in {cache['seconds']}s[/dim]\n"
+    )
+
+@app.command(name="audit")
+def audit(
+    output_format: str = typer.Option(
+        "text",
+        "--format",
+        "-f",
+        help="Output format: text, json or sarif",
+    ),
+    severity: str = typer.Option(
+        "low",
+        "--severity",
+        help="Lowest severity to report: low, medium or high",
+    ),
+    fail_on: str = typer.Option(
+        "high",
+        "--fail-on",
+        help="Exit with status 1 on findings at or above: low, medium, high or none",
+    ),
+    workers: Optional[int] = typer.Option(
+        None,
+        "--workers",
+        "-j",
+        help="Worker processes for scanning (default: CPU count, 1 = serial)",
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Rescan every file instead of skipping known-clean blobs",
+    ),
+    staged: bool = typer.Option(
+        False,
+        "--staged",
+        help="Scan the staged content (what the next commit contains), not the work tree",
+    ),
+    paths: Optional[list[Path]] = typer.Argument(
+        None,
+        help="Target directory, or files and directories to scan (defaults to current directory)",
+    ),
+):
+    """Scan for hardcoded secrets and risky code patterns.
+
+    All rules run as one combined matcher over each file, read once via
+    mmap and spread across CPU cores. Binary files are skipped, and files
+    that scanned clean are remembered by git blob hash, so rescans only
+    touch what changed. Suppress a line with an 'audit:ignore' comment.
+
+    A single directory argument is the project to scan. Otherwise the
+    arguments limit the scan to those paths under the current directory.
+
+    Examples:
+        lite-kits audit                       # Findings table
+        lite-kits audit --format sarif > audit.sarif
+        lite-kits audit src/ setup.py         # Only these paths
+        lite-kits audit --staged --fail-on medium   # Pre-commit gate
+    """
+    if output_format not in ("text", "json", "sarif"):
+        console.print(
+            f"[red]Error:[/red] Unknown format '{output_format}' (use text, json or sarif)"
+        )
+        raise typer.Exit(2)
+    if severity not in SEVERITIES or fail_on not in SEVERITIES + ["none"]:
+        console.print(
+            "[red]Error:[/red] Severities are low, medium, high (or 'none' for --fail-on)"
+        )
+        raise typer.Exit(2)
+
+    target_dir = Path.cwd()
+    scan_paths = None
+    if paths and len(paths) == 1 and not staged and paths[0].is_dir():
+        target_dir = paths[0]
+    elif paths:
+        root = target_dir.resolve()
+        scan_paths = []
+        for path in paths:
+            try:
+                scan_paths.append((root / path).resolve().relative_to(root).as_posix())
+            except ValueError:
+                console.print(f"[red]Error:[/red] {path} is outside {root}")
+                raise typer.Exit(2)
+
+    scanner = AuditScanner(target_dir, workers=workers, use_cache=not no_cache)
+    report = scanner.scan(min_severity=severity, paths=scan_paths, staged=staged)
+    findings = report["findings"]
+
+    if output_format == "json":
+        typer.echo(json.dumps(report, indent=2))
+    elif output_format == "sarif":
+        typer.echo(json.dumps(to_sarif(report, __version__, REPOSITORY_URL), indent=2))
+    else:
+        from rich.markup import escape
+
+        console.print()
+        if findings:
+            colors = {"high": "red", "medium": "yellow", "low": "dim"}
+            table = Table(show_header=True, header_style="bold cyan")
+            table.add_column("Severity")
+            table.add_column("Location", style="cyan", overflow="fold")
+            table.add_column("Rule")
+            table.add_column("Line", overflow="fold")
+            for f in findings:
+                color = colors[f["severity"]]
+                table.add_row(
+                    f"[{color}]{f['severity']}[/{color}]",
+                    f"{escape(f['path'])}:{f['line']}",
+                    f["rule"],
+                    escape(f["snippet"]),
+                )
+            console.print(table)
+        else:
+            console.print("[green][OK] No secrets or risky patterns found[/green]")
+
+        if report["manifests"]:
+            console.print("\n[bold]Dependency manifests[/bold] (run the matching audit tool):")
+            for manifest in report["manifests"]:
+                console.print(f"  {escape(manifest['path'])} -> [cyan]{manifest['tool']}[/cyan]")
+
+        console.print(
+            f"\n[dim]{report['files']} files: {report['scanned']} scanned, "
+            f"{report['cached']} cached clean, {report['binary']} binary, "
+            f"{report['skipped']} skipped in {report['seconds']}s[/dim]\n"
+        )
+
+    if fail_on != "none" and any(
+        SEVERITIES.index(f["severity"]) >= SEVERITIES.index(fail_on) for f in findings
+    ):
+        raise typer.Exit(1)
+
+@app.command(name="release")
+def release(
+    bump: Optional[str] = typer.Option(
+        None,
+        "--bump",
+        "-b",
+        help="major, minor, patch or an explicit X.Y.Z (default: suggested from commit types)",
+    ),
+    apply: bool = typer.Option(
+        False,
+        "--apply",
+        help="Write version files and CHANGELOG.md, commit and tag (default: preview only)",
+    ),
+    no_changelog: bool = typer.Option(
+        False,
+        "--no-changelog",
+        help="Do not update CHANGELOG.md",
+    ),
+    no_tag: bool = typer.Option(
+        False,
+        "--no-tag",
+        help="Do not create the annotated tag",
+    ),
+    notes_only: bool = typer.Option(
+        False,
+        "--notes",
+        help="Print only the changelog section",
+    ),
+    max_entries: int = typer.Option(
+        50,
+        "--max-entries",
+        help="Newest commits listed per changelog section",
+    ),
+    json_output: bool = typer.Option(
+        False,
+        "--json",
+        help="Output the release plan as JSON",
+    ),
+    target: Optional[Path] = typer.Argument(
+        None,
+        help="Target directory (defaults to current directory)",
+    ),
+):
+    """Prepare a release: notes since the last tag, version bump, tag.
+
+    Commits since the last tag are read in one streamed git log pass and
+    grouped by conventional commit type (feat, fix, perf, docs, ...).
+    Version strings in pyproject.toml, setup.cfg, package.json and
+    __version__ assignments are rewritten together. Hand-written entries
+    under '## [Unreleased]' in CHANGELOG.md are used as the release section
+    when present; otherwise the generated notes are.
+
+    Examples:
+        lite-kits release                     # Preview next version and notes
+        lite-kits release --notes             # Changelog section only
+        lite-kits release --bump minor --apply
+    """
+    target_dir = Path.cwd() if target is None else target
+    try:
+        builder = ReleaseBuilder(target_dir)
+        plan = builder.plan(level=bump, max_entries=max_entries)
+        result = None
+        if apply:
+            result = builder.apply(plan, changelog=not no_changelog, tag=not no_tag)
+    except (ValueError, GitError) as e:
+        console.print(f"[red]Error:[/red] {e}", style="bold")
+        raise typer.Exit(1)
+
+    if json_output:
+        typer.echo(json.dumps({**plan, "applied": result}, indent=2))
+        return
+    if notes_only:
+        typer.echo(plan["notes"])
+        return
+
+    from rich.markup import escape
+
+    console.print()
+    since = plan["since"] or "the first commit"
+    console.print(
+        f"[bold]{plan['current']} -> [cyan]{plan['version']}[/cyan][/bold] "
+        f"[dim]({plan['commits']} commits since {escape(since)}, "
+        f"{plan['contributors']} contributors)[/dim]"
+    )
+    for entry in plan["files"]:
+        console.print(f"  {escape(entry['path'])}: {entry['from']} -> {entry['to']}")
+    console.print()
+    console.print(escape(plan["notes"]), highlight=False)
+
+    if result:
+        console.print(f"[green][OK] Released {plan['tag']}[/green]")
+        if result["commit"]:
+            console.print(f"  Commit: {result['commit']}", style="dim")
+        console.print("  Push with: git push --follow-tags", style="dim")
+    else:
+        console.print(
+            "[dim]Preview only. Run with --apply to write files, commit and tag "
+            f"{plan['tag']}.[/dim]"
+        )
+    console.print()
+
+@app.command(name="diffsum")
+def diffsum(
+    staged_only: bool = typer.Option(
+        False,
+        "--staged",
+        help="Only summarize staged changes",
+    ),
+    max_bytes: int = typer.Option(
+        8192,
+        "--max-bytes",
+        help="Upper bound for the rendered summary size",
+    ),
+    hunk_lines: int = typer.Option(
+        30,
+        "--hunk-lines",
+        help="Patch lines kept per file",
+    ),
+    patch_lines: int = typer.Option(
+        400,
+        "--patch-lines",
+        help="Patch lines kept across all files",
+    ),
+    max_files: int = typer.Option(
+        200,
+        "--max-files",
+        help="File entries kept per section (JSON output)",
+    ),
+    json_output: bool = typer.Option(
+        False,
+        "--json",
+        help="Output the summary as JSON",
+    ),
+    target: Optional[Path] = typer.Argument(
+        None,
+        help="Target directory (defaults to current directory)",
+    ),
+):
+    """Summarize staged and unstaged changes within a size budget.
+
+    Reads file status and line counts from one 'git diff --raw --numstat'
+    call per side and streams the patch, keeping only the first lines of
+    each file. Classifies each file (source, test, docs, config, ci,
+    lockfile, generated, asset) and suggests commit groupings for /commit and
+    /review.
+
+    Examples:
+        lite-kits diffsum                  # Markdown summary
+        lite-kits diffsum --staged         # What /review should look at
+        lite-kits diffsum --json           # Structured data
+    """
+    target_dir = Path.cwd() if target is None else target
+    try:
+        data = DiffSummarizer(target_dir).summarize(
+            staged_only=staged_only,
+            hunk_lines=hunk_lines,
+            patch_lines=patch_lines,
+            max_files=max_files,
+        )
+    except GitError as e:
+        console.print()
+        console.print(f"[red]Error:[/red] {e}", style="bold")
+        console.print()
+        raise typer.Exit(1)
+
+    if json_output:
+        typer.echo(json.dumps(data, indent=2))
+    else:
+        typer.echo(render_summary(data, max_bytes), nl=False)
+
+@app.command(name="branches")
+def branches(
+    base: Optional[str] = typer.Option(
+        None,
+        "--base",
+        help="Branch merges are measured against (default: origin/HEAD, main or master)",
+    ),
+    remote: str = typer.Option(
+        "origin",
+        "--remote",
+        help="Remote whose branches are analyzed and deleted",
+    ),
+    local_only: bool = typer.Option(
+        False,
+        "--local",
+        help="Only analyze local branches",
+    ),
+    stale_days: int = typer.Option(
+        90,
+        "--stale-days",
+        help="Unmerged branches older than this are reported as stale",
+    ),
+    include_stale: bool = typer.Option(
+        False,
+        "--include-stale",
+        help="Add stale unmerged branches to the deletion plan (force delete)",
+    ),
+    delete: bool = typer.Option(
+        False,
+        "--delete",
+        help="Delete every branch in the plan (batched)",
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        help="With --delete: print the git commands without running them",
+    ),
+    force: bool = typer.Option(
+        False,
+        "--force",
+        help="With --delete: skip the confirmation prompt",
+    ),
+    json_output: bool = typer.Option(
+        False,
+        "--json",
+        help="Output analysis (and deletion results) as JSON",
+    ),
+    target: Optional[Path] = typer.Argument(
+        None,
+        help="Target directory (defaults to current directory)",
+    ),
+):
+    """Find merged and abandoned branches and plan their deletion.
+
+    Reads all local and remote branches with one for-each-ref call and the
+    merged set with one ancestry check, instead of running git log per
+    branch. Protects base branches, the current branch, branches checked
+    out in worktrees and features with active collaboration records.
+
+    Examples:
+        lite-kits branches                          # Ranked deletion plan
+        lite-kits branches --delete --dry-run       # Show batched commands
+        lite-kits branches --local --delete         # Delete merged local branches
+    """
+    target_dir = Path.cwd() if target is None else target
+    try:
+        analyzer = BranchAnalyzer(target_dir, base=base, remote=remote)
+        data = analyzer.analyze(
+            include_remote=not local_only,
+            stale_days=stale_days,
+            include_stale=include_stale,
+        )
+    except GitError as e:
+        console.print()
+        console.print(f"[red]Error:[/red] {e}", style="bold")
+        console.print()
+        raise typer.Exit(1)
+
+    plan = data["plan"]
+    if not json_output:
+        console.print()
+        console.print(
+            f"[bold]Base:[/bold] {data['base']}   "
+            f"[bold]Current:[/bold] {data['current'] or '(detached)'}"
+        )
+        counts = {}
+        for branch in data["branches"]:
+            counts[branch["category"]] = counts.get(branch["category"], 0) + 1
+        summary = ", ".join(f"{n} {c}" for c, n in sorted(counts.items()))
+        console.print(f"[dim]{summary}[/dim]\n")
+
+        if plan:
+            table = Table(
+                show_header=True,
+                header_style="bold cyan",
+                title="[bold magenta]Deletion Plan[/bold magenta]",
+            )
+            table.add_column("#", justify="right", style="dim")
+            table.add_column("Branch", style="cyan")
+            table.add_column("Category")
+            table.add_column("Last commit")
+            table.add_column("Reason", style="dim")
+            colors = {"merged": "green", "gone": "yellow", "stale": "red"}
+            for i, branch in enumerate(plan, 1):
+                name = branch["name"]
+                if branch["kind"] != "local":
+                    name = f"{data['remote']}/{name}"
+                color = colors[branch["category"]]
+                table.add_row(
+                    str(i),
+                    name,
+                    f"[{color}]{branch['category']}[/{color}]",
+                    f"{branch['sha']} {branch['age_days']}d ago by {branch['author']}",
+                    branch["reason"],
+                )
+            console.print(table)
+        else:
+            console.print("[green][OK] No branches to clean up[/green]")
+
+        protected = [
+            b for b in data["branches"] if b["category"] == "protected" and b["kind"] == "local"
+        ]
+        for branch in protected:
+            console.print(f"  [dim]kept {branch['name']}: {branch['reason']}[/dim]")
+        console.print()
+
+    result = None
+    if delete and plan:
+        if not (force or dry_run):
+            if json_output:
+                console.print("[red]Error:[/red] --delete with --json needs --force or --dry-run")
+                raise typer.Exit(2)
+            if not typer.confirm(f"Delete {len(plan)} branch(es)?"):
+                raise typer.Exit()
+        result = analyzer.delete(plan, dry_run=dry_run)
+        if not json_output:
+            if dry_run:
+                for command in result["commands"]:
+                    console.print(f"  {command}")
+            else:
+                console.print(f"[green][OK] Deleted {len(result['deleted'])} branch(es)[/green]")
+                for failure in result["failed"]:
+                    console.print(f"  [red]{failure['name']}[/red]: {failure['error']}")
+            console.print()
+
+    if json_output:
+        data["deletion"] = result
+        typer.echo(json.dumps(data, indent=2))
+
+def _open_checkpoints(target: Optional[Path], keep: int = 10) -> CheckpointStore:
+    """Open the checkpoint store for a repository, exiting on git errors."""
+    target_dir = Path.cwd() if target is None else target
+    try:
+        return CheckpointStore(target_dir, keep=keep)
+    except GitError as e:
+        console.print()
+        console.print(f"[red]Error:[/red] {e}", style="bold")
+        console.print()
+        raise typer.Exit(1)
+
+@checkpoint_app.command(name="create")
+def checkpoint_create(
+    message: str = typer.Option(
+        "",
+        "--message",
+        "-m",
+        help="Description of the checkpoint",
+    ),
+    keep: int = typer.Option(
+        10,
+        "--keep",
+        help="Number of checkpoints to retain (older ones are expired)",
+    ),
+    json_output: bool = typer.Option(
+        False,
+        "--json",
+        help="Output the checkpoint as JSON",
+    ),
+    target: Optional[Path] = typer.Argument(
+        None,
+        help="Target directory (defaults to current directory)",
+    ),
+):
+    """Snapshot all tracked and untracked (non-ignored) files.
+
+    Uses a temporary index, so the working tree, the real index and HEAD
+    are untouched. Identical consecutive snapshots are not duplicated.
+
+    Examples:
+        lite-kits checkpoint create -m "before refactor"
+        lite-kits checkpoint create --keep 20
+    """
+    store = _open_checkpoints(target, keep)
+    try:
+        checkpoint = store.create(message)
+    except GitError as e:
+        console.print(f"[red]Error:[/red] {e}", style="bold")
+        raise typer.Exit(1)
+
+    if json_output:
+        typer.echo(json.dumps(checkpoint, indent=2))
+        return
+
+    console.print()
+    if checkpoint["created"]:
+        console.print(
+            f"[green][OK] Created checkpoint {checkpoint['id']}[/green] "
+            f"({checkpoint['commit'][:10]})"
+        )
+    else:
+        console.print(f"[dim]No changes since checkpoint {checkpoint['id']}[/dim]")
+    if checkpoint["expired"]:
+        expired = ", ".join(map(str, checkpoint["expired"]))
+        console.print(f"[dim]Expired checkpoints: {expired}[/dim]")
+    console.print()
+
+@checkpoint_app.command(name="list")
+def checkpoint_list(
+    json_output: bool = typer.Option(
+        False,
+        "--json",
+        help="Output checkpoints as JSON",
+    ),
+    target: Optional[Path] = typer.Argument(
+        None,
+        help="Target directory (defaults to current directory)",
+    ),
+):
+    """List checkpoints, newest first."""
+    from datetime import datetime
+
+    checkpoints = _open_checkpoints(target).list()
+    if json_output:
+        typer.echo(json.dumps(checkpoints, indent=2))
+        return
+
+    console.print()
+    if not checkpoints:
+        console.print("[dim]No checkpoints[/dim]\n")
+        return
+    table = Table(show_header=True, header_style="bold cyan")
+    table.add_column("ID", justify="right", style="cyan")
+    table.add_column("Created")
+    table.add_column("Branch", style="dim")
+    table.add_column("Message")
+    for cp in checkpoints:
+        created = ""
+        if cp["date"]:
+            created = datetime.fromtimestamp(cp["date"]).strftime("%Y-%m-%d %H:%M:%S")
+        table.add_row(str(cp["id"]), created, cp["branch"] or "", cp["message"])
+    console.print(table)
+    console.print()
+
+@checkpoint_app.command(name="restore")
+def checkpoint_restore(
+    checkpoint_id: int = typer.Argument(
+        ...,
+        help="Checkpoint ID (see 'checkpoint list')",
+    ),
+    paths: Optional[list[str]] = typer.Option(
+        None,
+        "--path",
+        "-p",
+        help="Only restore these paths or directories (repeatable)",
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        help="Show which files would change",
+    ),
+    no_backup: bool = typer.Option(
+        False,
+        "--no-backup",
+        help="Don't checkpoint the current state before restoring",
+    ),
+    json_output: bool = typer.Option(
+        False,
+        "--json",
+        help="Output the result as JSON",
+    ),
+    target: Optional[Path] = typer.Option(
+        None,
+        "--target",
+        help="Target directory (defaults to current directory)",
+    ),
+):
+    """Restore the working tree to a checkpoint.
+
+    Only files that differ from the checkpoint are rewritten (or removed).
+    The index and HEAD are left alone. The current state is checkpointed
+    first, so a restore can itself be undone.
+
+    Examples:
+        lite-kits checkpoint restore 3 --dry-run
+        lite-kits checkpoint restore 3 -p src/
+    """
+    store = _open_checkpoints(target)
+    try:
+        result = store.restore(checkpoint_id, paths=paths, dry_run=dry_run, backup=not no_backup)
+    except GitError as e:
+        console.print()
+        console.print(f"[red]Error:[/red] {e}", style="bold")
+        console.print()
+        raise typer.Exit(1)
+
+    if json_output:
+        typer.echo(json.dumps(result, indent=2))
+        return
+
+    console.print()
+    if not (result["restored"] or result["removed"]):
+        console.print(f"[dim]Working tree already matches checkpoint {checkpoint_id}[/dim]\n")
+        return
+    verb = "Would restore" if dry_run else "Restored"
+    console.print(f"[bold]{verb} checkpoint {checkpoint_id}:[/bold]")
+    for path in result["restored"]:
+        console.print(f"  [green]~[/green] {path}")
+    for path in result["removed"]:
+        console.print(f"  [red]-[/red] {path}")
+    if result["backup"]:
+        console.print(f"\n[dim]Previous state saved as checkpoint {result['backup']}[/dim]")
+    console.print()
+
+@checkpoint_app.command(name="drop")
+def checkpoint_drop(
+    checkpoint_ids: list[int] = typer.Argument(
+        ...,
+        help="Checkpoint IDs to delete",
+    ),
+    target: Optional[Path] = typer.Option(
+        None,
+        "--target",
+        help="Target directory (defaults to current directory)",
+    ),
+):
+    """Delete checkpoints."""
+    dropped = _open_checkpoints(target).drop(checkpoint_ids)
+    console.print()
+    if dropped:
+        console.print(f"[green][OK] Dropped checkpoint(s): {', '.join(map(str, dropped))}[/green]")
+    missing = sorted(set(checkpoint_ids) - set(dropped))
+    if missing:
+        console.print(f"[yellow]Not found: {', '.join(map(str, missing))}[/yellow]")
+    console.print()
+
+@hooks_app.command(name="run")
+def hooks_run(
+    hook: Optional[list[str]] = typer.Option(
+        None,
+        "--hook",
+        help="Only run this hook id (repeatable; runs it even if disabled)",
+    ),
+    all_files: bool = typer.Option(
+        False,
+        "--all-files",
+        help="Check every tracked file instead of the staged ones",
+    ),
+    jobs: Optional[int] = typer.Option(
+        None,
+        "--jobs",
+        "-j",
+        help="Hooks run at the same time (default: settings.jobs in hooks.yaml)",
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Run hooks even if they already passed on this staged tree",
+    ),
+    json_output: bool = typer.Option(
+        False,
+        "--json",
+        help="Output results as JSON",
+    ),
+    target: Optional[Path] = typer.Argument(
+        None,
+        help="Target directory (defaults to current directory)",
+    ),
+):
+    """Run the configured pre-commit checks against the staged files.
+
+    Hooks run in parallel, each with its own timeout, and each receives only
+    the staged paths matching its 'files' pattern. A hook that passed is not
+    run again while the staged tree and its config stay the same. Exits with
+    status 1 when any hook fails or times out.
+
+    Examples:
+        lite-kits hooks run                    # What the git hook runs
+        lite-kits hooks run --hook ruff        # One hook
+        lite-kits hooks run --all-files        # Whole repository
+    """
+    target_dir = Path.cwd() if target is None else target
+    try:
+        runner = HookRunner(target_dir, jobs=jobs, use_cache=not no_cache)
+        report = runner.run(hook_ids=hook, all_files=all_files)
+    except FileNotFoundError:
+        console.print(f"[red]Error:[/red] No {HOOKS_CONFIG.as_posix()} found", style="bold")
+        console.print(f"  Run: {APP_NAME} add --kit {KIT_HOOKS}", style="dim")
+        raise typer.Exit(1)
+    except (ValueError, GitError) as e:
+        console.print(f"[red]Error:[/red] {e}", style="bold")
+        raise typer.Exit(1)
+
+    if json_output:
+        typer.echo(json.dumps(report, indent=2))
+    else:
+        from rich.markup import escape
+
+        styles = {
+            "passed": "[green]passed[/green]",
+            "cached": "[green]passed[/green] [dim](cached)[/dim]",
+            "skipped": "[dim]skipped (no files)[/dim]",
+            "disabled": "[dim]disabled[/dim]",
+            "failed": "[red]failed[/red]",
+            "timeout": "[red]timed out[/red]",
+            "error": "[red]error[/red]",
+        }
+        console.print()
+        for result in report["hooks"]:
+            timing = f" [dim]{result['seconds']:.2f}s[/dim]" if result["seconds"] else ""
+            console.print(f"  {escape(result['name']):<40} {styles[result['status']]}{timing}")
+        for result in report["hooks"]:
+            if result["status"] in ("failed", "timeout", "error") and result["output"]:
+                console.print(f"\n[bold red]{escape(result['id'])}[/bold red]")
+                console.print(escape(result["output"]), highlight=False)
+        console.print(f"\n[dim]{report['files']} files checked in {report['seconds']}s[/dim]\n")
+
+    if not report["passed"]:
+        raise typer.Exit(1)
+
+@hooks_app.command(name="install")
+def hooks_install(
+    force: bool = typer.Option(
+        False,
+        "--force",
+        help="Replace an existing pre-commit hook not written by lite-kits",
+    ),
+    target: Optional[Path] = typer.Argument(
+        None,
+        help="Target directory (defaults to current directory)",
+    ),
+):
+    """Install the git pre-commit hook that runs 'lite-kits hooks run'.
+
+    Honors core.hooksPath. An existing hook from another tool is left alone
+    unless --force is given.
+
+    Example:
+        lite-kits hooks install
+    """
+    target_dir = Path.cwd() if target is None else target
+    if not (target_dir / HOOKS_CONFIG).exists():
+        console.print(f"[yellow]Warning:[/yellow] No {HOOKS_CONFIG.as_posix()} yet", style="bold")
+        console.print(f"  Run: {APP_NAME} add --kit {KIT_HOOKS}", style="dim")
+    try:
+        hook_path = install_git_hook(target_dir, force=force)
+    except (FileExistsError, GitError) as e:
+        console.print(f"[red]Error:[/red] {e}", style="bold")
+        raise typer.Exit(1)
+    console.print(f"[green][OK] Installed pre-commit hook:[/green] {hook_path}")
+
+@app.command(name="info")
+def package_info():
+    """Show package information and available kits.
+
+    Displays:
+    - Package version and repository
+    - Available kits (dev, multiagent)
+    - Kit descriptions and commands
+    - Package management commands
+    """
+    # Package info (banner removed to avoid duplication with --banner flag)
+    console.print()
+    console.print("[bold]Info:[/bold]")
+    info_table = Table(show_header=False, box=None, padding=(0, 2))
+    info_table.add_column("Key", style="cyan")
+    info_table.add_column("Value")
+
+    info_table.add_row("Version", __version__)
+    info_table.add_row("Repository", REPOSITORY_URL)
+    info_table.add_row("License", LICENSE)
+
+    console.print(info_table)
+    console.print()
+
+    # Available kits
+    console.print("[bold]Available Kits:[/bold]")
+    kits_table = Table(show_header=False, box=None, padding=(0, 2))
+    kits_table.add_column("Kit", style="cyan")
+    kits_table.add_column("Description")
+
+    kits_table.add_row(KIT_DEV, KIT_DESC_DEV)
+    kits_table.add_row(KIT_MULTIAGENT, KIT_DESC_MULTIAGENT)
+    kits_table.add_row(KIT_HOOKS, KIT_DESC_HOOKS)
+
+    # Kits from installed packs (LITE_KITS_PATH / 'lite_kits.packs' entry points)
+    from rich.markup import escape
+
+    manifest = KitManifest(KITS_DIR)
+    for name in manifest.get_pack_kit_names():
+        try:
+            kit_info = manifest.get_kit(name)
+            pack = escape(kit_info['pack'])
+            kits_table.add_row(name, f"{kit_info.get('description', '')} [dim](pack: {pack})[/dim]")
+        except ValueError as e:
+            kits_table.add_row(name, f"[red]invalid:[/red] {escape(str(e))}")
+
+    console.print(kits_table)
+    print_manifest_warnings(manifest)
+    console.print()
+
+    # Package management
+    console.print("[bold]Package Management:[/bold]")
+    package_table = Table(show_header=False, box=None, padding=(0, 2))
+    package_table.add_column("Action", style="cyan")
+    package_table.add_column("Command")
+    
+    package_table.add_row("Update", f"[dim]uv tool install --upgrade {APP_NAME}[/dim]")
+    package_table.add_row("Uninstall", f"[dim]uv tool uninstall {APP_NAME}[/dim]")
+    
+    console.print(package_table)
+    console.print()
+
+@app.command(name="uninstall")
+def package_uninstall():
+    """Instructions for uninstalling the lite-kits package."""
+    console.print()
+    console.print(f"[bold yellow]Uninstall {APP_NAME}[/bold yellow]\n")
+
+    console.print("To uninstall the package, run:\n")
+    console.print(f"  [cyan]uv tool uninstall {APP_NAME}[/cyan]\n")
+
+    console.print("[dim]Or with pip:[/dim]\n")
+    console.print(f"  [dim]pip uninstall {APP_NAME}[/dim]\n")
+
+    console.print("[bold]Note:[/bold] This will remove the package but NOT the kits you've added to projects.")
+    console.print(f"To remove kits from a project, first run: [cyan]{APP_NAME} remove --all[/cyan]\n")
+
+@app.command(name="help")
+def show_help(
+    ctx: typer.Context,
+    command_name: Optional[str] = typer.Argument(
+        None,
+        help="Command to get help for (e.g., 'add', 'remove')",
+    ),
+):
+    """Show help and available commands.
+
+    Usage:
+        lite-kits help           # Show general help
+        lite-kits help add       # Show help for 'add' command
+    """
+    if command_name:
+        # Show help for specific command by invoking it with --help
+        import sys
+        sys.argv = [APP_NAME, command_name, "--help"]
+        try:
+            app()
+        except SystemExit:
+            pass
+    else:
+        # Show general help
+        console.print(ctx.parent.get_help())
+    raise typer.Exit(0)
+
+@app.command(name="banner", hidden=True)
+def show_banner():
+    """Show the lite-kits banner (hidden easter egg command)."""
+    diagonal_reveal_banner()
+
+@feature_app.command(name="new")
+def feature_new(
+    description: str = typer.Argument(
+        ...,
+        help="Feature description (first words become the branch name)",
+    ),
+    short_name: Optional[str] = typer.Option(
+        None,
+        "--short-name",
+        help="Explicit name to use instead of the description's first words",
+    ),
+    checkout: bool = typer.Option(
+        True,
+        "--checkout/--no-checkout",
+        help="Switch to the new feature branch",
+    ),
+    timeout: float = typer.Option(
+        10.0,
+        "--timeout",
+        help="Seconds to wait for another allocation to finish",
+    ),
+    json_output: bool = typer.Option(
+        False,
+        "--json",
+        help="Output the allocation as JSON (same keys as create-new-feature.sh --json)",
+    ),
+    target: Optional[Path] = typer.Argument(
+        None,
+        help="Target directory (defaults to current directory)",
+    ),
+):
+    """Create the next numbered feature branch and spec directory.
+
+    Replaces spec-kit's create-new-feature.sh: the number comes from one scan
+    of specs/ plus all local and remote branch names, and is claimed under a
+    project lock so concurrent agents never get the same number.
+
+    Examples:
+        lite-kits feature new "Add user authentication"
+        lite-kits feature new "OAuth login flow" --short-name oauth --json
+    """
+    target_dir = Path.cwd() if target is None else target
+
+    try:
+        result = FeatureAllocator(target_dir).create(
+            description,
+            short_name=short_name,
+            checkout=checkout,
+            timeout=timeout,
+        )
+    except (GitError, LockTimeoutError, OSError, ValueError) as e:
+        console.print(f"[red]Error:[/red] {e}", style="bold")
+        raise typer.Exit(1)
+
+    if json_output:
+        typer.echo(json.dumps(result, indent=2))
+        return
+
+    console.print()
+    console.print(f"[green][OK] Created feature {result['BRANCH_NAME']}[/green]")
+    console.print(f"  Spec file: {result['SPEC_FILE']}")
+    if not result["HAS_GIT"]:
+        console.print("[dim]  Git repository not detected; no branch created[/dim]")
+    elif not result["BRANCH_CREATED"]:
+        console.print(
+            "[dim]  Repository has no commits yet; branch starts with the first commit[/dim]"
+        )
+    elif checkout:
+        console.print(f"  Switched to branch {result['BRANCH_NAME']}")
+    console.print(
+        f"[dim]  Set SPECIFY_FEATURE={result['BRANCH_NAME']} "
+        "to target it from spec-kit scripts[/dim]"
+    )
+    console.print()
+
+@feature_app.command(name="context")
+def feature_context(
+    agent: Optional[list[str]] = typer.Option(
+        None,
+        "--agent",
+        "-a",
+        help="Agent file to update, created if missing (repeatable; default: every existing one)",
+    ),
+    feature: Optional[str] = typer.Option(
+        None,
+        "--feature",
+        help="Feature branch name (default: SPECIFY_FEATURE, then the current branch)",
+    ),
+    force: bool = typer.Option(
+        False,
+        "--force",
+        help="Re-apply the plan even if it has not changed since the last run",
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        help="Show which files and sections would change without writing",
+    ),
+    json_output: bool = typer.Option(
+        False,
+        "--json",
+        help="Output the result as JSON",
+    ),
+    target: Optional[Path] = typer.Argument(
+        None,
+        help="Target directory (defaults to current directory)",
+    ),
+):
+    """Update agent context files (CLAUDE.md, ...) from the feature's plan.md.
+
+    Replaces spec-kit's update-agent-context.sh: plan.md is parsed once, only
+    files whose 'Active Technologies' or 'Recent Changes' section differs are
+    rewritten, and nothing is read at all when the plan is unchanged.
+
+    Examples:
+        lite-kits feature context                  # Every existing agent file
+        lite-kits feature context --agent claude   # Create CLAUDE.md if missing
+    """
+    target_dir = Path.cwd() if target is None else target
+
+    try:
+        result = AgentContextUpdater(target_dir, feature=feature).update(
+            agents=agent,
+            force=force,
+            dry_run=dry_run,
+        )
+    except (LockTimeoutError, OSError, ValueError) as e:
+        console.print(f"[red]Error:[/red] {e}", style="bold")
+        raise typer.Exit(1)
+
+    if json_output:
+        typer.echo(json.dumps(result, indent=2))
+        return
+
+    console.print()
+    if result["skipped"]:
+        console.print(f"[green][OK] Agent context already up to date with {result['plan']}[/green]")
+        console.print()
+        return
+
+    styles = {"created": "green", "updated": "yellow", "unchanged": "dim", "error": "red"}
+    for entry in result["files"]:
+        style = styles[entry["action"]]
+        detail = ", ".join(entry["sections"]) or entry.get("error", "")
+        verb = entry["action"]
+        if dry_run and verb in ("created", "updated"):
+            verb = "would be " + verb
+        detail = f" ({detail})" if detail else ""
+        console.print(f"  [{style}]{entry['path']}[/{style}]: {verb}{detail}")
+    console.print(f"\n[dim]Feature {result['feature']} from {result['plan']}[/dim]\n")
+
+    if any(entry["action"] == "error" for entry in result["files"]):
+        raise typer.Exit(1)
+
+@app.command(name="stress", hidden=True)
+def stress(
+    installers: int = typer.Option(4, "--installers", "-i", help="Concurrent installer processes"),
+    validators: int = typer.Option(4, "--validators", "-v", help="Concurrent validator processes"),
+    rounds: int = typer.Option(10, "--rounds", "-n", help="Operations per process"),
+    kit: Optional[list[str]] = typer.Option(
+        None,
+        "--kit",
+        help="Kit to install (repeatable; default: manifest default)",
+    ),
+    in_place: bool = typer.Option(
+        False,
+        "--in-place",
+        help="Stress the project itself instead of a temporary copy (overwrites kit files)",
+    ),
+    json_output: bool = typer.Option(False, "--json", help="Output the report as JSON"),
+    target: Optional[Path] = typer.Argument(
+        None,
+        help="Target directory (defaults to current directory)",
+    ),
+):
+    """Run concurrent installs and validations against one project (maintainers).
+
+    Installers loop 'add --force' under the project install lock while
+    validators read lock-free. Reports lock contention, latency percentiles
+    and any validation that saw a half-written project.
+
+    Example:
+        lite-kits stress -i 8 -v 8 -n 20
+    """
+    target_dir = Path.cwd() if target is None else target
+
+    try:
+        report = run_stress(
+            target_dir,
+            kits=kit,
+            installers=installers,
+            validators=validators,
+            rounds=rounds,
+            scratch=not in_place,
+        )
+    except (OSError, ValueError) as e:
+        console.print(f"[red]Error:[/red] {e}", style="bold")
+        raise typer.Exit(1)
+
+    install, check = report["install"], report["validate"]
+    if json_output:
+        typer.echo(json.dumps(report, indent=2))
+    else:
+        table = Table(show_header=True, header_style="bold cyan")
+        table.add_column("Operation", style="cyan")
+        table.add_column("Ops", justify="right")
+        for column in ("p50", "p90", "p99", "max"):
+            table.add_column(column, justify="right")
+        rows = [
+            ("install", install["ops"], install["latency"]),
+            ("  lock wait", install["contended"], install["lock_wait"]),
+            ("validate", check["ops"], check["latency"]),
+        ]
+        for name, ops, stats in rows:
+            table.add_row(
+                name, str(ops),
+                *(f"{stats[key] * 1000:.1f}ms" for key in ("p50", "p90", "p99", "max")),
+            )
+
+        console.print()
+        console.print(table)
+        console.print(
+            f"[dim]{report['installers']} installers x {report['validators']} validators x "
+            f"{report['rounds']} rounds in {report['seconds']}s; "
+            f"lock contended on {install['contended']}/{install['ops']} installs[/dim]"
+        )
+        for error in install["errors"] + check["errors"]:
+            console.print(f"[red]Error:[/red] {error}")
+        if check["inconsistent"]:
+            console.print(
+                f"[red][X] {check['inconsistent']} validation(s) saw an inconsistent project[/red]"
+            )
+        else:
+            console.print("[green][OK] Every validation saw a consistent project[/green]")
+        console.print()
+
+    if install["errors"] or check["errors"] or check["inconsistent"]:
+        raise typer.Exit(1)
+
+@worktree_app.command(name="new")
+def worktree_new(
+    agent: str = typer.Argument(..., help="Agent name (e.g. claude, copilot)"),
+    feature: str = typer.Argument(..., help="Feature name or number (e.g. 003 or 003-user-auth)"),
+    path: Optional[Path] = typer.Option(
+        None,
+        "--path",
+        help="Worktree directory (default: <repo>-<number>-<agent> next to the main worktree)",
+    ),
+    branch: Optional[str] = typer.Option(
+        None,
+        "--branch",
+        help="Branch to create (default: <feature>-<agent>)",
+    ),
+    start: Optional[str] = typer.Option(
+        None,
+        "--from",
+        help="Start point (default: the feature branch if it exists, else HEAD)",
+    ),
+    sparse: bool = typer.Option(
+        False,
+        "--sparse",
+        help="Check out only the feature's specs, .specify/, agent dirs and root files",
+    ),
+    include: Optional[list[str]] = typer.Option(
+        None,
+        "--include",
+        help="Extra directory for --sparse (repeatable)",
+    ),
+    json_output: bool = typer.Option(
+        False,
+        "--json",
+        help="Output the new workspace as JSON",
+    ),
+    target: Optional[Path] = typer.Argument(
+        None,
+        help="Target directory (defaults to current directory)",
+    ),
+):
+    """Create a ready-to-use worktree for one agent on one feature.
+
+    Creates the worktree and branch (optionally sparse), links kit files
+    from the repository's kit store, seeds content-addressed caches, and
+    pre-creates today's session log from the session-log template.
+
+    Examples:
+        lite-kits worktree new claude 003
+        lite-kits worktree new copilot 003-user-auth --sparse --include src/web --json
+    """
+    target_dir = Path.cwd() if target is None else target
+
+    try:
+        result = provision_worktree(
+            target_dir,
+            agent,
+            feature,
+            path=path,
+            branch=branch,
+            start=start,
+            sparse=sparse,
+            include=include,
+        )
+    except (GitError, OSError, ValueError) as e:
+        console.print(f"[red]Error:[/red] {e}", style="bold")
+        raise typer.Exit(1)
+
+    if json_output:
+        typer.echo(json.dumps(result, indent=2))
+        return
+
+    console.print()
+    console.print(f"[green][OK] Worktree ready in {result['seconds']}s: {result['path']}[/green]")
+    console.print(f"  Branch: {result['branch']} (from {result['start']})")
+    if result["sparse"]:
+        console.print(f"  Sparse: {', '.join(result['sparse'])}")
+    if result["kits"]["placed"]:
+        console.print(f"  Kits: {result['kits']['placed']} files cloned from the kit store")
+    if result["caches"]:
+        console.print(f"  Caches: {', '.join(result['caches'])}")
+    if result["session_log"]:
+        console.print(f"  Session log: {result['session_log']}")
+    console.print(f"[dim]  cd {result['path']}[/dim]")
+    console.print()
+
+@app.command(name="overlap")
+def overlap(
+    base: Optional[str] = typer.Option(
+        None,
+        "--base",
+        help="Base branch (default: origin/HEAD, main or master)",
+    ),
+    branch: Optional[list[str]] = typer.Option(
+        None,
+        "--branch",
+        "-b",
+        help="Branch to compare (repeatable; default: every branch not merged into base)",
+    ),
+    remote: bool = typer.Option(
+        False,
+        "--remote",
+        help="Also compare remote-tracking branches",
+    ),
+    since: Optional[str] = typer.Option(
+        None,
+        "--since",
+        help="Only branches with commits since a date or span (e.g. 7d, 2w, 2025-10-01)",
+    ),
+    worktrees: bool = typer.Option(
+        True,
+        "--worktrees/--no-worktrees",
+        help="Include uncommitted changes in each branch's worktree",
+    ),
+    check: bool = typer.Option(
+        False,
+        "--check",
+        help="Exit with status 1 if any textual conflict is predicted",
+    ),
+    json_output: bool = typer.Option(
+        False,
+        "--json",
+        help="Output the report as JSON",
+    ),
+    target: Optional[Path] = typer.Argument(
+        None,
+        help="Target directory (defaults to current directory)",
+    ),
+):
+    """Find files changed on more than one agent branch, before merge time.
+
+    Compares the changed paths of every unmerged branch (and uncommitted
+    work in their worktrees) and predicts textual conflicts with in-memory
+    merges; no working tree is touched. Results are cached by branch tip.
+
+    Examples:
+        lite-kits overlap                   # All active branches vs base
+        lite-kits overlap --since 7d --check
+    """
+    from datetime import datetime
+
+    target_dir = Path.cwd() if target is None else target
+
+    try:
+        since_ts = int(datetime.fromisoformat(parse_since(since)).timestamp()) if since else None
+        report = OverlapAnalyzer(target_dir, base=base).analyze(
+            branches=branch,
+            include_remote=remote,
+            since=since_ts,
+            include_worktrees=worktrees,
+        )
+    except (GitError, ValueError) as e:
+        console.print(f"[red]Error:[/red] {e}", style="bold")
+        raise typer.Exit(1)
+
+    conflicts = [pair for pair in report["pairs"] if pair["conflicts"]]
+
+    if json_output:
+        typer.echo(json.dumps(report, indent=2))
+    else:
+        from rich.markup import escape
+
+        console.print()
+        if not report["overlaps"]:
+            console.print(
+                f"[green][OK] No overlapping files across {len(report['branches'])} "
+                f"branch(es) vs {report['base']}[/green]"
+            )
+        else:
+            table = Table(show_header=True, header_style="bold cyan")
+            table.add_column("File", style="cyan", overflow="fold")
+            table.add_column("Branches", overflow="fold")
+            table.add_column("Conflict")
+            for item in report["overlaps"]:
+                table.add_row(
+                    escape(item["path"]),
+                    ", ".join(item["branches"]),
+                    "[red]predicted[/red]" if item["conflict"] else "[dim]-[/dim]",
+                )
+            console.print(table)
+
+            for pair in report["pairs"]:
+                a, b = pair["branches"]
+                if pair["conflicts"]:
+                    console.print(
+                        f"  [red]✗[/red] {a} + {b}: {len(pair['conflicts'])} conflicting file(s)"
+                    )
+                elif pair["conflicts"] is None and len(pair["uncommitted"]) < len(pair["files"]):
+                    console.print(
+                        f"  [yellow]?[/yellow] {a} + {b}: conflicts not predicted (needs git 2.38+)"
+                    )
+                else:
+                    uncommitted = pair["uncommitted"]
+                    console.print(
+                        f"  [yellow]⚠[/yellow] {a} + {b}: {len(pair['files'])} shared file(s)"
+                        + (f", {len(uncommitted)} uncommitted" if uncommitted else "")
+                    )
+
+        cache = report["cache"]
+        console.print(
+            f"\n[dim]{len(report['branches'])} branches vs {report['base']}: "
+            f"{cache['diffs']} diffed ({cache['diffs_cached']} cached), "
+            f"{cache['merges']} merges ({cache['merges_cached']} cached) "
+            f"in {report['seconds']}s[/dim]\n"
+        )
+
+    if check and conflicts:
+        raise typer.Exit(1)
+
+@app.command(name="fingerprints", hidden=True)
+def update_fingerprints(
+    reference: Path = typer.Argument(
+        ...,
+        help="Vanilla snapshot directory (docs/vanilla-reference)",
+    ),
+    spec_kit_version: str = typer.Option(
+        ...,
+        "--spec-kit-version",
+        help="Spec-kit release the snapshots were taken from",
+    ),
+):
+    """Regenerate the vanilla spec-kit fingerprint table (maintainers)."""
+    table_path = Path(__file__).parent / "kits" / FINGERPRINTS_FILE
+
+    try:
+        table = build_table(reference, spec_kit_version, load_table(table_path))
+    except (OSError, ValueError) as e:
+        console.print(f"[red]Error:[/red] {e}", style="bold")
+        raise typer.Exit(1)
+
+    write_table(table_path, table)
+    flavors = table["versions"][spec_kit_version]["flavors"]
+    console.print(
+        f"[green]Fingerprinted spec-kit {spec_kit_version}:[/green] "
+        + ", ".join(f"{name} ({len(files)} files)" for name, files in flavors.items())
+    )
 
 if __name__ == "__main__":
     app()
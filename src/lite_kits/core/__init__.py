@@ -1,19 +1,58 @@
 """Core modules for lite-kits."""
 
 from .banner import diagonal_reveal_banner, show_loading_spinner, show_static_banner
+from .agent_context import AgentContextUpdater
+from .archive import CollabArchiver
+from .attribution import AttributionIndex
+from .audit import AuditScanner
+from .branches import BranchAnalyzer
+from .checkpoint import CheckpointStore
+from .collab import CollabIndex
 from .conflict_checker import ConflictChecker
 from .detector import Detector
+from .diffsum import DiffSummarizer
+from .feature import FeatureAllocator
+from .hooks import HookRunner
 from .installer import Installer
-from .manifest import KitManifest
+from .worktrees import KitStore
+from .lock import ProjectLock
+from .manifest import KITS_DIR, KitManifest
+from .orient import OrientBuilder
+from .stats import ProjectStats
+from .records import RecordWriter
+from .release import ReleaseBuilder
+from .search import SearchIndex
+from .specs import SpecIndex
+from .templates import TemplateEngine
 from .validator import Validator
 
 __all__ = [
     "diagonal_reveal_banner",
     "show_loading_spinner",
     "show_static_banner",
+    "AgentContextUpdater",
+    "AttributionIndex",
+    "AuditScanner",
+    "BranchAnalyzer",
+    "CheckpointStore",
+    "CollabArchiver",
+    "CollabIndex",
     "ConflictChecker",
     "Detector",
+    "DiffSummarizer",
+    "FeatureAllocator",
+    "HookRunner",
     "Installer",
     "KitManifest",
+    "KITS_DIR",
+    "KitStore",
+    "OrientBuilder",
+    "ProjectLock",
+    "ProjectStats",
+    "RecordWriter",
+    "ReleaseBuilder",
+    "SearchIndex",
+    "SpecIndex",
+    "TemplateEngine",
     "Validator",
 ]
\ No newline at end of file
@@ -0,0 +1,416 @@
+"""
+Native replacement for spec-kit's update-agent-context.sh.
+
+The vanilla script re-parses plan.md with sed for every agent and rewrites
+each context file line by line through temp files, even when nothing
+changed. Here plan.md is parsed once, the new 'Active Technologies' and
+'Recent Changes' sections are computed for every agent file, and a file is
+only rewritten (temp file + rename) when one of its sections actually
+differs. The plan's (mtime, size) and extracted metadata are cached in
+.specify/cache/agent-context.json, so an unchanged plan skips all work.
+"""
+
+import hashlib
+import json
+import os
+import re
+from datetime import date
+from pathlib import Path
+
+from .cache import (
+    fingerprint,
+    get_cache_dir,
+    read_json,
+    write_json_atomic,
+    write_text_atomic,
+)
+from .git import current_branch
+from .lock import ProjectLock
+
+CACHE_FILE = "agent-context.json"
+CACHE_VERSION = 1
+LOCK_NAME = "agent-context"
+
+AGENT_TEMPLATE = Path(".specify") / "templates" / "agent-file-template.md"
+
+# Context file per agent, as in spec-kit's update-agent-context.sh
+CONTEXT_FILES = {
+    "claude": "CLAUDE.md",
+    "gemini": "GEMINI.md",
+    "copilot": ".github/copilot-instructions.md",
+    "cursor": ".cursor/rules/specify-rules.mdc",
+    "qwen": "QWEN.md",
+    "opencode": "AGENTS.md",
+    "codex": "AGENTS.md",
+    "windsurf": ".windsurf/rules/specify-rules.md",
+    "kilocode": ".kilocode/rules/specify-rules.md",
+    "auggie": ".augment/rules/specify-rules.md",
+    "roo": ".roo/rules/specify-rules.md",
+    "q": "AGENTS.md",
+}
+
+PLAN_FIELDS = {
+    "language": "Language/Version",
+    "framework": "Primary Dependencies",
+    "storage": "Storage",
+    "project_type": "Project Type",
+}
+
+TECH_SECTION = "Active Technologies"
+CHANGES_SECTION = "Recent Changes"
+MAX_RECENT_CHANGES = 3
+
+_FIELD_RE = re.compile(r"^\*\*(?P<key>[^*]+)\*\*:\s*(?P<value>.*?)\s*$")
+_FEATURE_DIR_RE = re.compile(r"^(\d+)-")
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_FENCE_RE = re.compile(r"^\s*(```|~~~)")
+
+
+def parse_plan(path: Path) -> dict[str, str]:
+    """
+    Extract technical-context fields from plan.md in one pass.
+
+    Args:
+        path: plan.md path
+
+    Returns:
+        Dict with 'language', 'framework', 'storage' and 'project_type'
+        (empty when missing, 'N/A' or NEEDS CLARIFICATION)
+    """
+    wanted = {label: key for key, label in PLAN_FIELDS.items()}
+    result = {key: "" for key in PLAN_FIELDS}
+    with open(path, encoding='utf-8', errors='replace') as f:
+        for line in f:
+            match = _FIELD_RE.match(line.strip())
+            if not match:
+                continue
+            key = wanted.get(match.group("key").strip())
+            value = match.group("value")
+            if not key or result[key]:
+                continue
+            if value and value != "N/A" and "NEEDS CLARIFICATION" not in value:
+                result[key] = value
+            if all(result.values()):
+                break
+    return result
+
+
+def tech_stack(plan: dict[str, str]) -> str:
+    """Language and framework joined the way the vanilla script does."""
+    return " + ".join(part for part in (plan["language"], plan["framework"]) if part)
+
+
+class AgentContextUpdater:
+    """Updates agent context files (CLAUDE.md, copilot-instructions, ...) from plan.md."""
+
+    def __init__(self, target_dir: Path, feature: str | None = None):
+        """
+        Initialize updater.
+
+        Args:
+            target_dir: Project root directory
+            feature: Feature (branch) name; None = SPECIFY_FEATURE, then the
+                current git branch, then the highest-numbered spec directory
+        """
+        self.target_dir = Path(target_dir).resolve()
+        self.feature = feature or self._current_feature()
+
+    def plan_path(self) -> Path | None:
+        """
+        Locate the feature's plan.md.
+
+        Returns:
+            specs/<feature>/plan.md, or the spec directory with the same
+            number prefix; None if there is none
+        """
+        if not self.feature:
+            return None
+        specs_dir = self.target_dir / "specs"
+        name = self.feature.rsplit("/", 1)[-1]
+        plan = specs_dir / name / "plan.md"
+        if plan.is_file():
+            return plan
+
+        match = _FEATURE_DIR_RE.match(name)
+        if match:
+            try:
+                with os.scandir(specs_dir) as entries:
+                    for entry in sorted(entries, key=lambda e: e.name):
+                        other = _FEATURE_DIR_RE.match(entry.name)
+                        if other and int(other.group(1)) == int(match.group(1)):
+                            candidate = Path(entry.path) / "plan.md"
+                            if candidate.is_file():
+                                return candidate
+            except OSError:
+                pass
+        return None
+
+    def update(
+        self,
+        agents: list[str] | None = None,
+        force: bool = False,
+        dry_run: bool = False,
+    ) -> dict:
+        """
+        Bring agent context files up to date with the feature's plan.
+
+        Args:
+            agents: Agents to update (creating missing files); None = every
+                existing context file, or Claude's if there are none
+            force: Ignore the plan fingerprint cache
+            dry_run: Compute changes without writing
+
+        Returns:
+            Dict with 'feature', 'plan', 'skipped' (True when the plan is
+            unchanged since the last run), 'files' (path, agents, action,
+            sections) and 'plan_data'
+
+        Raises:
+            FileNotFoundError: If the feature has no plan.md
+            ValueError: If an agent name is unknown
+        """
+        plan_path = self.plan_path()
+        if plan_path is None:
+            raise FileNotFoundError(
+                f"No plan.md found for feature '{self.feature or '?'}' "
+                "(set SPECIFY_FEATURE or switch to the feature branch)"
+            )
+
+        targets = self._targets(agents)
+        result = {
+            "feature": self.feature,
+            "plan": plan_path.relative_to(self.target_dir).as_posix(),
+            "skipped": False,
+            "files": [],
+            "plan_data": None,
+        }
+
+        cache_path = get_cache_dir(self.target_dir) / CACHE_FILE
+        cache = read_json(cache_path)
+        if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+            cache = {"version": CACHE_VERSION}
+
+        key = json.dumps([self.feature, sorted(targets)])
+        plan_fp = list(fingerprint(plan_path.stat()))
+        files_fp = self._files_fingerprint(targets)
+        if not force and cache.get("key") == key and cache.get("plan_fp") == plan_fp \
+                and cache.get("files_fp") == files_fp:
+            result["skipped"] = True
+            result["plan_data"] = cache.get("plan_data")
+            return result
+
+        plan = parse_plan(plan_path)
+        digest = hashlib.sha1(json.dumps([key, plan], sort_keys=True).encode('utf-8')).hexdigest()
+        result["plan_data"] = plan
+        if not force and cache.get("digest") == digest and cache.get("files_fp") == files_fp:
+            # plan.md changed, but not in any field the context files use
+            result["skipped"] = True
+        else:
+            with ProjectLock(self.target_dir, LOCK_NAME):
+                for path, names in targets.items():
+                    result["files"].append(self._update_file(path, names, plan, dry_run))
+            files_fp = self._files_fingerprint(targets)
+
+        if not dry_run and (self.target_dir / ".specify").is_dir():
+            write_json_atomic(cache_path, {
+                "version": CACHE_VERSION,
+                "key": key,
+                "plan_fp": plan_fp,
+                "files_fp": files_fp,
+                "digest": digest,
+                "plan_data": plan,
+            })
+        return result
+
+    def _current_feature(self) -> str | None:
+        """SPECIFY_FEATURE, the git branch, or the highest-numbered spec dir."""
+        feature = os.environ.get("SPECIFY_FEATURE")
+        if feature:
+            return feature
+        branch = current_branch(self.target_dir)
+        if branch:
+            return branch
+        best: tuple[int, str | None] = (-1, None)
+        try:
+            with os.scandir(self.target_dir / "specs") as entries:
+                for entry in entries:
+                    match = _FEATURE_DIR_RE.match(entry.name)
+                    if match and entry.is_dir() and int(match.group(1)) > best[0]:
+                        best = (int(match.group(1)), entry.name)
+        except OSError:
+            pass
+        return best[1]
+
+    def _targets(self, agents: list[str] | None) -> dict[str, list[str]]:
+        """Context file path -> agent names sharing it."""
+        if agents:
+            unknown = [agent for agent in agents if agent not in CONTEXT_FILES]
+            if unknown:
+                raise ValueError(
+                    f"Unknown agent: {', '.join(unknown)}\n"
+                    f"Valid options: {', '.join(CONTEXT_FILES)}"
+                )
+            selected = agents
+        else:
+            selected = [
+                agent for agent, path in CONTEXT_FILES.items()
+                if (self.target_dir / path).is_file()
+            ] or ["claude"]
+
+        targets: dict[str, list[str]] = {}
+        for agent in selected:
+            targets.setdefault(CONTEXT_FILES[agent], []).append(agent)
+        return targets
+
+    def _files_fingerprint(self, targets: dict[str, list[str]]) -> dict[str, list[int] | None]:
+        files = {}
+        for path in targets:
+            try:
+                files[path] = list(fingerprint((self.target_dir / path).stat()))
+            except OSError:
+                files[path] = None
+        return files
+
+    def _update_file(
+        self, relative: str, agents: list[str], plan: dict[str, str], dry_run: bool
+    ) -> dict:
+        """Compute and (unless dry_run) write one context file."""
+        path = self.target_dir / relative
+        entry = {"path": relative, "agents": agents, "action": "unchanged", "sections": []}
+        today = date.today().isoformat()
+
+        if path.is_file():
+            with open(path, encoding='utf-8', newline='') as f:
+                old = f.read()
+            new, sections = _update_sections(old, plan, self.feature, today)
+            if not sections:
+                return entry
+            entry["action"] = "updated"
+        else:
+            template = self.target_dir / AGENT_TEMPLATE
+            if not template.is_file():
+                entry["action"] = "error"
+                entry["error"] = f"Template not found: {AGENT_TEMPLATE.as_posix()}"
+                return entry
+            new = _render_new_file(
+                template.read_text(encoding='utf-8'),
+                plan,
+                self.feature,
+                self.target_dir.name,
+                today,
+            )
+            sections = [TECH_SECTION, CHANGES_SECTION]
+            entry["action"] = "created"
+
+        entry["sections"] = sections
+        if not dry_run:
+            write_text_atomic(path, new)
+        return entry
+
+
+def _split_sections(text: str) -> list[tuple[str | None, list[str]]]:
+    """Split markdown into (## heading title or None, lines) sections, fence-aware."""
+    sections: list[tuple[str | None, list[str]]] = [(None, [])]
+    in_fence = False
+    for line in text.splitlines(keepends=True):
+        if _FENCE_RE.match(line):
+            in_fence = not in_fence
+        if not in_fence and line.startswith("## "):
+            sections.append((line[3:].strip(), [line]))
+        else:
+            sections[-1][1].append(line)
+    return sections
+
+
+def _update_sections(
+    text: str, plan: dict[str, str], feature: str, today: str
+) -> tuple[str, list[str]]:
+    """
+    Apply the plan to an existing context file.
+
+    Returns:
+        (new text, titles of sections that changed)
+    """
+    newline = "\r\n" if "\r\n" in text else "\n"
+    stack = tech_stack(plan)
+    storage = plan["storage"]
+
+    new_tech = []
+    if stack and stack not in text:
+        new_tech.append(f"- {stack} ({feature}){newline}")
+    if storage and storage not in text:
+        new_tech.append(f"- {storage} ({feature}){newline}")
+
+    added = stack or storage
+    change = f"- {feature}: Added {added}{newline}" if added else None
+
+    sections = _split_sections(text)
+    changed = []
+    for index, (title, lines) in enumerate(sections):
+        if title == TECH_SECTION and new_tech:
+            # New entries go after the existing list, before trailing blank lines
+            end = len(lines)
+            while end > 1 and not lines[end - 1].strip():
+                end -= 1
+            lines = lines[:end] + new_tech + lines[end:]
+        elif title == CHANGES_SECTION and change:
+            body = [line for line in lines[1:] if not line.startswith(f"- {feature}:")]
+            rest = []
+            entries = 0
+            for line in body:
+                if line.startswith("- "):
+                    entries += 1
+                    if entries >= MAX_RECENT_CHANGES:
+                        continue
+                rest.append(line)
+            lines = [lines[0], change] + rest
+        else:
+            continue
+        if lines != sections[index][1]:
+            sections[index] = (title, lines)
+            changed.append(title)
+
+    if not changed:
+        return text, []
+
+    new = "".join("".join(lines) for _, lines in sections)
+    # Only a real change bumps the 'Last updated' date
+    new = "".join(
+        _DATE_RE.sub(today, line, count=1) if "Last updated" in line else line
+        for line in new.splitlines(keepends=True)
+    )
+    return new, changed
+
+
+def _render_new_file(
+    template: str, plan: dict[str, str], feature: str, project: str, today: str
+) -> str:
+    """Fill agent-file-template.md for a new context file (vanilla substitutions)."""
+    stack = tech_stack(plan)
+    language = plan["language"]
+    structure = "backend/\nfrontend/\ntests/" if "web" in plan["project_type"] else "src/\ntests/"
+    if "Python" in language:
+        commands = "cd src && pytest && ruff check ."
+    elif "Rust" in language:
+        commands = "cargo test && cargo clippy"
+    elif "JavaScript" in language or "TypeScript" in language:
+        commands = "npm test && npm run lint"
+    else:
+        commands = f"# Add commands for {language}"
+
+    replacements = {
+        "[PROJECT NAME]": project,
+        "[DATE]": today,
+        "[EXTRACTED FROM ALL PLAN.MD FILES]": (
+            f"- {stack} ({feature})" if stack else f"- ({feature})"
+        ),
+        "[ACTUAL STRUCTURE FROM PLANS]": structure,
+        "[ONLY COMMANDS FOR ACTIVE TECHNOLOGIES]": commands,
+        "[LANGUAGE-SPECIFIC, ONLY FOR LANGUAGES IN USE]": (
+            f"{language}: Follow standard conventions"
+        ),
+        "[LAST 3 FEATURES AND WHAT THEY ADDED]": f"- {feature}: Added {stack}".rstrip(),
+    }
+    for placeholder, value in replacements.items():
+        template = template.replace(placeholder, value)
+    return template
@@ -0,0 +1,377 @@
+"""
+Archival and compaction of completed collaboration records.
+
+Moves session logs, handoffs and decisions of merged or closed features from
+collaboration/active/ to collaboration/archive/ (staged as batched git moves),
+and optionally packs old archive records into a compressed per-feature bundle
+with a small markdown summary stub. Every step is idempotent, so the archiver
+can run nightly.
+"""
+
+import gzip
+import json
+import os
+import re
+import shutil
+from datetime import UTC, date, datetime
+from pathlib import Path
+
+from .collab import BUNDLE_NAME, CollabIndex, classify_path, record_fields
+from .git import GitError, chunked, default_branch, is_git_repo, run_git
+
+SUMMARY_NAME = "ARCHIVE.md"
+
+# spec.md statuses that mark a feature as finished
+CLOSED_FEATURE_STATUSES = {
+    "closed", "merged", "done", "complete", "completed", "abandoned", "shipped",
+}
+
+_STATUS_RE = re.compile(r"^\*\*Status\*\*:\s*(?P<value>.+)$", re.IGNORECASE)
+
+
+class CollabArchiver:
+    """Archives and packs collaboration records of finished features."""
+
+    def __init__(self, target_dir: Path, base: str | None = None):
+        """
+        Initialize archiver.
+
+        Args:
+            target_dir: Project root directory (containing specs/)
+            base: Base branch used to decide which features are merged
+                  (None = detect origin/HEAD, main or master)
+        """
+        self.target_dir = Path(target_dir).resolve()
+        self.specs_dir = self.target_dir / "specs"
+        self.use_git = is_git_repo(self.target_dir)
+        self.base = base
+        if self.use_git and not self.base:
+            self.base = default_branch(self.target_dir)
+
+    def find_closed_features(self) -> dict[str, str]:
+        """
+        Find features whose collaboration records can be archived.
+
+        A feature is closed when its spec.md status is one of
+        CLOSED_FEATURE_STATUSES, or when a branch named after it has been
+        merged into the base branch (one for-each-ref call for all refs).
+
+        Returns:
+            Dict of feature directory name -> reason
+        """
+        if not self.specs_dir.is_dir():
+            return {}
+
+        features = sorted(
+            entry.name for entry in os.scandir(self.specs_dir)
+            if entry.is_dir() and (Path(entry.path) / "collaboration").is_dir()
+        )
+
+        merged = self._merged_branch_names()
+        closed = {}
+        for feature in features:
+            status = self._spec_status(feature)
+            if status in CLOSED_FEATURE_STATUSES:
+                closed[feature] = f"spec status: {status}"
+            elif feature in merged:
+                closed[feature] = f"merged into {self.base}"
+        return closed
+
+    def archive(
+        self,
+        features: list[str] | None = None,
+        dry_run: bool = False,
+    ) -> dict:
+        """
+        Move active records of closed features into archive/.
+
+        Tracked files are moved with batched 'git mv' calls (one per
+        destination directory and batch); untracked files are moved directly.
+
+        Args:
+            features: Explicit feature directory names (None = auto-detect closed)
+            dry_run: Report planned moves without touching anything
+
+        Returns:
+            Dict with 'features', 'moved', 'skipped' lists
+        """
+        result = {"features": {}, "moved": [], "skipped": []}
+
+        if features is None:
+            reasons = self.find_closed_features()
+        else:
+            reasons = {feature: "requested" for feature in features}
+        result["features"] = reasons
+
+        moves: dict[Path, list[Path]] = {}
+        for feature in reasons:
+            collab_dir = self.specs_dir / feature / "collaboration"
+            for subdir in ("sessions", "decisions"):
+                source_dir = collab_dir / "active" / subdir
+                if not source_dir.is_dir():
+                    continue
+                dest_dir = collab_dir / "archive" / subdir
+                for entry in sorted(os.scandir(source_dir), key=lambda e: e.name):
+                    if not _is_record(entry):
+                        continue
+                    if (dest_dir / entry.name).exists():
+                        skipped = self._rel(Path(entry.path))
+                        result["skipped"].append(f"{skipped} (already archived)")
+                        continue
+                    moves.setdefault(dest_dir, []).append(Path(entry.path))
+
+        for dest_dir, sources in moves.items():
+            result["moved"].extend(self._rel(source) for source in sources)
+            if dry_run:
+                continue
+            dest_dir.mkdir(parents=True, exist_ok=True)
+            self._move(sources, dest_dir)
+
+        return result
+
+    def pack(self, older_than: str, dry_run: bool = False) -> dict:
+        """
+        Pack archived records dated before older_than into per-feature bundles.
+
+        Each feature gets collaboration/archive/records.jsonl.gz (appended to
+        as a new gzip member on every run) and an ARCHIVE.md stub listing
+        what was packed. Packed originals are removed (git rm when tracked).
+
+        Args:
+            older_than: ISO date; records dated before it are packed
+            dry_run: Report planned packs without touching anything
+
+        Returns:
+            Dict with 'packed' list of record paths and 'bundles' list
+
+        Raises:
+            ValueError: If older_than is not an ISO date
+        """
+        try:
+            cutoff = date.fromisoformat(older_than.strip())
+        except ValueError:
+            raise ValueError(f"Invalid cutoff date: '{older_than}' (use e.g. 2025-10-01)")
+        result = {"packed": [], "bundles": []}
+        if not self.specs_dir.is_dir():
+            return result
+
+        packed_at = datetime.now(UTC).isoformat(timespec="seconds")
+        for feature_entry in sorted(os.scandir(self.specs_dir), key=lambda e: e.name):
+            if not feature_entry.is_dir():
+                continue
+            archive_dir = Path(feature_entry.path) / "collaboration" / "archive"
+            entries = []
+            for subdir in ("sessions", "decisions"):
+                directory = archive_dir / subdir
+                if not directory.is_dir():
+                    continue
+                for entry in sorted(os.scandir(directory), key=lambda e: e.name):
+                    if not _is_record(entry):
+                        continue
+                    path = Path(entry.path)
+                    text = path.read_text(encoding="utf-8", errors="replace")
+                    kind = classify_path(self._rel(path))[0]
+                    fields = record_fields(self._rel(path), kind, text)
+                    # Records without a parseable date fall back to their mtime
+                    record_date = _parse_date(fields.get("date")) \
+                        or date.fromtimestamp(entry.stat().st_mtime)
+                    if record_date >= cutoff:
+                        continue
+                    entries.append((path, text, record_date.isoformat()))
+
+            if not entries:
+                continue
+
+            bundle = archive_dir / BUNDLE_NAME
+            result["bundles"].append(self._rel(bundle))
+            result["packed"].extend(self._rel(path) for path, _, _ in entries)
+            if dry_run:
+                continue
+
+            with gzip.open(bundle, "at", encoding="utf-8") as f:
+                for path, text, record_date in entries:
+                    f.write(json.dumps({
+                        "path": self._rel(path),
+                        "date": record_date,
+                        "packed": packed_at,
+                        "content": text,
+                    }) + "\n")
+
+            self._write_summary(archive_dir, entries, packed_at)
+            self._remove([path for path, _, _ in entries])
+            self._stage([bundle, archive_dir / SUMMARY_NAME])
+
+        return result
+
+    def reindex(self) -> dict:
+        """Refresh the collaboration index after archiving/packing."""
+        index = CollabIndex(self.target_dir)
+        try:
+            return index.refresh()
+        finally:
+            index.close()
+
+    def _merged_branch_names(self) -> set[str]:
+        """
+        Names (without remote/namespace prefix) of branches merged into base.
+
+        A branch with no commits of its own (e.g. just created by 'feature
+        new --no-checkout') is also reachable from base; it only counts as
+        merged if it had commits, so those features fall back to spec status.
+        """
+        if not self.use_git:
+            return set()
+        try:
+            output = run_git(
+                [
+                    "for-each-ref",
+                    f"--merged={self.base}",
+                    "--format=%(refname)%00%(refname:short)%00%(objectname)%00%(worktreepath)",
+                    "refs/heads",
+                    "refs/remotes",
+                ],
+                self.target_dir,
+            )
+        except GitError:
+            return set()
+
+        candidates = []
+        for line in output.splitlines():
+            fields = line.split("\0")
+            if len(fields) != 4:
+                continue
+            ref, name, tip, worktree = fields
+            # A branch checked out somewhere is still being worked on
+            if not name or worktree or ref.endswith("/HEAD"):
+                continue
+            candidates.append((ref, name, tip))
+        if not candidates:
+            return set()
+
+        # Tips on base's first-parent line were never a separate line of work,
+        # unless the branch's reflog shows commits (a fast-forward merge)
+        try:
+            output = run_git(["rev-list", "--first-parent", self.base], self.target_dir)
+            mainline = set(output.split())
+        except GitError:
+            return set()
+
+        names = set()
+        for ref, name, tip in candidates:
+            if tip in mainline and not self._had_commits(ref):
+                continue
+            names.add(name.rsplit("/", 1)[-1])
+        names.discard(self.base)
+        return names
+
+    def _had_commits(self, ref: str) -> bool:
+        """True if a local branch's reflog records an update after its creation."""
+        if not ref.startswith("refs/heads/"):
+            return False
+        output = run_git(["reflog", "show", "--format=%H", ref, "--"], self.target_dir, check=False)
+        # Newest first; the oldest entry is the creation
+        return len(output.split()) > 1
+
+    def _spec_status(self, feature: str) -> str | None:
+        """Read the **Status** field from a feature's spec.md header."""
+        spec = self.specs_dir / feature / "spec.md"
+        try:
+            with open(spec, encoding="utf-8", errors="replace") as f:
+                for _, line in zip(range(20), f):
+                    match = _STATUS_RE.match(line.strip())
+                    if match:
+                        return match.group("value").strip().lower()
+        except OSError:
+            pass
+        return None
+
+    def _tracked(self, paths: list[Path]) -> set[Path]:
+        """Subset of paths tracked by git (one ls-files call per batch)."""
+        if not self.use_git or not paths:
+            return set()
+        tracked = set()
+        for batch in chunked([self._rel(p) for p in paths]):
+            # Literal pathspecs: a record named 'a*' must not match 'ab'
+            output = run_git(
+                ["--literal-pathspecs", "ls-files", "-z", "--", *batch], self.target_dir
+            )
+            tracked.update(self.target_dir / p for p in output.split("\0") if p)
+        return tracked
+
+    def _move(self, sources: list[Path], dest_dir: Path):
+        """Move files into dest_dir, using batched git mv for tracked files."""
+        tracked = self._tracked(sources)
+        tracked_sources = [p for p in sources if p in tracked]
+        for batch in chunked(tracked_sources):
+            run_git(
+                ["--literal-pathspecs", "mv", "-k", "--",
+                 *[self._rel(p) for p in batch], self._rel(dest_dir)],
+                self.target_dir,
+            )
+        for source in sources:
+            # git mv -k skips failures silently, so fall back for anything left over
+            if source.exists():
+                shutil.move(str(source), str(dest_dir / source.name))
+
+    def _remove(self, paths: list[Path]):
+        """Delete files, using batched git rm for tracked files."""
+        tracked = self._tracked(paths)
+        for batch in chunked([self._rel(p) for p in paths if p in tracked]):
+            # Content is already in the bundle, so staged edits are safe to drop
+            run_git(["--literal-pathspecs", "rm", "-q", "-f", "--", *batch], self.target_dir)
+        for path in paths:
+            if path.exists():
+                path.unlink()
+
+    def _stage(self, paths: list[Path]):
+        """Stage generated files when working in a git repository."""
+        if self.use_git:
+            run_git(
+                ["--literal-pathspecs", "add", "--", *[self._rel(p) for p in paths]],
+                self.target_dir,
+                check=False,
+            )
+
+    def _write_summary(self, archive_dir: Path, entries: list, packed_at: str):
+        """Append packed records to the archive summary stub."""
+        summary = archive_dir / SUMMARY_NAME
+        lines = []
+        if not summary.exists():
+            feature = archive_dir.parent.parent.name
+            lines += [
+                f"# Archived Collaboration Records: {feature}",
+                "",
+                f"Older records are packed into `{BUNDLE_NAME}` (gzip, one JSON record per line).",
+                "They remain searchable with `lite-kits collab list --archived`.",
+                "",
+                "| Date | Kind | Record | Packed |",
+                "|------|------|--------|--------|",
+            ]
+        for path, text, record_date in entries:
+            classified = classify_path(self._rel(path))
+            kind = classified[0] if classified else "record"
+            lines.append(f"| {record_date} | {kind} | {path.name} | {packed_at[:10]} |")
+
+        with open(summary, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def _rel(self, path: Path) -> str:
+        """Project-relative POSIX path."""
+        return Path(path).relative_to(self.target_dir).as_posix()
+
+
+def _is_record(entry: os.DirEntry) -> bool:
+    """True for a collaboration record file (markdown other than README.md)."""
+    return entry.is_file() and entry.name.endswith(".md") and entry.name != "README.md"
+
+
+def _parse_date(value: str | None) -> date | None:
+    """Date of an ISO date/datetime string (or one starting with an ISO date)."""
+    if not value:
+        return None
+    for candidate in (value.strip(), value.strip()[:10]):
+        try:
+            return datetime.fromisoformat(candidate).date()
+        except ValueError:
+            continue
+    return None
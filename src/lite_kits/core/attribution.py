@@ -0,0 +1,483 @@
+"""
+Persistent commit-attribution index for multi-agent activity.
+
+Agents sign their commits with a "via <model> @ <agent>" line (see /commit),
+and /sync used to find out who did what by rescanning a week of 'git log'
+bodies and grepping for it on every run. This keeps a SQLite index of every
+commit on the local branches - agent, model, feature and changed files - in
+<git-common-dir>/lite-kits/attribution.db, shared by all worktrees. A refresh
+only reads commits that are not reachable from the branch tips it indexed
+last time, so it is one short 'git log' once the index exists.
+"""
+
+import os
+import re
+import sqlite3
+import time
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+
+from .git import GitError, common_dir, default_branch, run_git, stream_git
+
+INDEX_FILE = "attribution.db"
+SCHEMA_VERSION = 2
+
+# "via claude-sonnet-4.5 @ claude-code" (commit trailer)
+_VIA_RE = re.compile(
+    r"\bvia\s+(?P<model>[^@\s][^@\n]*?)\s*@\s*(?P<agent>[^\n]+?)\s*$",
+    re.MULTILINE,
+)
+# "Co-authored with gpt-4o @ github copilot via vscode" (/commit footer)
+_WITH_RE = re.compile(
+    r"\bwith\s+(?P<model>[^@\s][^@\n]*?)\s*@\s*(?P<agent>[^\n]+?)(?:\s+via\s+\S+)?\s*$",
+    re.MULTILINE,
+)
+_FEATURE_RE = re.compile(r"^(?P<num>\d+)-")
+_SPEC_PATH_RE = re.compile(r"^specs/(?P<feature>\d+-[^/]+)/")
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS commits (
+    hash TEXT PRIMARY KEY,
+    date INTEGER NOT NULL,
+    author TEXT,
+    agent TEXT,
+    model TEXT,
+    feature TEXT,
+    feature_num TEXT,
+    subject TEXT
+);
+CREATE TABLE IF NOT EXISTS files (
+    hash TEXT NOT NULL,
+    path TEXT NOT NULL,
+    PRIMARY KEY (hash, path)
+);
+CREATE TABLE IF NOT EXISTS tips (
+    ref TEXT PRIMARY KEY,
+    hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_commits_agent ON commits (agent, date);
+CREATE INDEX IF NOT EXISTS idx_commits_feature ON commits (feature_num, date);
+CREATE INDEX IF NOT EXISTS idx_commits_date ON commits (date);
+CREATE INDEX IF NOT EXISTS idx_files_path ON files (path);
+PRAGMA user_version = {SCHEMA_VERSION};
+"""
+
+_COLUMNS = ["hash", "date", "author", "agent", "model", "feature", "feature_num", "subject"]
+
+
+def parse_attribution(body: str) -> tuple[str | None, str | None]:
+    """
+    Find the agent signature in a commit message.
+
+    Args:
+        body: Full commit message
+
+    Returns:
+        (agent, model) - agent names are lower-cased with spaces as dashes
+        ("github copilot" -> "github-copilot"); (None, None) if unsigned
+    """
+    match = _VIA_RE.search(body) or _WITH_RE.search(body)
+    if not match:
+        return None, None
+    agent = "-".join(match.group("agent").lower().split())
+    return agent or None, match.group("model").strip() or None
+
+
+def feature_for_paths(paths: list[str]) -> str | None:
+    """
+    Feature a commit belongs to, from the spec directories it touches.
+
+    Args:
+        paths: Changed paths (repository-relative)
+
+    Returns:
+        Feature directory name touched by most files (None if no specs/ paths)
+    """
+    counts: dict[str, int] = {}
+    for path in paths:
+        match = _SPEC_PATH_RE.match(path)
+        if match:
+            counts[match.group("feature")] = counts.get(match.group("feature"), 0) + 1
+    if not counts:
+        return None
+    return min(counts, key=lambda name: (-counts[name], name))
+
+
+def feature_for_branch(branch: str, spec_dirs: list[str]) -> str:
+    """
+    Feature a branch works on, normalized to its spec directory.
+
+    Agent branches from 'worktree new' (003-auth-claude) belong to the
+    feature of their spec directory (003-auth), so every agent's commits are
+    counted under one feature.
+
+    Args:
+        branch: Branch name (NNN-name...)
+        spec_dirs: Directory names under specs/
+
+    Returns:
+        The spec directory the branch name starts with, else the only spec
+        directory with the same number, else the branch name itself
+    """
+    match = _FEATURE_RE.match(branch)
+    if not match:
+        return branch
+    number = int(match.group("num"))
+    same = [
+        name for name in spec_dirs
+        if _FEATURE_RE.match(name) and int(_FEATURE_RE.match(name).group("num")) == number
+    ]
+    for name in sorted(same, key=len, reverse=True):
+        if branch == name or branch.startswith(name + "-"):
+            return name
+    return same[0] if len(same) == 1 else branch
+
+
+def _since_timestamp(value: str | None) -> int | None:
+    """ISO date (or datetime) -> Unix time, local timezone."""
+    if not value:
+        return None
+    try:
+        return int(datetime.fromisoformat(value).timestamp())
+    except ValueError:
+        raise ValueError(f"Invalid date: '{value}' (use YYYY-MM-DD)")
+
+
+class AttributionIndex:
+    """Incrementally updated index of which agent made which commit."""
+
+    def __init__(self, target_dir: Path):
+        """
+        Initialize attribution index.
+
+        Args:
+            target_dir: Any directory inside the repository
+
+        Raises:
+            GitError: If target_dir is not inside a git repository
+        """
+        self.target_dir = Path(target_dir).resolve()
+        git_dir = common_dir(self.target_dir)
+        if git_dir is None:
+            raise GitError(f"Not a git repository: {self.target_dir}")
+        self.db_path = git_dir / "lite-kits" / INDEX_FILE
+        self._conn: sqlite3.Connection | None = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Open (and migrate) the index database on first use"""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version not in (0, SCHEMA_VERSION):
+                conn.executescript(
+                    "DROP TABLE IF EXISTS commits;"
+                    " DROP TABLE IF EXISTS files;"
+                    " DROP TABLE IF EXISTS tips;"
+                )
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        """Close the index database."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def refresh(self, rebuild: bool = False) -> dict:
+        """
+        Index commits added to local branches since the last refresh.
+
+        New commits are those reachable from a branch tip (or HEAD) but not
+        from any tip recorded last time, so rebased or deleted branches cost
+        nothing and an unchanged repository needs no 'git log' at all.
+        Commits that touch no specs/ directory take the feature of the
+        feature branch (NNN-name) they were added on, if any, normalized to
+        its spec directory (see feature_for_branch()).
+
+        Args:
+            rebuild: Drop the index and read the whole history again
+
+        Returns:
+            Dict with 'indexed' (new commits), 'commits' (total) and 'seconds'
+        """
+        started = time.monotonic()
+        conn = self.conn
+        if rebuild:
+            with conn:
+                conn.executescript("DELETE FROM commits; DELETE FROM files; DELETE FROM tips;")
+
+        tips = self._current_tips()
+        known = {row["ref"]: row["hash"] for row in conn.execute("SELECT ref, hash FROM tips")}
+        if tips == known:
+            return {
+                "indexed": 0,
+                "commits": self._count(),
+                "seconds": round(time.monotonic() - started, 3),
+            }
+
+        heads = sorted(set(tips.values()))
+        seen = self._existing(sorted(set(known.values())))
+        commits = list(self._read_log(heads, seen)) if heads else []
+
+        # Feature branches that moved: their new commits inherit the branch's feature
+        branch_features: dict[str, str] = {}
+        moved = [
+            ref for ref, tip in tips.items()
+            if known.get(ref) != tip and _FEATURE_RE.match(ref.rsplit("/", 1)[-1])
+        ]
+        if moved:
+            base = self._base()
+            spec_dirs = self._spec_dirs()
+            for ref in moved:
+                feature = feature_for_branch(ref.rsplit("/", 1)[-1], spec_dirs)
+                exclude = [f"^{h}" for h in seen] + ([f"^{base}"] if base else [])
+                added = run_git(["rev-list", tips[ref], *exclude], self.target_dir, check=False)
+                for line in added.split():
+                    branch_features.setdefault(line, feature)
+
+        with conn:
+            for commit in commits:
+                feature = feature_for_paths(commit["files"]) or branch_features.get(commit["hash"])
+                match = _FEATURE_RE.match(feature or "")
+                commit["feature"] = feature
+                commit["feature_num"] = match.group("num") if match else None
+            conn.executemany(  # audit:ignore - only column names are interpolated
+                f"INSERT OR REPLACE INTO commits ({', '.join(_COLUMNS)})"
+                f" VALUES ({', '.join('?' for _ in _COLUMNS)})",
+                [tuple(commit[col] for col in _COLUMNS) for commit in commits],
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO files (hash, path) VALUES (?, ?)",
+                [(commit["hash"], path) for commit in commits for path in commit["files"]],
+            )
+            conn.execute("DELETE FROM tips")
+            conn.executemany("INSERT INTO tips (ref, hash) VALUES (?, ?)", sorted(tips.items()))
+
+        return {
+            "indexed": len(commits),
+            "commits": self._count(),
+            "seconds": round(time.monotonic() - started, 3),
+        }
+
+    def query(
+        self,
+        agent: str | None = None,
+        feature: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        path: str | None = None,
+        limit: int | None = None,
+    ) -> list[dict]:
+        """
+        Query indexed commits.
+
+        Args:
+            agent: Agent name (substring match, e.g. "claude")
+            feature: Feature number ("012") or directory name ("012-auth")
+            since: ISO date lower bound (inclusive)
+            until: ISO date upper bound (exclusive)
+            path: Only commits that changed this file
+            limit: Maximum number of commits to return
+
+        Returns:
+            List of commit dicts (hash, date, author, agent, model, feature,
+            subject, files), newest first
+        """
+        where, params = self._filters(agent, feature, since, until, path)
+        sql = "SELECT * FROM commits" + where + " ORDER BY date DESC, hash"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        rows = [dict(row) for row in self.conn.execute(sql, params)]
+        for row in rows:
+            row["files"] = [
+                r["path"] for r in self.conn.execute(
+                    "SELECT path FROM files WHERE hash = ? ORDER BY path", (row["hash"],)
+                )
+            ]
+        return rows
+
+    def summary(
+        self,
+        agent: str | None = None,
+        feature: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+    ) -> dict:
+        """
+        Aggregate commit counts per agent and per feature.
+
+        Args:
+            agent: Agent name filter (substring match)
+            feature: Feature number or directory name
+            since: ISO date lower bound (inclusive)
+            until: ISO date upper bound (exclusive)
+
+        Returns:
+            Dict with 'commits', 'unattributed', 'agents' (agent, commits,
+            files, last - newest first by count) and 'features' (feature,
+            commits, agents)
+        """
+        where, params = self._filters(agent, feature, since, until, None)
+        conn = self.conn
+        total, unattributed = conn.execute(
+            f"SELECT COUNT(*), SUM(agent IS NULL) FROM commits{where}", params
+        ).fetchone()
+
+        attributed = f"{where}{' AND' if where else ' WHERE'} commits.agent IS NOT NULL"
+        files = {
+            row["agent"]: row["n"]
+            for row in conn.execute(
+                "SELECT commits.agent, COUNT(DISTINCT files.path) AS n"
+                f" FROM commits JOIN files ON files.hash = commits.hash{attributed}"
+                " GROUP BY commits.agent",
+                params,
+            )
+        }
+        agents = [
+            {
+                "agent": row["agent"],
+                "commits": row["n"],
+                "files": files.get(row["agent"], 0),
+                "last": row["last"],
+            }
+            for row in conn.execute(
+                f"SELECT agent, COUNT(*) AS n, MAX(date) AS last FROM commits{attributed}"
+                " GROUP BY agent ORDER BY n DESC, agent",
+                params,
+            )
+        ]
+        features = [
+            {
+                "feature": row["feature"],
+                "commits": row["n"],
+                "agents": sorted(filter(None, (row["agents"] or "").split(","))),
+            }
+            for row in conn.execute(
+                "SELECT feature, COUNT(*) AS n, GROUP_CONCAT(DISTINCT agent) AS agents"
+                f" FROM commits{where}{' AND' if where else ' WHERE'} feature IS NOT NULL"
+                " GROUP BY feature ORDER BY n DESC, feature",
+                params,
+            )
+        ]
+        return {
+            "commits": total,
+            "unattributed": unattributed or 0,
+            "agents": agents,
+            "features": features,
+        }
+
+    def _spec_dirs(self) -> list[str]:
+        """Feature directory names under the worktree's specs/."""
+        toplevel = run_git(["rev-parse", "--show-toplevel"], self.target_dir, check=False).strip()
+        try:
+            with os.scandir(Path(toplevel or self.target_dir) / "specs") as entries:
+                return [entry.name for entry in entries if entry.is_dir()]
+        except OSError:
+            return []
+
+    def _filters(
+        self,
+        agent: str | None,
+        feature: str | None,
+        since: str | None,
+        until: str | None,
+        path: str | None,
+    ) -> tuple[str, list]:
+        """WHERE clause (with leading space, or '') and parameters for commit filters."""
+        clauses = []
+        params: list = []
+        if agent:
+            clauses.append("commits.agent LIKE ?")
+            params.append(f"%{agent.lower()}%")
+        if feature:
+            if feature.isdigit():
+                clauses.append("CAST(commits.feature_num AS INTEGER) = ?")
+                params.append(int(feature))
+            else:
+                clauses.append("commits.feature = ?")
+                params.append(feature)
+        if since:
+            clauses.append("commits.date >= ?")
+            params.append(_since_timestamp(since))
+        if until:
+            clauses.append("commits.date < ?")
+            params.append(_since_timestamp(until))
+        if path:
+            clauses.append("commits.hash IN (SELECT hash FROM files WHERE path = ?)")
+            params.append(path)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def _count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM commits").fetchone()[0]
+
+    def _current_tips(self) -> dict[str, str]:
+        """Local branch tips plus HEAD (covers a detached worktree)."""
+        tips = {}
+        output = run_git(
+            ["for-each-ref", "--format=%(refname:short)%00%(objectname)", "refs/heads"],
+            self.target_dir,
+        )
+        for line in output.splitlines():
+            name, _, tip = line.partition("\0")
+            if tip:
+                tips[name] = tip
+        head = run_git(["rev-parse", "--verify", "-q", "HEAD"], self.target_dir, check=False)
+        if head.strip():
+            tips["HEAD"] = head.strip()
+        return tips
+
+    def _existing(self, hashes: list[str]) -> list[str]:
+        """Recorded tips that still exist (gc may have pruned rewritten ones)."""
+        if not hashes:
+            return []
+        output = run_git(
+            ["cat-file", "--batch-check=%(objectname) %(objecttype)"],
+            self.target_dir,
+            check=False,
+            input="\n".join(hashes) + "\n",
+        )
+        return [line.split()[0] for line in output.splitlines() if line.endswith(" commit")]
+
+    def _base(self) -> str | None:
+        """Base branch tip that feature branches fork from (None if unknown)."""
+        try:
+            base = default_branch(self.target_dir)
+        except GitError:
+            return None
+        tip = run_git(
+            ["rev-parse", "--verify", "-q", f"{base}^{{commit}}"], self.target_dir, check=False
+        )
+        return tip.strip() or None
+
+    def _read_log(self, heads: list[str], seen: list[str]) -> Iterator[dict]:
+        """Commits reachable from heads but not from seen, from one 'git log' pass."""
+        args = [
+            "-c", "core.quotePath=false",
+            "log", "--name-only", "--no-renames",
+            "--format=%x1e%H%x1f%at%x1f%aN%x1f%s%x1f%B%x1f",
+            *heads,
+        ]
+        if seen:
+            args += ["--not", *seen]
+        for record in stream_git(args, self.target_dir, sep="\x1e"):
+            fields = record.split("\x1f")
+            if len(fields) < 6:
+                continue
+            hash_, date, author, subject = fields[:4]
+            body = "\x1f".join(fields[4:-1])
+            agent, model = parse_attribution(body)
+            yield {
+                "hash": hash_,
+                "date": int(date) if date.isdigit() else 0,
+                "author": author,
+                "agent": agent,
+                "model": model,
+                "subject": subject,
+                "files": sorted({line for line in fields[-1].splitlines() if line}),
+            }
@@ -0,0 +1,422 @@
+"""
+Multi-pattern secret and risky-code scanner behind /audit.
+
+All rules are compiled into one combined regex, and each file is read once
+through mmap and matched in a single pass. The leftmost alternative wins,
+so a credential assignment ('token = "ghp_..."') is re-checked against the
+high-severity token rules and reported as the token it holds. Files are listed once (see
+files.py), binaries are sniffed and skipped, and large cold scans fan out to
+a process pool. Files that scanned clean are remembered by git blob hash in
+.specify/cache/audit.json, so unchanged files are never reopened.
+"""
+
+import hashlib
+import mmap
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .cache import fingerprint, get_cache_dir, read_json, write_json_atomic
+from .files import SNIFF_BYTES, is_binary, iter_project_files
+from .git import GitError, is_git_repo, read_blobs, stream_git
+
+CACHE_FILE = "audit.json"
+CACHE_VERSION = 1
+
+# Files above this size (minified bundles, data dumps) are not scanned
+MAX_FILE_BYTES = 4 << 20
+
+PARALLEL_THRESHOLD = 256
+BATCH_FILES = 64
+
+# Lines containing this marker are never reported
+IGNORE_MARKER = b"audit:ignore"
+
+SEVERITIES = ["low", "medium", "high"]
+
+# (id, severity, description, pattern) - patterns must only use non-capturing groups
+RULES = [
+    ("private-key", "high", "Private key block",
+     rb"-----BEGIN (?:RSA |EC |DSA |OPENSSH |PGP |ENCRYPTED )?PRIVATE KEY-----"),
+    ("aws-access-key", "high", "AWS access key ID",
+     rb"\b(?:AKIA|ASIA)[0-9A-Z]{16}\b"),
+    ("github-token", "high", "GitHub token",
+     rb"\b(?:gh[pousr]_[A-Za-z0-9]{36,}|github_pat_[A-Za-z0-9_]{22,})\b"),
+    ("slack-token", "high", "Slack token",
+     rb"\bxox[abprs]-[A-Za-z0-9-]{10,}"),
+    ("stripe-key", "high", "Stripe secret key",
+     rb"\b[rs]k_live_[A-Za-z0-9]{16,}"),
+    ("hardcoded-secret", "medium", "Hardcoded credential assignment",
+     rb"(?i:\b[\w.-]*(?:api[_-]?key|secret|passw(?:or)?d|token|credential)s?\b['\"]?\s*[:=]\s*['\"][^'\"\s]{8,}['\"])"),
+    ("sql-concat", "medium", "SQL built by string formatting (injection risk)",
+     rb"\b(?:execute|executemany|executescript|raw)\s*\(\s*(?:f['\"]|['\"][^'\"\n]*['\"]\s*(?:%|\+|\.format\b))"),
+    ("eval-exec", "medium", "Dynamic code execution",
+     rb"(?<![\w.])(?:eval|exec)\s*\(\s*(?!['\"])"),
+    ("weak-hash", "low", "Weak hash algorithm (MD5/SHA1)",
+     rb"\bhashlib\.(?:md5|sha1)\b|\bcreateHash\(\s*['\"](?:md5|sha1)['\"]|\b(?:MD5|SHA1)\.Create\(\)"),
+    ("shell-true", "low", "Subprocess with shell=True",  # audit:ignore
+     rb"\bshell\s*=\s*True\b"),
+    ("world-writable", "low", "World-writable file permissions",
+     rb"\bchmod\b[^\n]{0,40}\b0?o?777\b"),
+    ("tls-verify-off", "medium", "TLS certificate verification disabled",
+     rb"\bverify\s*=\s*False\b|rejectUnauthorized\s*:\s*false|InsecureSkipVerify\s*:\s*true"),
+]
+
+RULE_INFO = {rule_id: {"severity": sev, "description": desc} for rule_id, sev, desc, _ in RULES}
+
+# Single combined matcher; match.lastgroup maps back to the rule
+_GROUPS = {f"r{i}": rule[0] for i, rule in enumerate(RULES)}
+COMBINED = re.compile(b"|".join(
+    b"(?P<%s>%s)" % (group.encode(), RULES[i][3]) for i, group in enumerate(_GROUPS)
+))
+RULES_DIGEST = hashlib.sha1(COMBINED.pattern).hexdigest()[:12]  # audit:ignore - cache key
+
+# High-severity token rules, searched inside generic credential assignments
+_TOKEN_GROUPS = {
+    group: rule for group, rule in _GROUPS.items()
+    if RULE_INFO[rule]["severity"] == "high" and rule != "private-key"
+}
+TOKENS = re.compile(b"|".join(
+    b"(?P<%s>%s)" % (group.encode(), RULES[int(group[1:])][3]) for group in _TOKEN_GROUPS
+))
+
+# Dependency manifests and the tool that audits them
+DEPENDENCY_FILES = {
+    "requirements.txt": ("python", "pip-audit"),
+    "pyproject.toml": ("python", "pip-audit"),
+    "setup.py": ("python", "pip-audit"),
+    "Pipfile.lock": ("python", "pip-audit"),
+    "package.json": ("node", "npm audit"),
+    "package-lock.json": ("node", "npm audit"),
+    "yarn.lock": ("node", "yarn audit"),
+    "pnpm-lock.yaml": ("node", "pnpm audit"),
+    "Cargo.lock": ("rust", "cargo audit"),
+    "go.sum": ("go", "govulncheck ./..."),
+    "Gemfile.lock": ("ruby", "bundle audit"),
+    "composer.lock": ("php", "composer audit"),
+}
+
+
+def blob_hash(data) -> str:
+    """Compute the git blob object id (SHA-1) of file content."""
+    digest = hashlib.sha1(b"blob %d\0" % len(data))  # audit:ignore - git object id
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def scan_file(
+    full_path: str, want_hash: bool = True
+) -> tuple[str | None, bool, list[dict]] | None:
+    """
+    Scan one file with the combined matcher.
+
+    Args:
+        full_path: Absolute file path
+        want_hash: Also compute the git blob hash of the content
+
+    Returns:
+        (blob_hash, is_binary, findings) tuple, or None if unreadable or too
+        large. Findings are dicts with 'rule', 'line', 'column' and 'snippet'.
+    """
+    try:
+        with open(full_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size > MAX_FILE_BYTES:
+                return None
+            if size == 0:
+                return (blob_hash(b"") if want_hash else None, False, [])
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                oid = blob_hash(data) if want_hash else None
+                if is_binary(data[:SNIFF_BYTES]):
+                    return (oid, True, [])
+                return (oid, False, _match(data))
+    except (OSError, ValueError):
+        return None
+
+
+def scan_blob(data: bytes) -> tuple[bool, list[dict]]:
+    """
+    Scan in-memory content (a staged blob) with the combined matcher.
+
+    Returns:
+        (is_binary, findings) tuple, findings as in scan_file()
+    """
+    if is_binary(data[:SNIFF_BYTES]):
+        return (True, [])
+    return (False, _match(data))
+
+
+def _match(data) -> list[dict]:
+    """Run the combined matcher over file content."""
+    findings = []
+    line = 1
+    counted_to = 0
+    for match in COMBINED.finditer(data):
+        start = match.start()
+        line += data[counted_to:start].count(b"\n")
+        counted_to = start
+
+        line_start = data.rfind(b"\n", 0, start) + 1
+        line_end = data.find(b"\n", start)
+        text = data[line_start:line_end if line_end != -1 else len(data)]
+        if IGNORE_MARKER in text:
+            continue
+
+        rule = _GROUPS[match.lastgroup]
+        if rule == "hardcoded-secret":
+            token = TOKENS.search(data, match.start(), match.end())
+            if token:
+                match, rule = token, _TOKEN_GROUPS[token.lastgroup]
+        secret = match.group()
+        snippet = text.strip().decode("utf-8", errors="replace")
+        if RULE_INFO[rule]["severity"] == "high" or rule == "hardcoded-secret":
+            snippet = snippet.replace(secret.decode("utf-8", errors="replace"), _redact(secret))
+        findings.append({
+            "rule": rule,
+            "line": line,
+            "column": match.start() - line_start + 1,
+            "snippet": snippet[:200],
+        })
+    return findings
+
+
+def _redact(secret: bytes) -> str:
+    """Keep just enough of a secret to recognize it."""
+    text = secret.decode("utf-8", errors="replace")
+    return text[:8] + "****" if len(text) > 12 else "****"
+
+
+def _scan_batch(jobs: list[tuple[str, bool]]) -> list:
+    """Process-pool worker: scan a batch of files."""
+    return [scan_file(path, want_hash) for path, want_hash in jobs]
+
+
+class AuditScanner:
+    """Scans a project for secrets, risky code patterns and dependency manifests."""
+
+    def __init__(self, target_dir: Path, workers: int | None = None, use_cache: bool = True):
+        """
+        Initialize audit scanner.
+
+        Args:
+            target_dir: Project root directory
+            workers: Process pool size (None = CPU count, 1 = no pool)
+            use_cache: Skip files whose blob hash previously scanned clean
+        """
+        self.target_dir = Path(target_dir).resolve()
+        self.workers = workers
+        self.use_cache = use_cache
+        self.cache_path = get_cache_dir(self.target_dir) / CACHE_FILE
+
+    def scan(
+        self, min_severity: str = "low", paths: list[str] | None = None, staged: bool = False
+    ) -> dict:
+        """
+        Scan every non-ignored project file.
+
+        Args:
+            min_severity: Lowest severity to report ('low', 'medium', 'high')
+            paths: Only scan these project-relative files and directories
+            staged: Scan the content staged in the index (what the next
+                commit will contain) instead of the working tree
+
+        Returns:
+            Dict with 'findings', 'manifests', 'files', 'scanned', 'cached',
+            'binary', 'skipped' and 'seconds'
+        """
+        started = time.perf_counter()
+        cache = read_json(self.cache_path) if self.use_cache else None
+        if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION \
+                or cache.get("rules") != RULES_DIGEST:
+            cache = {"version": CACHE_VERSION, "rules": RULES_DIGEST, "clean": [], "stat": {}}
+        clean = set(cache["clean"])
+        stat_cache: dict[str, list] = cache["stat"]
+
+        index_oids, dirty = self._index_state()
+        if staged:
+            files = sorted(index_oids)
+        else:
+            files = list(iter_project_files(self.target_dir))
+        if paths is not None:
+            prefixes = [p.strip("/") for p in paths]
+            files = [
+                f for f in files
+                if any(not p or p == "." or f == p or f.startswith(p + "/") for p in prefixes)
+            ]
+
+        report = {
+            "findings": [],
+            "manifests": [],
+            "files": len(files),
+            "scanned": 0,
+            "cached": 0,
+            "binary": 0,
+            "skipped": 0,
+        }
+        fresh_clean = set()
+        fresh_stat: dict[str, list] = {}
+        jobs: list[tuple[str, list[int] | None]] = []
+
+        for rel_path in files:
+            name = rel_path.rsplit("/", 1)[-1]
+            if name in DEPENDENCY_FILES:
+                ecosystem, tool = DEPENDENCY_FILES[name]
+                report["manifests"].append({"path": rel_path, "ecosystem": ecosystem, "tool": tool})
+
+            oid = index_oids.get(rel_path) if staged or rel_path not in dirty else None
+            fp = None
+            if oid is None and not staged:
+                # Not in the index or edited: fall back to a stat-keyed oid
+                try:
+                    fp = list(fingerprint(os.stat(self.target_dir / rel_path)))
+                except OSError:
+                    continue
+                cached = stat_cache.get(rel_path)
+                if cached and cached[:2] == fp:
+                    oid = cached[2]
+                    fresh_stat[rel_path] = cached
+
+            if oid and oid in clean:
+                fresh_clean.add(oid)
+                report["cached"] += 1
+            else:
+                jobs.append((rel_path, fp))
+
+        if staged:
+            results = self._run_staged([index_oids[p] for p, _ in jobs])
+        else:
+            results = self._run([(str(self.target_dir / p), fp is not None) for p, fp in jobs])
+        for (rel_path, fp), result in zip(jobs, results):
+            if result is None:
+                report["skipped"] += 1
+                continue
+            oid, binary, findings = result
+            oid = oid or index_oids.get(rel_path)
+            report["scanned"] += 1
+            report["binary"] += binary
+            if fp is not None and oid:
+                fresh_stat[rel_path] = fp + [oid]
+            if not findings and oid:
+                fresh_clean.add(oid)
+            for finding in findings:
+                info = RULE_INFO[finding["rule"]]
+                if SEVERITIES.index(info["severity"]) < SEVERITIES.index(min_severity):
+                    continue
+                report["findings"].append({
+                    "path": rel_path,
+                    **finding,
+                    "severity": info["severity"],
+                    "description": info["description"],
+                })
+
+        if self.use_cache:
+            if staged or paths is not None:
+                # Partial scan: keep what the other files contributed
+                fresh_clean |= clean
+                fresh_stat = {**stat_cache, **fresh_stat}
+            write_json_atomic(self.cache_path, {
+                "version": CACHE_VERSION,
+                "rules": RULES_DIGEST,
+                "clean": sorted(fresh_clean),
+                "stat": fresh_stat,
+            })
+
+        report["findings"].sort(
+            key=lambda f: (-SEVERITIES.index(f["severity"]), f["path"], f["line"])
+        )
+        report["seconds"] = round(time.perf_counter() - started, 3)
+        return report
+
+    def _index_state(self) -> tuple[dict[str, str], set]:
+        """Index blob ids (stage 0, no submodules) and paths whose work tree copy differs."""
+        oids: dict[str, str] = {}
+        dirty = set()
+        if not is_git_repo(self.target_dir):
+            return oids, dirty
+        try:
+            for record in stream_git(["ls-files", "-s", "-z"], self.target_dir, sep="\0"):
+                meta, _, path = record.partition("\t")
+                fields = meta.split()
+                if len(fields) == 3 and fields[2] == "0" and fields[0] != "160000":
+                    oids[path] = fields[1]
+            changed = stream_git(["diff-files", "--name-only", "-z"], self.target_dir, sep="\0")
+            dirty.update(p for p in changed if p)
+        except GitError:
+            return {}, set()
+        return oids, dirty
+
+    def _run_staged(self, oids: list[str]) -> list:
+        """Scan staged blobs read in one batch (too large or unreadable -> None)."""
+        try:
+            blobs = read_blobs(self.target_dir, oids, max_bytes=MAX_FILE_BYTES)
+        except GitError:
+            return [None] * len(oids)
+        return [
+            None if blobs.get(oid) is None else (oid, *scan_blob(blobs[oid]))
+            for oid in oids
+        ]
+
+    def _run(self, jobs: list[tuple[str, bool]]) -> list:
+        """Scan files, fanning out to a process pool for large batches."""
+        if self.workers == 1 or len(jobs) < PARALLEL_THRESHOLD:
+            return [scan_file(path, want_hash) for path, want_hash in jobs]
+
+        batches = [jobs[i:i + BATCH_FILES] for i in range(0, len(jobs), BATCH_FILES)]
+        results = []
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for batch_result in pool.map(_scan_batch, batches):
+                results.extend(batch_result)
+        return results
+
+
+def to_sarif(report: dict, tool_version: str, information_uri: str = "") -> dict:
+    """
+    Convert a scan report to SARIF 2.1.0.
+
+    Args:
+        report: Result of AuditScanner.scan()
+        tool_version: lite-kits version string
+        information_uri: Project URL for the tool driver
+
+    Returns:
+        SARIF log dict
+    """
+    levels = {"high": "error", "medium": "warning", "low": "note"}
+    driver = {
+        "name": "lite-kits audit",
+        "version": tool_version,
+        "rules": [
+            {
+                "id": rule_id,
+                "shortDescription": {"text": desc},
+                "defaultConfiguration": {"level": levels[sev]},
+            }
+            for rule_id, sev, desc, _ in RULES
+        ],
+    }
+    if information_uri:
+        driver["informationUri"] = information_uri
+
+    return {
+        "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+        "version": "2.1.0",
+        "runs": [{
+            "tool": {"driver": driver},
+            "results": [
+                {
+                    "ruleId": f["rule"],
+                    "level": levels[f["severity"]],
+                    "message": {"text": f["description"]},
+                    "locations": [{
+                        "physicalLocation": {
+                            "artifactLocation": {"uri": f["path"]},
+                            "region": {"startLine": f["line"], "startColumn": f["column"]},
+                        }
+                    }],
+                }
+                for f in report["findings"]
+            ],
+        }],
+    }
@@ -0,0 +1,253 @@
+"""
+Batched branch analysis and cleanup behind /cleanup.
+
+Reads every local and remote-tracking branch (tip, date, author, upstream
+state, worktree checkout) with one 'git for-each-ref' call and computes the
+merged set with one more ancestry-filtered call, instead of running
+'git log' per branch. Produces a ranked deletion plan and deletes in batches
+('git branch -d/-D' and 'git push --delete' with many refs per call).
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+
+from .collab import CollabIndex
+from .git import GitError, chunked, current_branch, default_branch, run_git
+
+# Never proposed for deletion
+PROTECTED_BRANCHES = {"main", "master", "develop", "development", "trunk", "HEAD"}
+
+DEFAULT_STALE_DAYS = 90
+
+# Deletion plan order: safest first
+CATEGORY_RANK = {"merged": 0, "gone": 1, "stale": 2}
+
+_FIELDS = [
+    "refname", "objectname:short", "committerdate:unix", "authorname",
+    "upstream:short", "upstream:track", "worktreepath", "subject",
+]
+
+
+def _error_for(error: GitError, name: str) -> str:
+    """The error line naming a branch, or the whole message if none does."""
+    lines = str(error).splitlines()
+    return next((line for line in lines if f"'{name}'" in line), str(error))
+
+
+class BranchAnalyzer:
+    """Classifies branches and builds a ranked deletion plan."""
+
+    def __init__(self, target_dir: Path, base: str | None = None, remote: str = "origin"):
+        """
+        Initialize branch analyzer.
+
+        Args:
+            target_dir: Repository directory
+            base: Branch merges are measured against (None = detect)
+            remote: Remote whose branches are analyzed and deleted
+        """
+        self.target_dir = Path(target_dir).resolve()
+        self.base = base or default_branch(self.target_dir)
+        self.remote = remote
+
+    def analyze(
+        self,
+        include_remote: bool = True,
+        stale_days: int = DEFAULT_STALE_DAYS,
+        include_stale: bool = False,
+    ) -> dict:
+        """
+        Classify every branch.
+
+        Categories: 'merged' (reachable from base, safe to delete), 'gone'
+        (upstream deleted, usually a squash-merged PR), 'stale' (unmerged and
+        older than stale_days), 'active' and 'protected'.
+
+        Args:
+            include_remote: Also analyze refs/remotes/<remote>/*
+            stale_days: Age after which an unmerged branch counts as stale
+            include_stale: Put stale branches in the deletion plan
+
+        Returns:
+            Dict with 'base', 'current', 'branches' (all) and 'plan'
+            (ranked deletion candidates)
+
+        Raises:
+            GitError: If git fails (e.g. the base branch does not exist)
+        """
+        patterns = ["refs/heads"] + ([f"refs/remotes/{self.remote}"] if include_remote else [])
+        merged = self._merged_refs(patterns)
+        current = current_branch(self.target_dir)
+        guarded = self._collab_features()
+        now = time.time()
+
+        output = run_git(
+            ["for-each-ref", "--format=" + "%00".join(f"%({f})" for f in _FIELDS), *patterns],
+            self.target_dir,
+        )
+
+        branches = []
+        for line in output.splitlines():
+            fields = line.split("\0")
+            if len(fields) != len(_FIELDS):
+                continue
+            ref, sha, date, author, upstream, track, worktree, subject = fields
+
+            if ref.startswith("refs/heads/"):
+                kind, name = "local", ref[len("refs/heads/"):]
+            else:
+                kind, name = "remote", ref[len(f"refs/remotes/{self.remote}/"):]
+            age_days = int((now - int(date or now)) // 86400)
+
+            branch = {
+                "name": name,
+                "kind": kind,
+                "ref": ref,
+                "sha": sha,
+                "date": int(date) if date else None,
+                "age_days": age_days,
+                "author": author,
+                "subject": subject,
+                "upstream": upstream or None,
+                "worktree": worktree or None,
+                "merged": ref in merged,
+            }
+            branch["category"], branch["reason"] = self._categorize(
+                branch, track, current, guarded, stale_days
+            )
+            branches.append(branch)
+
+        planned = {"merged", "gone", "stale"} if include_stale else {"merged", "gone"}
+        plan = sorted(
+            (b for b in branches if b["category"] in planned),
+            key=lambda b: (CATEGORY_RANK[b["category"]], -b["age_days"], b["kind"], b["name"]),
+        )
+        return {
+            "base": self.base,
+            "remote": self.remote,
+            "current": current,
+            "branches": branches,
+            "plan": plan,
+        }
+
+    def delete(self, plan: list[dict], dry_run: bool = False) -> dict:
+        """
+        Delete planned branches in batches.
+
+        Merged local branches use 'git branch -d'; 'gone' and 'stale' ones
+        need 'git branch -D'. Remote branches are removed with one
+        'git push <remote> --delete' per batch.
+
+        Args:
+            plan: Branch entries from analyze()['plan'] (possibly filtered)
+            dry_run: Only return the commands that would run
+
+        Returns:
+            Dict with 'deleted' (names), 'failed' ({name, error}) and 'commands'
+        """
+        result = {"deleted": [], "failed": [], "commands": []}
+
+        safe = [b["name"] for b in plan if b["kind"] == "local" and b["category"] == "merged"]
+        forced = [b["name"] for b in plan if b["kind"] == "local" and b["category"] != "merged"]
+        remote = [b["name"] for b in plan if b["kind"] == "remote"]
+
+        for flag, names in (("-d", safe), ("-D", forced)):
+            for batch in chunked(names):
+                self._run_local(["branch", flag, *batch], batch, result, dry_run)
+        for batch in chunked(remote):
+            self._run_remote(
+                ["push", "--porcelain", self.remote, "--delete", *batch], batch, result, dry_run
+            )
+        return result
+
+    def _run_local(self, args: list[str], names: list[str], result: dict, dry_run: bool):
+        """Run one batched 'git branch -d/-D' and attribute failures to branch names."""
+        result["commands"].append("git " + " ".join(args))
+        if dry_run:
+            return
+        try:
+            run_git(args, self.target_dir)
+            result["deleted"].extend(names)
+            return
+        except GitError as e:
+            error = e
+        # 'git branch' keeps going after a failure; whatever still exists failed
+        output = run_git(
+            ["for-each-ref", "--format=%(refname)", *(f"refs/heads/{n}" for n in names)],
+            self.target_dir,
+            check=False,
+        )
+        remaining = {ref[len("refs/heads/"):] for ref in output.split()}
+        for name in names:
+            if name in remaining:
+                result["failed"].append({"name": name, "error": _error_for(error, name)})
+            else:
+                result["deleted"].append(name)
+
+    def _run_remote(self, args: list[str], names: list[str], result: dict, dry_run: bool):
+        """Run one batched 'git push --delete' and read per-ref status from --porcelain."""
+        result["commands"].append("git " + " ".join(args))
+        if dry_run:
+            return
+        try:
+            output = run_git(args, self.target_dir)
+            error = None
+        except GitError as e:
+            output, error = e.output, e
+        # Porcelain lines: "<flag>\t:refs/heads/<name>\t<summary> (<reason>)"; '!' is rejected
+        status = {}
+        for line in output.splitlines():
+            parts = line.split("\t")
+            if len(parts) >= 3 and parts[1].startswith(":refs/heads/"):
+                status[parts[1][len(":refs/heads/"):]] = (parts[0], parts[2])
+        for name in names:
+            flag, summary = status.get(name, (None, None))
+            if flag == "!":
+                result["failed"].append({"name": name, "error": summary})
+            elif flag is None and error is not None:
+                # No status line: the push failed before reaching this ref
+                result["failed"].append({"name": name, "error": _error_for(error, name)})
+            else:
+                result["deleted"].append(name)
+
+    def _categorize(self, branch: dict, track: str, current: str | None,
+                    guarded: set[str], stale_days: int):
+        """Return (category, reason) for one branch."""
+        name = branch["name"]
+        if name in PROTECTED_BRANCHES or name == self.base or name == self.base.split("/")[-1]:
+            return "protected", "base/protected branch"
+        if branch["kind"] == "local" and name == current:
+            return "protected", "current branch"
+        if branch["worktree"]:
+            return "protected", f"checked out in worktree {branch['worktree']}"
+        feature = name.rsplit("/", 1)[-1]
+        if feature in guarded:
+            return "protected", "active collaboration records"
+        if branch["merged"]:
+            return "merged", f"merged into {self.base}"
+        if branch["kind"] == "local" and track == "[gone]":
+            return "gone", f"upstream {branch['upstream']} was deleted"
+        if branch["age_days"] >= stale_days:
+            return "stale", f"unmerged, no commits for {branch['age_days']} days"
+        return "active", "unmerged"
+
+    def _merged_refs(self, patterns: list[str]) -> set[str]:
+        """Refs reachable from base, from one ancestry-filtered for-each-ref."""
+        output = run_git(
+            ["for-each-ref", f"--merged={self.base}", "--format=%(refname)", *patterns],
+            self.target_dir,
+        )
+        return set(output.split())
+
+    def _collab_features(self) -> set[str]:
+        """Features with active sessions or open handoffs (never auto-delete)."""
+        index = CollabIndex(self.target_dir)
+        try:
+            index.refresh()
+            rows = index.query(state="active", open_only=True)
+            return {row["feature"] for row in rows if row["feature"]}
+        except sqlite3.Error:
+            return set()
+        finally:
+            index.close()
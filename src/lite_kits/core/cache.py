@@ -0,0 +1,178 @@
+"""
+Project-local cache directory for lite-kits indexes.
+
+Derived state (indexes, fingerprints, bundles) lives under .specify/cache/ in
+spec-kit projects. The directory carries its own .gitignore so generated files
+never get committed. Elsewhere the cache goes under the git dir (or the user
+cache dir outside git), so read-only commands never create .specify/ and turn
+a random directory into something status reports as a spec-kit project.
+Cache directories are created on first write, not when located.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from .git import git_dir
+
+CACHE_DIR = Path(".specify") / "cache"
+
+# Cache location inside the git dir for projects without .specify/
+GIT_CACHE_DIR = Path("lite-kits") / "cache"
+
+
+def get_cache_dir(target_dir: Path) -> Path:
+    """
+    Locate the cache directory for a project (without creating it).
+
+    Args:
+        target_dir: Project root directory
+
+    Returns:
+        .specify/cache/ if the project has .specify/, else
+        <git-dir>/lite-kits/cache/, else a per-project directory under the
+        user cache dir ($XDG_CACHE_HOME or ~/.cache)
+    """
+    target_dir = Path(target_dir)
+    if (target_dir / ".specify").is_dir():
+        return target_dir / CACHE_DIR
+
+    repo_dir = git_dir(target_dir)
+    if repo_dir is not None:
+        return repo_dir / GIT_CACHE_DIR
+
+    user_cache = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    key = hashlib.sha1(str(target_dir.resolve()).encode("utf-8")).hexdigest()[:16]
+    return user_cache / "lite-kits" / key
+
+
+def ensure_cache_dir(cache_dir: Path) -> Path:
+    """
+    Create a cache directory before writing to it.
+
+    A .specify/cache/ directory gets its .gitignore when created.
+
+    Args:
+        cache_dir: Result of get_cache_dir()
+
+    Returns:
+        The same path
+    """
+    cache_dir = Path(cache_dir)
+    if not cache_dir.is_dir():
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        if cache_dir.parts[-2:] == CACHE_DIR.parts:
+            gitignore = cache_dir / ".gitignore"
+            if not gitignore.exists():
+                gitignore.write_text("*\n", encoding='utf-8')
+    return cache_dir
+
+
+def fingerprint(stat: os.stat_result) -> tuple[int, int]:
+    """
+    Cheap change fingerprint for a file.
+
+    Args:
+        stat: Result of os.stat() / DirEntry.stat()
+
+    Returns:
+        (mtime_ns, size) tuple
+    """
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def read_json(path: Path) -> Any | None:
+    """
+    Load a JSON cache file.
+
+    Args:
+        path: Cache file path
+
+    Returns:
+        Parsed data, or None if missing or unreadable
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json_atomic(path: Path, data: Any):
+    """
+    Write a JSON cache file atomically (temp file + rename).
+
+    Concurrent readers see either the old or the new file, never a partial one.
+
+    Args:
+        path: Cache file path
+        data: JSON-serializable data
+    """
+    path = Path(path)
+    ensure_cache_dir(path.parent)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding='utf-8') as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def replace_file(target: Path, write: Callable[[str], Any], keep_mode: bool = False):
+    """
+    Create or replace a file atomically (temp file in the same directory + rename).
+
+    Concurrent readers see either the old or the new file, never a partial one.
+
+    Args:
+        target: File to create or replace
+        write: Callable that writes the new content to the given temp path
+        keep_mode: Give the new file the permissions of the one it replaces
+            (0644 if there is none) instead of the temp file's 0600
+    """
+    target = Path(target)
+    ensure_cache_dir(target.parent)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp)
+        if keep_mode:
+            try:
+                mode = target.stat().st_mode & 0o777
+            except FileNotFoundError:
+                mode = 0o644
+            os.chmod(tmp, mode)
+        os.replace(tmp, target)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def write_text_atomic(path: Path, text: str):
+    """
+    Replace a text file atomically, keeping its permissions.
+
+    The text is written as-is (no newline translation), so a file's existing
+    line endings survive the rewrite.
+
+    Args:
+        path: File to create or replace
+        text: New content
+    """
+    def write(tmp: str):
+        with open(tmp, "w", encoding='utf-8', newline="") as f:
+            f.write(text)
+
+    replace_file(path, write, keep_mode=True)
@@ -0,0 +1,309 @@
+"""
+Working tree checkpoints built on git plumbing.
+
+A checkpoint snapshots every non-ignored file without touching the working
+tree, the index or any branch: a copy of the index is refreshed with
+'git add -A' (so unchanged files reuse their cached stat data), turned into a
+tree with 'write-tree' and wrapped with 'commit-tree'. The commit is stored
+under refs/lite-kits/checkpoints/<id>. Restores diff the checkpoint tree
+against a snapshot of the current state and rewrite only the files that
+differ. Only the newest checkpoints are kept.
+"""
+
+import builtins
+import os
+import shutil
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from .git import GitError, current_branch, run_git
+
+REF_NAMESPACE = "refs/lite-kits/checkpoints"
+DEFAULT_KEEP = 10
+
+# Identity used when the repository has none configured
+FALLBACK_IDENTITY = {
+    "GIT_AUTHOR_NAME": "lite-kits",
+    "GIT_AUTHOR_EMAIL": "lite-kits@localhost",
+    "GIT_COMMITTER_NAME": "lite-kits",
+    "GIT_COMMITTER_EMAIL": "lite-kits@localhost",
+}
+
+
+class CheckpointStore:
+    """Creates, lists, restores and expires working tree checkpoints."""
+
+    def __init__(self, target_dir: Path, keep: int = DEFAULT_KEEP):
+        """
+        Initialize checkpoint store.
+
+        Args:
+            target_dir: Repository directory
+            keep: Number of checkpoints retained after each create
+        """
+        self.target_dir = Path(target_dir).resolve()
+        self.keep = keep
+        self.top = Path(run_git(["rev-parse", "--show-toplevel"], self.target_dir).strip())
+
+    def create(self, message: str = "") -> dict:
+        """
+        Snapshot the working tree (tracked changes and untracked files).
+
+        Args:
+            message: Optional description
+
+        Returns:
+            Checkpoint dict ('id', 'commit', 'tree', 'message', ...) plus
+            'created' (False when identical to the newest checkpoint) and
+            'expired' (ids removed by retention)
+        """
+        tree = self._snapshot_tree()
+        latest = self.list()
+        if latest and latest[0]["tree"] == tree:
+            checkpoint = {**latest[0], "created": False}
+        else:
+            checkpoint = {**self._commit(tree, message, latest), "created": True}
+        checkpoint["expired"] = self.expire(self.keep)
+        return checkpoint
+
+    def list(self) -> list[dict]:
+        """
+        List checkpoints, newest first (one for-each-ref call).
+
+        Returns:
+            List of dicts with 'id', 'commit', 'tree', 'date', 'message',
+            'branch' and 'head'
+        """
+        output = run_git(
+            [
+                "for-each-ref",
+                "--format=%(refname:lstrip=3)%00%(objectname)%00%(tree)%00%(creatordate:unix)%00%(contents)%1e",
+                REF_NAMESPACE,
+            ],
+            self.target_dir,
+        )
+        checkpoints = []
+        for record in output.split("\x1e"):
+            fields = record.strip("\n").split("\0")
+            if len(fields) != 5 or not fields[0].isdigit():
+                continue
+            cp_id, commit, tree, date, body = fields
+            meta = _parse_body(body)
+            checkpoints.append({
+                "id": int(cp_id),
+                "commit": commit,
+                "tree": tree,
+                "date": int(date) if date else None,
+                "message": meta.get("message", ""),
+                "branch": meta.get("branch"),
+                "head": meta.get("head"),
+            })
+        return sorted(checkpoints, key=lambda cp: -cp["id"])
+
+    def restore(
+        self,
+        checkpoint_id: int,
+        paths: builtins.list[str] | None = None,
+        dry_run: bool = False,
+        backup: bool = True,
+    ) -> dict:
+        """
+        Bring the working tree back to a checkpoint, touching only files that differ.
+
+        The index and HEAD are left alone, so restored content shows up as
+        ordinary working tree changes. Unless disabled, the current state is
+        checkpointed first so the restore itself can be undone.
+
+        Args:
+            checkpoint_id: Checkpoint to restore
+            paths: Optional path prefixes limiting the restore
+            dry_run: Only report what would change
+            backup: Checkpoint the current state before restoring
+
+        Returns:
+            Dict with 'restored' and 'removed' paths and 'backup' (checkpoint
+            id or None)
+
+        Raises:
+            GitError: If the checkpoint does not exist
+        """
+        target = self._get(checkpoint_id)
+        current_tree = self._snapshot_tree()
+
+        restored: list[str] = []
+        removed: list[str] = []
+        records = run_git(
+            ["diff-tree", "-r", "-z", "--no-renames", "--name-status",
+             current_tree, target["tree"]],
+            self.top,
+        ).split("\0")
+        for status, path in zip(records[0::2], records[1::2]):
+            if paths and not any(path == p or path.startswith(p.rstrip("/") + "/") for p in paths):
+                continue
+            (removed if status == "D" else restored).append(path)
+
+        result = {
+            "checkpoint": checkpoint_id,
+            "restored": restored,
+            "removed": removed,
+            "backup": None,
+        }
+        if dry_run or not (restored or removed):
+            return result
+
+        if backup:
+            snapshot = self._commit(
+                current_tree, f"before restoring checkpoint {checkpoint_id}", self.list()
+            )
+            result["backup"] = snapshot["id"]
+
+        if restored:
+            # Writes the working tree only; the real index is not touched.
+            # Paths are literal: a file named 'a*' must not also restore 'ab'
+            run_git(
+                ["--literal-pathspecs", "restore", f"--source={target['commit']}", "--worktree",
+                 "--pathspec-from-file=-", "--pathspec-file-nul"],
+                self.top,
+                input="\0".join(restored),
+            )
+        for path in removed:
+            full_path = self.top / path
+            try:
+                full_path.unlink()
+            except FileNotFoundError:
+                continue
+            _prune_empty_dirs(full_path.parent, self.top)
+
+        if backup:
+            self.expire(self.keep)
+        return result
+
+    def drop(self, checkpoint_ids: builtins.list[int]) -> builtins.list[int]:
+        """
+        Delete checkpoints in one ref transaction.
+
+        Args:
+            checkpoint_ids: Ids to delete
+
+        Returns:
+            Ids that existed and were deleted
+        """
+        existing = {cp["id"] for cp in self.list()}
+        doomed = [cp_id for cp_id in checkpoint_ids if cp_id in existing]
+        if doomed:
+            run_git(
+                ["update-ref", "--stdin"],
+                self.target_dir,
+                input="".join(f"delete {REF_NAMESPACE}/{cp_id}\n" for cp_id in doomed),
+            )
+        return doomed
+
+    def expire(self, keep: int) -> builtins.list[int]:
+        """
+        Delete all but the newest keep checkpoints.
+
+        Args:
+            keep: Number of checkpoints to retain
+
+        Returns:
+            Deleted ids
+        """
+        return self.drop([cp["id"] for cp in self.list()[keep:]])
+
+    def _get(self, checkpoint_id: int) -> dict:
+        """Look up one checkpoint by id."""
+        for checkpoint in self.list():
+            if checkpoint["id"] == checkpoint_id:
+                return checkpoint
+        raise GitError(f"Checkpoint {checkpoint_id} not found")
+
+    def _snapshot_tree(self) -> str:
+        """Write the full working tree state as a tree object via a temporary index."""
+        with self._temp_index() as env:
+            run_git(["add", "-A", "--", "."], self.top, env=env)
+            return run_git(["write-tree"], self.top, env=env).strip()
+
+    @contextmanager
+    def _temp_index(self) -> Iterator[dict]:
+        """Yield an environment pointing git at a throwaway copy of the index."""
+        index = Path(run_git(
+            ["rev-parse", "--path-format=absolute", "--git-path", "index"], self.top
+        ).strip())
+        fd, temp_path = tempfile.mkstemp(prefix="lite-kits-index-", dir=index.parent)
+        os.close(fd)
+        try:
+            if index.exists():
+                # Starting from the real index lets 'add -A' skip unchanged files by stat;
+                # copy2 keeps the index mtime so racily-clean entries are still re-read
+                shutil.copy2(index, temp_path)
+            else:
+                os.unlink(temp_path)
+            yield {**os.environ, "GIT_INDEX_FILE": temp_path}
+        finally:
+            for leftover in (temp_path, temp_path + ".lock"):
+                try:
+                    os.unlink(leftover)
+                except FileNotFoundError:
+                    pass
+
+    def _commit(self, tree: str, message: str, existing: builtins.list[dict]) -> dict:
+        """Wrap a tree in a commit and claim the next checkpoint id."""
+        head = run_git(["rev-parse", "--verify", "--quiet", "HEAD"], self.top, check=False).strip()
+        branch = current_branch(self.top)
+        body = (
+            f"{message or 'checkpoint'}\n\n"
+            f"branch: {branch or '(detached)'}\nhead: {head or '(none)'}\n"
+        )
+
+        args = ["commit-tree", tree] + (["-p", head] if head else [])
+        try:
+            commit = run_git(args, self.top, input=body).strip()
+        except GitError:
+            # No user identity configured; checkpoints are private refs anyway
+            env = {**os.environ, **FALLBACK_IDENTITY}
+            commit = run_git(args, self.top, input=body, env=env).strip()
+
+        # All-zero old value (as long as the repo's oids: SHA-1 or SHA-256)
+        # makes the update fail if another process took this id
+        zero_oid = "0" * len(commit)
+        first_id = (existing[0]["id"] if existing else 0) + 1
+        for next_id in range(first_id, first_id + 100):
+            try:
+                run_git(["update-ref", f"{REF_NAMESPACE}/{next_id}", commit, zero_oid], self.top)
+                break
+            except GitError:
+                continue
+        else:
+            raise GitError("Could not allocate a checkpoint id")
+
+        return {
+            "id": next_id,
+            "commit": commit,
+            "tree": tree,
+            "message": message or "checkpoint",
+            "branch": branch,
+            "head": head or None,
+        }
+
+
+def _parse_body(body: str) -> dict:
+    """Split a checkpoint commit message into message and metadata."""
+    message, _, trailer = body.strip().partition("\n\n")
+    meta = {"message": message.strip()}
+    for line in trailer.splitlines():
+        key, sep, value = line.partition(": ")
+        if sep and key in ("branch", "head"):
+            meta[key] = None if value.startswith("(") else value.strip()
+    return meta
+
+
+def _prune_empty_dirs(directory: Path, top: Path):
+    """Remove directories left empty by a restore, up to the repository root."""
+    while directory != top and top in directory.parents:
+        try:
+            directory.rmdir()
+        except OSError:
+            return
+        directory = directory.parent
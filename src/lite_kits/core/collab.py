@@ -0,0 +1,592 @@
+"""
+Indexed collaboration store for the multiagent kit.
+
+Keeps an incrementally refreshed SQLite index of every session log, handoff
+and decision under specs/*/collaboration/, so queries like "open handoffs for
+feature 012" don't have to rescan and reparse thousands of markdown files.
+"""
+
+import gzip
+import json
+import os
+import re
+import sqlite3
+from collections.abc import Iterator
+from datetime import date, timedelta
+from pathlib import Path
+
+from .cache import ensure_cache_dir, fingerprint, get_cache_dir
+
+INDEX_FILE = "collab.db"
+SCHEMA_VERSION = 2
+
+# Compressed per-feature bundle of packed archive records (JSON lines, gzip)
+BUNDLE_NAME = "records.jsonl.gz"
+
+# Record kinds
+KIND_SESSION = "session"
+KIND_HANDOFF = "handoff"
+KIND_DECISION = "decision"
+KINDS = [KIND_SESSION, KIND_HANDOFF, KIND_DECISION]
+
+# Collaboration states (subdirectories of collaboration/)
+STATES = ["active", "archive"]
+
+# Statuses that mean a record no longer needs attention
+CLOSED_STATUSES = {
+    "accepted", "acknowledged", "completed", "done", "closed",
+    "implemented", "superseded", "handed-off",
+}
+
+# "**Key**: value" lines used by the templates
+_FIELD_RE = re.compile(r"^\*\*(?P<key>[^*]+)\*\*:\s*(?P<value>.*)$")
+_FEATURE_DIR_RE = re.compile(r"^(?P<num>\d+)-")
+_SESSION_NAME_RE = re.compile(r"^(?P<date>\d{4}-\d{2}-\d{2})-(?P<agent>.+)$")
+_HANDOFF_NAME_RE = re.compile(r"^handoff-to-(?P<agent>.+)$")
+
+# Template field -> index column
+_FIELD_MAP = {
+    "date": "date",
+    "agent": "agent",
+    "from": "agent",
+    "decided by": "agent",
+    "to": "to_agent",
+    "feature": "feature_title",
+    "status": "status",
+    "session status": "status",
+    "handoff status": "status",
+}
+
+_COLUMNS = [
+    "path", "bundle", "kind", "state", "feature", "feature_num", "feature_title",
+    "agent", "to_agent", "date", "status", "title", "mtime_ns", "size",
+]
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS records (
+    path TEXT NOT NULL,
+    bundle TEXT NOT NULL DEFAULT '',
+    kind TEXT NOT NULL,
+    state TEXT NOT NULL,
+    feature TEXT NOT NULL,
+    feature_num TEXT,
+    feature_title TEXT,
+    agent TEXT,
+    to_agent TEXT,
+    date TEXT,
+    status TEXT,
+    title TEXT,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (path, bundle)
+);
+CREATE INDEX IF NOT EXISTS idx_records_feature ON records (feature_num, kind, state);
+CREATE INDEX IF NOT EXISTS idx_records_agent ON records (agent, date);
+CREATE INDEX IF NOT EXISTS idx_records_date ON records (date);
+PRAGMA user_version = {SCHEMA_VERSION};
+"""
+
+
+def parse_record(text: str) -> dict[str, str]:
+    """
+    Parse front-matter fields from a collaboration record.
+
+    Understands both the "**Key**: value" lines used by the kit templates and
+    a leading YAML-style "---" block. Unfilled template placeholders such as
+    "[agent-name]" or "YYYY-MM-DD" are ignored.
+
+    Args:
+        text: Markdown content of the record
+
+    Returns:
+        Dict of index columns (title, agent, to_agent, date, status, feature_title)
+    """
+    fields: dict[str, str] = {}
+    lines = text.splitlines()
+
+    # Optional YAML-style front matter
+    if lines and lines[0].strip() == "---":
+        for i, line in enumerate(lines[1:], start=1):
+            if line.strip() == "---":
+                lines = lines[i + 1:]
+                break
+            key, sep, value = line.partition(":")
+            if sep:
+                _set_field(fields, key, value)
+
+    for line in lines:
+        stripped = line.strip()
+        if "title" not in fields and stripped.startswith("# "):
+            fields["title"] = stripped[2:].strip()
+            continue
+        match = _FIELD_RE.match(stripped)
+        if match:
+            _set_field(fields, match.group("key"), match.group("value"))
+
+    return fields
+
+
+def record_fields(rel_path: str, kind: str, text: str) -> dict[str, str]:
+    """
+    Parse a record and fill unset fields from file naming conventions.
+
+    Session logs are named YYYY-MM-DD-<agent>.md and handoffs
+    handoff-to-<agent>.md, so date/agent can be recovered from the name
+    when the template fields were left as placeholders.
+
+    Args:
+        rel_path: Project-relative record path
+        kind: Record kind
+        text: Markdown content
+
+    Returns:
+        Parsed fields (see parse_record)
+    """
+    fields = parse_record(text)
+    stem = Path(rel_path).stem
+
+    if kind == KIND_SESSION:
+        match = _SESSION_NAME_RE.match(stem)
+        if match:
+            fields.setdefault("date", match.group("date"))
+            fields.setdefault("agent", match.group("agent"))
+    elif kind == KIND_HANDOFF:
+        match = _HANDOFF_NAME_RE.match(stem)
+        if match:
+            fields.setdefault("to_agent", match.group("agent"))
+
+    return fields
+
+
+def _set_field(fields: dict[str, str], key: str, value: str):
+    """Store a template field under its index column (first value wins)."""
+    column = _FIELD_MAP.get(key.strip().lower())
+    if not column or column in fields:
+        return
+
+    value = value.strip().strip("`").strip()
+    if not value or value.startswith("[") or value.startswith("YYYY") or set(value) <= {"_"}:
+        return
+
+    if column == "status":
+        value = value.lower()
+    fields[column] = value
+
+
+def parse_since(value: str) -> str:
+    """
+    Convert a --since value into an ISO date.
+
+    Args:
+        value: Relative span ("7d", "2w") or ISO date ("2025-10-01")
+
+    Returns:
+        ISO date string
+
+    Raises:
+        ValueError: If value is not understood
+    """
+    match = re.fullmatch(r"(\d+)([dw])", value.strip().lower())
+    if match:
+        days = int(match.group(1)) * (7 if match.group(2) == "w" else 1)
+        return (date.today() - timedelta(days=days)).isoformat()
+
+    try:
+        return date.fromisoformat(value.strip()).isoformat()
+    except ValueError:
+        raise ValueError(f"Invalid --since value: '{value}' (use e.g. 7d, 2w or 2025-10-01)")
+
+
+class CollabIndex:
+    """Incrementally updated index of collaboration records."""
+
+    def __init__(self, target_dir: Path):
+        """
+        Initialize collaboration index.
+
+        Args:
+            target_dir: Project root directory (containing specs/)
+        """
+        self.target_dir = Path(target_dir).resolve()
+        self.specs_dir = self.target_dir / "specs"
+        self.db_path = get_cache_dir(self.target_dir) / INDEX_FILE
+        self._conn: sqlite3.Connection | None = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Open (and migrate) the index database on first use"""
+        if self._conn is None:
+            ensure_cache_dir(self.db_path.parent)
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version not in (0, SCHEMA_VERSION):
+                conn.execute("DROP TABLE IF EXISTS records")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        """Close the index database."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def refresh(self, rebuild: bool = False) -> dict:
+        """
+        Bring the index up to date with the collaboration directories.
+
+        Only files whose (mtime, size) fingerprint changed are re-read.
+
+        Args:
+            rebuild: Drop all indexed records and reparse everything
+
+        Returns:
+            Dict with 'scanned', 'updated' and 'removed' counts
+        """
+        conn = self.conn
+        if rebuild:
+            conn.execute("DELETE FROM records")
+
+        known: dict[str, tuple[int, int]] = {}
+        known_bundles: dict[str, tuple[int, int]] = {}
+        for row in conn.execute("SELECT path, bundle, mtime_ns, size FROM records"):
+            if row["bundle"]:
+                known_bundles[row["bundle"]] = (row["mtime_ns"], row["size"])
+            else:
+                known[row["path"]] = (row["mtime_ns"], row["size"])
+
+        seen = set()
+        seen_bundles = set()
+        updates = []
+        stale_bundles = []
+        for rel_path, kind, state, feature, stat in iter_record_files(self.specs_dir):
+            fp = fingerprint(stat)
+            if kind == "bundle":
+                seen_bundles.add(rel_path)
+                if known_bundles.get(rel_path) != fp:
+                    stale_bundles.append(rel_path)
+                    updates.extend(self._build_bundle_rows(rel_path, feature, fp))
+                continue
+
+            seen.add(rel_path)
+            if known.get(rel_path) == fp:
+                continue
+            updates.append(self._build_row(rel_path, kind, state, feature, fp))
+
+        removed = [path for path in known if path not in seen]
+        removed_bundles = [path for path in known_bundles if path not in seen_bundles]
+
+        with conn:
+            conn.executemany(
+                "DELETE FROM records WHERE bundle = ?",
+                [(b,) for b in stale_bundles + removed_bundles],
+            )
+            if removed:
+                conn.executemany(
+                    "DELETE FROM records WHERE path = ? AND bundle = ''",
+                    [(p,) for p in removed],
+                )
+            if updates:
+                self._insert_rows(updates)
+
+        return {
+            "scanned": len(seen),
+            "bundles": len(seen_bundles),
+            "updated": len(updates),
+            "removed": len(removed),
+        }
+
+    def update_paths(self, paths: list[Path]) -> int:
+        """
+        Re-index specific record files (e.g. right after writing them).
+
+        Args:
+            paths: Absolute or project-relative record paths
+
+        Returns:
+            Number of records indexed
+        """
+        count = 0
+        with self.conn:
+            for path in paths:
+                path = Path(path)
+                full = path if path.is_absolute() else self.target_dir / path
+                rel_path = full.relative_to(self.target_dir).as_posix()
+                classified = classify_path(rel_path)
+                if classified is None:
+                    continue
+                if not full.exists():
+                    self.conn.execute(
+                        "DELETE FROM records WHERE path = ? AND bundle = ''", (rel_path,)
+                    )
+                    continue
+                kind, state, feature = classified
+                row = self._build_row(rel_path, kind, state, feature, fingerprint(full.stat()))
+                self._insert_rows([row])
+                count += 1
+        return count
+
+    def query(
+        self,
+        kind: str | None = None,
+        feature: str | None = None,
+        agent: str | None = None,
+        status: str | None = None,
+        state: str | None = "active",
+        since: str | None = None,
+        open_only: bool = False,
+        limit: int | None = None,
+    ) -> list[dict]:
+        """
+        Query indexed records.
+
+        Args:
+            kind: Record kind (session, handoff, decision)
+            feature: Feature number ("012") or directory name ("012-auth")
+            agent: Agent name (matches author or handoff recipient)
+            status: Exact status value
+            state: Collaboration state (active, archive, None for both)
+            since: ISO date lower bound (inclusive)
+            open_only: Exclude records with a closed status
+            limit: Maximum number of records to return
+
+        Returns:
+            List of record dicts, newest first
+        """
+        clauses = []
+        params: list = []
+
+        if kind:
+            if kind not in KINDS:
+                raise ValueError(f"Unknown record kind: '{kind}'. Valid: {', '.join(KINDS)}")
+            clauses.append("kind = ?")
+            params.append(kind)
+        if feature:
+            if feature.isdigit():
+                clauses.append("CAST(feature_num AS INTEGER) = ?")
+                params.append(int(feature))
+            else:
+                clauses.append("feature = ?")
+                params.append(feature)
+        if agent:
+            clauses.append("(agent LIKE ? OR to_agent LIKE ?)")
+            params.extend([f"%{agent}%", f"%{agent}%"])
+        if status:
+            clauses.append("status = ?")
+            params.append(status.lower())
+        if state:
+            clauses.append("state = ?")
+            params.append(state)
+        if since:
+            clauses.append("date >= ?")
+            params.append(since)
+        if open_only:
+            marks = ", ".join("?" for _ in CLOSED_STATUSES)
+            clauses.append(f"(status IS NULL OR status NOT IN ({marks}))")
+            params.extend(sorted(CLOSED_STATUSES))
+
+        sql = "SELECT * FROM records"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY date DESC, path"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def counts(self, state: str | None = "active") -> dict[str, int]:
+        """
+        Count indexed records by kind.
+
+        Args:
+            state: Collaboration state filter (None for all)
+
+        Returns:
+            Dict of kind -> count, plus 'features'
+        """
+        sql = "SELECT kind, COUNT(*) AS n FROM records"
+        params: list = []
+        if state:
+            sql += " WHERE state = ?"
+            params.append(state)
+        sql += " GROUP BY kind"
+
+        result = {kind: 0 for kind in KINDS}
+        for row in self.conn.execute(sql, params):
+            result[row["kind"]] = row["n"]
+
+        feature_sql = "SELECT COUNT(DISTINCT feature) FROM records"
+        if state:
+            feature_sql += " WHERE state = ?"
+        result["features"] = self.conn.execute(feature_sql, params).fetchone()[0]
+        return result
+
+    def _insert_rows(self, rows: list[dict]):
+        """Insert or replace index rows."""
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        self.conn.executemany(  # audit:ignore - only column names are interpolated
+            f"INSERT OR REPLACE INTO records ({', '.join(_COLUMNS)}) VALUES ({placeholders})",
+            [tuple(row[col] for col in _COLUMNS) for row in rows],
+        )
+
+    def _build_bundle_rows(self, rel_bundle: str, feature: str, fp: tuple[int, int]) -> list[dict]:
+        """Parse every record packed into a bundle into index rows."""
+        rows = []
+        for entry in iter_bundle(self.target_dir / rel_bundle):
+            rel_path = entry.get("path", "")
+            classified = classify_path(rel_path)
+            kind = classified[0] if classified else entry.get("kind", KIND_DECISION)
+            row = self._build_row(
+                rel_path, kind, "archive", feature, fp, text=entry.get("content", "")
+            )
+            row["bundle"] = rel_bundle
+            rows.append(row)
+        return rows
+
+    def _build_row(
+        self,
+        rel_path: str,
+        kind: str,
+        state: str,
+        feature: str,
+        fp: tuple[int, int],
+        text: str | None = None,
+    ) -> dict:
+        """Read and parse a record file into an index row."""
+        if text is None:
+            try:
+                text = (self.target_dir / rel_path).read_text(encoding="utf-8", errors="replace")
+            except OSError:
+                text = ""
+
+        fields = record_fields(rel_path, kind, text)
+        stem = Path(rel_path).stem
+        feature_match = _FEATURE_DIR_RE.match(feature)
+        return {
+            "path": rel_path,
+            "bundle": "",
+            "kind": kind,
+            "state": state,
+            "feature": feature,
+            "feature_num": feature_match.group("num") if feature_match else None,
+            "feature_title": fields.get("feature_title"),
+            "agent": fields.get("agent"),
+            "to_agent": fields.get("to_agent"),
+            "date": fields.get("date"),
+            "status": fields.get("status"),
+            "title": fields.get("title", stem),
+            "mtime_ns": fp[0],
+            "size": fp[1],
+        }
+
+
+def iter_record_files(specs_dir: Path) -> Iterator[tuple[str, str, str, str, os.stat_result]]:
+    """
+    Walk collaboration directories without recursive globbing.
+
+    Only the fixed specs/<feature>/collaboration/<state>/<subdir>/ layout is
+    listed, one scandir per directory. Packed archive bundles are yielded
+    with kind 'bundle'.
+
+    Args:
+        specs_dir: Project specs/ directory
+
+    Yields:
+        (rel_path, kind, state, feature, stat) for every record file
+    """
+    if not specs_dir.is_dir():
+        return
+
+    for feature_entry in _scandir(specs_dir):
+        if not feature_entry.is_dir():
+            continue
+        collab_dir = Path(feature_entry.path) / "collaboration"
+        bundle = collab_dir / "archive" / BUNDLE_NAME
+        try:
+            bundle_stat = bundle.stat()
+        except OSError:
+            bundle_stat = None
+        if bundle_stat is not None:
+            rel_bundle = f"specs/{feature_entry.name}/collaboration/archive/{BUNDLE_NAME}"
+            yield rel_bundle, "bundle", "archive", feature_entry.name, bundle_stat
+
+        for state in STATES:
+            for subdir in ("sessions", "decisions"):
+                directory = collab_dir / state / subdir
+                for entry in _scandir(directory):
+                    if not entry.name.endswith(".md") or entry.name == "README.md":
+                        continue
+                    if not entry.is_file():
+                        continue
+                    rel_path = (
+                        f"specs/{feature_entry.name}/collaboration/{state}/{subdir}/{entry.name}"
+                    )
+                    kind = _classify_name(subdir, entry.name)
+                    yield rel_path, kind, state, feature_entry.name, entry.stat()
+
+
+def iter_bundle(bundle_path: Path) -> Iterator[dict]:
+    """
+    Read packed records from an archive bundle.
+
+    Bundles are gzip streams of JSON lines; later packs append a new gzip
+    member, so a record packed twice is yielded twice (last one wins).
+
+    Args:
+        bundle_path: Path to records.jsonl.gz
+
+    Yields:
+        Record dicts with 'path', 'content' and 'packed' keys
+    """
+    try:
+        with gzip.open(bundle_path, "rt", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+    except (OSError, EOFError, json.JSONDecodeError):
+        return
+
+
+def classify_path(rel_path: str) -> tuple[str, str, str] | None:
+    """
+    Classify a project-relative path as a collaboration record.
+
+    Args:
+        rel_path: POSIX path relative to project root
+
+    Returns:
+        (kind, state, feature) tuple, or None if not a record
+    """
+    parts = rel_path.split("/")
+    if (
+        len(parts) != 6
+        or parts[0] != "specs"
+        or parts[2] != "collaboration"
+        or parts[3] not in STATES
+        or parts[4] not in ("sessions", "decisions")
+        or not parts[5].endswith(".md")
+        or parts[5] == "README.md"
+    ):
+        return None
+    return _classify_name(parts[4], parts[5]), parts[3], parts[1]
+
+
+def _classify_name(subdir: str, name: str) -> str:
+    """Map a record's directory and file name to its kind."""
+    if subdir == "sessions":
+        return KIND_SESSION
+    if name.startswith("handoff"):
+        return KIND_HANDOFF
+    return KIND_DECISION
+
+
+def _scandir(directory: Path) -> list[os.DirEntry]:
+    """List a directory, treating a missing directory as empty."""
+    try:
+        with os.scandir(directory) as entries:
+            return sorted(entries, key=lambda e: e.name)
+    except (FileNotFoundError, NotADirectoryError):
+        return []
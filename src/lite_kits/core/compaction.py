@@ -0,0 +1,302 @@
+"""
+Install-time compaction of command prompts.
+
+Agents load a command file into context on every invocation, so bytes that
+do not apply to the project are paid for again and again. Compaction runs on
+the rendered body of a command template:
+
+- Shell filtering (always on when the installed shells are known): fenced
+  code blocks that sit next to each other as per-shell variants keep only the
+  variants for installed shells, and '<!-- shell: NAME -->' ... '<!-- /shell -->'
+  regions are dropped for shells that are not installed. A lone code block
+  is never removed, since it may be the only instructions there are.
+- 'light': also drops HTML comments and horizontal rules, trims trailing
+  whitespace and collapses runs of blank lines.
+- 'full': also drops example sections and comment-only lines in shell code.
+
+A compacted file ends with a marker comment recording how it was produced,
+so validation can re-render the same variant and compare.
+"""
+
+import math
+import re
+from collections.abc import Iterable
+
+COMPACTION_LEVELS = ["none", "light", "full"]
+
+# Rough heuristic for English markdown with code; good enough for comparing sizes
+BYTES_PER_TOKEN = 4
+
+_FENCE_OPEN_RE = re.compile(r"^ {0,3}(`{3,}|~{3,})\s*([^\s`{]*)")
+_SHELL_REGION_RE = re.compile(r"^\s*<!--\s*shell:\s*([\w,\s-]+?)\s*-->\s*$")
+_SHELL_REGION_END_RE = re.compile(r"^\s*<!--\s*/shell\s*-->\s*$")
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_EXAMPLE_TITLE_RE = re.compile(r"\bexamples?\b", re.IGNORECASE)
+_RULE_RE = re.compile(r"^\s{0,3}([-*_])(\s*\1){2,}\s*$")
+_SHELL_COMMENT_RE = re.compile(r"^\s*#(?!!)")
+_MARKER_RE = re.compile(r"<!-- lite-kits: compact=(\w+) shells=([\w,-]*) -->\s*\Z")
+
+
+class _Code:
+    """A fenced code block: its lines and the shell its language maps to."""
+
+    def __init__(self, lines: list[str], shell: str | None):
+        self.lines = lines
+        self.shell = shell
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the model tokens a prompt costs.
+
+    Args:
+        text: Prompt text
+
+    Returns:
+        Approximate token count (UTF-8 bytes / BYTES_PER_TOKEN, rounded up)
+    """
+    return math.ceil(len(text.encode('utf-8')) / BYTES_PER_TOKEN)
+
+
+def validate_level(level: str) -> str:
+    """
+    Check a compaction level name.
+
+    Args:
+        level: Level name
+
+    Returns:
+        The normalized level name
+
+    Raises:
+        ValueError: If the level is unknown
+    """
+    normalized = (level or "none").strip().lower()
+    if normalized not in COMPACTION_LEVELS:
+        raise ValueError(
+            f"Unknown compaction level: '{level}'\n"
+            f"Valid options: {', '.join(COMPACTION_LEVELS)}"
+        )
+    return normalized
+
+
+def compact(
+    body: str,
+    shells: Iterable[str] | None,
+    level: str,
+    fences: dict[str, list[str]],
+) -> tuple[str, bool]:
+    """
+    Compact a rendered prompt body.
+
+    Args:
+        body: Markdown body (without front matter)
+        shells: Installed shells (None = keep every shell variant)
+        level: Compaction level from COMPACTION_LEVELS
+        fences: Shell name -> code fence languages (e.g. {'bash': ['bash', 'sh']})
+
+    Returns:
+        (compacted body, whether anything was removed or rewritten)
+    """
+    level = validate_level(level)
+    language_shell = {
+        language.lower(): shell
+        for shell, languages in fences.items()
+        for language in languages
+    }
+    items = _parse(body, language_shell)
+
+    if shells is not None:
+        items = _filter_shells(items, set(shells))
+    if level in ("light", "full"):
+        items = _strip_light(items)
+    if level == "full":
+        items = _strip_full(items)
+    if level in ("light", "full"):
+        items = _collapse_blank_lines(items)
+
+    result = "".join(
+        "".join(item.lines) if isinstance(item, _Code) else item
+        for item in items
+    )
+    return result, result != body
+
+
+def marker(level: str, shells: Iterable[str] | None) -> str:
+    """
+    Marker comment appended to compacted files.
+
+    Args:
+        level: Compaction level used
+        shells: Shells the file was filtered for
+
+    Returns:
+        Marker line (with trailing newline)
+    """
+    return f"<!-- lite-kits: compact={level} shells={','.join(sorted(shells or []))} -->\n"
+
+
+def read_marker(text: str) -> tuple[str, list[str] | None] | None:
+    """
+    Read the compaction marker from an installed file.
+
+    Args:
+        text: Installed file content
+
+    Returns:
+        (level, shells) if the file was compacted, None otherwise; shells is
+        None when the file was not filtered by shell
+    """
+    match = _MARKER_RE.search(text[-200:])
+    if not match or match.group(1) not in COMPACTION_LEVELS:
+        return None
+    shells = [shell for shell in match.group(2).split(",") if shell]
+    return match.group(1), shells or None
+
+
+def _parse(body: str, language_shell: dict[str, str]) -> list:
+    """Split a body into text lines and _Code blocks (CommonMark fence rules)."""
+    lines = body.splitlines(keepends=True)
+    items: list = []
+    index = 0
+    while index < len(lines):
+        match = _FENCE_OPEN_RE.match(lines[index])
+        if not match:
+            items.append(lines[index])
+            index += 1
+            continue
+
+        fence = match.group(1)
+        close_re = re.compile(r"^ {0,3}" + re.escape(fence[0]) + "{" + str(len(fence)) + r",}\s*$")
+        end = index + 1
+        while end < len(lines) and not close_re.match(lines[end]):
+            end += 1
+        # An unclosed fence runs to the end of the document
+        items.append(_Code(lines[index:end + 1], language_shell.get(match.group(2).lower())))
+        index = end + 1
+    return items
+
+
+def _is_blank(item) -> bool:
+    return isinstance(item, str) and not item.strip()
+
+
+def _filter_shells(items: list, shells: set) -> list:
+    """Drop other-shell variants and regions."""
+    drop = set()
+
+    # Variant groups: shell code blocks separated only by blank lines
+    index = 0
+    while index < len(items):
+        if not (isinstance(items[index], _Code) and items[index].shell):
+            index += 1
+            continue
+        group = [index]
+        cursor = index + 1
+        while cursor < len(items):
+            if _is_blank(items[cursor]):
+                cursor += 1
+            elif isinstance(items[cursor], _Code) and items[cursor].shell:
+                group.append(cursor)
+                cursor += 1
+            else:
+                break
+        group_shells = {items[i].shell for i in group}
+        if len(group_shells) > 1 and group_shells & shells:
+            for position, member in enumerate(group):
+                if items[member].shell in shells:
+                    continue
+                drop.add(member)
+                # Take the separating blank lines with the dropped block
+                if position + 1 < len(group):
+                    drop.update(range(member + 1, group[position + 1]))
+                elif position > 0:
+                    drop.update(range(group[position - 1] + 1, member))
+        index = group[-1] + 1
+
+    # Explicit regions
+    kept = []
+    region_kept = True
+    for index, item in enumerate(items):
+        if isinstance(item, str):
+            start = _SHELL_REGION_RE.match(item)
+            if start:
+                names = {name.strip().lower() for name in start.group(1).split(",")}
+                region_kept = bool(names & shells)
+                continue
+            if _SHELL_REGION_END_RE.match(item):
+                region_kept = True
+                continue
+        if region_kept and index not in drop:
+            kept.append(item)
+    return kept
+
+
+def _strip_light(items: list) -> list:
+    """Drop HTML comments and rules, trim trailing whitespace."""
+    kept = []
+    in_comment = False
+    for item in items:
+        if isinstance(item, _Code):
+            kept.append(_Code([_rstrip_line(line) for line in item.lines], item.shell))
+            continue
+
+        line = item
+        if in_comment:
+            if "-->" not in line:
+                continue
+            line = line.split("-->", 1)[1]
+            in_comment = False
+        line = re.sub(r"<!--.*?-->", "", line)
+        if "<!--" in line:
+            line, in_comment = line.split("<!--", 1)[0], True
+            line = line + "\n" if line.strip() else ""
+        if item.strip() and not line.strip():
+            continue  # Line was only a comment
+
+        previous = kept[-1] if kept else "\n"
+        # '---' under a paragraph is a setext heading, not a rule
+        if _RULE_RE.match(line) and (isinstance(previous, _Code) or not previous.strip()):
+            continue
+        kept.append(_rstrip_line(line))
+    return kept
+
+
+def _strip_full(items: list) -> list:
+    """Drop example sections and comment-only lines in shell code."""
+    kept = []
+    skip_level = 0
+    for item in items:
+        if isinstance(item, str):
+            heading = _HEADING_RE.match(item)
+            if heading:
+                depth = len(heading.group(1))
+                if skip_level and depth <= skip_level:
+                    skip_level = 0
+                if not skip_level and _EXAMPLE_TITLE_RE.search(heading.group(2)):
+                    skip_level = depth
+        if skip_level:
+            continue
+        if isinstance(item, _Code) and item.shell and len(item.lines) > 1:
+            body = [line for line in item.lines[1:-1] if not _SHELL_COMMENT_RE.match(line)]
+            item = _Code([item.lines[0], *body, item.lines[-1]], item.shell)
+        kept.append(item)
+    return kept
+
+
+def _collapse_blank_lines(items: list) -> list:
+    """Collapse blank runs outside code to one line and drop leading/trailing blanks."""
+    collapsed: list = []
+    for item in items:
+        if _is_blank(item) and (not collapsed or _is_blank(collapsed[-1])):
+            continue
+        collapsed.append(item)
+    while collapsed and _is_blank(collapsed[-1]):
+        collapsed.pop()
+    return collapsed
+
+
+def _rstrip_line(line: str) -> str:
+    """Trim trailing whitespace, keeping the line ending."""
+    ending = "\r\n" if line.endswith("\r\n") else "\n" if line.endswith("\n") else ""
+    return line.rstrip() + ending
@@ -5,15 +5,17 @@ Checks for existing files that would be overwritten.
 """
 
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from .manifest import KitManifest
+from .templates import TemplateEngine
 
 
 class ConflictChecker:
     """Detects file conflicts before installation."""
 
-    def __init__(self, target_dir: Path, kits_dir: Path, manifest: KitManifest):
+    def __init__(self, target_dir: Path, kits_dir: Path, manifest: KitManifest,
+                 templates: Optional[TemplateEngine] = None):
         """
         Initialize conflict checker.
 
@@ -21,10 +23,12 @@ class ConflictChecker:
             target_dir: Target project directory
             kits_dir: Kits source directory
             manifest: Loaded kit manifest
+            templates: Shared template engine (None = create one)
         """
         self.target_dir = target_dir
         self.kits_dir = kits_dir
         self.manifest = manifest
+        self.templates = templates or TemplateEngine(kits_dir, manifest)
 
     def check_conflicts(
         self,
@@ -53,11 +57,11 @@ class ConflictChecker:
         for kit_name in kits:
             # Check agent files
             for agent in agents:
-                self._check_file_group(kit_name, agent, result)
+                self._check_file_group(kit_name, agent, result, shells)
 
             # Check shell files
             for shell in shells:
-                self._check_file_group(kit_name, shell, result)
+                self._check_file_group(kit_name, shell, result, shells)
 
             # Check agent-agnostic files
             all_files = self.manifest.get_kit_files(kit_name, agent=None)
@@ -71,7 +75,8 @@ class ConflictChecker:
         result['has_conflicts'] = len(result['conflicts']) > 0
         return result
 
-    def _check_file_group(self, kit_name: str, agent_or_shell: str, result: Dict):
+    def _check_file_group(self, kit_name: str, agent_or_shell: str, result: Dict,
+                          shells: Optional[List[str]] = None):
         """Check a group of files for an agent/shell."""
         files = self.manifest.get_kit_files(kit_name, agent=agent_or_shell)
 
@@ -79,9 +84,9 @@ class ConflictChecker:
             if file_info.get('status') == 'planned':
                 continue
 
-            self._check_file(file_info, result)
+            self._check_file(file_info, result, shells)
 
-    def _check_file(self, file_info: Dict, result: Dict):
+    def _check_file(self, file_info: Dict, result: Dict, shells: Optional[List[str]] = None):
         """Check a single file for conflicts."""
         target_path = self.target_dir / file_info['path']
 
@@ -90,14 +95,15 @@ class ConflictChecker:
                 result['safe'].append(file_info['path'])
             return
 
-        # File exists, check if content differs
-        source_path = self.kits_dir / file_info['source']
-
-        if not source_path.exists():
+        # File exists, check if content differs (templates are rendered for
+        # the file's agent and compacted for the installed shells, in memory)
+        try:
+            new_content = self.templates.content(file_info, shells)
+        except FileNotFoundError:
             return
 
         try:
-            source_content = source_path.read_text(encoding='utf-8')
+            source_content = new_content.decode('utf-8').replace('\r\n', '\n')
             target_content = target_path.read_text(encoding='utf-8')
 
             if source_content != target_content:
@@ -107,7 +113,7 @@ class ConflictChecker:
                         'path': file_info['path'],
                         'source': file_info['source'],
                         'size_current': target_path.stat().st_size,
-                        'size_new': source_path.stat().st_size,
+                        'size_new': len(new_content),
                     })
         except Exception:
             # If can't read/compare, treat as conflict
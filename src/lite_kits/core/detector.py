@@ -5,8 +5,9 @@ Detects which AI agents and shell environments are present in a project.
 """
 
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
+from .fingerprints import FINGERPRINTS_FILE, SpecKitFingerprinter, load_table
 from .manifest import KitManifest
 
 
@@ -175,3 +176,18 @@ class Detector:
             return len(found) > 0
 
         return len(found) == len(markers)
+
+    def detect_spec_kit(self) -> Dict:
+        """
+        Identify the vanilla spec-kit release and agent flavor, with drift.
+
+        Hashes a handful of spec-kit files against kits/fingerprints.yaml
+        (see fingerprints.py); hashes are cached per file, so this is cheap
+        enough to run on every status call.
+
+        Returns:
+            Dict with 'version' and 'flavor' (None if unknown), 'matched',
+            'probed', and 'modified'/'missing'/'unmodified' when identified
+        """
+        table = load_table(self.manifest.kits_dir / FINGERPRINTS_FILE)
+        return SpecKitFingerprinter(self.target_dir, table).detect()
@@ -0,0 +1,497 @@
+"""
+Bounded digest of staged and unstaged changes behind /commit and /review.
+
+File lists, statuses and line counts for each side come from a single
+'git diff --raw --numstat -z' call; the patch is streamed and only the first
+lines of each hunk are kept, so memory and output stay bounded no matter how
+large the diff is. Each file gets a change class (source, test, docs, config,
+ci, lockfile, generated, asset), and files are bucketed into suggested commit groups.
+"""
+
+import re
+from collections.abc import Iterator
+from pathlib import Path
+
+from .git import current_branch, stream_git
+from .stats import count_file
+
+DEFAULT_MAX_BYTES = 8192
+DEFAULT_HUNK_LINES = 30
+DEFAULT_PATCH_LINES = 400
+DEFAULT_MAX_FILES = 200
+
+STATUS_NAMES = {
+    "A": "added",
+    "M": "modified",
+    "D": "deleted",
+    "R": "renamed",
+    "C": "copied",
+    "T": "typechange",
+    "U": "unmerged",
+}
+
+LOCKFILES = {
+    "package-lock.json", "npm-shrinkwrap.json", "yarn.lock", "pnpm-lock.yaml",
+    "poetry.lock", "Pipfile.lock", "uv.lock", "pdm.lock", "Cargo.lock",
+    "go.sum", "Gemfile.lock", "composer.lock", "packages.lock.json",
+}
+
+GENERATED_DIRS = {
+    "dist", "build", "vendor", "node_modules", "__generated__", "generated", "__snapshots__",
+}
+GENERATED_SUFFIXES = (
+    ".min.js", ".min.css", ".map", "_pb2.py", "_pb2_grpc.py", ".pb.go", ".g.dart", ".snap",
+)
+
+# Markers generators put near the top of their output
+_GENERATED_MARKER_RE = re.compile(
+    r"@generated|DO NOT EDIT|Code generated by|auto-generated", re.IGNORECASE
+)
+
+CONFIG_NAMES = {
+    "pyproject.toml", "setup.py", "setup.cfg", "requirements.txt", "package.json", "tsconfig.json",
+    "Cargo.toml", "go.mod", "Gemfile", "composer.json", "Makefile", "Dockerfile", "tox.ini",
+    "noxfile.py", ".gitignore", ".gitattributes", ".editorconfig",
+}
+CONFIG_SUFFIXES = (".toml", ".ini", ".cfg", ".yaml", ".yml")
+DOC_SUFFIXES = (".md", ".rst", ".txt", ".adoc")
+
+# Conventional commit type suggested per change class
+CLASS_TYPES = {
+    "lockfile": "build",
+    "config": "build",
+    "ci": "ci",
+    "docs": "docs",
+    "test": "test",
+    "generated": "chore",
+    "asset": "chore",
+}
+
+_FEATURE_RE = re.compile(r"(?:^|/)(?P<num>\d{3,})-")
+
+
+def classify_path(path: str) -> str:
+    """
+    Classify a changed path by name alone.
+
+    Args:
+        path: Repository-relative POSIX path
+
+    Returns:
+        One of 'lockfile', 'generated', 'ci', 'test', 'docs', 'config', 'source'
+        (binary source files become 'asset' once numstat is known)
+    """
+    parts = path.split("/")
+    name = parts[-1]
+    dirs = set(parts[:-1])
+
+    if name in LOCKFILES:
+        return "lockfile"
+    if dirs & GENERATED_DIRS or name.endswith(GENERATED_SUFFIXES):
+        return "generated"
+    if path.startswith(".github/workflows/") \
+            or name in (".gitlab-ci.yml", "Jenkinsfile", ".travis.yml"):
+        return "ci"
+    if dirs & {"tests", "test", "__tests__", "spec"} or name.startswith("test_") \
+            or re.search(r"[._-](test|spec)\.[^.]+$", name):
+        return "test"
+    if name.endswith(DOC_SUFFIXES) or "docs" in dirs:
+        return "docs"
+    if name in CONFIG_NAMES or (len(parts) == 1 and name.endswith(CONFIG_SUFFIXES)):
+        return "config"
+    return "source"
+
+
+def parse_raw_numstat(records: Iterator[str]) -> list[dict]:
+    """
+    Parse 'git diff --raw --numstat -z' output.
+
+    Raw entries come first, then numstat entries in the same order; renames
+    and copies carry both source and destination paths.
+
+    Args:
+        records: NUL-separated output records
+
+    Returns:
+        List of file dicts with 'path', 'old_path', 'status', 'added',
+        'deleted' and 'binary'
+    """
+    files: list[dict] = []
+    numstat_index = 0
+    records = iter(records)
+
+    for record in records:
+        if not record:
+            continue
+        if record.startswith(":"):
+            status = record.split()[-1]
+            letter = status[0]
+            old_path = next(records, "") if letter in "RC" else None
+            path = next(records, "")
+            files.append({
+                "path": path,
+                "old_path": old_path,
+                "status": STATUS_NAMES.get(letter, letter),
+                "added": 0,
+                "deleted": 0,
+                "binary": False,
+            })
+            continue
+
+        added, deleted, path = record.split("\t", 2)
+        if not path:
+            # Rename/copy: source and destination follow as separate records
+            next(records, "")
+            next(records, "")
+        if numstat_index < len(files):
+            entry = files[numstat_index]
+            entry["binary"] = added == "-"
+            entry["added"] = 0 if added == "-" else int(added)
+            entry["deleted"] = 0 if deleted == "-" else int(deleted)
+        numstat_index += 1
+
+    return files
+
+
+class DiffSummarizer:
+    """Builds a size-bounded summary of working tree changes."""
+
+    def __init__(self, target_dir: Path):
+        """
+        Initialize diff summarizer.
+
+        Args:
+            target_dir: Repository directory
+        """
+        self.target_dir = Path(target_dir).resolve()
+
+    def summarize(
+        self,
+        staged_only: bool = False,
+        hunk_lines: int = DEFAULT_HUNK_LINES,
+        patch_lines: int = DEFAULT_PATCH_LINES,
+        max_files: int = DEFAULT_MAX_FILES,
+    ) -> dict:
+        """
+        Collect changes, classify them and keep a bounded excerpt of each patch.
+
+        Args:
+            staged_only: Ignore unstaged and untracked changes
+            hunk_lines: Patch lines kept per file
+            patch_lines: Patch lines kept across all files
+            max_files: File entries kept per section (the rest are counted)
+
+        Returns:
+            Dict with 'branch', 'feature', 'staged', 'unstaged', 'untracked',
+            'totals', 'groups' and 'omitted_files'
+
+        Raises:
+            GitError: If the directory is not a git repository
+        """
+        branch = current_branch(self.target_dir)
+        match = _FEATURE_RE.search(branch or "")
+
+        staged = self._diff(["--cached"])
+        unstaged = [] if staged_only else self._diff([])
+        untracked = [] if staged_only else self._untracked()
+
+        budget = {"total": patch_lines}
+        self._attach_patches(["--cached"], staged, hunk_lines, budget)
+        if unstaged:
+            self._attach_patches([], unstaged, hunk_lines, budget)
+
+        for entry in staged + unstaged + untracked:
+            if entry["class"] == "source" and entry["generated"]:
+                entry["class"] = "generated"
+            elif entry["class"] == "source" and entry["binary"]:
+                entry["class"] = "asset"
+
+        sections = {"staged": staged, "unstaged": unstaged, "untracked": untracked}
+        data = {
+            "branch": branch,
+            "feature": match.group("num") if match else None,
+            "totals": {
+                name: {
+                    "files": len(entries),
+                    "added": sum(e["added"] for e in entries),
+                    "deleted": sum(e["deleted"] for e in entries),
+                }
+                for name, entries in sections.items()
+            },
+            "groups": suggest_groups(staged or unstaged + untracked),
+            "omitted_files": {},
+        }
+        for name, entries in sections.items():
+            # Keep the biggest changes when a section has to be cut
+            if len(entries) > max_files:
+                biggest = sorted(entries, key=lambda e: -(e["added"] + e["deleted"]))
+                kept = {id(e) for e in biggest[:max_files]}
+                data["omitted_files"][name] = len(entries) - max_files
+                entries = [e for e in entries if id(e) in kept]
+            data[name] = entries
+        return data
+
+    def _diff(self, extra: list[str]) -> list[dict]:
+        """One raw+numstat diff call for one side of the index."""
+        files = parse_raw_numstat(stream_git(
+            ["diff", *extra, "--raw", "--numstat", "-z", "-M", "--no-ext-diff"],
+            self.target_dir,
+            sep="\0",
+        ))
+        for entry in files:
+            entry["class"] = classify_path(entry["path"])
+            entry["generated"] = entry["class"] in ("generated", "lockfile")
+            entry["hunks"] = []
+            entry["omitted_lines"] = 0
+        return files
+
+    def _untracked(self) -> list[dict]:
+        """Untracked, non-ignored files with line counts."""
+        entries = []
+        paths = stream_git(
+            ["ls-files", "--others", "--exclude-standard", "-z"], self.target_dir, sep="\0"
+        )
+        for path in paths:
+            if not path:
+                continue
+            counted = count_file(str(self.target_dir / path))
+            binary = bool(counted and counted[2])
+            entry_class = classify_path(path)
+            entries.append({
+                "path": path,
+                "old_path": None,
+                "status": "untracked",
+                "added": counted[0] if counted and not binary else 0,
+                "deleted": 0,
+                "binary": binary,
+                "class": entry_class,
+                "generated": entry_class in ("generated", "lockfile"),
+                "hunks": [],
+                "omitted_lines": 0,
+            })
+        return entries
+
+    def _attach_patches(self, extra: list[str], files: list[dict], hunk_lines: int, budget: dict):
+        """
+        Stream the patch and keep at most hunk_lines per file.
+
+        Patch sections arrive in the same order as the raw entries, so the
+        n-th 'diff --git' header belongs to files[n]. Lockfiles, generated
+        and binary files only get their size noted.
+        """
+        if not files or budget["total"] <= 0:
+            return
+
+        index = -1
+        entry: dict | None = None
+        kept = 0
+        sniffed = 0
+        in_hunk = False
+
+        lines = stream_git(
+            ["diff", *extra, "-M", "--no-color", "--no-ext-diff", "-U2"], self.target_dir
+        )
+        try:
+            for line in lines:
+                if line.startswith("diff --git "):
+                    index += 1
+                    entry = files[index] if index < len(files) else None
+                    kept = 0
+                    sniffed = 0
+                    in_hunk = False
+                    continue
+                if entry is None:
+                    continue
+                if line.startswith("@@"):
+                    in_hunk = True
+                    if self._keep(entry, kept, hunk_lines, budget):
+                        entry["hunks"].append({"header": line, "lines": []})
+                    continue
+                if not in_hunk:
+                    continue
+
+                if line.startswith("+") and sniffed < 10:
+                    sniffed += 1
+                    if _GENERATED_MARKER_RE.search(line):
+                        entry["generated"] = True
+                if self._keep(entry, kept, hunk_lines, budget) and entry["hunks"]:
+                    entry["hunks"][-1]["lines"].append(line[:200])
+                    kept += 1
+                    budget["total"] -= 1
+                else:
+                    entry["omitted_lines"] += 1
+
+                if budget["total"] <= 0:
+                    # Out of budget: stop reading instead of draining the rest
+                    break
+        finally:
+            lines.close()
+
+    @staticmethod
+    def _keep(entry: dict, kept: int, hunk_lines: int, budget: dict) -> bool:
+        """Whether another patch line fits the per-file and global budgets."""
+        return (
+            not entry["generated"]
+            and not entry["binary"]
+            and kept < hunk_lines
+            and budget["total"] > 0
+        )
+
+
+def suggest_groups(files: list[dict]) -> list[dict]:
+    """
+    Bucket changed files into suggested commits.
+
+    Groups are keyed by conventional commit type and scope (the containing
+    directory for source files). Tests join the source group of the module
+    they cover when that module changed too. Types for source changes are a
+    guess: 'feat' when files were added, otherwise 'fix'.
+
+    Args:
+        files: File entries from DiffSummarizer
+
+    Returns:
+        List of {'type', 'scope', 'files'} dicts, largest first
+    """
+    groups: dict[tuple, dict] = {}
+    source_scopes: dict[str, tuple] = {}
+
+    def add(key: tuple, path: str):
+        groups.setdefault(key, {"type": key[0], "scope": key[1], "files": []})["files"].append(path)
+
+    for entry in files:
+        if entry["class"] != "source":
+            continue
+        parts = entry["path"].split("/")
+        scope = parts[-2] if len(parts) > 1 else "root"
+        key = ("source", scope)
+        add(key, entry["path"])
+        source_scopes[_stem(parts[-1])] = key
+
+    for entry in files:
+        cls = entry["class"]
+        path = entry["path"]
+        if cls == "source":
+            continue
+        if cls == "test":
+            stem = _stem(path.rsplit("/", 1)[-1])
+            stem = re.sub(r"^test_|[._-](test|spec)$", "", stem)
+            if stem in source_scopes:
+                add(source_scopes[stem], path)
+                continue
+        feature = _FEATURE_RE.search(path) if path.startswith("specs/") else None
+        if feature:
+            add(("docs", feature.group("num")), path)
+        elif cls == "lockfile" or (cls == "config" and path.rsplit("/", 1)[-1] in CONFIG_NAMES):
+            add((CLASS_TYPES[cls], "deps" if cls == "lockfile" else "config"), path)
+        else:
+            add((CLASS_TYPES[cls], None), path)
+
+    added = {e["path"] for e in files if e["status"] in ("added", "untracked")}
+    result = []
+    for (kind, scope), group in groups.items():
+        if kind == "source":
+            group["type"] = "feat" if added & set(group["files"]) else "fix"
+        result.append(group)
+    return sorted(result, key=lambda g: -len(g["files"]))
+
+
+def _stem(name: str) -> str:
+    """File name without its last extension."""
+    return name.rsplit(".", 1)[0]
+
+
+def render_summary(data: dict, max_bytes: int = DEFAULT_MAX_BYTES) -> str:
+    """
+    Render a diff summary as markdown no larger than max_bytes.
+
+    Patch excerpts are dropped first (last file first), then file lists are
+    shortened; totals and commit groups are always kept.
+
+    Args:
+        data: Result of DiffSummarizer.summarize()
+        max_bytes: Size bound in UTF-8 bytes
+
+    Returns:
+        Markdown text
+    """
+    header = ["# Change Summary", ""]
+    header.append(f"**Branch**: {data['branch'] or '(detached)'}")
+    if data["feature"]:
+        header.append(f"**Feature**: {data['feature']}")
+    for name in ("staged", "unstaged", "untracked"):
+        totals = data["totals"][name]
+        if totals["files"]:
+            header.append(
+                f"**{name.capitalize()}**: {totals['files']} file(s) "
+                f"(+{totals['added']} -{totals['deleted']})"
+            )
+    if not any(data["totals"][name]["files"] for name in data["totals"]):
+        header.append("**Working tree**: clean")
+
+    if data["groups"]:
+        header += ["", "## Suggested Commits", ""]
+        for group in data["groups"]:
+            prefix = f"{group['type']}({group['scope']})" if group["scope"] else group["type"]
+            more = len(group["files"]) - 6
+            header.append(f"- {prefix}: {', '.join(group['files'][:6])}"
+                          + (f" (+{more} more)" if more > 0 else ""))
+
+    file_sections = []
+    for name in ("staged", "unstaged", "untracked"):
+        if not data[name]:
+            continue
+        lines = []
+        for entry in data[name]:
+            path = entry["path"]
+            if entry["old_path"]:
+                path = f"{entry['old_path']} -> {path}"
+            size = "binary" if entry["binary"] else f"+{entry['added']} -{entry['deleted']}"
+            tag = entry["class"]
+            if entry["generated"] and tag != "lockfile":
+                tag = "generated"
+            lines.append(f"- {entry['status']} {path} ({size}) [{tag}]")
+        file_sections.append({
+            "title": f"{name.capitalize()} Files",
+            "lines": lines,
+            "omitted": data["omitted_files"].get(name, 0),
+        })
+
+    patch_sections = []
+    for entry in data["staged"] + data["unstaged"]:
+        if not entry["hunks"]:
+            continue
+        lines = ["", f"### {entry['path']}", "", "```diff"]
+        for hunk in entry["hunks"]:
+            lines.append(hunk["header"])
+            lines += hunk["lines"]
+        lines.append("```")
+        if entry["omitted_lines"]:
+            lines.append(f"({entry['omitted_lines']} more lines)")
+        patch_sections.append(lines)
+
+    def render() -> str:
+        body = list(header)
+        for section in file_sections:
+            body += ["", f"## {section['title']}", ""] + section["lines"]
+            if section["omitted"]:
+                body.append(f"- ... {section['omitted']} more file(s)")
+        if patch_sections:
+            body += ["", "## Patch Excerpts"] + [line for part in patch_sections for line in part]
+        return "\n".join(body) + "\n"
+
+    # Drop patch excerpts (last first), then shorten the longest file list
+    text = render()
+    while len(text.encode("utf-8")) > max_bytes and patch_sections:
+        patch_sections.pop()
+        text = render()
+    while len(text.encode("utf-8")) > max_bytes and any(s["lines"] for s in file_sections):
+        longest = max(file_sections, key=lambda s: len(s["lines"]))
+        longest["lines"].pop()
+        longest["omitted"] += 1
+        text = render()
+
+    encoded = text.encode("utf-8")
+    if len(encoded) > max_bytes:
+        text = encoded[:max_bytes].decode("utf-8", errors="ignore")
+    return text
@@ -0,0 +1,234 @@
+"""
+Feature allocation: next feature number, branch and spec directory.
+
+Replaces the scan in spec-kit's create-new-feature.sh. The next number comes
+from one scandir of specs/ plus one 'git for-each-ref' over local and remote
+branches, and is claimed under a project lock so concurrent agents never get
+the same number. The branch ref is created with a must-not-exist check and
+the spec directory is staged under a temporary name and renamed into place,
+so a failed allocation leaves neither behind.
+"""
+
+import os
+import re
+import shutil
+from pathlib import Path
+
+from .git import GitError, is_git_repo, run_git
+from .lock import ProjectLock
+
+SPEC_TEMPLATE = Path(".specify") / "templates" / "spec-template.md"
+SLUG_WORDS = 3
+LOCK_NAME = "feature"
+
+_NUMBER_RE = re.compile(r"^(\d+)-")
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
+def slugify(description: str, words: int | None = SLUG_WORDS) -> str:
+    """
+    Branch-name slug from a feature description (as create-new-feature.sh does).
+
+    Args:
+        description: Free-text feature description
+        words: Number of leading words to keep (None = all)
+
+    Returns:
+        Lowercase, hyphen-separated slug (may be empty)
+    """
+    parts = [part for part in _SLUG_RE.split(description.lower()) if part]
+    return "-".join(parts[:words])
+
+
+def resolve_feature(toplevel: Path, feature: str) -> str:
+    """
+    Full feature name from a name or number, via specs/ and local branches.
+
+    Args:
+        toplevel: Project root directory
+        feature: Feature name ("003-auth") or number ("003", "3")
+
+    Returns:
+        Feature name, preferring the spec directory's name over agent
+        branches like 003-auth-claude
+
+    Raises:
+        ValueError: If no feature matches, or a number matches several
+    """
+    names = set()
+    try:
+        with os.scandir(toplevel / "specs") as entries:
+            names.update(entry.name for entry in entries if entry.is_dir())
+    except OSError:
+        pass
+    refs = run_git(
+        ["for-each-ref", "--format=%(refname:short)", "refs/heads"], toplevel, check=False
+    )
+    names.update(refs.split())
+
+    if feature in names and _NUMBER_RE.match(feature):
+        return feature
+    number = _NUMBER_RE.match(feature + "-")
+    if number:
+        wanted = int(number.group(1))
+        matches = sorted(
+            name for name in names
+            if _NUMBER_RE.match(name) and int(_NUMBER_RE.match(name).group(1)) == wanted
+        )
+        # Prefer the spec directory's name over agent branches like 003-auth-claude
+        candidates = [name for name in matches if (toplevel / "specs" / name).is_dir()] or matches
+        if len(candidates) > 1:
+            raise ValueError(f"Ambiguous feature {feature}: {', '.join(candidates)}")
+        if candidates:
+            return candidates[0]
+    raise ValueError(f"Unknown feature: {feature} (no specs/ directory or branch matches)")
+
+
+class FeatureAllocator:
+    """Allocates feature numbers, branches and spec directories."""
+
+    def __init__(self, target_dir: Path):
+        """
+        Initialize allocator.
+
+        Args:
+            target_dir: Project root directory (containing specs/)
+        """
+        self.target_dir = Path(target_dir).resolve()
+        self.specs_dir = self.target_dir / "specs"
+        self.has_git = is_git_repo(self.target_dir)
+
+    def highest_number(self) -> int:
+        """
+        Highest feature number in use.
+
+        Looks at specs/NNN-* directories and at local and remote branches
+        whose last path component starts with NNN- (e.g. 'origin/dev/012-x').
+
+        Returns:
+            Highest number found (0 if none)
+        """
+        highest = 0
+        try:
+            with os.scandir(self.specs_dir) as entries:
+                for entry in entries:
+                    match = _NUMBER_RE.match(entry.name)
+                    if match and entry.is_dir():
+                        highest = max(highest, int(match.group(1)))
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+
+        if self.has_git:
+            refs = run_git(
+                ["for-each-ref", "--format=%(refname:short)", "refs/heads", "refs/remotes"],
+                self.target_dir,
+            )
+            for ref in refs.splitlines():
+                match = _NUMBER_RE.match(ref.rsplit("/", 1)[-1])
+                if match:
+                    highest = max(highest, int(match.group(1)))
+
+        return highest
+
+    def create(
+        self,
+        description: str,
+        short_name: str | None = None,
+        checkout: bool = True,
+        timeout: float = 10.0,
+    ) -> dict:
+        """
+        Allocate the next feature.
+
+        Args:
+            description: Feature description (slugged into the name)
+            short_name: Explicit slug instead of one derived from the description
+            checkout: Switch to the new branch
+            timeout: Seconds to wait for the project lock
+
+        Returns:
+            Dict with the keys create-new-feature.sh --json prints
+            (BRANCH_NAME, SPEC_FILE, FEATURE_NUM) plus FEATURE_DIR, HAS_GIT
+            and BRANCH_CREATED
+
+        Raises:
+            ValueError: If the description gives an empty slug
+            GitError: If the branch cannot be created
+            LockTimeoutError: If another allocation holds the lock too long
+        """
+        slug = slugify(short_name, words=None) if short_name else slugify(description)
+        if not slug:
+            raise ValueError("Feature description must contain letters or digits")
+
+        with ProjectLock(self.target_dir, LOCK_NAME, timeout=timeout):
+            number = f"{self.highest_number() + 1:03d}"
+            name = f"{number}-{slug}"
+            feature_dir = self.specs_dir / name
+
+            branch_created = False
+            if self.has_git:
+                branch_created = self._create_branch(name, checkout)
+            try:
+                spec_file = self._create_spec_dir(feature_dir)
+            except BaseException:
+                if branch_created:
+                    self._delete_branch(name)
+                raise
+
+        if branch_created and checkout:
+            run_git(["checkout", "-q", name], self.target_dir)
+
+        return {
+            "BRANCH_NAME": name,
+            "SPEC_FILE": str(spec_file),
+            "FEATURE_NUM": number,
+            "FEATURE_DIR": str(feature_dir),
+            "HAS_GIT": self.has_git,
+            "BRANCH_CREATED": branch_created,
+        }
+
+    def _create_branch(self, name: str, checkout: bool) -> bool:
+        """Create refs/heads/<name> at HEAD; fails if it already exists."""
+        run_git(["check-ref-format", "--branch", name], self.target_dir)
+        head = run_git(
+            ["rev-parse", "-q", "--verify", "HEAD^{commit}"], self.target_dir, check=False
+        ).strip()
+        if not head:
+            # Unborn repository: nothing to branch from yet, just point HEAD at the name
+            if checkout:
+                run_git(["symbolic-ref", "HEAD", f"refs/heads/{name}"], self.target_dir)
+            return False
+        # An empty old value makes update-ref refuse to overwrite an existing ref
+        run_git(
+            ["update-ref", "-m", "lite-kits feature new", f"refs/heads/{name}", head, ""],
+            self.target_dir,
+        )
+        return True
+
+    def _delete_branch(self, name: str):
+        try:
+            run_git(["update-ref", "-d", f"refs/heads/{name}"], self.target_dir)
+        except GitError:
+            pass
+
+    def _create_spec_dir(self, feature_dir: Path) -> Path:
+        """Stage specs/<name>/spec.md in a temp dir and rename it into place."""
+        if feature_dir.exists():
+            raise FileExistsError(f"Feature directory already exists: {feature_dir}")
+
+        self.specs_dir.mkdir(parents=True, exist_ok=True)
+        # Hidden, so spec scans ignore it; unique because we hold the lock
+        staging = self.specs_dir / f".{feature_dir.name}.{os.getpid()}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir()
+        try:
+            template = self.target_dir / SPEC_TEMPLATE
+            if template.is_file():
+                shutil.copyfile(template, staging / "spec.md")
+            else:
+                (staging / "spec.md").touch()
+            os.rename(staging, feature_dir)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        return feature_dir / "spec.md"
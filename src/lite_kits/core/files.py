@@ -0,0 +1,111 @@
+"""
+Project file enumeration shared by stats and audit.
+
+Lists files once, honoring .gitignore. Inside a git repository this is a
+single 'git ls-files' call (tracked + untracked, standard excludes), which
+never descends into .git or ignored trees like node_modules. Outside git, a
+pruned os.walk applies the root .gitignore's simple patterns.
+"""
+
+import fnmatch
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+from .git import GitError, is_git_repo, stream_git
+
+# Directories never worth walking when git can't tell us what's ignored
+DEFAULT_PRUNE = {
+    ".git", "node_modules", ".venv", "venv", "__pycache__", ".mypy_cache",
+    ".pytest_cache", ".ruff_cache", ".tox", ".nox", "dist", "build", "target",
+}
+
+# Bytes sniffed to decide whether a file is binary
+SNIFF_BYTES = 8192
+
+
+def iter_project_files(root: Path) -> Iterator[str]:
+    """
+    Yield project-relative POSIX paths of all non-ignored files.
+
+    Args:
+        root: Project root directory
+
+    Yields:
+        Relative file paths
+    """
+    root = Path(root)
+    if is_git_repo(root):
+        try:
+            for path in stream_git(
+                ["ls-files", "-z", "--cached", "--others", "--exclude-standard", "--deduplicate"],
+                root,
+                sep="\0",
+            ):
+                if path:
+                    yield path
+            return
+        except GitError:
+            pass
+
+    yield from _walk(root)
+
+
+def is_binary(chunk: bytes) -> bool:
+    """Sniff a leading chunk of file content for binary data (NUL bytes)."""
+    return b"\0" in chunk
+
+
+def _walk(root: Path) -> Iterator[str]:
+    """Pruned directory walk honoring simple root .gitignore patterns."""
+    patterns = _read_gitignore(root / ".gitignore")
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, root)
+        rel_dir = "" if rel_dir == "." else rel_dir.replace(os.sep, "/") + "/"
+
+        dirnames[:] = [
+            d for d in dirnames
+            if d not in DEFAULT_PRUNE
+            and not _ignored(rel_dir + d, d, patterns, is_dir=True)
+            and not _self_ignored(os.path.join(dirpath, d))
+        ]
+        for name in filenames:
+            rel_path = rel_dir + name
+            if not _ignored(rel_path, name, patterns, is_dir=False):
+                yield rel_path
+
+
+def _read_gitignore(path: Path) -> list[str]:
+    """Read non-comment, non-negated patterns from a .gitignore file."""
+    try:
+        lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
+    except OSError:
+        return []
+    return [
+        line.strip() for line in lines
+        if line.strip() and not line.startswith("#") and not line.startswith("!")
+    ]
+
+
+def _self_ignored(path: str) -> bool:
+    """Check for a directory that ignores itself (like .specify/cache/)."""
+    return _read_gitignore(Path(path) / ".gitignore") == ["*"]
+
+
+def _ignored(rel_path: str, name: str, patterns: list[str], is_dir: bool) -> bool:
+    """Approximate gitignore matching for the non-git fallback."""
+    for pattern in patterns:
+        dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        if dir_only and not is_dir:
+            continue
+        if pattern.startswith("/"):
+            if fnmatch.fnmatch(rel_path, pattern[1:]):
+                return True
+        elif "/" in pattern:
+            if fnmatch.fnmatch(rel_path, pattern):
+                return True
+        elif fnmatch.fnmatch(name, pattern):
+            return True
+    return False
@@ -0,0 +1,380 @@
+"""
+Spec-kit version fingerprinting against vanilla reference snapshots.
+
+kits/fingerprints.yaml holds a table of content hashes for every file in the
+vanilla spec-kit snapshots under docs/vanilla-reference/, one map per
+(spec-kit version, agent flavor). Identifying a project only hashes the few
+files that tell the candidates apart; drift is then reported against the
+matched snapshot. Hashes are cached in .specify/cache/fingerprints.json keyed
+by (mtime, size), so repeated status calls only stat a couple dozen files.
+"""
+
+import hashlib
+import re
+from datetime import date
+from pathlib import Path
+
+import yaml
+
+from .cache import fingerprint, get_cache_dir, read_json, write_json_atomic
+
+FINGERPRINTS_FILE = "fingerprints.yaml"
+CACHE_FILE = "fingerprints.json"
+CACHE_VERSION = 1
+
+# Line endings are normalized so Windows checkouts hash the same
+ALGORITHM = "sha1-lf"
+HASH_LENGTH = 16
+
+# Snapshot directory -> agent flavor (other directories use their name minus '-vanilla')
+SNAPSHOT_FLAVORS = {
+    "claude-code-vanilla": "claude",
+    "github-cli-vanilla": "copilot",
+}
+
+# Files spec-kit expects users to edit; never fingerprinted
+USER_OWNED = {
+    ".specify/memory/constitution.md",
+    ".github/copilot-instructions.md",
+    "CLAUDE.md",
+    ".claude/CLAUDE.md",
+    ".claude/settings.local.json",
+}
+
+_VERSION_RE = re.compile(r"^v?(\d+)(?:\.(\d+))?(?:\.(\d+))?")
+
+
+def hash_file(path: Path) -> str:
+    """
+    Hash a file the way the fingerprint table does.
+
+    Args:
+        path: File path
+
+    Returns:
+        Truncated hex digest of the content with CRLF normalized to LF
+    """
+    data = Path(path).read_bytes().replace(b"\r\n", b"\n")
+    return hashlib.sha1(data).hexdigest()[:HASH_LENGTH]
+
+
+def parse_version(version: str) -> tuple[int, int, int]:
+    """
+    Parse a version string for comparison.
+
+    Args:
+        version: Version like '0.1.0', 'v1.2' or '0.3.3.dev1'
+
+    Returns:
+        (major, minor, patch) tuple
+
+    Raises:
+        ValueError: If the string does not start with a version number
+    """
+    match = _VERSION_RE.match(str(version).strip())
+    if not match:
+        raise ValueError(f"Not a version: {version}")
+    return tuple(int(part or 0) for part in match.groups())
+
+
+def load_table(path: Path) -> dict:
+    """
+    Load a fingerprint table.
+
+    Args:
+        path: fingerprints.yaml path
+
+    Returns:
+        Table dict ({'versions': {}} if the file does not exist)
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            table = yaml.safe_load(f) or {}
+    except FileNotFoundError:
+        table = {}
+    table.setdefault("versions", {})
+    return table
+
+
+def build_table(reference_dir: Path, version: str, table: dict | None = None) -> dict:
+    """
+    Fingerprint vanilla snapshots as one spec-kit version.
+
+    Each subdirectory of reference_dir is one agent flavor of the same
+    spec-kit release. Entries for other versions in 'table' are kept, so the
+    table accumulates every release the snapshots were updated to.
+
+    Args:
+        reference_dir: Directory of snapshots (docs/vanilla-reference)
+        version: Spec-kit version the snapshots correspond to
+        table: Existing table to merge into (None = start empty)
+
+    Returns:
+        Updated table
+
+    Raises:
+        ValueError: If the version is malformed or no snapshot has files
+    """
+    parse_version(version)
+    reference_dir = Path(reference_dir)
+
+    flavors = {}
+    for snapshot in sorted(p for p in reference_dir.iterdir() if p.is_dir()):
+        flavor = SNAPSHOT_FLAVORS.get(snapshot.name, snapshot.name.removesuffix("-vanilla"))
+        files = {}
+        for path in sorted(snapshot.rglob("*")):
+            relative = path.relative_to(snapshot).as_posix()
+            if path.is_file() and relative not in USER_OWNED:
+                files[relative] = hash_file(path)
+        if files:
+            flavors[flavor] = files
+
+    if not flavors:
+        raise ValueError(f"No vanilla snapshots found in {reference_dir}")
+
+    table = dict(table or {})
+    versions = dict(table.get("versions") or {})
+    versions[str(version)] = {"generated": date.today().isoformat(), "flavors": flavors}
+    table["algorithm"] = ALGORITHM
+    table["versions"] = dict(sorted(versions.items(), key=lambda item: parse_version(item[0])))
+    return table
+
+
+def write_table(path: Path, table: dict):
+    """
+    Write a fingerprint table as YAML.
+
+    Args:
+        path: fingerprints.yaml path
+        table: Table from build_table()
+    """
+    header = (
+        "# Vanilla spec-kit fingerprints (generated - do not edit by hand)\n"
+        "# Regenerate: lite-kits fingerprints docs/vanilla-reference --spec-kit-version X.Y.Z\n\n"
+    )
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(header)
+        yaml.safe_dump(table, f, sort_keys=False, default_flow_style=False)
+
+
+def check_requirements(
+    metadata: dict,
+    kits: dict[str, dict],
+    spec_kit_version: str | None,
+    lite_kits_version: str,
+) -> dict:
+    """
+    Check manifest version requirements.
+
+    'min_lite_kits_version' and 'min_spec_kit_version' are read from the
+    manifest metadata and may be raised per kit.
+
+    Args:
+        metadata: Manifest 'metadata' section
+        kits: Kit name -> kit definition, for the kits being installed
+        spec_kit_version: Detected spec-kit version (None = unknown)
+        lite_kits_version: Running lite-kits version
+
+    Returns:
+        Dict with 'errors' (blocking) and 'warnings' lists
+    """
+    errors = []
+    warnings = []
+
+    requirements = [("manifest", metadata or {})]
+    requirements.extend((name, kit or {}) for name, kit in kits.items())
+
+    for owner, spec in requirements:
+        needed = spec.get("min_lite_kits_version")
+        if needed and parse_version(lite_kits_version) < parse_version(needed):
+            errors.append(f"{owner} requires lite-kits >= {needed} (running {lite_kits_version})")
+
+        needed = spec.get("min_spec_kit_version")
+        if not needed:
+            continue
+        if spec_kit_version is None:
+            if owner == "manifest":
+                warnings.append(
+                    f"Could not identify the spec-kit version (need >= {needed}); "
+                    "files do not match any known vanilla release"
+                )
+        elif parse_version(spec_kit_version) < parse_version(needed):
+            errors.append(f"{owner} requires spec-kit >= {needed} (detected {spec_kit_version})")
+
+    return {"errors": errors, "warnings": warnings}
+
+
+class SpecKitFingerprinter:
+    """Identifies the vanilla spec-kit release a project was created from."""
+
+    def __init__(self, target_dir: Path, table: dict):
+        """
+        Initialize fingerprinter.
+
+        Args:
+            target_dir: Project root directory
+            table: Fingerprint table from load_table()
+        """
+        self.target_dir = Path(target_dir)
+        # Newest release first, so ties resolve to the latest version
+        self.candidates: list[tuple[str, str, dict[str, str]]] = sorted(
+            (
+                (str(version), flavor, files or {})
+                for version, info in (table.get("versions") or {}).items()
+                for flavor, files in ((info or {}).get("flavors") or {}).items()
+            ),
+            key=lambda candidate: parse_version(candidate[0]),
+            reverse=True,
+        )
+        self._hashes: dict[str, str | None] = {}
+        self._cache: dict | None = None
+        self._dirty = False
+
+    def probes(self) -> list[str]:
+        """
+        Paths whose hash (or absence) differs between candidates.
+
+        Returns:
+            Sorted list of paths; every known path if there is a single candidate
+        """
+        paths = sorted({path for _, _, files in self.candidates for path in files})
+        if len(self.candidates) < 2:
+            return paths
+        return [
+            path for path in paths
+            if len({files.get(path) for _, _, files in self.candidates}) > 1
+        ]
+
+    def identify(self) -> dict:
+        """
+        Identify spec-kit version and agent flavor.
+
+        Only the probe files are hashed. If none of them match any candidate
+        (e.g. an agent/shell combination without a snapshot), every known
+        file is hashed before giving up.
+
+        Returns:
+            Dict with 'version' and 'flavor' (None if unknown), 'matched'
+            (probe files with a matching hash) and 'probed' (files hashed)
+        """
+        result = {"version": None, "flavor": None, "matched": 0, "probed": 0}
+        if not self.candidates:
+            return result
+
+        probes = self.probes()
+        best = self._best(probes)
+        if best[1] == 0:
+            probes = sorted({path for _, _, files in self.candidates for path in files})
+            best = self._best(probes)
+
+        (version, flavor, _), matched = best
+        result["probed"] = len(probes)
+        if matched:
+            result.update(version=version, flavor=flavor, matched=matched)
+        return result
+
+    def drift(self, version: str, flavor: str) -> dict:
+        """
+        Compare the project with one vanilla snapshot.
+
+        Args:
+            version: Spec-kit version from the table
+            flavor: Agent flavor from the table
+
+        Returns:
+            Dict with 'modified', 'missing' and 'unmodified' (count)
+        """
+        files = next(
+            (files for v, f, files in self.candidates if v == version and f == flavor),
+            {},
+        )
+        modified = []
+        missing = []
+        for path, expected in sorted(files.items()):
+            actual = self._hash(path)
+            if actual is None:
+                missing.append(path)
+            elif actual != expected:
+                modified.append(path)
+        return {
+            "modified": modified,
+            "missing": missing,
+            "unmodified": len(files) - len(modified) - len(missing),
+        }
+
+    def detect(self) -> dict:
+        """
+        Identify the release and report drift from it.
+
+        Returns:
+            identify() result plus drift() keys when a release was identified
+        """
+        result = self.identify()
+        if result["version"]:
+            result.update(self.drift(result["version"], result["flavor"]))
+        self._save_cache()
+        return result
+
+    def _best(self, probes: list[str]) -> tuple[tuple[str, str, dict[str, str]], int]:
+        """Best candidate for the probe files, with its count of hash matches."""
+        observed = {path: self._hash(path) for path in probes}
+        scored = []
+        for candidate in self.candidates:
+            files = candidate[2]
+            # Absence agrees with absence; only real hashes count as evidence
+            agree = sum(1 for path in probes if files.get(path) == observed[path])
+            evidence = sum(
+                1 for path in probes if observed[path] and files.get(path) == observed[path]
+            )
+            scored.append((agree, evidence, candidate))
+        agree, evidence, candidate = max(scored, key=lambda item: (item[0], item[1]))
+        return candidate, evidence
+
+    def _hash(self, relative: str) -> str | None:
+        """Hash a project file, reusing cached hashes for unchanged files."""
+        if relative in self._hashes:
+            return self._hashes[relative]
+
+        path = self.target_dir / relative
+        try:
+            stat = path.stat()
+        except OSError:
+            self._hashes[relative] = None
+            return None
+
+        files = self._load_cache()
+        key = list(fingerprint(stat))
+        cached = files.get(relative)
+        if cached and cached[:2] == key:
+            digest = cached[2]
+        else:
+            try:
+                digest = hash_file(path)
+            except OSError:
+                digest = None
+            files[relative] = key + [digest]
+            self._dirty = True
+        self._hashes[relative] = digest
+        return digest
+
+    def _load_cache(self) -> dict:
+        if self._cache is None:
+            data = read_json(get_cache_dir(self.target_dir) / CACHE_FILE)
+            if isinstance(data, dict) and data.get("version") == CACHE_VERSION:
+                self._cache = data.get("files") or {}
+            else:
+                self._cache = {}
+        return self._cache
+
+    def _save_cache(self):
+        # Only spec-kit projects get a cache directory
+        if not self._dirty or not (self.target_dir / ".specify").is_dir():
+            return
+        try:
+            write_json_atomic(
+                get_cache_dir(self.target_dir) / CACHE_FILE,
+                {"version": CACHE_VERSION, "files": self._cache},
+            )
+        except OSError:
+            pass
+        self._dirty = False
@@ -0,0 +1,389 @@
+"""
+Thin git subprocess helpers.
+
+All git access goes through run_git() so callers get consistent encoding,
+error handling and a single place to batch arguments.
+"""
+
+import subprocess
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+
+# Conservative per-invocation argument count for batched path operations
+BATCH_SIZE = 200
+
+
+class GitError(RuntimeError):
+    """Raised when a git command fails."""
+
+    def __init__(self, message: str, output: str = ""):
+        super().__init__(message)
+        # Stdout of the failed command (per-ref status for 'push --porcelain')
+        self.output = output
+
+
+def run_git(
+    args: Sequence[str],
+    cwd: Path,
+    check: bool = True,
+    input: str | None = None,
+    env: dict | None = None,
+) -> str:
+    """
+    Run a git command and return its stdout.
+
+    Args:
+        args: Arguments after 'git'
+        cwd: Working directory
+        check: Raise GitError on non-zero exit
+        input: Optional stdin text
+        env: Optional environment (replaces os.environ)
+
+    Returns:
+        Command stdout
+
+    Raises:
+        GitError: If the command fails (and check is True) or git is missing
+    """
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+            input=input,
+            env=env,
+        )
+    except FileNotFoundError:
+        raise GitError("git executable not found")
+
+    if check and result.returncode != 0:
+        message = result.stderr.strip() or f"git {args[0]} exited with {result.returncode}"
+        raise GitError(message, result.stdout)
+    return result.stdout
+
+
+def stream_git(args: Sequence[str], cwd: Path, sep: str = "\n") -> Iterator[str]:
+    """
+    Run a git command and yield its output record by record.
+
+    Output is read incrementally, so memory stays bounded no matter how long
+    the history is.
+
+    Args:
+        args: Arguments after 'git'
+        cwd: Working directory
+        sep: Record separator ('\n' for lines, '\0' for -z output)
+
+    Yields:
+        Output records without the separator
+
+    Raises:
+        GitError: If git is missing or exits non-zero
+    """
+    try:
+        proc = subprocess.Popen(
+            ["git", *args],
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+        )
+    except FileNotFoundError:
+        raise GitError("git executable not found")
+
+    pending = ""
+    try:
+        while True:
+            block = proc.stdout.read(65536)
+            if not block:
+                break
+            pending += block
+            *records, pending = pending.split(sep)
+            yield from records
+        if pending:
+            yield pending
+    finally:
+        proc.stdout.close()
+        stderr = proc.stderr.read()
+        proc.stderr.close()
+        returncode = proc.wait()
+
+    if returncode != 0:
+        raise GitError(stderr.strip() or f"git {args[0]} exited with {returncode}")
+
+
+def read_blobs(
+    cwd: Path, oids: Sequence[str], max_bytes: int | None = None
+) -> dict[str, bytes | None]:
+    """
+    Read blob contents with one 'git cat-file --batch' call.
+
+    Args:
+        cwd: Working directory
+        oids: Full blob object ids
+        max_bytes: Blobs larger than this are not read
+
+    Returns:
+        Dict of oid -> content (None if missing or larger than max_bytes)
+
+    Raises:
+        GitError: If git is missing or exits non-zero
+    """
+    blobs: dict[str, bytes | None] = dict.fromkeys(oids)
+    wanted = list(blobs)
+    if wanted and max_bytes is not None:
+        sizes = run_git(
+            ["cat-file", "--batch-check=%(objectname) %(objectsize)"],
+            cwd,
+            input="\n".join(wanted) + "\n",
+        )
+        wanted = [
+            fields[0] for fields in (line.split() for line in sizes.splitlines())
+            if len(fields) == 2 and int(fields[1]) <= max_bytes
+        ]
+    if not wanted:
+        return blobs
+
+    try:
+        result = subprocess.run(
+            ["git", "cat-file", "--batch"],
+            cwd=cwd,
+            input=("\n".join(wanted) + "\n").encode("utf-8"),
+            capture_output=True,
+        )
+    except FileNotFoundError:
+        raise GitError("git executable not found")
+    if result.returncode != 0:
+        stderr = result.stderr.decode("utf-8", errors="replace").strip()
+        raise GitError(stderr or f"git cat-file exited with {result.returncode}")
+
+    # Each object: "<oid> <type> <size>\n<content>\n"; unknown ones: "<oid> missing\n"
+    output = result.stdout
+    pos = 0
+    while pos < len(output):
+        end = output.index(b"\n", pos)
+        header = output[pos:end].split()
+        pos = end + 1
+        if len(header) == 3:
+            size = int(header[2])
+            blobs[header[0].decode("ascii")] = output[pos:pos + size]
+            pos += size + 1
+    return blobs
+
+
+def is_git_repo(path: Path) -> bool:
+    """Check if path is inside a git work tree."""
+    try:
+        return run_git(["rev-parse", "--is-inside-work-tree"], path).strip() == "true"
+    except GitError:
+        return False
+
+
+def current_branch(cwd: Path) -> str | None:
+    """Get the checked-out branch name (None when detached or not a repo)."""
+    try:
+        name = run_git(["branch", "--show-current"], cwd).strip()
+    except GitError:
+        return None
+    return name or None
+
+
+def common_dir(cwd: Path) -> Path | None:
+    """
+    Get the git directory shared by all worktrees of a repository.
+
+    Args:
+        cwd: Any directory inside the repository or one of its worktrees
+
+    Returns:
+        Absolute path of the common git dir (None if not a repo)
+    """
+    try:
+        path = run_git(["rev-parse", "--git-common-dir"], cwd).strip()
+    except GitError:
+        return None
+    # Older git prints it relative to cwd
+    return (Path(cwd) / path).resolve()
+
+
+def git_dir(cwd: Path) -> Path | None:
+    """
+    Get the git directory of the worktree containing a directory.
+
+    Args:
+        cwd: Any directory inside the worktree
+
+    Returns:
+        Absolute path of the worktree's git dir (None if not a repo)
+    """
+    try:
+        path = run_git(["rev-parse", "--absolute-git-dir"], cwd).strip()
+    except GitError:
+        return None
+    return Path(path)
+
+
+def list_worktrees(cwd: Path) -> list[dict]:
+    """
+    List a repository's worktrees from one 'git worktree list --porcelain' call.
+
+    Args:
+        cwd: Any directory inside the repository
+
+    Returns:
+        List of dicts with 'path', 'head', 'branch' (None when detached),
+        'bare' and 'prunable' (directory gone); the main worktree comes first
+    """
+    worktrees = []
+    for line in run_git(["worktree", "list", "--porcelain"], cwd).splitlines():
+        key, _, value = line.partition(" ")
+        if key == "worktree":
+            worktrees.append({
+                "path": value, "head": None, "branch": None, "bare": False, "prunable": False,
+            })
+        elif not worktrees:
+            continue
+        elif key == "HEAD":
+            worktrees[-1]["head"] = value
+        elif key == "branch":
+            worktrees[-1]["branch"] = value.removeprefix("refs/heads/")
+        elif key == "bare":
+            worktrees[-1]["bare"] = True
+        elif key == "prunable":
+            worktrees[-1]["prunable"] = True
+    return worktrees
+
+
+def default_branch(cwd: Path) -> str:
+    """
+    Guess the repository's base branch.
+
+    Prefers origin/HEAD, then local main/master.
+
+    Args:
+        cwd: Repository directory
+
+    Returns:
+        Branch name (e.g. 'main')
+    """
+    head = run_git(
+        ["symbolic-ref", "--quiet", "--short", "refs/remotes/origin/HEAD"], cwd, check=False
+    ).strip()
+    if head:
+        return head.split("/", 1)[1] if "/" in head else head
+
+    refs = run_git(
+        ["for-each-ref", "--format=%(refname:short)", "refs/heads/main", "refs/heads/master"],
+        cwd,
+        check=False,
+    ).split()
+    if refs:
+        return "main" if "main" in refs else refs[0]
+    return current_branch(cwd) or "main"
+
+
+def status_summary(cwd: Path, all_untracked: bool = False) -> dict:
+    """
+    Branch, upstream and working tree counts from one git status call.
+
+    Uses 'git status --porcelain=v2 --branch', which reports ahead/behind
+    without separate rev-list calls.
+
+    Args:
+        cwd: Repository directory
+        all_untracked: List every untracked file instead of collapsing
+            untracked directories to one entry
+
+    Returns:
+        Dict with 'branch', 'head', 'upstream', 'ahead', 'behind', 'staged',
+        'modified', 'untracked', 'conflicts' and 'files' (changed paths)
+    """
+    args = ["status", "--porcelain=v2", "--branch", "-z"]
+    if all_untracked:
+        args.append("--untracked-files=all")
+    output = run_git(args, cwd)
+    summary = {
+        "branch": None,
+        "head": None,
+        "upstream": None,
+        "ahead": None,
+        "behind": None,
+        "staged": 0,
+        "modified": 0,
+        "untracked": 0,
+        "conflicts": 0,
+        "files": [],
+    }
+
+    records = output.split("\0")
+    skip_next = False
+    for record in records:
+        if skip_next:
+            # Rename/copy entries carry the original path as an extra record
+            skip_next = False
+            continue
+        if not record:
+            continue
+        if record.startswith("# branch.oid "):
+            oid = record.split()[-1]
+            summary["head"] = None if oid == "(initial)" else oid
+        elif record.startswith("# branch.head "):
+            head = record.split(" ", 2)[2]
+            summary["branch"] = None if head == "(detached)" else head
+        elif record.startswith("# branch.upstream "):
+            summary["upstream"] = record.split(" ", 2)[2]
+        elif record.startswith("# branch.ab "):
+            ahead, behind = record.split()[2:4]
+            summary["ahead"] = int(ahead.lstrip("+"))
+            summary["behind"] = int(behind.lstrip("-"))
+        elif record.startswith("? "):
+            summary["untracked"] += 1
+            summary["files"].append(record[2:])
+        elif record.startswith("u "):
+            summary["conflicts"] += 1
+            summary["files"].append(record.split(" ", 10)[-1])
+        elif record[:2] in ("1 ", "2 "):
+            xy = record[2:4]
+            summary["staged"] += xy[0] != "."
+            summary["modified"] += xy[1] != "."
+            fields = 9 if record[0] == "1" else 10
+            summary["files"].append(record.split(" ", fields - 1)[-1])
+            skip_next = record[0] == "2"
+
+    return summary
+
+
+def recent_commits(cwd: Path, count: int = 5, rev: str = "HEAD") -> list[dict]:
+    """
+    Last commits from one git log call.
+
+    Args:
+        cwd: Repository directory
+        count: Number of commits
+        rev: Revision to start from
+
+    Returns:
+        List of dicts with 'hash', 'subject', 'author', 'date' (ISO) and 'relative'
+    """
+    output = run_git(
+        ["log", f"-n{int(count)}", "--format=%h%x1f%s%x1f%an%x1f%aI%x1f%ar%x1e", rev, "--"],
+        cwd,
+        check=False,
+    )
+    commits = []
+    for record in output.split("\x1e"):
+        fields = record.strip("\n").split("\x1f")
+        if len(fields) == 5:
+            commits.append(dict(zip(["hash", "subject", "author", "date", "relative"], fields)))
+    return commits
+
+
+def chunked(items: Sequence, size: int = BATCH_SIZE) -> Iterator[list]:
+    """Split a sequence into lists of at most size items."""
+    for start in range(0, len(items), size):
+        yield list(items[start:start + size])
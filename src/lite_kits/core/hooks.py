@@ -0,0 +1,313 @@
+"""
+Cached, parallel pre-commit hook runner behind the hooks kit.
+
+Hooks are configured in .specify/hooks.yaml. Each run lists the staged files
+once, gives every hook only the paths its 'files'/'exclude' patterns select,
+and runs all hooks at the same time with per-hook timeouts. A passing result
+is remembered under a key built from the staged tree hash and the hook's own
+config digest, so committing identical staged content again skips the work.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shlex
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import yaml
+
+from .cache import get_cache_dir, read_json, write_json_atomic
+from .git import BATCH_SIZE, GitError, chunked, run_git
+
+HOOKS_CONFIG = Path(".specify") / "hooks.yaml"
+CACHE_FILE = "hooks.json"
+
+DEFAULT_TIMEOUT = 60
+DEFAULT_JOBS = 4
+
+# Pass results remembered (oldest dropped first)
+MAX_CACHE_ENTRIES = 500
+
+# Characters of hook output kept in reports
+MAX_OUTPUT_CHARS = 4000
+
+HOOK_MARKER = "# Installed by lite-kits (hooks kit)"
+HOOK_SCRIPT = f"""#!/bin/sh
+{HOOK_MARKER}
+if ! command -v lite-kits >/dev/null 2>&1; then
+    echo "lite-kits not found on PATH; skipping pre-commit hooks" >&2
+    exit 0
+fi
+exec lite-kits hooks run
+"""
+
+
+def load_hooks(target_dir: Path) -> dict:
+    """
+    Load and normalize the hooks configuration.
+
+    Args:
+        target_dir: Project root directory
+
+    Returns:
+        Dict with 'jobs' and 'hooks' (list of normalized hook dicts, each with
+        a 'digest' of its own settings)
+
+    Raises:
+        FileNotFoundError: If .specify/hooks.yaml does not exist
+        ValueError: If the configuration is malformed
+    """
+    config_path = Path(target_dir) / HOOKS_CONFIG
+    with open(config_path, encoding='utf-8') as f:
+        try:
+            config = yaml.safe_load(f) or {}
+        except yaml.YAMLError as e:
+            raise ValueError(f"{HOOKS_CONFIG}: {e}")
+
+    settings = config.get("settings") or {}
+    default_timeout = settings.get("default_timeout", DEFAULT_TIMEOUT)
+
+    hooks = []
+    seen = set()
+    for raw in config.get("hooks") or []:
+        if not isinstance(raw, dict) or not raw.get("id") or not raw.get("entry"):
+            raise ValueError(f"{HOOKS_CONFIG}: every hook needs an 'id' and an 'entry'")
+        if raw["id"] in seen:
+            raise ValueError(f"{HOOKS_CONFIG}: duplicate hook id '{raw['id']}'")
+        seen.add(raw["id"])
+
+        hook = {
+            "id": str(raw["id"]),
+            "name": str(raw.get("name", raw["id"])),
+            "entry": str(raw["entry"]),
+            "files": raw.get("files") or "",
+            "exclude": raw.get("exclude") or "",
+            "pass_filenames": bool(raw.get("pass_filenames", True)),
+            "always_run": bool(raw.get("always_run", False)),
+            "timeout": float(raw.get("timeout", default_timeout)),
+            "enabled": bool(raw.get("enabled", True)),
+        }
+        for key in ("files", "exclude"):
+            try:
+                re.compile(hook[key])
+            except re.error as e:
+                raise ValueError(
+                    f"{HOOKS_CONFIG}: hook '{hook['id']}' has an invalid '{key}' pattern: {e}"
+                )
+        hook["digest"] = hashlib.sha1(json.dumps(hook, sort_keys=True).encode('utf-8')).hexdigest()
+        hooks.append(hook)
+
+    return {"jobs": int(settings.get("jobs", DEFAULT_JOBS)), "hooks": hooks}
+
+
+def install_git_hook(target_dir: Path, force: bool = False) -> Path:
+    """
+    Write the git pre-commit hook that calls 'lite-kits hooks run'.
+
+    Args:
+        target_dir: Repository directory
+        force: Replace a pre-commit hook not written by lite-kits
+
+    Returns:
+        Path of the installed hook
+
+    Raises:
+        GitError: If target_dir is not a git repository
+        FileExistsError: If a foreign pre-commit hook exists and force is False
+    """
+    # --git-path honors core.hooksPath and linked worktrees
+    hook_path = Path(run_git(
+        ["rev-parse", "--path-format=absolute", "--git-path", "hooks/pre-commit"], target_dir
+    ).strip())
+    if hook_path.exists() and not force:
+        if HOOK_MARKER not in hook_path.read_text(encoding='utf-8', errors='replace'):
+            raise FileExistsError(f"{hook_path} already exists (use --force to replace it)")
+
+    hook_path.parent.mkdir(parents=True, exist_ok=True)
+    hook_path.write_text(HOOK_SCRIPT, encoding='utf-8', newline="\n")
+    hook_path.chmod(0o755)
+    return hook_path
+
+
+class HookRunner:
+    """Runs configured hooks against the staged files."""
+
+    def __init__(self, target_dir: Path, jobs: int | None = None, use_cache: bool = True):
+        """
+        Initialize hook runner.
+
+        Args:
+            target_dir: Project root directory (must contain .specify/hooks.yaml)
+            jobs: Hooks run at the same time (None = config 'settings.jobs')
+            use_cache: Skip hooks that already passed on this staged tree
+
+        Raises:
+            FileNotFoundError: If the hooks kit is not installed
+            ValueError: If the configuration is malformed
+        """
+        self.target_dir = Path(target_dir).resolve()
+        self.config = load_hooks(self.target_dir)
+        self.jobs = jobs or self.config["jobs"]
+        self.use_cache = use_cache
+        self.top = Path(run_git(["rev-parse", "--show-toplevel"], self.target_dir).strip())
+
+    def run(self, hook_ids: list[str] | None = None, all_files: bool = False) -> dict:
+        """
+        Run hooks in parallel.
+
+        Args:
+            hook_ids: Only run these hooks (None = all enabled hooks)
+            all_files: Check every tracked file instead of the staged ones
+                (results are not cached)
+
+        Returns:
+            Dict with 'tree' (staged tree hash or None), 'files' (candidate
+            count), 'passed' (bool), 'seconds' and 'hooks' (per-hook dicts
+            with 'id', 'name', 'status', 'files', 'seconds', 'output')
+
+        Raises:
+            ValueError: If hook_ids names an unknown hook
+        """
+        started = time.perf_counter()
+        hooks = self._select(hook_ids)
+
+        if all_files:
+            tree = None
+            files = [p for p in run_git(["ls-files", "-z"], self.top).split("\0") if p]
+            dirty: set[str] = set()
+        else:
+            tree = self._staged_tree()
+            files = [
+                p for p in run_git(
+                    ["diff", "--cached", "--name-only", "-z", "--diff-filter=ACMR"], self.top
+                ).split("\0") if p
+            ]
+            # Checks read the working tree; results for files with unstaged
+            # edits describe different content than the staged tree
+            output = run_git(["diff-files", "--name-only", "-z"], self.top)
+            dirty = {p for p in output.split("\0") if p}
+
+        cache_path = get_cache_dir(self.top) / CACHE_FILE
+        passed_keys = (read_json(cache_path) or {}).get("passed", []) if tree else []
+        known = set(passed_keys) if self.use_cache else set()
+
+        results: dict[str, dict] = {}
+        pending = []
+        for hook in hooks:
+            selected = self._filter(hook, files)
+            key = f"{tree}:{hook['digest']}" if tree else None
+            result = {"id": hook["id"], "name": hook["name"], "status": None,
+                      "files": len(selected), "seconds": 0.0, "output": ""}
+            if not hook["enabled"]:
+                results[hook["id"]] = {**result, "status": "disabled"}
+            elif not selected and not hook["always_run"]:
+                results[hook["id"]] = {**result, "status": "skipped"}
+            elif key and key in known:
+                results[hook["id"]] = {**result, "status": "cached"}
+            else:
+                inputs = set(selected) if hook["pass_filenames"] else set(files)
+                cacheable = key is not None and not (dirty & inputs)
+                pending.append((hook, selected, key if cacheable else None))
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=max(1, self.jobs)) as pool:
+                futures = [
+                    (hook, key, pool.submit(self._execute, hook, selected))
+                    for hook, selected, key in pending
+                ]
+                for hook, key, future in futures:
+                    result = {"id": hook["id"], "name": hook["name"], **future.result()}
+                    results[hook["id"]] = result
+                    if key and result["status"] == "passed" and key not in passed_keys:
+                        passed_keys.append(key)
+
+            if tree:
+                write_json_atomic(cache_path, {"passed": passed_keys[-MAX_CACHE_ENTRIES:]})
+
+        ordered = [results[hook["id"]] for hook in hooks]
+        return {
+            "tree": tree,
+            "files": len(files),
+            "passed": all(
+                r["status"] in ("passed", "cached", "skipped", "disabled") for r in ordered
+            ),
+            "seconds": round(time.perf_counter() - started, 3),
+            "hooks": ordered,
+        }
+
+    def _select(self, hook_ids: list[str] | None) -> list[dict]:
+        """Hooks to run, in config order."""
+        hooks = self.config["hooks"]
+        if not hook_ids:
+            return hooks
+        by_id = {hook["id"]: hook for hook in hooks}
+        unknown = [hook_id for hook_id in hook_ids if hook_id not in by_id]
+        if unknown:
+            raise ValueError(
+                f"Unknown hook(s): {', '.join(unknown)}. "
+                f"Configured: {', '.join(by_id) or 'none'}"
+            )
+        # Explicitly requested hooks run even when disabled in the config
+        return [{**by_id[hook_id], "enabled": True} for hook_id in dict.fromkeys(hook_ids)]
+
+    def _staged_tree(self) -> str | None:
+        """Tree hash of the index (None while merge conflicts are unresolved)."""
+        try:
+            return run_git(["write-tree"], self.top).strip()
+        except GitError:
+            return None
+
+    @staticmethod
+    def _filter(hook: dict, files: list[str]) -> list[str]:
+        """Staged paths selected by a hook's include/exclude patterns."""
+        include = re.compile(hook["files"]) if hook["files"] else None
+        exclude = re.compile(hook["exclude"]) if hook["exclude"] else None
+        return [
+            path for path in files
+            if (include is None or include.search(path)) and not (exclude and exclude.search(path))
+        ]
+
+    def _execute(self, hook: dict, files: list[str]) -> dict:
+        """Run one hook (in filename batches) within its timeout."""
+        started = time.perf_counter()
+        deadline = started + hook["timeout"]
+        command = shlex.split(hook["entry"], posix=os.name != "nt")
+        batches = list(chunked(files, BATCH_SIZE)) if hook["pass_filenames"] and files else [[]]
+
+        status = "passed"
+        output = []
+        for batch in batches:
+            try:
+                completed = subprocess.run(
+                    command + batch,
+                    cwd=self.top,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    text=True,
+                    encoding='utf-8',
+                    errors='replace',
+                    timeout=max(0.0, deadline - time.perf_counter()),
+                )
+            except FileNotFoundError:
+                status = "error"
+                output.append(f"Command not found: {command[0]}")
+                break
+            except subprocess.TimeoutExpired:
+                status = "timeout"
+                output.append(f"Timed out after {hook['timeout']:g}s")
+                break
+            output.append(completed.stdout)
+            if completed.returncode != 0:
+                status = "failed"
+
+        text = "".join(output).strip()
+        return {
+            "status": status,
+            "files": len(files),
+            "seconds": round(time.perf_counter() - started, 3),
+            "output": text[-MAX_OUTPUT_CHARS:],
+        }
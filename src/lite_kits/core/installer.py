@@ -3,16 +3,32 @@ Manifest-driven installer for lite-kits.
 
 Orchestrates detection, validation, and file operations.
 Delegates to specialized modules for specific tasks.
+
+Installs and removals hold the project install lock (.specify/locks/install.lock),
+so concurrent agents never interleave file operations. Files are replaced
+atomically, which lets read-only status/validate run without the lock.
+With a KitStore (see worktrees.py), files are cloned from the repository's
+shared store instead of rendered and written per worktree.
 """
 
+import os
 import shutil
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from .. import __version__
+from .cache import replace_file
+from .compaction import estimate_tokens
 from .conflict_checker import ConflictChecker
 from .detector import Detector
-from .manifest import KitManifest
+from .fingerprints import check_requirements
+from .lock import DEFAULT_TIMEOUT, ProjectLock
+from .manifest import KITS_DIR, KitManifest
+from .templates import TemplateEngine
 from .validator import Validator
+from .worktrees import KitStore
+
+INSTALL_LOCK = "install"
 
 
 class Installer:
@@ -25,6 +41,11 @@ class Installer:
         force: bool = False,
         agents: Optional[List[str]] = None,
         shells: Optional[List[str]] = None,
+        compaction: Optional[str] = None,
+        lock_timeout: float = DEFAULT_TIMEOUT,
+        store: Optional[KitStore] = None,
+        templates: Optional[TemplateEngine] = None,
+        manifest: Optional[KitManifest] = None,
     ):
         """
         Initialize installer.
@@ -35,24 +56,46 @@ class Installer:
             force: Skip confirmations and overwrite existing files
             agents: List of explicit agent preferences (None = auto-detect)
             shells: List of explicit shell preferences (None = auto-detect)
+            compaction: Prompt compaction level (None = manifest 'prompt_compaction' option)
+            lock_timeout: Seconds to wait for another install/remove to finish
+            store: Shared kit store to link files from (None = write files directly)
+            templates: Template engine to share between installers (overrides compaction)
+            manifest: Kit manifest to use (None = packaged kits plus discovered packs)
+
+        Raises:
+            ValueError: If a kit, agent, shell or compaction level is invalid
         """
         self.target_dir = Path(target_dir).resolve()
-        self.kits_dir = Path(__file__).parent.parent / "kits"
-
-        # Load manifest
-        self.manifest = KitManifest(self.kits_dir)
+        self.kits_dir = KITS_DIR
+
+        # Command templates are compiled once and shared by all modules
+        if templates is not None:
+            self.manifest = templates.manifest
+            self.templates = templates
+        else:
+            self.manifest = manifest or KitManifest(self.kits_dir)
+            if compaction is None:
+                options = self.manifest.manifest.get('options', {})
+                compaction = options.get('prompt_compaction', 'none')
+            self.templates = TemplateEngine(self.kits_dir, self.manifest, compaction)
 
         # Initialize specialized modules
         self.detector = Detector(self.target_dir, self.manifest)
-        self.validator = Validator(self.target_dir, self.manifest)
+        self.validator = Validator(self.target_dir, self.manifest, self.templates)
         self.conflict_checker = ConflictChecker(
             self.target_dir,
             self.kits_dir,
-            self.manifest
+            self.manifest,
+            self.templates,
         )
 
         # Operational modes
         self.force = force
+        self.lock_timeout = lock_timeout
+        self.store = store
+        # None = manifest 'validate_on_install' option
+        self.validate_on_install: Optional[bool] = None
+        self._placed: Dict[str, Dict] = {}
 
         # Preferences - validate immediately during init
         self.preferred_agents = agents
@@ -71,11 +114,15 @@ class Installer:
         self._validate_kit_names()
 
     def _validate_kit_names(self):
-        """Validate kit names against manifest."""
-        valid_kits = set(self.manifest.get_kit_names())
-        invalid = set(self.kits) - valid_kits
+        """
+        Validate kit names against manifest.
+
+        Only the requested kits are loaded; pack kits are looked up (and
+        their fragments validated) one by one.
+        """
+        invalid = {name for name in self.kits if self.manifest.get_kit(name) is None}
         if invalid:
-            valid_list = ', '.join(sorted(valid_kits))
+            valid_list = ', '.join(sorted(self.manifest.get_kit_names()))
             raise ValueError(f"Invalid kit(s): {invalid}. Valid: {valid_list}")
 
     def is_spec_kit_project(self) -> bool:
@@ -86,6 +133,25 @@ class Installer:
         """Check if kit is installed."""
         return self.validator.is_kit_installed(kit_name)
 
+    def check_compatibility(self) -> Dict:
+        """
+        Check manifest version requirements against this project.
+
+        Returns:
+            Dict with 'errors' (block install unless forced), 'warnings' and
+            'spec_kit' (the Detector.detect_spec_kit() result)
+        """
+        spec_kit = self.detector.detect_spec_kit()
+        kits = {name: self.manifest.get_kit(name) for name in self.kits}
+        result = check_requirements(
+            self.manifest.manifest.get('metadata', {}),
+            kits,
+            spec_kit.get('version'),
+            __version__,
+        )
+        result["spec_kit"] = spec_kit
+        return result
+
     def preview_installation(self) -> Dict:
         """Preview installation without making changes."""
         agents = self.detector.detect_agents(self.preferred_agents)
@@ -97,8 +163,13 @@ class Installer:
             "warnings": [],
             "agents": agents,
             "shells": shells,
+            "incompatible": [],
         }
 
+        compatibility = self.check_compatibility()
+        preview['incompatible'] = compatibility['errors']
+        preview['warnings'].extend(compatibility['warnings'])
+
         if not agents:
             supported = [
                 name for name, config in self.manifest.manifest.get('agents', {}).items()
@@ -166,51 +237,82 @@ class Installer:
                         preview["new_directories"].append(parent_dir)
 
     def install(self) -> Dict:
-        """Install kits to target project."""
+        """Install kits to target project (under the project install lock)."""
         result = {
             "success": False,
             "installed": [],
             "skipped": [],
+            "prompts": [],
             "error": None,
         }
 
         try:
-            agents = self.detector.detect_agents(self.preferred_agents)
-            shells = self.detector.detect_shells(self.preferred_shells)
-
-            if not agents:
-                supported = [
-                    name for name, config in self.manifest.manifest.get('agents', {}).items()
-                    if config.get('supported', False)
-                ]
-                result["error"] = (
-                    f"No supported AI interface found. Supported: {', '.join(supported)}. "
-                    r"To enable AI interface support, create a '.claude\' or '.github\prompts\' directory in your project."
-                )
-                return result
-
-            if not self.force:
-                conflicts = self.conflict_checker.check_conflicts(self.kits, agents, shells)
+            with self._lock() as lock:
+                result["lock"] = {"waited": round(lock.waited, 4), "contended": lock.contended}
+                self._install(result)
+        except Exception as e:
+            result["error"] = str(e)
 
-                if conflicts['has_conflicts']:
-                    result["conflicts"] = conflicts['overwrites']
-                    result["error"] = f"Found {len(conflicts['conflicts'])} file conflicts. Use --force to overwrite."
-                    return result
+        return result
 
-            options = self.manifest.manifest.get('options', {})
+    def _install(self, result: Dict):
+        """Install kits; fills in result (the caller holds the install lock)."""
+        agents = self.detector.detect_agents(self.preferred_agents)
+        shells = self.detector.detect_shells(self.preferred_shells)
 
-            for kit_name in self.kits:
-                self._install_kit(kit_name, agents, shells, options, result)
+        if not agents:
+            supported = [
+                name for name, config in self.manifest.manifest.get('agents', {}).items()
+                if config.get('supported', False)
+            ]
+            result["error"] = (
+                f"No supported AI interface found. Supported: {', '.join(supported)}. "
+                r"To enable AI interface support, create a '.claude\' or '.github\prompts\' "
+                "directory in your project."
+            )
+            return
+
+        if not self.force:
+            compatibility = self.check_compatibility()
+            if compatibility['errors']:
+                result["error"] = (
+                    "Incompatible project: " + "; ".join(compatibility['errors'])
+                    + ". Use --force to install anyway."
+                )
+                return
 
-            result["success"] = True
+            conflicts = self.conflict_checker.check_conflicts(self.kits, agents, shells)
 
-            if options.get('validate_on_install', True):
-                result["validation"] = self.validator.validate_all()
+            if conflicts['has_conflicts']:
+                result["conflicts"] = conflicts['overwrites']
+                result["error"] = (
+                    f"Found {len(conflicts['conflicts'])} file conflicts. "
+                    "Use --force to overwrite."
+                )
+                return
 
-        except Exception as e:
-            result["error"] = str(e)
+        options = self.manifest.manifest.get('options', {})
 
-        return result
+        for kit_name in self.kits:
+            self._install_kit(kit_name, agents, shells, options, result)
+
+        result["success"] = True
+
+        if self.store is not None:
+            self.store.record(self.target_dir, {
+                "kits": self.kits,
+                "agents": agents,
+                "shells": shells,
+                "compaction": self.templates.compaction,
+                "files": self._placed,
+            })
+            result["stored"] = len(self._placed)
+
+        validate = self.validate_on_install
+        if validate is None:
+            validate = options.get('validate_on_install', True)
+        if validate:
+            result["validation"] = self.validator.validate_all(self.kits)
 
     def _install_kit(self, kit_name: str, agents: List[str], shells: List[str], options: Dict, result: Dict):
         """Install a single kit."""
@@ -218,19 +320,21 @@ class Installer:
 
         for agent in agents:
             files = self.manifest.get_kit_files(kit_name, agent=agent)
-            self._install_files(files, skip_existing, result)
+            self._install_files(files, skip_existing, result, shells)
 
         for shell in shells:
             files = self.manifest.get_kit_files(kit_name, agent=shell)
-            self._install_files(files, skip_existing, result)
+            self._install_files(files, skip_existing, result, shells)
 
         all_files = self.manifest.get_kit_files(kit_name, agent=None)
         for file_info in all_files:
             if file_info.get('type') in ['command', 'prompt', 'script']:
                 continue
-            self._install_files([file_info], skip_existing, result)
+            self._install_files([file_info], skip_existing, result, shells)
 
-    def _install_files(self, files: List[Dict], skip_existing: bool, result: Dict):
+    def _install_files(
+        self, files: List[Dict], skip_existing: bool, result: Dict, shells: List[str]
+    ):
         """Install a list of files."""
         for file_info in files:
             if file_info.get('status') == 'planned':
@@ -243,8 +347,10 @@ class Installer:
                 result["skipped"].append(file_info['path'])
                 continue
 
-            self._copy_file(file_info['source'], file_info['path'])
+            self._copy_file(file_info, shells)
             result["installed"].append(file_info['path'])
+            if file_info.get('agent'):
+                result["prompts"].append(self._prompt_size(file_info, shells))
 
     def validate(self) -> Dict:
         """Validate all installed kits."""
@@ -278,7 +384,7 @@ class Installer:
         return preview
 
     def remove(self) -> Dict:
-        """Remove kits from project."""
+        """Remove kits from project (under the project install lock)."""
         result = {
             "success": False,
             "removed": [],
@@ -287,42 +393,85 @@ class Installer:
         }
 
         try:
-            for kit_name in self.kits:
-                kit_info = self.manifest.get_kit(kit_name)
-                removed_files = []
-                not_found_files = []
-
-                all_files = self.manifest.get_kit_files(kit_name, agent=None)
+            with self._lock() as lock:
+                result["lock"] = {"waited": round(lock.waited, 4), "contended": lock.contended}
+                self._remove(result)
+        except Exception as e:
+            result["error"] = str(e)
 
-                for file_info in all_files:
-                    target_path = self.target_dir / file_info['path']
+        return result
 
-                    if target_path.exists():
-                        target_path.unlink()
-                        removed_files.append(file_info['path'])
-                    else:
-                        not_found_files.append(file_info['path'])
+    def _remove(self, result: Dict):
+        """Remove kit files; fills in result (the caller holds the install lock)."""
+        for kit_name in self.kits:
+            kit_info = self.manifest.get_kit(kit_name)
+            removed_files = []
+            not_found_files = []
 
-                if removed_files:
-                    result["removed"].append({'kit': kit_info['name'], 'files': removed_files})
+            all_files = self.manifest.get_kit_files(kit_name, agent=None)
 
-                if not_found_files:
-                    result["not_found"].extend(not_found_files)
+            for file_info in all_files:
+                target_path = self.target_dir / file_info['path']
 
-            result["success"] = True
+                try:
+                    target_path.unlink()
+                    removed_files.append(file_info['path'])
+                except FileNotFoundError:
+                    not_found_files.append(file_info['path'])
+
+            if removed_files:
+                result["removed"].append({'kit': kit_info['name'], 'files': removed_files})
+
+            if not_found_files:
+                result["not_found"].extend(not_found_files)
+
+        result["success"] = True
+
+        if self.store is not None:
+            removed = [path for entry in result["removed"] for path in entry["files"]]
+            self.store.record(self.target_dir, {}, removed=removed + result["not_found"])
+            self.store.forget_kits(self.target_dir, self.kits)
+
+    def _lock(self) -> ProjectLock:
+        """Project install lock shared by install() and remove()."""
+        return ProjectLock(self.target_dir, INSTALL_LOCK, timeout=self.lock_timeout)
+
+    def _prompt_size(self, file_info: Dict, shells: List[str]) -> Dict:
+        """Byte and token estimates for an installed command, before and after compaction."""
+        full = self.templates.render(file_info['source'], file_info['agent'], level='none')
+        installed = self.templates.render(file_info['source'], file_info['agent'], shells)
+        return {
+            "path": file_info['path'],
+            "source_bytes": len(full.encode('utf-8')),
+            "bytes": len(installed.encode('utf-8')),
+            "source_tokens": estimate_tokens(full),
+            "tokens": estimate_tokens(installed),
+        }
 
-        except Exception as e:
-            result["error"] = str(e)
+    def _copy_file(self, file_info: Dict, shells: Optional[List[str]] = None):
+        """Copy a kit file (or render a command template) into the target project."""
+        target = self.target_dir / file_info['path']
 
-        return result
+        if file_info.get('agent'):
+            content = self.templates.render(file_info['source'], file_info['agent'], shells)
+            if self.store is not None:
+                self._placed[file_info['path']] = self.store.place(target, content.encode('utf-8'))
+            else:
+                replace_file(target, lambda tmp: _write_text(tmp, content))
+            return
 
-    def _copy_file(self, kit_relative_path: str, target_relative_path: str):
-        """Copy file from kits/ to target project."""
-        source = self.kits_dir / kit_relative_path
-        target = self.target_dir / target_relative_path
+        source = self.kits_dir / file_info['source']
 
         if not source.exists():
             raise FileNotFoundError(f"Kit file not found: {source}")
 
-        target.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(source, target)
+        if self.store is not None:
+            self._placed[file_info['path']] = self.store.place(target, source.read_bytes())
+        else:
+            replace_file(target, lambda tmp: shutil.copy2(source, tmp))
+
+
+def _write_text(path: str, content: str):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(content)
+    os.chmod(path, 0o644)
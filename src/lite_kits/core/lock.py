@@ -0,0 +1,216 @@
+"""
+Advisory project locks under .specify/locks/.
+
+Several agents may run lite-kits in one repository at the same time. Short
+critical sections (allocating a feature number, for example) take a named
+lock file with an OS-level lock: fcntl.flock on POSIX, msvcrt.locking on
+Windows. The OS drops the lock when the holding process exits, so a crashed
+holder never blocks others; the file only records who holds it.
+
+Some network filesystems refuse OS locks. There the lock falls back to an
+exclusively created '<name>.lock.held' file, and a holder that is provably
+gone (dead pid on this host, or older than STALE_AFTER elsewhere) is broken.
+"""
+
+import errno
+import json
+import os
+import socket
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+LOCK_DIR = Path(".specify") / "locks"
+DEFAULT_TIMEOUT = 10.0
+POLL_INTERVAL = 0.05
+# Fallback locks older than this are stale even if their host can't be checked
+STALE_AFTER = 600.0
+
+# errno values meaning "this filesystem does not support OS locks"
+_UNSUPPORTED = {errno.ENOLCK, errno.EOPNOTSUPP, getattr(errno, "ENOTSUP", errno.EOPNOTSUPP)}
+
+
+class LockTimeoutError(RuntimeError):
+    """Raised when a project lock cannot be acquired in time."""
+
+
+class ProjectLock:
+    """Named advisory lock for one project (use as a context manager)."""
+
+    def __init__(
+        self,
+        target_dir: Path,
+        name: str,
+        timeout: float = DEFAULT_TIMEOUT,
+        lock_dir: Path = LOCK_DIR,
+    ):
+        """
+        Initialize project lock.
+
+        Args:
+            target_dir: Project root directory
+            name: Lock name (one file per name)
+            timeout: Seconds to wait for the lock (0 = fail immediately)
+            lock_dir: Lock directory relative to target_dir
+        """
+        self.path = Path(target_dir) / lock_dir / f"{name}.lock"
+        self.held_path = self.path.with_name(f"{name}.lock.held")
+        self.timeout = timeout
+        # Filled in by acquire(): seconds spent waiting, and whether anyone else held it
+        self.waited = 0.0
+        self.contended = False
+        self._fd: int | None = None
+        self._fallback = False
+
+    def acquire(self) -> "ProjectLock":
+        """
+        Acquire the lock, waiting up to the timeout.
+
+        Returns:
+            self
+
+        Raises:
+            LockTimeoutError: If another process holds the lock past the timeout
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        gitignore = self.path.parent / ".gitignore"
+        if not gitignore.exists():
+            gitignore.write_text("*\n", encoding='utf-8')
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        owner = json.dumps({"pid": os.getpid(), "host": socket.gethostname(), "since": time.time()})
+        started = time.monotonic()
+        deadline = started + self.timeout
+        self.contended = False
+        while True:
+            try:
+                if self._fallback:
+                    _create_held(self.held_path, owner)
+                else:
+                    _lock(fd)
+                break
+            except OSError as e:
+                if e.errno in _UNSUPPORTED and not self._fallback:
+                    self._fallback = True
+                    continue
+                if self._fallback and e.errno == errno.EEXIST and _is_stale(self.holder()):
+                    _remove(self.held_path)
+                    continue
+                self.contended = True
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    holder = self.holder()
+                    detail = ""
+                    if holder:
+                        detail = f" (held by pid {holder.get('pid')} on {holder.get('host')})"
+                    raise LockTimeoutError(f"Timed out waiting for {self.path}{detail}")
+                time.sleep(POLL_INTERVAL)
+
+        self.waited = time.monotonic() - started
+        os.ftruncate(fd, 0)
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.write(fd, owner.encode('utf-8'))
+        self._fd = fd
+        return self
+
+    def release(self):
+        """Release the lock (no-op if not held)."""
+        if self._fd is None:
+            return
+        try:
+            os.ftruncate(self._fd, 0)
+            if self._fallback:
+                _remove(self.held_path)
+            else:
+                _unlock(self._fd)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def holder(self) -> dict | None:
+        """
+        Read who holds (or last held) the lock.
+
+        Returns:
+            Dict with 'pid', 'host' and 'since', or None if unknown
+        """
+        for path in (self.held_path, self.path):
+            try:
+                data = json.loads(path.read_text(encoding='utf-8') or "null")
+            except (OSError, ValueError):
+                continue
+            if isinstance(data, dict):
+                return data
+        return None
+
+    def is_stale(self) -> bool:
+        """
+        Check whether the recorded holder is gone.
+
+        With OS locks a dead holder's lock is already released; this matters
+        for the fallback lock file and for diagnosing timeouts.
+
+        Returns:
+            True if a holder is recorded and provably no longer running
+        """
+        return _is_stale(self.holder())
+
+    def __enter__(self) -> "ProjectLock":
+        return self.acquire()
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+def _lock(fd: int):
+    """Take a non-blocking exclusive lock (raises OSError if held)."""
+    if fcntl:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+
+
+def _unlock(fd: int):
+    if fcntl:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+def _create_held(path: Path, owner: str):
+    """Create the fallback lock file (raises FileExistsError if held)."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    try:
+        os.write(fd, owner.encode('utf-8'))
+    finally:
+        os.close(fd)
+
+
+def _remove(path: Path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def _is_stale(holder: dict | None) -> bool:
+    """True if the holder's process is gone (same host) or its lock is too old."""
+    if not holder:
+        return False
+    if holder.get("host") == socket.gethostname() and fcntl and isinstance(holder.get("pid"), int):
+        # Signal 0 only checks existence (not usable on Windows, where fcntl is None)
+        try:
+            os.kill(holder["pid"], 0)
+        except ProcessLookupError:
+            return True
+        except OSError:
+            return False
+        return False
+    since = holder.get("since")
+    return isinstance(since, (int, float)) and time.time() - since > STALE_AFTER
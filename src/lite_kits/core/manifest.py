@@ -3,26 +3,178 @@ Kit manifest loader and utilities.
 
 Loads kit definitions from kits.yaml and provides helpers for installation,
 validation, and status checking.
+
+Besides the packaged kits, kits can come from kit packs: directories that
+hold one <kit>/kit.yaml fragment per kit (same schema as an entry under
+'kits:' in kits.yaml, sources relative to the pack directory). Packs are
+found on LITE_KITS_PATH and through 'lite_kits.packs' entry points, and a
+pack kit's fragment is only read and validated when that kit is asked for,
+so a large catalog doesn't slow down 'lite-kits add --kit dev'.
 """
 
-from pathlib import Path
-from typing import Dict, List, Optional
+import os
+import re
+from importlib.metadata import entry_points
+from pathlib import Path, PurePosixPath
+from types import ModuleType
+from typing import Dict, List, Optional, Tuple
+
 import yaml
 
+# Packaged kits (kits.yaml plus kit sources)
+KITS_DIR = Path(__file__).parent.parent / "kits"
+
+# Kit pack discovery
+PACK_PATH_ENV = "LITE_KITS_PATH"
+PACK_ENTRY_POINTS = "lite_kits.packs"
+KIT_FRAGMENT = "kit.yaml"
+
+_KIT_NAME_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]*$")
+
+
+def find_pack_dirs() -> Tuple[List[Path], List[str]]:
+    """
+    Locate installed kit packs.
+
+    LITE_KITS_PATH entries (os.pathsep-separated) come first, then the
+    directories named by 'lite_kits.packs' entry points. An entry point may
+    refer to a path, a package (its directory is used) or a callable
+    returning either. Packs that fail to load are skipped with a warning.
+
+    Returns:
+        (pack directories in lookup order without duplicates, warnings)
+    """
+    candidates = [Path(p) for p in os.environ.get(PACK_PATH_ENV, "").split(os.pathsep) if p]
+    warnings = []
+    for entry_point in entry_points(group=PACK_ENTRY_POINTS):
+        try:
+            target = entry_point.load()
+            if callable(target) and not isinstance(target, ModuleType):
+                target = target()
+            if isinstance(target, ModuleType):
+                target = Path(target.__file__).parent
+            candidates.append(Path(target))
+        except Exception as e:  # a broken pack must not break the CLI
+            warnings.append(f"Skipping kit pack '{entry_point.name}': {e}")
+
+    dirs = []
+    seen = set()
+    for path in candidates:
+        resolved = path.expanduser().resolve()
+        if resolved.is_dir() and resolved not in seen:
+            seen.add(resolved)
+            dirs.append(resolved)
+    return dirs, warnings
+
+
+def load_kit_fragment(name: str, kit: Dict, pack_dir: Path) -> Dict:
+    """
+    Validate a pack kit definition and resolve its sources.
+
+    Args:
+        name: Kit name (the fragment's directory name)
+        kit: Parsed <pack>/<name>/kit.yaml
+        pack_dir: Pack directory the sources are relative to
+
+    Returns:
+        Kit dict with sources made absolute and 'pack' set to the pack directory
+
+    Raises:
+        ValueError: If the definition is malformed, a path escapes the
+            project or pack, or a source file is missing
+    """
+    where = f"{pack_dir / name / KIT_FRAGMENT}"
+    errors = []
+    if not isinstance(kit, dict):
+        raise ValueError(f"Invalid kit manifest {where}: expected a mapping")
+    if not kit.get("name"):
+        errors.append("missing 'name'")
+    markers = kit.get("markers")
+    if not isinstance(markers, list) or not markers:
+        errors.append("'markers' must be a non-empty list")
+    else:
+        errors += [f"marker {m!r}: {e}" for m in markers for e in _path_errors(m)]
+
+    def check_source(label: str, entry: Dict):
+        if entry.get("status") == "planned":
+            return
+        source = entry.get("source")
+        problems = _path_errors(source)
+        if not problems and not (pack_dir / source).is_file():
+            problems = ["file not found"]
+        errors.extend(f"{label} source {source!r}: {e}" for e in problems)
+
+    commands = kit.get("commands") or []
+    if not isinstance(commands, list):
+        errors.append("'commands' must be a list")
+        commands = []
+    for command in commands:
+        if not isinstance(command, dict) or not command.get("name"):
+            errors.append(f"command {command!r}: missing 'name'")
+            continue
+        check_source(f"command {command['name']!r}", command)
+
+    groups = kit.get("files") or {}
+    if not isinstance(groups, dict):
+        errors.append("'files' must map group names to lists")
+        groups = {}
+    for group, entries in groups.items():
+        for entry in entries if isinstance(entries, list) else [None]:
+            if not isinstance(entry, dict):
+                errors.append(f"files.{group}: entries must be mappings with 'path' and 'source'")
+                continue
+            errors += [
+                f"files.{group} path {entry.get('path')!r}: {e}"
+                for e in _path_errors(entry.get("path"))
+            ]
+            check_source(f"files.{group}", entry)
+
+    if errors:
+        raise ValueError(f"Invalid kit manifest {where}: " + "; ".join(errors))
+
+    def resolve(entry: Dict) -> Dict:
+        if entry.get("source"):
+            entry = {**entry, "source": str(pack_dir / entry["source"])}
+        return entry
+
+    return {
+        **kit,
+        "commands": [resolve(command) for command in commands],
+        "files": {
+            group: [resolve(entry) for entry in entries] for group, entries in groups.items()
+        },
+        "pack": str(pack_dir),
+    }
+
+
+def _path_errors(path) -> List[str]:
+    """Problems with a manifest path: must be relative and stay inside its root."""
+    if not isinstance(path, str) or not path:
+        return ["missing"]
+    posix = PurePosixPath(path.replace("\\", "/"))
+    if posix.is_absolute() or Path(path).is_absolute() or ".." in posix.parts:
+        return ["must be a relative path without '..'"]
+    return []
+
 
 class KitManifest:
     """Loads and provides access to kit definitions from kits.yaml"""
 
-    def __init__(self, kits_dir: Path):
+    def __init__(self, kits_dir: Path, pack_dirs: Optional[List[Path]] = None):
         """
         Initialize manifest loader.
 
         Args:
             kits_dir: Path to kits directory containing kits.yaml
+            pack_dirs: Kit pack directories (None = find_pack_dirs() on first use)
         """
         self.kits_dir = kits_dir
         self.manifest_path = kits_dir / "kits.yaml"
         self._manifest = None
+        self._pack_dirs = pack_dirs
+        self._pack_kits: Dict[str, Optional[Dict]] = {}
+        # Problems found while discovering packs, for the caller to report
+        self.warnings: List[str] = []
 
     @property
     def manifest(self) -> Dict:
@@ -32,22 +184,102 @@ class KitManifest:
                 self._manifest = yaml.safe_load(f)
         return self._manifest
 
+    @property
+    def pack_dirs(self) -> List[Path]:
+        """Kit pack directories (discovered on first use)"""
+        if self._pack_dirs is None:
+            self._pack_dirs, self.warnings = find_pack_dirs()
+        return self._pack_dirs
+
     def get_kit(self, kit_name: str) -> Optional[Dict]:
-        """Get kit definition by name"""
-        return self.manifest['kits'].get(kit_name)
+        """
+        Get kit definition by name.
+
+        Packaged kits are looked up first; a pack kit's fragment is read and
+        validated the first time it is asked for.
+
+        Raises:
+            ValueError: If the pack kit's fragment is invalid
+        """
+        kit = self.manifest['kits'].get(kit_name)
+        if kit is None:
+            kit = self._load_pack_kit(kit_name)
+        return kit
 
     def get_all_kits(self) -> Dict[str, Dict]:
-        """Get all kit definitions"""
-        return self.manifest['kits']
+        """Get all valid kit definitions (loads every pack kit)"""
+        return {name: self.get_kit(name) for name in self.get_valid_kit_names()}
 
     def get_kit_names(self) -> List[str]:
-        """Get list of all kit names"""
-        return list(self.manifest['kits'].keys())
+        """Get list of all kit names (packaged first, then pack kits)"""
+        return list(self.manifest['kits'].keys()) + self.get_pack_kit_names()
+
+    def get_valid_kit_names(self) -> List[str]:
+        """
+        Kit names whose definitions load, for callers that act on every kit.
+
+        Pack kits with an invalid fragment are skipped; each one adds a
+        message to warnings.
+        """
+        names = []
+        for name in self.get_kit_names():
+            try:
+                self.get_kit(name)
+            except ValueError as e:
+                message = f"Skipping kit '{name}': {e}"
+                if message not in self.warnings:
+                    self.warnings.append(message)
+                continue
+            names.append(name)
+        return names
+
+    def get_pack_kit_names(self) -> List[str]:
+        """
+        Names of kits provided by packs, without reading their fragments.
+
+        A name already taken by a packaged kit or an earlier pack is skipped.
+        """
+        names = []
+        taken = set(self.manifest['kits'])
+        for pack in self.pack_dirs:
+            try:
+                with os.scandir(pack) as entries:
+                    found = sorted(
+                        entry.name for entry in entries
+                        if entry.is_dir() and (Path(entry.path) / KIT_FRAGMENT).is_file()
+                    )
+            except OSError:
+                continue
+            for name in found:
+                if name not in taken and _KIT_NAME_RE.match(name):
+                    taken.add(name)
+                    names.append(name)
+        return names
+
+    def _load_pack_kit(self, kit_name: str) -> Optional[Dict]:
+        """Read and validate one pack kit's fragment (cached)."""
+        if kit_name in self._pack_kits:
+            return self._pack_kits[kit_name]
+        kit = None
+        if _KIT_NAME_RE.match(kit_name):
+            for pack in self.pack_dirs:
+                fragment = pack / kit_name / KIT_FRAGMENT
+                try:
+                    with open(fragment, encoding='utf-8') as f:
+                        data = yaml.safe_load(f)
+                except FileNotFoundError:
+                    continue
+                except yaml.YAMLError as e:
+                    raise ValueError(f"Invalid kit manifest {fragment}: {e}")
+                kit = load_kit_fragment(kit_name, data, pack)
+                break
+        self._pack_kits[kit_name] = kit
+        return kit
 
     def get_recommended_kits(self) -> List[str]:
         """Get list of recommended kit names"""
         return [
-            name for name, kit in self.manifest['kits'].items()
+            name for name, kit in self.get_all_kits().items()
             if kit.get('recommended', False)
         ]
 
@@ -59,9 +291,13 @@ class KitManifest:
         """
         Get list of files for a kit.
 
+        Command templates are expanded into one file per agent (see
+        get_command_files()); other files come from the kit's 'files' groups.
+
         Args:
             kit_name: Name of kit
-            agent: Optional agent filter ('claude', 'copilot', None for all)
+            agent: Optional agent/shell filter ('claude', 'copilot', 'bash',
+                None for all groups and all supported agents)
 
         Returns:
             List of file dicts with 'path', 'source', 'required' keys
@@ -71,21 +307,58 @@ class KitManifest:
             return []
 
         files = []
-        file_groups = kit.get('files', {})
-
-        # Map agent names to file groups
-        agent_groups = {
-            'claude': ['claude'],
-            'copilot': ['copilot'],
-            None: list(file_groups.keys())  # All groups
-        }
-
-        groups_to_include = agent_groups.get(agent, [])
+        file_groups = kit.get('files') or {}
+
+        if agent is None:
+            groups_to_include = list(file_groups.keys())  # All groups
+            agents = [
+                name for name, config in self.manifest.get('agents', {}).items()
+                if config.get('supported', False)
+            ]
+        else:
+            groups_to_include = [agent]
+            agents = [agent] if self.get_agent_config(agent) else []
 
         for group_name in groups_to_include:
             if group_name in file_groups:
                 files.extend(file_groups[group_name])
 
+        for agent_name in agents:
+            files.extend(self.get_command_files(kit_name, agent_name))
+
+        return files
+
+    def get_command_files(self, kit_name: str, agent: str) -> List[Dict]:
+        """
+        Expand a kit's command templates into installable files for one agent.
+
+        Args:
+            kit_name: Name of kit
+            agent: Agent name ('claude', 'copilot', ...)
+
+        Returns:
+            List of file dicts with 'path', 'source', 'required', 'type',
+            'category' and 'agent' (marks the entry as a rendered template)
+        """
+        config = self.get_agent_config(agent)
+        if not config:
+            return []
+
+        files = []
+        for command in self.get_kit_commands(kit_name):
+            if not command.get('source'):
+                continue
+            entry = {
+                'path': f"{config['commands_dir']}/{command['name']}{config['file_extension']}",
+                'source': command['source'],
+                'required': command.get('required', True),
+                'type': config.get('file_type', 'command'),
+                'category': command.get('category'),
+                'agent': agent,
+            }
+            if command.get('status') == 'planned':
+                entry['status'] = 'planned'
+            files.append(entry)
         return files
 
     def get_kit_markers(self, kit_name: str) -> List[str]:
@@ -128,7 +401,7 @@ class KitManifest:
 
     def validate_kit_name(self, kit_name: str) -> bool:
         """Check if kit name is valid"""
-        return kit_name in self.get_kit_names()
+        return self.get_kit(kit_name) is not None
 
     def get_kit_description(self, kit_name: str) -> str:
         """Get kit description"""
@@ -0,0 +1,306 @@
+"""
+Precomputed /orient context bundle.
+
+Gathers everything the /orient prompt used to collect step by step (git state,
+recent commits, active spec progress, open handoffs, installed kits, which
+agents have been committing) in one
+process and renders it as a single size-bounded markdown bundle. The bundle is
+cached in .specify/cache/orient.md and only rewritten when its content changes.
+"""
+
+import os
+import re
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from .attribution import AttributionIndex
+from .cache import get_cache_dir, read_json, replace_file, write_json_atomic
+from .collab import KIND_HANDOFF, CollabIndex
+from .git import GitError, is_git_repo, recent_commits, status_summary
+from .manifest import KITS_DIR, KitManifest
+from .specs import SpecIndex
+
+BUNDLE_FILE = "orient.md"
+BUNDLE_DATA_FILE = "orient.json"
+
+DEFAULT_COMMITS = 5
+DEFAULT_MAX_BYTES = 4096
+
+# Window for the per-agent activity line
+ACTIVITY_DAYS = 7
+
+# Project docs an agent should read first (in order)
+PRIMARY_DOCS = [
+    ".github/copilot-instructions.md",
+    "CLAUDE.md",
+    ".specify/memory/constitution.md",
+    "README.md",
+]
+
+_BRANCH_NUM_RE = re.compile(r"(?:^|/)(?P<num>\d+)-")
+
+
+class OrientBuilder:
+    """Builds the orientation context bundle for a project."""
+
+    def __init__(self, target_dir: Path, kits_dir: Path | None = None):
+        """
+        Initialize orient builder.
+
+        Args:
+            target_dir: Project root directory
+            kits_dir: Kits directory containing kits.yaml (None = packaged kits)
+        """
+        self.target_dir = Path(target_dir).resolve()
+        self.kits_dir = kits_dir or KITS_DIR
+        self.cache_dir = get_cache_dir(self.target_dir)
+
+    def load_cached(self, max_age: float) -> dict | None:
+        """
+        Return the cached bundle data if it is younger than max_age seconds.
+
+        Args:
+            max_age: Maximum age in seconds
+
+        Returns:
+            Bundle data dict, or None if missing or stale
+        """
+        data = read_json(self.cache_dir / BUNDLE_DATA_FILE)
+        if not isinstance(data, dict) or time.time() - data.get("generated_at", 0) > max_age:
+            return None
+        return data
+
+    def build(self, commits: int = DEFAULT_COMMITS, max_bytes: int = DEFAULT_MAX_BYTES) -> dict:
+        """
+        Collect orientation data and refresh the cached bundle.
+
+        Args:
+            commits: Number of recent commits to include
+            max_bytes: Upper bound for the rendered markdown bundle
+
+        Returns:
+            Bundle data dict (also includes 'markdown' and 'bundle_path')
+        """
+        data = {
+            "generated_at": time.time(),
+            "project": self.target_dir.name,
+            "kits": self._installed_kits(),
+            "docs": [doc for doc in PRIMARY_DOCS if (self.target_dir / doc).is_file()],
+            "git": None,
+            "commits": [],
+            "feature": None,
+            "handoffs": [],
+            "sessions": 0,
+            "agents": [],
+        }
+
+        if is_git_repo(self.target_dir):
+            try:
+                git = status_summary(self.target_dir)
+                git.pop("files")
+                data["git"] = git
+                data["commits"] = recent_commits(self.target_dir, commits)
+            except GitError:
+                pass
+
+        branch = data["git"]["branch"] if data["git"] else None
+        data["feature"] = self._active_feature(branch)
+        feature_filter = data["feature"]["feature"] if data["feature"] else None
+        if data["git"]:
+            data["agents"] = self._agent_activity(feature_filter)
+
+        index = CollabIndex(self.target_dir)
+        try:
+            index.refresh()
+            data["handoffs"] = [
+                {k: h[k] for k in ("path", "agent", "to_agent", "date", "status")}
+                for h in index.query(kind=KIND_HANDOFF, open_only=True)
+            ]
+            data["sessions"] = len(index.query(kind="session", feature=feature_filter))
+        finally:
+            index.close()
+
+        data["next_action"] = suggest_next_action(data)
+        data["markdown"] = render_bundle(data, max_bytes)
+        bundle = self.cache_dir / BUNDLE_FILE
+        data["bundle_path"] = Path(os.path.relpath(bundle, self.target_dir)).as_posix()
+
+        try:
+            unchanged = bundle.read_text(encoding="utf-8") == data["markdown"]
+        except OSError:
+            unchanged = False
+        if not unchanged:
+            markdown = data["markdown"]
+            replace_file(bundle, lambda tmp: Path(tmp).write_text(markdown, encoding="utf-8"))
+        write_json_atomic(self.cache_dir / BUNDLE_DATA_FILE, data)
+
+        return data
+
+    def _installed_kits(self) -> list[str]:
+        """Kits whose marker files exist in the project (invalid pack kits are skipped)."""
+        manifest = KitManifest(self.kits_dir)
+        return [
+            name for name in manifest.get_valid_kit_names()
+            if any((self.target_dir / marker).exists() for marker in manifest.get_kit_markers(name))
+        ]
+
+    def _agent_activity(self, feature: str | None) -> list[dict]:
+        """Recent commits per agent on the active feature (whole repo without one)."""
+        since = (date.today() - timedelta(days=ACTIVITY_DAYS)).isoformat()
+        try:
+            index = AttributionIndex(self.target_dir)
+        except GitError:
+            return []
+        try:
+            index.refresh()
+            return [
+                {"agent": row["agent"], "commits": row["commits"]}
+                for row in index.summary(feature=feature, since=since)["agents"]
+            ]
+        except GitError:
+            return []
+        finally:
+            index.close()
+
+    def _active_feature(self, branch: str | None) -> dict | None:
+        """Pick the feature for the current branch (or the latest unfinished one)."""
+        features = SpecIndex(self.target_dir).scan()
+        if not features:
+            return None
+
+        if branch:
+            match = _BRANCH_NUM_RE.search(branch)
+            for feature in features:
+                if feature["feature"] == branch.rsplit("/", 1)[-1]:
+                    return feature
+                if not (match and feature["number"]):
+                    continue
+                if int(feature["number"]) == int(match.group("num")):
+                    return feature
+
+        unfinished = [f for f in features if f["stage"] != "complete"]
+        return unfinished[-1] if unfinished else None
+
+
+def suggest_next_action(data: dict) -> str:
+    """
+    Apply the /orient decision logic to bundle data.
+
+    Args:
+        data: Bundle data from OrientBuilder.build()
+
+    Returns:
+        Suggested next action sentence
+    """
+    feature = data.get("feature")
+    git = data.get("git") or {}
+
+    if data.get("handoffs"):
+        return f"Review handoff in {data['handoffs'][0]['path']}"
+    if git.get("conflicts"):
+        return "Resolve merge conflicts before continuing"
+    if not feature:
+        return "Run /specify to start a new feature"
+    if not feature["files"]["plan.md"]:
+        return "Run /plan to create implementation plan"
+    if not feature["files"]["tasks.md"]:
+        return "Run /tasks to break down into tasks"
+    if feature["stage"] != "complete":
+        return "Run /implement to continue with the next open task"
+    if git.get("staged") or git.get("modified"):
+        return "Review changes and consider running /commit"
+    return "Feature tasks complete - consider running /pr"
+
+
+def render_bundle(data: dict, max_bytes: int = DEFAULT_MAX_BYTES) -> str:
+    """
+    Render bundle data as markdown no larger than max_bytes.
+
+    Long lists (commits, handoffs, phases) are trimmed first; the header with
+    branch, feature and next action is always kept.
+
+    Args:
+        data: Bundle data from OrientBuilder.build()
+        max_bytes: Size bound in UTF-8 bytes
+
+    Returns:
+        Markdown text
+    """
+    git = data.get("git")
+    feature = data.get("feature")
+
+    header = ["# Orientation", ""]
+    header.append(f"**Project**: {data['project']}")
+    header.append(f"**Installed kits**: {', '.join(data['kits']) or 'vanilla only'}")
+    if git:
+        branch = git["branch"] or "(detached)"
+        if git["upstream"]:
+            branch += f" -> {git['upstream']} (ahead {git['ahead']}, behind {git['behind']})"
+        header.append(f"**Branch**: {branch}")
+        header.append(
+            f"**Working tree**: {git['staged']} staged, {git['modified']} modified, "
+            f"{git['untracked']} untracked, {git['conflicts']} conflicts"
+        )
+    else:
+        header.append("**Branch**: not in git repo")
+
+    if feature:
+        line = f"**Active feature**: specs/{feature['feature']}/ ({feature['stage']}"
+        tasks = feature.get("tasks")
+        if tasks and tasks["total"]:
+            line += f", {tasks['done']}/{tasks['total']} tasks"
+        header.append(line + ")")
+    else:
+        header.append("**Active feature**: none")
+    if data.get("agents"):
+        header.append(
+            f"**Agent activity ({ACTIVITY_DAYS}d)**: "
+            + ", ".join(f"{a['agent']} ({a['commits']})" for a in data["agents"][:5])
+        )
+    header.append(f"**Open handoffs**: {len(data['handoffs'])}")
+    header.append(f"**Next suggested action**: {data['next_action']}")
+
+    sections = []
+    if data["docs"]:
+        sections.append(["", "## Read First", ""] + [f"- {doc}" for doc in data["docs"]])
+    if data["commits"]:
+        sections.append(["", "## Recent Commits", ""] + [
+            f"- {c['hash']} {c['subject']} ({c['author']}, {c['relative']})"
+            for c in data["commits"]
+        ])
+    if feature and feature.get("tasks"):
+        tasks = feature["tasks"]
+        lines = ["", "## Task Progress", ""]
+        if feature["current_phase"]:
+            lines.append(f"Current phase: {feature['current_phase']}")
+        if tasks["next"]:
+            lines.append(f"Next task: {tasks['next']}")
+        lines += [f"- {p['name']}: {p['done']}/{p['total']}" for p in tasks["phases"]]
+        sections.append(lines)
+    if data["handoffs"]:
+        sections.append(["", "## Open Handoffs", ""] + [
+            f"- {h['path']} ({h['agent'] or '?'} -> {h['to_agent'] or '?'}, "
+            f"{h['date'] or 'undated'})"
+            for h in data["handoffs"]
+        ])
+
+    def size(parts: list[list[str]]) -> int:
+        lines = header + [line for part in parts for line in part]
+        return len("\n".join(lines).encode("utf-8")) + 1
+
+    # Trim the longest section one line at a time until the bundle fits
+    while sections and size(sections) > max_bytes:
+        longest = max(sections, key=len)
+        if len(longest) <= 4:
+            sections.remove(longest)
+        elif longest[-1] == "- ...":
+            longest.pop(-2)
+        else:
+            longest[-1] = "- ..."
+
+    text = "\n".join(header + [line for part in sections for line in part]) + "\n"
+    encoded = text.encode("utf-8")
+    if len(encoded) > max_bytes:
+        text = encoded[:max_bytes].decode("utf-8", errors="ignore")
+    return text
@@ -0,0 +1,252 @@
+"""
+Cross-branch overlap and conflict prediction for parallel agents.
+
+parallel-work-protocol.md asks agents to stay out of each other's files, but
+nothing checks it until merge time. This computes the changed-path set of
+every unmerged branch against the base (one 'git diff --name-only' per
+branch, run in parallel), adds uncommitted changes from each branch's
+worktree, and reports files touched by more than one branch. Pairs that
+share files get an in-memory 'git merge-tree --write-tree' run to predict
+textual conflicts; no working tree is touched. Path sets and merge results
+are cached in .specify/cache/overlap.json by branch tip, so a rerun only
+looks at branches that moved.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+from pathlib import Path
+
+from .cache import get_cache_dir, read_json, write_json_atomic
+from .git import GitError, default_branch, run_git, status_summary
+
+CACHE_FILE = "overlap.json"
+CACHE_VERSION = 1
+
+DEFAULT_JOBS = 8
+
+_FIELDS = ["refname", "refname:short", "objectname", "committerdate:unix", "worktreepath"]
+
+
+class OverlapAnalyzer:
+    """Finds files changed on more than one active branch."""
+
+    def __init__(self, target_dir: Path, base: str | None = None, jobs: int = DEFAULT_JOBS):
+        """
+        Initialize overlap analyzer.
+
+        Args:
+            target_dir: Repository directory
+            base: Branch changes are measured against (None = detect)
+            jobs: Parallel git processes
+        """
+        self.target_dir = Path(target_dir).resolve()
+        self.base = base or default_branch(self.target_dir)
+        self.jobs = max(1, jobs)
+
+    def analyze(
+        self,
+        branches: list[str] | None = None,
+        include_remote: bool = False,
+        since: int | None = None,
+        include_worktrees: bool = True,
+        predict: bool = True,
+    ) -> dict:
+        """
+        Compare the changed paths of all active branches.
+
+        Args:
+            branches: Branch names to compare (None = every branch not merged into base)
+            include_remote: Also compare remote-tracking branches (other machines' agents)
+            since: Only branches with commits after this Unix time
+            include_worktrees: Add uncommitted changes from each branch's worktree
+            predict: Run merge-tree on overlapping pairs to predict conflicts
+
+        Returns:
+            Dict with 'base', 'branches' (name, tip, worktree, changed and
+            uncommitted counts), 'overlaps' (path, branches, conflict),
+            'pairs' (branches, files, conflicts - None if not predicted),
+            'cache' counters and 'seconds'
+
+        Raises:
+            GitError: If git fails (e.g. the base branch does not exist)
+            ValueError: If a requested branch is unknown or already merged
+        """
+        started = time.monotonic()
+        base_tip = run_git(
+            ["rev-parse", "--verify", f"{self.base}^{{commit}}"], self.target_dir
+        ).strip()
+        candidates = self._branches(branches, include_remote, since)
+
+        cache = read_json(get_cache_dir(self.target_dir) / CACHE_FILE)
+        if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+            cache = {}
+        old_paths: dict[str, list[str]] = cache.get("paths") or {}
+        old_merges: dict[str, list[str] | None] = cache.get("merges") or {}
+        counters = {"diffs": 0, "diffs_cached": 0, "merges": 0, "merges_cached": 0}
+
+        # Committed changes: one diff per branch tip not seen before
+        keys = {branch["name"]: f"{base_tip}:{branch['tip']}" for branch in candidates}
+        missing = sorted({key for key in keys.values() if key not in old_paths})
+        paths = {key: old_paths[key] for key in keys.values() if key in old_paths}
+        counters["diffs_cached"] = len(paths)
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            for key, changed in zip(missing, pool.map(self._changed_paths, missing)):
+                paths[key] = changed
+        counters["diffs"] = len(missing)
+
+        committed: dict[str, set[str]] = {}
+        uncommitted: dict[str, set[str]] = {}
+        for branch in candidates:
+            committed[branch["name"]] = set(paths[keys[branch["name"]]])
+            uncommitted[branch["name"]] = set()
+            if include_worktrees and branch["worktree"]:
+                try:
+                    # Per file: an untracked directory (e.g. each agent's new
+                    # session log) must not collapse into one shared path
+                    dirty = status_summary(Path(branch["worktree"]), all_untracked=True)["files"]
+                except GitError:
+                    dirty = []
+                uncommitted[branch["name"]] = set(dirty) - committed[branch["name"]]
+
+        touched: dict[str, list[str]] = {}
+        for branch in candidates:
+            for path in committed[branch["name"]] | uncommitted[branch["name"]]:
+                touched.setdefault(path, []).append(branch["name"])
+
+        # Pairs sharing files; merge-tree only sees commits, so only committed
+        # overlaps are predicted
+        tips = {branch["name"]: branch["tip"] for branch in candidates}
+        shared: dict[tuple[str, str], list[str]] = {}
+        for path, names in touched.items():
+            for pair in combinations(sorted(names), 2):
+                shared.setdefault(pair, []).append(path)
+
+        merges = {}
+        to_merge = []
+        for a, b in shared:
+            if not (committed[a] & committed[b]):
+                continue
+            key = ":".join(sorted((tips[a], tips[b])))
+            if key in old_merges:
+                merges[key] = old_merges[key]
+            elif predict:
+                to_merge.append(key)
+        counters["merges_cached"] = len(merges)
+        to_merge = sorted(set(to_merge))
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            for key, conflicts in zip(to_merge, pool.map(self._merge_conflicts, to_merge)):
+                merges[key] = conflicts
+        counters["merges"] = len(to_merge)
+
+        pairs = []
+        conflicted: set[str] = set()
+        for (a, b), files in sorted(shared.items()):
+            key = ":".join(sorted((tips[a], tips[b])))
+            conflicts = merges.get(key) if predict else None
+            conflicted.update(conflicts or [])
+            pairs.append({
+                "branches": [a, b],
+                "files": sorted(files),
+                "uncommitted": sorted(
+                    f for f in files if f not in committed[a] or f not in committed[b]
+                ),
+                "conflicts": conflicts,
+            })
+
+        overlaps = [
+            {"path": path, "branches": sorted(names), "conflict": path in conflicted}
+            for path, names in sorted(touched.items())
+            if len(names) > 1
+        ]
+
+        if (self.target_dir / ".specify").is_dir():
+            # A full run drops tips that moved on; a filtered one keeps the rest
+            filtered = branches is not None or since is not None
+            write_json_atomic(get_cache_dir(self.target_dir) / CACHE_FILE, {
+                "version": CACHE_VERSION,
+                "paths": {
+                    **(old_paths if filtered else {}),
+                    **{key: paths[key] for key in keys.values()},
+                },
+                "merges": {**(old_merges if filtered else {}), **merges},
+            })
+
+        return {
+            "base": self.base,
+            "branches": [
+                {
+                    **branch,
+                    "changed": len(committed[branch["name"]]),
+                    "uncommitted": len(uncommitted[branch["name"]]),
+                }
+                for branch in candidates
+            ],
+            "overlaps": overlaps,
+            "pairs": pairs,
+            "cache": counters,
+            "seconds": round(time.monotonic() - started, 3),
+        }
+
+    def _branches(
+        self, names: list[str] | None, include_remote: bool, since: int | None
+    ) -> list[dict]:
+        """Unmerged branches (tip, date, worktree) from one for-each-ref call."""
+        patterns = ["refs/heads"] + (["refs/remotes"] if include_remote else [])
+        output = run_git(
+            [
+                "for-each-ref",
+                f"--no-merged={self.base}",
+                "--format=" + "%00".join(f"%({f})" for f in _FIELDS),
+                *patterns,
+            ],
+            self.target_dir,
+        )
+        base_names = {self.base, self.base.split("/")[-1]}
+        branches = []
+        for line in output.splitlines():
+            fields = line.split("\0")
+            if len(fields) != len(_FIELDS):
+                continue
+            ref, name, tip, date, worktree = fields
+            if name in base_names or ref.endswith("/HEAD"):
+                continue
+            if names is not None and name not in names:
+                continue
+            if since is not None and int(date or 0) < since:
+                continue
+            branches.append({"name": name, "tip": tip, "worktree": worktree or None})
+
+        if names:
+            unknown = sorted(set(names) - {branch["name"] for branch in branches})
+            if unknown:
+                raise ValueError(f"Not an unmerged branch: {', '.join(unknown)}")
+        return branches
+
+    def _changed_paths(self, key: str) -> list[str]:
+        """Paths changed on a branch since it forked from base ('base...tip')."""
+        base_tip, tip = key.split(":")
+        output = run_git(
+            ["diff", "--name-only", "-z", "--no-renames", f"{base_tip}...{tip}"], self.target_dir
+        )
+        return sorted(path for path in output.split("\0") if path)
+
+    def _merge_conflicts(self, key: str) -> list[str] | None:
+        """
+        Conflicted paths of an in-memory merge of two tips.
+
+        Returns:
+            Sorted paths ([] for a clean merge), or None if this git has no
+            'merge-tree --write-tree' (before 2.38)
+        """
+        a, b = key.split(":")
+        output = run_git(
+            ["merge-tree", "--write-tree", "--name-only", "--no-messages", a, b],
+            self.target_dir,
+            check=False,
+        )
+        lines = output.splitlines()
+        if not lines:
+            return None
+        # First line is the merged tree; conflicted paths follow
+        return sorted(set(line for line in lines[1:] if line))
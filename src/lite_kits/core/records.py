@@ -0,0 +1,395 @@
+"""
+Collaboration record scaffolding.
+
+Creating a session log, handoff or decision used to mean copying a template
+from .specify/templates/ and filling in date, agent, feature, commits and
+changed files by hand, with a git command for each. This collects the git
+side from one 'git log --numstat' pass, renders the template in memory and
+places the finished record under specs/<feature>/collaboration/active/ with
+an atomic rename, then updates the collaboration index for just that file.
+"""
+
+import os
+import re
+from datetime import date
+from pathlib import Path
+
+from .cache import replace_file
+from .collab import KIND_DECISION, KIND_HANDOFF, KIND_SESSION, KINDS, CollabIndex
+from .feature import resolve_feature, slugify
+from .git import GitError, current_branch, default_branch, run_git
+from .lock import ProjectLock
+
+TEMPLATE_DIR = Path(".specify") / "templates"
+TEMPLATES = {
+    KIND_SESSION: "session-log.md",
+    KIND_HANDOFF: "handoff.md",
+    KIND_DECISION: "decision.md",
+}
+# Packaged copies, used when the multiagent kit isn't installed in the project
+KIT_TEMPLATE_DIR = Path(__file__).parent.parent / "kits" / "multiagent" / "templates"
+
+DEFAULT_COMMITS = 20
+LOCK_NAME = "collab"
+
+# Status for records created without --status (handoffs have none)
+_DEFAULT_STATUS = {KIND_SESSION: "ongoing", KIND_DECISION: "proposed"}
+
+_FIELD_RE = re.compile(r"^\*\*(?P<key>[^*]+)\*\*:\s*(?P<value>.*)$")
+_FEATURE_RE = re.compile(r"^(\d+)-")
+
+# Heading placeholders -> value key
+_TITLE_PLACEHOLDERS = {
+    "[AGENT-NAME]": "agent",
+    "[FROM-AGENT]": "agent",
+    "[TO-AGENT]": "to_agent",
+    "[DECISION TITLE]": "title",
+}
+
+# "**Key**:" template fields -> value key (only placeholder values are replaced)
+_FIELD_VALUES = {
+    "date": "date",
+    "agent": "agent",
+    "from": "agent",
+    "decided by": "agent",
+    "to": "to_agent",
+    "feature": "feature",
+    "duration": "duration",
+    "status": "status",
+    "session status": "status",
+    "commits this session": "commit_count",
+    "lines changed": "lines",
+    "last updated": "date",
+}
+
+# List labels followed by example bullets -> generated list
+_LIST_LABELS = {
+    "**commits**:": "commits",
+    "**key files**:": "files",
+    "**files affected**:": "files",
+    "**commits implementing this**:": "commits",
+}
+
+
+def git_context(cwd: Path, since: str | None = None, limit: int = DEFAULT_COMMITS) -> dict:
+    """
+    Commits and changed files of the current branch from one 'git log' pass.
+
+    On a feature branch only commits not on the base branch are listed; on
+    the base branch itself the most recent ones.
+
+    Args:
+        cwd: Repository directory
+        since: Only commits after this date/time (git --since syntax)
+        limit: Maximum number of commits
+
+    Returns:
+        Dict with 'branch', 'commits' (hash, subject), 'files' (in order of
+        first appearance, newest commit first), 'added' and 'deleted' line
+        counts; empty lists outside a repository or before the first commit
+    """
+    context = {"branch": None, "commits": [], "files": [], "added": 0, "deleted": 0}
+    branch = current_branch(cwd)
+    context["branch"] = branch
+    try:
+        base = default_branch(cwd)
+    except GitError:
+        base = None
+    revs = [f"{base}..HEAD"] if base and branch and branch != base else ["HEAD"]
+
+    args = [
+        "-c", "core.quotePath=false",
+        "log", "--no-merges", "--no-renames", f"-n{limit}", "--numstat", "--format=%x1e%h%x1f%s",
+    ]
+    if since:
+        args.append(f"--since={since}")
+    try:
+        output = run_git([*args, *revs], cwd)
+    except GitError:
+        if revs == ["HEAD"]:
+            return context
+        # Base branch missing locally: fall back to the branch's own history
+        try:
+            output = run_git([*args, "HEAD"], cwd)
+        except GitError:
+            return context
+
+    seen = set()
+    for record in output.split("\x1e")[1:]:
+        header, _, numstat = record.partition("\n")
+        hash_, _, subject = header.partition("\x1f")
+        context["commits"].append({"hash": hash_, "subject": subject})
+        for line in numstat.splitlines():
+            parts = line.split("\t", 2)
+            if len(parts) != 3:
+                continue
+            added, deleted, path = parts
+            context["added"] += int(added) if added.isdigit() else 0
+            context["deleted"] += int(deleted) if deleted.isdigit() else 0
+            if path not in seen:
+                seen.add(path)
+                context["files"].append(path)
+    return context
+
+
+def render_record(kind: str, template: str, values: dict) -> str:
+    """
+    Fill a collaboration template in memory.
+
+    Only placeholders are replaced ("[agent-name]", "YYYY-MM-DD", example
+    commit and file bullets), so customized templates keep their own text.
+
+    Args:
+        kind: Record kind (session, handoff, decision)
+        template: Template text
+        values: 'agent', 'to_agent', 'feature', 'date', 'title', 'status'
+            and optionally 'commits', 'files', 'added', 'deleted'
+
+    Returns:
+        Rendered markdown
+    """
+    commits = values.get("commits") or []
+    files = values.get("files") or []
+    lists = {
+        "commits": [f"`{c['hash']}` - {c['subject']}" for c in commits] or ["(none yet)"],
+        "files": [f"`{path}`" for path in files] or ["(none yet)"],
+    }
+    fields = {
+        **values,
+        "duration": "ongoing",
+        "commit_count": f"{len(commits)} commits",
+        "lines": f"+{values.get('added', 0)} -{values.get('deleted', 0)}",
+    }
+
+    out: list[str] = []
+    skip_bullets = False
+    in_work_section = False
+    for line in template.splitlines():
+        stripped = line.strip()
+
+        # Session logs: the example task blocks become one generated block
+        if kind == KIND_SESSION and stripped == "## Work Completed":
+            in_work_section = True
+            out += [line, "", "- Files changed:"]
+            out += [f"  - {item}" for item in lists["files"]]
+            out += ["- Commits:"]
+            out += [f"  - {item}" for item in lists["commits"]]
+            out.append("")
+            continue
+        if in_work_section:
+            if stripped.startswith("## "):
+                in_work_section = False
+            else:
+                continue
+
+        if skip_bullets:
+            if stripped.startswith("- `"):
+                continue
+            skip_bullets = False
+
+        if line.startswith("# "):
+            for placeholder, key in _TITLE_PLACEHOLDERS.items():
+                if fields.get(key):
+                    line = line.replace(placeholder, fields[key])
+            out.append(line)
+            continue
+
+        label = stripped.lower()
+        if label in _LIST_LABELS:
+            indent = line[:len(line) - len(line.lstrip())]
+            out.append(line)
+            out += [f"{indent}- {item}" for item in lists[_LIST_LABELS[label]]]
+            skip_bullets = True
+            continue
+
+        match = _FIELD_RE.match(stripped)
+        if match:
+            key = _FIELD_VALUES.get(match.group("key").strip().lower())
+            value = match.group("value").strip()
+            if key and fields.get(key) and (value.startswith("[") or value.startswith("YYYY")):
+                line = f"**{match.group('key')}**: {fields[key]}"
+        out.append(line)
+
+    return "\n".join(out) + "\n"
+
+
+def record_path(feature_dir: Path, kind: str, values: dict) -> Path:
+    """
+    Conventional path of a new record (before making it unique).
+
+    Session logs are sessions/<date>-<agent>.md, handoffs
+    decisions/handoff-to-<agent>.md and decisions decisions/<date>-<slug>.md.
+    """
+    active = feature_dir / "collaboration" / "active"
+    if kind == KIND_SESSION:
+        return active / "sessions" / f"{values['date']}-{values['agent']}.md"
+    if kind == KIND_HANDOFF:
+        return active / "decisions" / f"handoff-to-{values.get('to_agent') or 'any'}.md"
+    slug = slugify(values.get("title") or "decision", words=6) or "decision"
+    return active / "decisions" / f"{values['date']}-{slug}.md"
+
+
+def new_record(
+    feature_dir: Path,
+    kind: str,
+    template: str,
+    values: dict,
+    lock_root: Path | None = None,
+) -> tuple[Path, bool]:
+    """
+    Render a record and place it atomically under collaboration/active/.
+
+    A session log that already exists for the same agent and day is kept as
+    is. Handoffs and decisions never overwrite: a taken name gets a numeric
+    suffix. The name is picked and the file renamed into place under the
+    project's 'collab' lock, so concurrent writers can't claim the same path,
+    and readers (or 'collab watch') never see a half-written record.
+
+    Args:
+        feature_dir: Feature spec directory (specs/NNN-name)
+        kind: Record kind
+        template: Template text
+        values: Template values (see render_record); 'date' defaults to today
+        lock_root: Project root holding .specify/locks (default: two levels above feature_dir)
+
+    Returns:
+        (path, created)
+    """
+    values = {**values, "date": values.get("date") or date.today().isoformat()}
+    values.setdefault("feature", feature_dir.name)
+    text = render_record(kind, template, values)
+    path = record_path(feature_dir, kind, values)
+
+    with ProjectLock(lock_root or feature_dir.parent.parent, LOCK_NAME):
+        if path.exists():
+            if kind == KIND_SESSION:
+                return path, False
+            stem, number = path.stem, 2
+            while path.exists():
+                path = path.with_name(f"{stem}-{number}.md")
+                number += 1
+        replace_file(path, lambda tmp: _write_text(tmp, text))
+    return path, True
+
+
+class RecordWriter:
+    """Creates collaboration records with git context filled in."""
+
+    def __init__(self, target_dir: Path):
+        """
+        Initialize record writer.
+
+        Args:
+            target_dir: Project root directory (containing specs/)
+        """
+        self.target_dir = Path(target_dir).resolve()
+
+    def create(
+        self,
+        kind: str,
+        agent: str,
+        feature: str | None = None,
+        to_agent: str | None = None,
+        title: str | None = None,
+        status: str | None = None,
+        since: str | None = None,
+        git: bool = True,
+    ) -> dict:
+        """
+        Create a session log, handoff or decision.
+
+        Args:
+            kind: Record kind (session, handoff, decision)
+            agent: Agent writing the record
+            feature: Feature name or number (None = from the current branch)
+            to_agent: Receiving agent (handoffs)
+            title: Decision title
+            status: Status field (default: template's own, 'proposed' for decisions)
+            since: Only list commits after this (default: today for sessions)
+            git: Fill in commits and changed files
+
+        Returns:
+            Dict with 'path' (project-relative), 'created', 'kind', 'feature',
+            'commits' and 'files'
+
+        Raises:
+            ValueError: If the kind is unknown, a handoff has no recipient,
+                a decision has no title, or the feature can't be determined
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Unknown record kind: '{kind}'. Valid: {', '.join(KINDS)}")
+        if kind == KIND_HANDOFF and not to_agent:
+            raise ValueError("A handoff needs a recipient (--to)")
+        if kind == KIND_DECISION and not title:
+            raise ValueError("A decision needs a title (--title)")
+
+        today = date.today().isoformat()
+        if since is None and kind == KIND_SESSION:
+            since = f"{today} 00:00"
+        if git:
+            context = git_context(self.target_dir, since=since)
+        else:
+            context = {"branch": current_branch(self.target_dir)}
+        feature = self._feature(feature, context.get("branch"))
+
+        values = {
+            "agent": agent,
+            "to_agent": to_agent,
+            "title": title,
+            "status": status or _DEFAULT_STATUS.get(kind),
+            "date": today,
+            "feature": feature,
+            "commits": context.get("commits", []),
+            "files": context.get("files", []),
+            "added": context.get("added", 0),
+            "deleted": context.get("deleted", 0),
+        }
+        path, created = new_record(
+            self.target_dir / "specs" / feature, kind, self._template(kind), values,
+            lock_root=self.target_dir,
+        )
+
+        index = CollabIndex(self.target_dir)
+        try:
+            index.update_paths([path])
+        finally:
+            index.close()
+
+        return {
+            "path": path.relative_to(self.target_dir).as_posix(),
+            "created": created,
+            "kind": kind,
+            "feature": feature,
+            "commits": len(values["commits"]),
+            "files": len(values["files"]),
+        }
+
+    def _feature(self, feature: str | None, branch: str | None) -> str:
+        """Feature directory name from an explicit name/number or the branch."""
+        if not feature:
+            match = _FEATURE_RE.match((branch or "").rsplit("/", 1)[-1])
+            if not match:
+                raise ValueError(
+                    "No feature given and the current branch is not a feature branch "
+                    "(use --feature)"
+                )
+            feature = match.group(1)
+        name = resolve_feature(self.target_dir, feature)
+        if not (self.target_dir / "specs" / name).is_dir():
+            raise ValueError(f"No spec directory for feature {name}: specs/{name}/")
+        return name
+
+    def _template(self, kind: str) -> str:
+        """Project template, falling back to the packaged one."""
+        for directory in (self.target_dir / TEMPLATE_DIR, KIT_TEMPLATE_DIR):
+            try:
+                return (directory / TEMPLATES[kind]).read_text(encoding='utf-8')
+            except OSError:
+                continue
+        raise ValueError(f"Template not found: {TEMPLATE_DIR / TEMPLATES[kind]}")
+
+
+def _write_text(tmp: str, text: str):
+    with open(tmp, "w", encoding='utf-8', newline="") as f:
+        f.write(text)
+    os.chmod(tmp, 0o644)
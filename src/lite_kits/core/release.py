@@ -0,0 +1,424 @@
+"""
+Release notes and version bumps behind /bump, /tag and /release.
+
+Commits since the last tag are read from one streamed 'git log' pass and
+grouped by conventional commit type; only the newest entries of each group
+are kept, so memory stays bounded on very long histories. Version strings in
+pyproject.toml, setup.cfg, package.json and __init__.py-style files are
+rewritten together after every file has been read and checked, then the
+changelog section, release commit and annotated tag are created.
+"""
+
+import datetime
+import re
+from pathlib import Path
+
+from .cache import write_text_atomic
+from .git import GitError, run_git, stream_git
+
+DEFAULT_TAG_PREFIX = "v"
+DEFAULT_MAX_ENTRIES = 50
+CHANGELOG = "CHANGELOG.md"
+
+# Changelog heading per conventional commit type (Keep a Changelog names first)
+SECTIONS = {
+    "feat": "Added",
+    "fix": "Fixed",
+    "perf": "Changed",
+    "refactor": "Changed",
+    "revert": "Changed",
+    "style": "Changed",
+    "docs": "Documentation",
+    "build": "Maintenance",
+    "ci": "Maintenance",
+    "chore": "Maintenance",
+    "test": "Maintenance",
+}
+SECTION_ORDER = [
+    "Breaking Changes", "Added", "Fixed", "Changed", "Documentation", "Maintenance", "Other",
+]
+
+_CONVENTIONAL_RE = re.compile(
+    r"^(?P<type>[a-zA-Z]+)(?:\((?P<scope>[^)]*)\))?(?P<breaking>!)?:\s*(?P<subject>.+)$"
+)
+_BREAKING_RE = re.compile(r"^BREAKING[ -]CHANGE:", re.MULTILINE)
+_SEMVER_RE = re.compile(r"^(\d+)\.(\d+)\.(\d+)(?:[-+].*)?$")
+
+# (glob, regex with a 'version' group) per supported version file; the first
+# match in each file is rewritten
+VERSION_PATTERNS = [
+    ("pyproject.toml", re.compile(
+        r'^(?P<pre>version\s*=\s*["\'])(?P<version>[^"\']+)(?P<post>["\'])', re.MULTILINE
+    )),
+    ("setup.cfg", re.compile(
+        r"^(?P<pre>version\s*=\s*)(?P<version>\d[^\s#]*)(?P<post>)", re.MULTILINE
+    )),
+    ("package.json", re.compile(r'(?P<pre>"version"\s*:\s*")(?P<version>[^"]+)(?P<post>")')),
+    ("__init__.py", re.compile(
+        r'^(?P<pre>__version__\s*=\s*["\'])(?P<version>[^"\']+)(?P<post>["\'])', re.MULTILINE
+    )),
+    ("_version.py", re.compile(
+        r'^(?P<pre>__version__\s*=\s*["\'])(?P<version>[^"\']+)(?P<post>["\'])', re.MULTILINE
+    )),
+]
+
+# Directories searched for __init__.py / _version.py (package roots, src layout)
+_PACKAGE_GLOBS = ["*/{name}", "src/*/{name}"]
+
+
+def parse_commit(subject: str, body: str = "") -> dict:
+    """
+    Split a commit message into conventional commit parts.
+
+    Args:
+        subject: First line of the message
+        body: Remaining message text (checked for BREAKING CHANGE footers)
+
+    Returns:
+        Dict with 'type' (None when not conventional), 'scope', 'breaking'
+        and 'subject'
+    """
+    match = _CONVENTIONAL_RE.match(subject.strip())
+    if not match:
+        return {
+            "type": None,
+            "scope": None,
+            "breaking": bool(_BREAKING_RE.search(body)),
+            "subject": subject.strip(),
+        }
+    return {
+        "type": match.group("type").lower(),
+        "scope": match.group("scope") or None,
+        "breaking": bool(match.group("breaking")) or bool(_BREAKING_RE.search(body)),
+        "subject": match.group("subject").strip(),
+    }
+
+
+def bump_version(version: str, level: str) -> str:
+    """
+    Compute the next semantic version.
+
+    Args:
+        version: Current version ('1.2.3'; pre-release/build suffixes dropped)
+        level: 'major', 'minor', 'patch' or an explicit 'X.Y.Z'
+
+    Returns:
+        New version string
+
+    Raises:
+        ValueError: If the version or level cannot be parsed
+    """
+    if _SEMVER_RE.match(level):
+        return level
+    match = _SEMVER_RE.match(version)
+    if not match:
+        raise ValueError(f"Not a semantic version: {version}")
+    major, minor, patch = (int(part) for part in match.groups())
+    if level == "major":
+        return f"{major + 1}.0.0"
+    if level == "minor":
+        return f"{major}.{minor + 1}.0"
+    if level == "patch":
+        return f"{major}.{minor}.{patch + 1}"
+    raise ValueError(f"Unknown bump level '{level}' (use major, minor, patch or X.Y.Z)")
+
+
+def render_notes(notes: dict, version: str, date: str | None = None) -> str:
+    """
+    Render grouped commits as a changelog section.
+
+    Args:
+        notes: Result of ReleaseBuilder.collect()
+        version: Version for the heading
+        date: ISO date (default: today)
+
+    Returns:
+        Markdown starting with '## [version] - date'
+    """
+    lines = [f"## [{version}] - {date or datetime.date.today().isoformat()}", ""]
+    for section in notes["sections"]:
+        lines.append(f"### {section['title']}")
+        lines.append("")
+        for entry in section["entries"]:
+            scope = f"**{entry['scope']}:** " if entry["scope"] else ""
+            lines.append(f"- {scope}{entry['subject']} ({entry['hash']})")
+        hidden = section["count"] - len(section["entries"])
+        if hidden > 0:
+            lines.append(f"- ...and {hidden} more")
+        lines.append("")
+    if not notes["sections"]:
+        lines.extend(["_No changes._", ""])
+    return "\n".join(lines)
+
+
+class ReleaseBuilder:
+    """Collects release notes and applies version bumps for one repository."""
+
+    def __init__(self, target_dir: Path, tag_prefix: str | None = None):
+        """
+        Initialize release builder.
+
+        Args:
+            target_dir: Repository directory
+            tag_prefix: Tag prefix (None = taken from the last tag, else 'v')
+
+        Raises:
+            GitError: If target_dir is not a git repository
+        """
+        self.target_dir = Path(target_dir).resolve()
+        self.top = Path(run_git(["rev-parse", "--show-toplevel"], self.target_dir).strip())
+        self.last_tag = run_git(
+            ["describe", "--tags", "--abbrev=0"], self.top, check=False
+        ).strip() or None
+        if tag_prefix is None:
+            tag_prefix = DEFAULT_TAG_PREFIX
+            if self.last_tag and not self.last_tag[:1].isdigit():
+                tag_prefix = re.match(r"^\D*", self.last_tag).group(0)
+        self.tag_prefix = tag_prefix
+
+    def collect(self, since: str | None = None, max_entries: int = DEFAULT_MAX_ENTRIES) -> dict:
+        """
+        Group commits since a tag from one streamed 'git log' pass.
+
+        Args:
+            since: Starting revision (default: the last tag, or all history)
+            max_entries: Newest entries kept per section (counts stay exact)
+
+        Returns:
+            Dict with 'since', 'commits', 'contributors', 'breaking',
+            'suggested_bump' and 'sections' (list of {'title', 'count',
+            'entries'} in changelog order)
+        """
+        since = since or self.last_tag
+        rev = f"{since}..HEAD" if since else "HEAD"
+        sections: dict[str, dict] = {}
+        authors = set()
+        commits = 0
+        breaking = 0
+        features = 0
+
+        records = stream_git(
+            ["log", "--no-merges", "--format=%h%x1f%aN%x1f%s%x1f%b%x1e", rev, "--"],
+            self.top,
+            sep="\x1e",
+        )
+        for record in records:
+            fields = record.lstrip("\n").split("\x1f")
+            if len(fields) != 4:
+                continue
+            short_hash, author, subject, body = fields
+            commit = parse_commit(subject, body)
+            commits += 1
+            authors.add(author)
+            features += commit["type"] == "feat"
+            breaking += commit["breaking"]
+
+            if commit["breaking"]:
+                title = "Breaking Changes"
+            else:
+                title = SECTIONS.get(commit["type"], "Other")
+            section = sections.setdefault(title, {"title": title, "count": 0, "entries": []})
+            section["count"] += 1
+            if len(section["entries"]) < max_entries:
+                section["entries"].append({
+                    "hash": short_hash,
+                    "type": commit["type"],
+                    "scope": commit["scope"],
+                    "subject": commit["subject"],
+                    "author": author,
+                })
+
+        current = self.current_version()
+        if breaking:
+            # 0.x versions signal breaking changes with a minor bump
+            suggested = "minor" if current and current.startswith("0.") else "major"
+        elif features:
+            suggested = "minor"
+        else:
+            suggested = "patch"
+
+        return {
+            "since": since,
+            "commits": commits,
+            "contributors": len(authors),
+            "breaking": breaking,
+            "suggested_bump": suggested if commits else None,
+            "sections": [sections[title] for title in SECTION_ORDER if title in sections],
+        }
+
+    def version_files(self) -> list[tuple[Path, re.Pattern, str]]:
+        """
+        Find files carrying a version string.
+
+        Returns:
+            List of (path, pattern, current version) tuples
+        """
+        found = []
+        for name, pattern in VERSION_PATTERNS:
+            if name.endswith(".py"):
+                candidates = sorted(
+                    p for g in _PACKAGE_GLOBS for p in self.top.glob(g.format(name=name))
+                )
+            else:
+                candidates = [self.top / name]
+            for path in candidates:
+                try:
+                    match = pattern.search(_read_text(path))
+                except (OSError, UnicodeDecodeError):
+                    continue
+                if match:
+                    found.append((path, pattern, match.group("version")))
+        return found
+
+    def current_version(self) -> str | None:
+        """Version from the first version file, falling back to the last tag."""
+        files = self.version_files()
+        if files:
+            return files[0][2]
+        if self.last_tag and self.last_tag.startswith(self.tag_prefix):
+            return self.last_tag[len(self.tag_prefix):]
+        return None
+
+    def plan(self, level: str | None = None, max_entries: int = DEFAULT_MAX_ENTRIES) -> dict:
+        """
+        Work out the next release without changing anything.
+
+        Args:
+            level: 'major', 'minor', 'patch', 'X.Y.Z' or None (suggested from commits)
+            max_entries: Newest entries kept per changelog section
+
+        Returns:
+            collect() result plus 'current', 'version', 'tag', 'files'
+            ([{'path', 'from', 'to'}]) and 'notes' (markdown)
+
+        Raises:
+            ValueError: If no version can be determined or the bump is invalid
+            GitError: If the tag already exists
+        """
+        notes = self.collect(max_entries=max_entries)
+        current = self.current_version() or "0.0.0"
+        version = bump_version(current, level or notes["suggested_bump"] or "patch")
+        tag = f"{self.tag_prefix}{version}"
+        exists = run_git(
+            ["rev-parse", "--verify", "--quiet", f"refs/tags/{tag}"], self.top, check=False
+        )
+        if exists.strip():
+            raise GitError(f"Tag {tag} already exists")
+
+        return {
+            **notes,
+            "current": current,
+            "version": version,
+            "tag": tag,
+            "files": [
+                {"path": path.relative_to(self.top).as_posix(), "from": old, "to": version}
+                for path, _, old in self.version_files()
+            ],
+            "notes": render_notes(notes, version),
+        }
+
+    def apply(
+        self, plan: dict, changelog: bool = True, commit: bool = True, tag: bool = True
+    ) -> dict:
+        """
+        Write version files and the changelog, then commit and tag.
+
+        All new file contents are computed before anything is written, and
+        each file is replaced atomically.
+
+        Args:
+            plan: Result of plan()
+            changelog: Insert the notes into CHANGELOG.md
+            commit: Commit the changed files ('chore(release): X.Y.Z')
+            tag: Create an annotated tag with the notes as its message
+
+        Returns:
+            Dict with 'written' (paths), 'commit' and 'tag'
+
+        Raises:
+            GitError: If a file to be written has uncommitted changes, or git fails
+        """
+        updates: dict[Path, str] = {}
+        for path, pattern, _ in self.version_files():
+            text = updates.get(path) or _read_text(path)
+            updates[path] = pattern.sub(
+                lambda m: f"{m.group('pre')}{plan['version']}{m.group('post')}", text, count=1
+            )
+        if changelog:
+            path = self.top / CHANGELOG
+            existing = _read_text(path) if path.exists() else ""
+            updates[path] = insert_changelog_section(existing, plan["notes"], plan["version"])
+
+        relative = [path.relative_to(self.top).as_posix() for path in updates]
+        if commit and relative:
+            dirty = run_git(
+                ["--literal-pathspecs", "status", "--porcelain", "-z", "--", *relative], self.top
+            )
+            if dirty.strip("\0"):
+                raise GitError(
+                    "Version files or CHANGELOG.md have uncommitted changes; "
+                    "commit or stash them first"
+                )
+
+        for path, text in updates.items():
+            write_text_atomic(path, text)
+
+        result = {"written": relative, "commit": None, "tag": None}
+        message = f"{plan['notes']}\n"
+        if commit and relative:
+            run_git(["--literal-pathspecs", "add", "--", *relative], self.top)
+            run_git(
+                ["--literal-pathspecs", "commit", "-q", "-m",
+                 f"chore(release): {plan['version']}", "--", *relative],
+                self.top,
+            )
+            result["commit"] = run_git(["rev-parse", "--short", "HEAD"], self.top).strip()
+        if tag:
+            run_git(
+                ["tag", "-a", "--cleanup=whitespace", plan["tag"], "-F", "-"],
+                self.top,
+                input=f"Release {plan['tag']}\n\n{message}",
+            )
+            result["tag"] = plan["tag"]
+        return result
+
+
+def insert_changelog_section(changelog: str, notes: str, version: str) -> str:
+    """
+    Add a release section to a Keep a Changelog style file.
+
+    Hand-written entries under '## [Unreleased]' become the release section
+    (they are curated, the generated notes are not); otherwise the generated
+    notes are used. An empty Unreleased heading is kept above the release.
+
+    Args:
+        changelog: Current CHANGELOG.md text ('' when missing)
+        notes: Rendered section from render_notes()
+        version: Release version
+
+    Returns:
+        Updated changelog text
+    """
+    if not changelog.strip():
+        return f"# Changelog\n\n## [Unreleased]\n\n{notes.rstrip()}\n"
+
+    match = re.search(r"^## \[Unreleased\][^\n]*\n", changelog, re.MULTILINE | re.IGNORECASE)
+    if not match:
+        first = re.search(r"^## ", changelog, re.MULTILINE)
+        at = first.start() if first else len(changelog)
+        return f"{changelog[:at]}{notes.rstrip()}\n\n{changelog[at:]}"
+
+    following = re.compile(r"^## |^---\s*$", re.MULTILINE).search(changelog, match.end())
+    end = following.start() if following else len(changelog)
+    curated = changelog[match.end():end].strip()
+
+    heading = notes.split("\n", 1)[0]
+    section = f"{heading}\n\n{curated}" if curated else notes.rstrip()
+    separator = "---\n\n" if following and following.group(0).startswith("---") else ""
+    return f"{changelog[:match.end()]}\n{separator}{section}\n\n{changelog[end:]}"
+
+
+def _read_text(path: Path) -> str:
+    """Read a text file without translating its line endings."""
+    with open(path, encoding='utf-8', newline="") as f:
+        return f.read()
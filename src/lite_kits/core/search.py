@@ -0,0 +1,285 @@
+"""
+Full-text search over memory guides and collaboration records.
+
+Maintains a persistent SQLite FTS5 inverted index in .specify/cache/search.db.
+Files are re-chunked only when their (mtime, size) fingerprint changes, so a
+query costs a handful of stat() calls plus one indexed lookup instead of a
+grep over every markdown file.
+"""
+
+import os
+import re
+import sqlite3
+from collections.abc import Iterator
+from pathlib import Path
+
+from .cache import ensure_cache_dir, fingerprint, get_cache_dir
+from .collab import iter_bundle, iter_record_files
+
+INDEX_FILE = "search.db"
+SCHEMA_VERSION = 1
+
+# Directories whose markdown files are indexed (besides collaboration records)
+MEMORY_DIR = Path(".specify") / "memory"
+
+# Chunking: split at headings, and cap chunk length so line refs stay precise
+MAX_CHUNK_LINES = 30
+
+# Snippet highlight markers (replaced by the caller for display)
+MARK_START = "\x02"
+MARK_END = "\x03"
+
+_TOKEN_RE = re.compile(r'"[^"]+"|[\w-]+\*?', re.UNICODE)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS files (
+    source TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chunk_meta (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    path TEXT NOT NULL,
+    line INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_chunk_meta_source ON chunk_meta (source);
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks USING fts5(content, tokenize = 'porter unicode61');
+PRAGMA user_version = {SCHEMA_VERSION};
+"""
+
+
+def build_match_query(query: str) -> str:
+    """
+    Turn free text into a safe FTS5 MATCH expression.
+
+    Words are AND-ed; "quoted phrases" and trailing-* prefixes are kept.
+
+    Args:
+        query: User query
+
+    Returns:
+        FTS5 query string
+
+    Raises:
+        ValueError: If the query has no searchable terms
+    """
+    terms = []
+    for token in _TOKEN_RE.findall(query):
+        if token.startswith('"'):
+            phrase = token.strip('"').replace('"', '')
+            if phrase.strip():
+                terms.append(f'"{phrase}"')
+        elif token.endswith("*"):
+            terms.append(f'"{token[:-1]}"*')
+        else:
+            terms.append(f'"{token}"')
+    if not terms:
+        raise ValueError("Search query has no searchable terms")
+    return " ".join(terms)
+
+
+def chunk_markdown(text: str) -> Iterator[tuple[int, str]]:
+    """
+    Split markdown into (start_line, text) chunks.
+
+    Args:
+        text: Markdown content
+
+    Yields:
+        1-based start line and chunk text
+    """
+    lines = text.splitlines()
+    start = 0
+    for i, line in enumerate(lines):
+        at_heading = line.startswith("#") and i > start
+        if at_heading or i - start >= MAX_CHUNK_LINES:
+            chunk = "\n".join(lines[start:i])
+            if chunk.strip():
+                yield start + 1, chunk
+            start = i
+    chunk = "\n".join(lines[start:])
+    if chunk.strip():
+        yield start + 1, chunk
+
+
+class SearchIndex:
+    """Persistent, incrementally updated full-text index."""
+
+    def __init__(self, target_dir: Path):
+        """
+        Initialize search index.
+
+        Args:
+            target_dir: Project root directory
+        """
+        self.target_dir = Path(target_dir).resolve()
+        self.db_path = get_cache_dir(self.target_dir) / INDEX_FILE
+        self._conn: sqlite3.Connection | None = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Open (and migrate) the index database on first use"""
+        if self._conn is None:
+            ensure_cache_dir(self.db_path.parent)
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version not in (0, SCHEMA_VERSION):
+                conn.executescript(
+                    "DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS chunk_meta; "
+                    "DROP TABLE IF EXISTS chunks;"
+                )
+            try:
+                conn.execute("PRAGMA journal_mode = WAL")
+                conn.executescript(_SCHEMA)
+            except sqlite3.OperationalError as e:
+                conn.close()
+                raise RuntimeError(f"SQLite FTS5 support is required for search: {e}")
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        """Close the index database."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def refresh(self, rebuild: bool = False) -> dict:
+        """
+        Re-index files whose fingerprint changed and drop deleted ones.
+
+        Args:
+            rebuild: Discard the index and re-read everything
+
+        Returns:
+            Dict with 'files', 'updated' and 'removed' counts
+        """
+        conn = self.conn
+        if rebuild:
+            with conn:
+                conn.execute("DELETE FROM files")
+                conn.execute("DELETE FROM chunk_meta")
+                conn.execute("DELETE FROM chunks")
+
+        known = {
+            row["source"]: (row["mtime_ns"], row["size"])
+            for row in conn.execute("SELECT source, mtime_ns, size FROM files")
+        }
+
+        seen = set()
+        changed = []
+        for source, stat in self._iter_sources():
+            seen.add(source)
+            fp = fingerprint(stat)
+            if known.get(source) != fp:
+                changed.append((source, fp))
+
+        removed = [source for source in known if source not in seen]
+
+        with conn:
+            for source in removed + [source for source, _ in changed]:
+                self._delete_source(source)
+            conn.executemany("DELETE FROM files WHERE source = ?", [(s,) for s in removed])
+
+            for source, fp in changed:
+                for path, text in self._read_source(source):
+                    for line, chunk in chunk_markdown(text):
+                        cursor = conn.execute(
+                            "INSERT INTO chunk_meta (source, path, line) VALUES (?, ?, ?)",
+                            (source, path, line),
+                        )
+                        conn.execute(
+                            "INSERT INTO chunks (rowid, content) VALUES (?, ?)",
+                            (cursor.lastrowid, chunk),
+                        )
+                conn.execute(
+                    "INSERT OR REPLACE INTO files (source, mtime_ns, size) VALUES (?, ?, ?)",
+                    (source, fp[0], fp[1]),
+                )
+
+        return {"files": len(seen), "updated": len(changed), "removed": len(removed)}
+
+    def search(self, query: str, limit: int = 10) -> list[dict]:
+        """
+        Run a ranked full-text query.
+
+        Args:
+            query: Free-text query (words AND-ed, "phrases", prefix*)
+            limit: Maximum number of hits
+
+        Returns:
+            List of hit dicts with 'path', 'line', 'snippet', 'score' keys,
+            best match first. Snippets mark hits with MARK_START/MARK_END.
+        """
+        match = build_match_query(query)
+        rows = self.conn.execute(  # audit:ignore - only marker constants are interpolated
+            f"""
+            SELECT m.path, m.line, chunks.content,
+                   snippet(chunks, 0, '{MARK_START}', '{MARK_END}', '…', 16) AS snippet,
+                   bm25(chunks) AS score
+            FROM chunks JOIN chunk_meta AS m ON m.id = chunks.rowid
+            WHERE chunks MATCH ?
+            ORDER BY score
+            LIMIT ?
+            """,
+            (match, int(limit)),
+        ).fetchall()
+
+        terms = [t.strip('"*').lower() for t in _TOKEN_RE.findall(query)]
+        return [
+            {
+                "path": row["path"],
+                "line": row["line"] + _first_hit_offset(row["content"], terms),
+                "snippet": " ".join(row["snippet"].split()),
+                "score": round(-row["score"], 3),
+            }
+            for row in rows
+        ]
+
+    def _delete_source(self, source: str):
+        """Remove all chunks belonging to a source file."""
+        self.conn.execute(
+            "DELETE FROM chunks WHERE rowid IN (SELECT id FROM chunk_meta WHERE source = ?)",
+            (source,),
+        )
+        self.conn.execute("DELETE FROM chunk_meta WHERE source = ?", (source,))
+
+    def _iter_sources(self) -> Iterator[tuple[str, os.stat_result]]:
+        """Yield (rel_path, stat) for every indexed source file."""
+        memory_dir = self.target_dir / MEMORY_DIR
+        try:
+            with os.scandir(memory_dir) as entries:
+                for entry in sorted(entries, key=lambda e: e.name):
+                    if entry.name.endswith(".md") and entry.is_file():
+                        yield f"{MEMORY_DIR.as_posix()}/{entry.name}", entry.stat()
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+
+        for rel_path, _, _, _, stat in iter_record_files(self.target_dir / "specs"):
+            yield rel_path, stat
+
+    def _read_source(self, source: str) -> Iterator[tuple[str, str]]:
+        """Yield (display_path, text) pairs for a source (bundles hold many)."""
+        full = self.target_dir / source
+        if source.endswith(".jsonl.gz"):
+            for entry in iter_bundle(full):
+                yield f"{entry.get('path', source)} (packed)", entry.get("content", "")
+            return
+        try:
+            yield source, full.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return
+
+
+def _first_hit_offset(content: str, terms: list[str]) -> int:
+    """Line offset of the first line in a chunk containing a query term."""
+    if not terms:
+        return 0
+    # Stemmed matches ("protocols" for "protocol") share a short prefix
+    needles = [t for t in terms if t] + [t[:5] for t in terms if len(t) > 5]
+    for offset, line in enumerate(content.splitlines()):
+        lowered = line.lower()
+        if any(needle in lowered for needle in needles):
+            return offset
+    return 0
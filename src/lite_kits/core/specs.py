@@ -0,0 +1,251 @@
+"""
+Spec tree indexer with task progress aggregation.
+
+Parses every specs/NNN-feature/ directory (spec.md, plan.md, tasks.md) line by
+line, extracting status, task checkbox counts, phases and [P] parallel markers.
+Per-file results are cached in .specify/cache/specs.json keyed by (mtime, size),
+so only edited files are re-read.
+"""
+
+import os
+import re
+from pathlib import Path
+
+from .cache import fingerprint, get_cache_dir, read_json, write_json_atomic
+
+CACHE_FILE = "specs.json"
+CACHE_VERSION = 1
+
+SPEC_FILES = ["spec.md", "plan.md", "tasks.md"]
+
+_FEATURE_DIR_RE = re.compile(r"^(?P<num>\d+)-(?P<name>.+)$")
+_CHECKBOX_RE = re.compile(r"^\s*[-*]\s+\[(?P<mark>[ xX])\]\s+(?P<text>.*)$")
+_TASK_ID_RE = re.compile(r"^(?P<id>T\d+)\b")
+_PHASE_RE = re.compile(r"^#{2,3}\s+(?P<name>Phase\b.*)$", re.IGNORECASE)
+_FIELD_RE = re.compile(r"^\*\*(?P<key>[^*]+)\*\*:\s*(?P<value>.*?)\s*$")
+_TITLE_RE = re.compile(r"^#\s+(?:[^:]+:\s*)?(?P<title>.+)$")
+
+
+def parse_spec_file(path: Path) -> dict:
+    """
+    Parse spec.md / plan.md header fields.
+
+    Args:
+        path: Markdown file path
+
+    Returns:
+        Dict with 'title' and 'status' (either may be None)
+    """
+    result = {"title": None, "status": None}
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line_no, line in enumerate(f):
+            # Header fields live at the top; don't stream the whole document
+            if line_no > 40:
+                break
+            line = line.strip()
+            if result["title"] is None:
+                match = _TITLE_RE.match(line)
+                if match:
+                    result["title"] = match.group("title").strip()
+                    continue
+            match = _FIELD_RE.match(line) if result["status"] is None else None
+            if match and match.group("key").strip().lower() == "status":
+                result["status"] = match.group("value").strip().lower() or None
+    return result
+
+
+def parse_tasks_file(path: Path) -> dict:
+    """
+    Stream tasks.md and aggregate checkbox progress.
+
+    When the file uses task IDs (T001, T002...) only those checkboxes count,
+    so trailing validation checklists don't inflate the totals.
+
+    Args:
+        path: tasks.md path
+
+    Returns:
+        Dict with 'total', 'done', 'parallel', 'parallel_open', 'phases'
+        (list of {'name', 'total', 'done'}) and 'next' (first open task)
+    """
+    with_ids = _TaskCounter()
+    any_box = _TaskCounter()
+    phase = None
+
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            match = _PHASE_RE.match(line.strip())
+            if match:
+                phase = match.group("name").strip()
+                continue
+
+            match = _CHECKBOX_RE.match(line)
+            if not match:
+                continue
+            done = match.group("mark") != " "
+            text = match.group("text").strip()
+            parallel = "[P]" in text
+
+            any_box.add(phase, text, done, parallel)
+            if _TASK_ID_RE.match(text):
+                with_ids.add(phase, text, done, parallel)
+
+    counter = with_ids if with_ids.total else any_box
+    return counter.as_dict()
+
+
+class _TaskCounter:
+    """Accumulates task counts overall and per phase."""
+
+    def __init__(self):
+        self.total = 0
+        self.done = 0
+        self.parallel = 0
+        self.parallel_open = 0
+        self.next: str | None = None
+        self.phases: dict[str, dict] = {}
+
+    def add(self, phase: str | None, text: str, done: bool, parallel: bool):
+        self.total += 1
+        self.done += done
+        self.parallel += parallel
+        self.parallel_open += parallel and not done
+        if not done and self.next is None:
+            self.next = text
+        if phase:
+            counts = self.phases.setdefault(phase, {"name": phase, "total": 0, "done": 0})
+            counts["total"] += 1
+            counts["done"] += done
+
+    def as_dict(self) -> dict:
+        return {
+            "total": self.total,
+            "done": self.done,
+            "parallel": self.parallel,
+            "parallel_open": self.parallel_open,
+            "phases": list(self.phases.values()),
+            "next": self.next,
+        }
+
+
+class SpecIndex:
+    """Cached index of feature specs and their task progress."""
+
+    def __init__(self, target_dir: Path):
+        """
+        Initialize spec index.
+
+        Args:
+            target_dir: Project root directory (containing specs/)
+        """
+        self.target_dir = Path(target_dir).resolve()
+        self.specs_dir = self.target_dir / "specs"
+        self.cache_path = get_cache_dir(self.target_dir) / CACHE_FILE
+
+    def scan(self, feature: str | None = None) -> list[dict]:
+        """
+        Summarize every feature directory.
+
+        Args:
+            feature: Optional feature number ("012") or directory name filter
+
+        Returns:
+            List of feature dicts sorted by feature number
+        """
+        cache = read_json(self.cache_path)
+        if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+            cache = {"version": CACHE_VERSION, "files": {}}
+        cached_files: dict[str, dict] = cache["files"]
+        fresh_files: dict[str, dict] = {}
+        dirty = False
+
+        features = []
+        for entry in self._feature_dirs():
+            match = _FEATURE_DIR_RE.match(entry.name)
+            if feature and not _feature_matches(entry.name, match, feature):
+                continue
+
+            parsed = {}
+            for name in SPEC_FILES:
+                path = Path(entry.path) / name
+                try:
+                    fp = list(fingerprint(path.stat()))
+                except OSError:
+                    continue
+                rel_path = f"specs/{entry.name}/{name}"
+                cached = cached_files.get(rel_path)
+                if cached and cached["fp"] == fp:
+                    data = cached["data"]
+                else:
+                    data = parse_tasks_file(path) if name == "tasks.md" else parse_spec_file(path)
+                    dirty = True
+                fresh_files[rel_path] = {"fp": fp, "data": data}
+                parsed[name] = data
+
+            features.append(_summarize(entry.name, match, parsed))
+
+        # Keep entries for features filtered out of this scan
+        if feature:
+            for rel_path, value in cached_files.items():
+                fresh_files.setdefault(rel_path, value)
+        if dirty or set(fresh_files) != set(cached_files):
+            write_json_atomic(self.cache_path, {"version": CACHE_VERSION, "files": fresh_files})
+
+        return features
+
+    def _feature_dirs(self) -> list[os.DirEntry]:
+        """List feature directories (NNN-name) under specs/."""
+        try:
+            with os.scandir(self.specs_dir) as entries:
+                dirs = [e for e in entries if e.is_dir() and _FEATURE_DIR_RE.match(e.name)]
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+        return sorted(dirs, key=lambda e: (int(_FEATURE_DIR_RE.match(e.name).group("num")), e.name))
+
+
+def _feature_matches(name: str, match, wanted: str) -> bool:
+    """Check a feature directory against a number or name filter."""
+    if wanted.isdigit() and match:
+        return int(match.group("num")) == int(wanted)
+    return name == wanted
+
+
+def _summarize(name: str, match, parsed: dict[str, dict]) -> dict:
+    """Combine parsed spec/plan/tasks data into one feature summary."""
+    spec = parsed.get("spec.md", {})
+    tasks = parsed.get("tasks.md")
+
+    current_phase = None
+    if tasks:
+        for phase in tasks["phases"]:
+            if phase["done"] < phase["total"]:
+                current_phase = phase["name"]
+                break
+
+    if tasks and tasks["total"]:
+        progress = round(100 * tasks["done"] / tasks["total"])
+    else:
+        progress = None
+
+    if tasks and tasks["total"] and tasks["done"] == tasks["total"]:
+        stage = "complete"
+    elif tasks:
+        stage = "implementing"
+    elif "plan.md" in parsed:
+        stage = "planned"
+    elif "spec.md" in parsed:
+        stage = "specified"
+    else:
+        stage = "empty"
+
+    return {
+        "feature": name,
+        "number": match.group("num") if match else None,
+        "title": spec.get("title"),
+        "status": spec.get("status"),
+        "stage": stage,
+        "files": {file: file in parsed for file in SPEC_FILES},
+        "tasks": tasks,
+        "current_phase": current_phase,
+        "progress": progress,
+    }
@@ -0,0 +1,270 @@
+"""
+Parallel project statistics engine behind /stats.
+
+Lists the project once (gitignore-aware), counts lines/bytes per language by
+counting newline bytes in binary reads on a process pool, and derives commit
+velocity from a single streamed 'git log' pass. Per-file counts are cached in
+.specify/cache/stats.json keyed by (inode, mtime, size), so re-runs only read
+files that changed. Per-agent commit counts come from the attribution index.
+"""
+
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from pathlib import Path
+
+from .attribution import AttributionIndex
+from .cache import get_cache_dir, read_json, write_json_atomic
+from .files import SNIFF_BYTES, is_binary, iter_project_files
+from .git import GitError, is_git_repo, stream_git
+
+CACHE_FILE = "stats.json"
+CACHE_VERSION = 1
+
+READ_BLOCK = 1 << 20
+
+# Below this many files to (re)count, a process pool costs more than it saves
+PARALLEL_THRESHOLD = 256
+BATCH_FILES = 128
+
+# Extension -> language (lower-case, including the dot)
+LANGUAGES = {
+    ".py": "Python", ".pyi": "Python",
+    ".js": "JavaScript", ".mjs": "JavaScript", ".cjs": "JavaScript", ".jsx": "JavaScript",
+    ".ts": "TypeScript", ".tsx": "TypeScript",
+    ".go": "Go", ".rs": "Rust", ".java": "Java", ".kt": "Kotlin", ".scala": "Scala",
+    ".c": "C", ".h": "C", ".cc": "C++", ".cpp": "C++", ".cxx": "C++", ".hpp": "C++",
+    ".cs": "C#", ".rb": "Ruby", ".php": "PHP", ".swift": "Swift", ".m": "Objective-C",
+    ".sh": "Shell", ".bash": "Shell", ".zsh": "Shell", ".fish": "Shell",
+    ".ps1": "PowerShell", ".psm1": "PowerShell",
+    ".html": "HTML", ".htm": "HTML", ".css": "CSS", ".scss": "SCSS", ".less": "LESS",
+    ".vue": "Vue", ".svelte": "Svelte",
+    ".md": "Markdown", ".rst": "reStructuredText", ".txt": "Text",
+    ".json": "JSON", ".yaml": "YAML", ".yml": "YAML", ".toml": "TOML", ".xml": "XML",
+    ".ini": "INI", ".cfg": "INI",
+    ".sql": "SQL", ".graphql": "GraphQL", ".proto": "Protobuf",
+    ".lua": "Lua", ".r": "R", ".jl": "Julia", ".dart": "Dart", ".ex": "Elixir", ".exs": "Elixir",
+    ".erl": "Erlang", ".hs": "Haskell", ".clj": "Clojure", ".tf": "Terraform",
+}
+
+# Whole-file names that identify a language
+FILENAMES = {
+    "Dockerfile": "Dockerfile",
+    "Makefile": "Makefile",
+    "CMakeLists.txt": "CMake",
+    "Jenkinsfile": "Groovy",
+}
+
+
+def language_for(path: str) -> str:
+    """
+    Map a file path to a language name.
+
+    Args:
+        path: File path
+
+    Returns:
+        Language name, or 'Other'
+    """
+    name = path.rsplit("/", 1)[-1]
+    if name in FILENAMES:
+        return FILENAMES[name]
+    _, ext = os.path.splitext(name)
+    return LANGUAGES.get(ext.lower(), "Other")
+
+
+def count_file(full_path: str) -> tuple[int, int, bool] | None:
+    """
+    Count newline bytes in a file without decoding it.
+
+    Args:
+        full_path: Absolute file path
+
+    Returns:
+        (lines, bytes, is_binary) tuple, or None if unreadable
+    """
+    lines = 0
+    size = 0
+    last = b"\n"
+    try:
+        with open(full_path, "rb") as f:
+            block = f.read(READ_BLOCK)
+            if block and is_binary(block[:SNIFF_BYTES]):
+                return (0, os.fstat(f.fileno()).st_size, True)
+            while block:
+                lines += block.count(b"\n")
+                size += len(block)
+                last = block[-1:]
+                block = f.read(READ_BLOCK)
+    except OSError:
+        return None
+
+    # A final line without a trailing newline still counts
+    if size and last != b"\n":
+        lines += 1
+    return (lines, size, False)
+
+
+def _count_batch(paths: list[str]) -> list[tuple[int, int, bool] | None]:
+    """Process-pool worker: count a batch of files."""
+    return [count_file(path) for path in paths]
+
+
+class ProjectStats:
+    """Computes cached, parallel project statistics."""
+
+    def __init__(self, target_dir: Path, workers: int | None = None):
+        """
+        Initialize stats engine.
+
+        Args:
+            target_dir: Project root directory
+            workers: Process pool size (None = CPU count, 1 = no pool)
+        """
+        self.target_dir = Path(target_dir).resolve()
+        self.workers = workers
+        self.cache_path = get_cache_dir(self.target_dir) / CACHE_FILE
+
+    def collect(self, history: bool = True) -> dict:
+        """
+        Gather code and history statistics.
+
+        Args:
+            history: Include commit velocity from git log
+
+        Returns:
+            Dict with 'totals', 'languages', 'history' and 'cache' sections
+        """
+        started = time.perf_counter()
+        cache = read_json(self.cache_path)
+        if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+            cache = {"version": CACHE_VERSION, "files": {}}
+        cached: dict[str, list] = cache["files"]
+
+        entries: dict[str, list] = {}
+        misses: list[tuple[str, list[int]]] = []
+        for rel_path in iter_project_files(self.target_dir):
+            try:
+                st = os.stat(self.target_dir / rel_path)
+            except OSError:
+                continue
+            key = [st.st_ino, st.st_mtime_ns, st.st_size]
+            hit = cached.get(rel_path)
+            if hit and hit[0] == key:
+                entries[rel_path] = hit
+            else:
+                misses.append((rel_path, key))
+
+        for (rel_path, key), counted in zip(misses, self._count([p for p, _ in misses])):
+            if counted is not None:
+                entries[rel_path] = [key, *counted]
+
+        if misses or len(entries) != len(cached):
+            write_json_atomic(self.cache_path, {"version": CACHE_VERSION, "files": entries})
+
+        languages: dict[str, dict] = {}
+        totals = {"files": 0, "lines": 0, "bytes": 0, "binary_files": 0}
+        for rel_path, (_, lines, size, binary) in entries.items():
+            totals["files"] += 1
+            totals["bytes"] += size
+            if binary:
+                totals["binary_files"] += 1
+                continue
+            totals["lines"] += lines
+            lang = languages.setdefault(
+                language_for(rel_path), {"files": 0, "lines": 0, "bytes": 0}
+            )
+            lang["files"] += 1
+            lang["lines"] += lines
+            lang["bytes"] += size
+
+        ordered = dict(sorted(languages.items(), key=lambda item: -item[1]["lines"]))
+        return {
+            "totals": totals,
+            "languages": ordered,
+            "history": self._history() if history else None,
+            "cache": {
+                "files": len(entries),
+                "recounted": len(misses),
+                "seconds": round(time.perf_counter() - started, 3),
+            },
+        }
+
+    def _count(self, rel_paths: list[str]) -> list[tuple[int, int, bool] | None]:
+        """Count files, fanning out to a process pool for large batches."""
+        full_paths = [str(self.target_dir / p) for p in rel_paths]
+        if self.workers == 1 or len(full_paths) < PARALLEL_THRESHOLD:
+            return [count_file(p) for p in full_paths]
+
+        batches = [full_paths[i:i + BATCH_FILES] for i in range(0, len(full_paths), BATCH_FILES)]
+        results: list[tuple[int, int, bool] | None] = []
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for batch_result in pool.map(_count_batch, batches):
+                results.extend(batch_result)
+        return results
+
+    def _history(self) -> dict | None:
+        """Commit counts, contributors and velocity from one git log pass."""
+        if not is_git_repo(self.target_dir):
+            return None
+
+        now = time.time()
+        windows = {"7d": 7, "30d": 30, "90d": 90}
+        recent = Counter()
+        authors = Counter()
+        total = 0
+        first = last = None
+
+        try:
+            for line in stream_git(["log", "--format=%at%x1f%aN"], self.target_dir):
+                timestamp, _, author = line.partition("\x1f")
+                if not timestamp.isdigit():
+                    continue
+                ts = int(timestamp)
+                total += 1
+                authors[author] += 1
+                last = ts if last is None else max(last, ts)
+                first = ts if first is None else min(first, ts)
+                age_days = (now - ts) / 86400
+                for label, days in windows.items():
+                    if age_days <= days:
+                        recent[label] += 1
+        except GitError:
+            # Empty repository (no commits yet)
+            pass
+
+        weeks = max((last - first) / (7 * 86400), 1) if total else 1
+        return {
+            "commits": total,
+            "contributors": len(authors),
+            "top_contributors": authors.most_common(5),
+            "commits_last": {label: recent[label] for label in windows},
+            "per_week": round(total / weeks, 1),
+            "per_week_last_30d": round(recent["30d"] / (30 / 7), 1),
+            "agents": self._agents() if total else [],
+        }
+
+    def _agents(self) -> list[dict]:
+        """Commits per signing agent (all history and last 30 days) from the attribution index."""
+        month = date.fromtimestamp(time.time() - 30 * 86400).isoformat()
+        try:
+            index = AttributionIndex(self.target_dir)
+        except GitError:
+            return []
+        try:
+            index.refresh()
+            recent = {row["agent"]: row["commits"] for row in index.summary(since=month)["agents"]}
+            return [
+                {
+                    "agent": row["agent"],
+                    "commits": row["commits"],
+                    "last_30d": recent.get(row["agent"], 0),
+                }
+                for row in index.summary()["agents"]
+            ]
+        except GitError:
+            return []
+        finally:
+            index.close()
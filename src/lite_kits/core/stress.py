@@ -0,0 +1,187 @@
+"""
+Concurrency stress harness for installs.
+
+Runs several installer processes ('add --force' in a loop) and several
+validator processes against one project at the same time. Installers
+serialize on the project install lock; validators read without it and
+must still only ever see complete files. The report gives latency and
+lock-wait percentiles, how often the lock was contended, and any validation
+that disagreed with the settled state (a torn read).
+"""
+
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .installer import Installer
+
+# Workers start together after this delay, so process start-up doesn't stagger them
+START_DELAY = 0.5
+
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    """
+    Nearest-rank percentiles of a sample.
+
+    Args:
+        values: Measurements (seconds)
+
+    Returns:
+        Dict with 'p50', 'p90', 'p99' and 'max' (all 0 for an empty sample)
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return {"p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0}
+
+    def rank(p: float) -> float:
+        index = max(0, -(-len(ordered) * p // 100) - 1)
+        return round(ordered[int(index)], 4)
+
+    return {"p50": rank(50), "p90": rank(90), "p99": rank(99), "max": round(ordered[-1], 4)}
+
+
+def run_stress(
+    target_dir: Path,
+    kits: list[str] | None = None,
+    installers: int = 4,
+    validators: int = 4,
+    rounds: int = 10,
+    lock_timeout: float = 60.0,
+    scratch: bool = True,
+) -> dict:
+    """
+    Stress one project with concurrent installs and validations.
+
+    Args:
+        target_dir: Spec-kit project with an agent directory
+        kits: Kits to install (None = manifest default)
+        installers: Concurrent installer processes
+        validators: Concurrent validator processes
+        rounds: Operations per process
+        lock_timeout: Seconds an installer may wait for the lock
+        scratch: Work on a temporary copy (without .git) instead of the project
+
+    Returns:
+        Report dict with 'install' and 'validate' sections (ops, errors,
+        latency percentiles; lock wait and contention for installs;
+        inconsistent reads for validations) and 'seconds'
+
+    Raises:
+        ValueError: If the target is not a spec-kit project or the initial
+            install fails
+    """
+    source = Path(target_dir).resolve()
+    workdir = None
+    if scratch:
+        workdir = Path(tempfile.mkdtemp(prefix="lite-kits-stress-"))
+        project = workdir / source.name
+        shutil.copytree(source, project, symlinks=True, ignore=shutil.ignore_patterns(".git"))
+    else:
+        project = source
+
+    try:
+        installer = Installer(project, kits=kits, force=True)
+        if not installer.is_spec_kit_project():
+            raise ValueError(f"Not a spec-kit project: {source}")
+        # Settle the project first, so every later validation should match it
+        initial = installer.install()
+        if not initial["success"]:
+            raise ValueError(f"Initial install failed: {initial['error']}")
+        baseline = _summarize(installer.validate())
+
+        start_at = time.time() + START_DELAY
+        with ProcessPoolExecutor(max_workers=installers + validators) as pool:
+            install_jobs = [
+                pool.submit(_install_worker, str(project), kits, rounds, lock_timeout, start_at)
+                for _ in range(installers)
+            ]
+            validate_jobs = [
+                pool.submit(_validate_worker, str(project), rounds, start_at)
+                for _ in range(validators)
+            ]
+            install_samples = [s for job in install_jobs for s in job.result()]
+            validate_samples = [s for job in validate_jobs for s in job.result()]
+        elapsed = time.time() - start_at
+    finally:
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    ok = [s for s in install_samples if not s["error"]]
+    reads = [s for s in validate_samples if not s["error"]]
+    return {
+        "project": str(source),
+        "scratch": scratch,
+        "installers": installers,
+        "validators": validators,
+        "rounds": rounds,
+        "install": {
+            "ops": len(install_samples),
+            "errors": sorted({s["error"] for s in install_samples if s["error"]}),
+            "contended": sum(1 for s in ok if s["contended"]),
+            "latency": percentiles([s["seconds"] for s in ok]),
+            "lock_wait": percentiles([s["waited"] for s in ok]),
+        },
+        "validate": {
+            "ops": len(validate_samples),
+            "errors": sorted({s["error"] for s in validate_samples if s["error"]}),
+            "inconsistent": sum(1 for s in reads if s["summary"] != baseline),
+            "latency": percentiles([s["seconds"] for s in reads]),
+        },
+        "seconds": round(max(elapsed, 0.0), 3),
+    }
+
+
+def _summarize(validation: dict) -> dict:
+    """Per-kit missing/corrupted files; equal summaries mean equal on-disk state."""
+    return {
+        name: [
+            check.get("status"),
+            sorted(check.get("missing_files", [])),
+            sorted(check.get("corrupted_files", [])),
+        ]
+        for name, check in validation["checks"].items()
+    }
+
+
+def _wait_until(start_at: float):
+    delay = start_at - time.time()
+    if delay > 0:
+        time.sleep(delay)
+
+
+def _install_worker(
+    project: str, kits: list[str] | None, rounds: int, lock_timeout: float, start_at: float
+) -> list[dict]:
+    installer = Installer(Path(project), kits=kits, force=True, lock_timeout=lock_timeout)
+    _wait_until(start_at)
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        result = installer.install()
+        lock = result.get("lock") or {}
+        samples.append({
+            "seconds": time.perf_counter() - started,
+            "waited": lock.get("waited", 0.0),
+            "contended": lock.get("contended", False),
+            "error": result["error"],
+        })
+    return samples
+
+
+def _validate_worker(project: str, rounds: int, start_at: float) -> list[dict]:
+    installer = Installer(Path(project))
+    _wait_until(start_at)
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        try:
+            summary = _summarize(installer.validate())
+            error = None
+        except Exception as e:
+            summary, error = None, str(e)
+        samples.append(
+            {"seconds": time.perf_counter() - started, "summary": summary, "error": error}
+        )
+    return samples
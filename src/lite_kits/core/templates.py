@@ -0,0 +1,229 @@
+"""
+Single-source command templates rendered per agent.
+
+Each kit command has one canonical markdown source. At install time it is
+rendered for every agent from the manifest's 'agents' section: front-matter
+keys the agent does not understand are dropped and {{placeholders}} are
+filled from the agent's settings. Sources are parsed once per process and
+rendered variants are kept in memory, so previews, conflict checks and
+installs never re-read or re-render a template.
+
+Rendered bodies can also be compacted for the installed shells (see
+compaction.py); compacted output ends with a marker recording the level and
+shells so the same variant can be reproduced later.
+"""
+
+import re
+from collections.abc import Callable
+from pathlib import Path
+
+from .compaction import compact, marker, validate_level
+from .manifest import KitManifest
+
+_PLACEHOLDER_RE = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+_FRONT_MATTER_KEY_RE = re.compile(r"^([A-Za-z0-9_-]+)\s*:")
+
+
+class TemplateError(ValueError):
+    """Raised when a template cannot be rendered for an agent."""
+
+
+class CompiledTemplate:
+    """A parsed template: front-matter entries plus body segments."""
+
+    def __init__(self, text: str):
+        """
+        Parse template text.
+
+        Args:
+            text: Template source (optionally starting with a '---' front-matter block)
+        """
+        self.front_matter, body = _split_front_matter(text)
+        # Even indexes are literal text, odd indexes are placeholder names
+        self.segments: list[str] = _PLACEHOLDER_RE.split(body)
+        self.variables = set(self.segments[1::2])
+
+    def render(
+        self,
+        keys: list[str] | None,
+        variables: dict[str, str],
+        transform: Callable[[str], str] | None = None,
+    ) -> str:
+        """
+        Render the template.
+
+        Args:
+            keys: Front-matter keys to keep (None = all, [] = no front matter)
+            variables: Placeholder values
+            transform: Optional function applied to the rendered body
+
+        Returns:
+            Rendered text
+
+        Raises:
+            TemplateError: If a placeholder has no value
+        """
+        missing = sorted(self.variables - set(variables))
+        if missing:
+            raise TemplateError(f"No value for {', '.join('{{' + name + '}}' for name in missing)}")
+
+        parts = []
+        kept = [raw for key, raw in self.front_matter if keys is None or key in keys]
+        if kept:
+            parts.append("---\n" + "".join(kept) + "---\n")
+        body = "".join(
+            segment if i % 2 == 0 else str(variables[segment])
+            for i, segment in enumerate(self.segments)
+        )
+        if transform:
+            body = transform(body)
+        parts.append(body if kept else body.lstrip("\n"))
+        return "".join(parts)
+
+
+class TemplateEngine:
+    """Compiles kit templates once and renders agent variants in memory."""
+
+    def __init__(self, kits_dir: Path, manifest: KitManifest, compaction: str = "none"):
+        """
+        Initialize template engine.
+
+        Args:
+            kits_dir: Kits source directory
+            manifest: Loaded kit manifest
+            compaction: Default compaction level for rendered commands
+
+        Raises:
+            ValueError: If the compaction level is unknown
+        """
+        self.kits_dir = Path(kits_dir)
+        self.manifest = manifest
+        self.compaction = validate_level(compaction)
+        self._compiled: dict[str, CompiledTemplate] = {}
+        self._rendered: dict[tuple, str] = {}
+        self._fences = {
+            name: config.get("fence_languages") or [name]
+            for name, config in (manifest.manifest.get("shells") or {}).items()
+        }
+
+    def compile(self, source: str) -> CompiledTemplate:
+        """
+        Parse a template source once per engine.
+
+        Args:
+            source: Path relative to the kits directory
+
+        Returns:
+            Compiled template
+
+        Raises:
+            FileNotFoundError: If the source does not exist
+        """
+        if source not in self._compiled:
+            path = self.kits_dir / source
+            if not path.exists():
+                raise FileNotFoundError(f"Kit file not found: {path}")
+            with open(path, encoding='utf-8', newline="") as f:
+                self._compiled[source] = CompiledTemplate(f.read())
+        return self._compiled[source]
+
+    def render(
+        self,
+        source: str,
+        agent: str,
+        shells: list[str] | None = None,
+        level: str | None = None,
+    ) -> str:
+        """
+        Render a command template for one agent.
+
+        Args:
+            source: Path relative to the kits directory
+            agent: Agent name from the manifest
+            shells: Installed shells (None or empty = keep every shell variant)
+            level: Compaction level (None = the engine default)
+
+        Returns:
+            Rendered text (cached per source, agent, shells and level)
+
+        Raises:
+            FileNotFoundError: If the source does not exist
+            TemplateError: If the agent is unknown or a placeholder has no value
+            ValueError: If the compaction level is unknown
+        """
+        level = self.compaction if level is None else validate_level(level)
+        shell_key = tuple(sorted(shells)) if shells else None
+        key = (source, agent, shell_key, level)
+        if key not in self._rendered:
+            config = self.manifest.get_agent_config(agent)
+            if not config:
+                raise TemplateError(f"Unknown agent: {agent}")
+            variables = {
+                "agent": agent,
+                "agent_name": config.get("name", agent),
+                "commands_dir": config.get("commands_dir", ""),
+                "file_extension": config.get("file_extension", ".md"),
+                **(config.get("variables") or {}),
+            }
+
+            def transform(body: str) -> str:
+                if shell_key is None and level == "none":
+                    return body
+                body, changed = compact(body, shell_key, level, self._fences)
+                if changed:
+                    body = body.rstrip("\n") + "\n\n" + marker(level, shell_key)
+                return body
+
+            try:
+                self._rendered[key] = self.compile(source).render(
+                    config.get("front_matter"), variables, transform
+                )
+            except TemplateError as e:
+                raise TemplateError(f"{source} ({agent}): {e}")
+        return self._rendered[key]
+
+    def content(self, file_info: dict, shells: list[str] | None = None) -> bytes:
+        """
+        Bytes that installing a manifest file entry would write.
+
+        Args:
+            file_info: File dict from KitManifest.get_kit_files()
+            shells: Installed shells, for compacting command templates
+
+        Returns:
+            Rendered template for agent command files, raw source bytes otherwise
+
+        Raises:
+            FileNotFoundError: If the source does not exist
+        """
+        if file_info.get("agent"):
+            return self.render(file_info["source"], file_info["agent"], shells).encode('utf-8')
+        path = self.kits_dir / file_info["source"]
+        if not path.exists():
+            raise FileNotFoundError(f"Kit file not found: {path}")
+        return path.read_bytes()
+
+
+def _split_front_matter(text: str) -> tuple[list[tuple[str, str]], str]:
+    """
+    Split '---' front matter into (key, raw lines) entries and the body.
+
+    Raw lines are kept so rendered files match the source byte for byte when
+    every key is kept.
+    """
+    if not text.startswith("---\n") and not text.startswith("---\r\n"):
+        return [], text
+
+    lines = text.splitlines(keepends=True)
+    entries: list[tuple[str, str]] = []
+    for index, line in enumerate(lines[1:], start=1):
+        if line.rstrip("\r\n") == "---":
+            return entries, "".join(lines[index + 1:])
+        match = _FRONT_MATTER_KEY_RE.match(line)
+        if match:
+            entries.append((match.group(1), line))
+        elif entries:
+            # Continuation of a multi-line value
+            entries[-1] = (entries[-1][0], entries[-1][1] + line)
+    # Unterminated block: treat the whole file as body
+    return [], text
@@ -5,48 +5,65 @@ Validates installed kits, checks for missing/corrupted files.
 """
 
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional
 
+from .compaction import read_marker
 from .manifest import KitManifest
 from .detector import Detector
+from .templates import TemplateEngine
 
 
 class Validator:
     """Validates kit installations."""
 
-    def __init__(self, target_dir: Path, manifest: KitManifest):
+    def __init__(self, target_dir: Path, manifest: KitManifest,
+                 templates: Optional[TemplateEngine] = None):
         """
         Initialize validator.
 
         Args:
             target_dir: Target project directory
             manifest: Loaded kit manifest
+            templates: Shared template engine (None = create one)
         """
         self.target_dir = target_dir
         self.manifest = manifest
         self.detector = Detector(target_dir, manifest)
+        self.templates = templates or TemplateEngine(manifest.kits_dir, manifest)
 
-    def validate_all(self) -> Dict:
+    def validate_all(self, kits: Optional[List[str]] = None) -> Dict:
         """
         Validate all kits.
 
+        Args:
+            kits: Kits to validate (None = every kit, including pack kits)
+
         Returns:
             Validation results for all kits
         """
         checks = {}
         options = self.manifest.manifest.get('options', {})
 
-        for kit_name in self.manifest.get_kit_names():
-            checks[kit_name] = self.validate_kit(kit_name, options)
+        for kit_name in kits if kits is not None else self.manifest.get_kit_names():
+            try:
+                checks[kit_name] = self.validate_kit(kit_name, options)
+            except ValueError as e:
+                # A pack kit with a malformed kit.yaml
+                checks[kit_name] = {"passed": False, "status": "invalid", "message": str(e)}
 
         # Overall validation passes if at least one kit is fully installed
+        # and no kit definition is broken
         any_installed = any(
             check['status'] == 'installed'
             for check in checks.values()
         )
+        any_invalid = any(
+            check['status'] == 'invalid'
+            for check in checks.values()
+        )
 
         return {
-            "valid": any_installed,
+            "valid": any_installed and not any_invalid,
             "checks": checks,
             "target_dir": self.target_dir,
         }
@@ -117,7 +134,8 @@ class Validator:
 
         missing = []
         corrupted = []
-        outdated = []
+        compacted = []
+        modified = []
 
         for file_info in files_to_validate:
             # Skip non-required files
@@ -130,19 +148,23 @@ class Validator:
 
             target_path = self.target_dir / file_info['path']
 
-            # Check exists
-            if not target_path.exists():
+            # Check exists (one stat, so a concurrent removal can't slip in between checks)
+            try:
+                size = target_path.stat().st_size
+            except FileNotFoundError:
                 missing.append(file_info['path'])
                 continue
 
             # Check integrity
             if options.get('check_file_integrity', True):
                 min_size = options.get('min_file_size', 100)
-                if target_path.stat().st_size < min_size:
+                if size < min_size:
                     corrupted.append(file_info['path'])
 
-            # Check if outdated (differs from source)
-            # (Placeholder for now, can add diff later)
+            # Rendered commands: compare with what the kit would install,
+            # using the compaction recorded in the file itself
+            if file_info.get('agent'):
+                self._check_command(file_info, target_path, compacted, modified)
 
         # Build result
         if missing or corrupted:
@@ -158,14 +180,43 @@ class Validator:
                 "message": f"{kit_info['name']}: {', '.join(issues)}",
                 "missing_files": missing,
                 "corrupted_files": corrupted,
+                "compacted_files": compacted,
+                "modified_files": modified,
             }
 
         return {
             "passed": True,
             "status": "installed",
             "message": f"{kit_info['name']}: all files present",
+            "compacted_files": compacted,
+            "modified_files": modified,
         }
 
+    def _check_command(self, file_info: Dict, target_path: Path, compacted: list, modified: list):
+        """
+        Compare an installed command with its template.
+
+        Compacted files carry a marker naming the level and shells they were
+        rendered for, so they are compared against that variant rather than
+        the full template. Differences are informational (local edits or an
+        older kit release), not integrity failures.
+        """
+        try:
+            content = target_path.read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError):
+            return
+
+        level, shells = read_marker(content) or ("none", None)
+        if level != "none" or shells:
+            compacted.append(file_info['path'])
+
+        try:
+            expected = self.templates.render(file_info['source'], file_info['agent'], shells, level)
+        except (OSError, ValueError):
+            return
+        if expected.replace('\r\n', '\n') != content:
+            modified.append(file_info['path'])
+
     def is_kit_installed(self, kit_name: str) -> bool:
         """
         Quick check if kit is installed.
@@ -0,0 +1,413 @@
+"""
+Live feed of collaboration records across worktrees.
+
+Agents used to learn about a new handoff only when they next ran /sync and
+rescanned every specs/*/collaboration/ directory. This watches those
+directories in every worktree of the repository and reports each record
+that is created, changed or removed as soon as it happens, parsing only that
+one file. On Linux it uses inotify (through ctypes, no extra dependency);
+elsewhere, or if the kernel runs out of watches, it falls back to a short
+poll of the fixed collaboration layout.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+
+from .cache import fingerprint
+from .collab import KINDS, STATES, classify_path, iter_record_files, record_fields
+from .git import GitError, list_worktrees
+
+DEFAULT_INTERVAL = 1.0
+
+# How often the worktree list is re-read (new agents joining)
+WORKTREE_REFRESH = 5.0
+
+# inotify(7) constants
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+_DIR_MASK = _IN_CREATE | _IN_MOVED_TO | _IN_MOVED_FROM | _IN_DELETE | _IN_DELETE_SELF
+# Files are reported once written (close), not on every partial write
+_FILE_MASK = _DIR_MASK | _IN_CLOSE_WRITE
+_EVENT_HEADER = struct.Struct("iIII")
+
+EVENT_CREATED = "created"
+EVENT_MODIFIED = "modified"
+EVENT_DELETED = "deleted"
+
+Key = tuple[str, str]
+
+
+class WatchLimitError(OSError):
+    """The kernel refused another inotify watch (fs.inotify.max_user_watches)."""
+
+
+class _Inotify:
+    """Minimal Linux inotify binding."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add(self, path: Path, mask: int) -> int | None:
+        """Watch a directory; None if it vanished, WatchLimitError if out of watches."""
+        wd = self._add_watch(self.fd, os.fsencode(path), mask)
+        if wd >= 0:
+            return wd
+        code = ctypes.get_errno()
+        if code == errno.ENOSPC:
+            raise WatchLimitError(code, "inotify watch limit reached")
+        return None
+
+    def read(self, timeout: float) -> list[tuple[int, int, str]]:
+        """Wait up to timeout seconds and return (wd, mask, name) events."""
+        ready, _, _ = select.select([self.fd], [], [], max(timeout, 0))
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+def _open_inotify() -> _Inotify | None:
+    """inotify instance, or None where unavailable (non-Linux, old libc)."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return _Inotify()
+    except (OSError, AttributeError):
+        return None
+
+
+class CollabWatcher:
+    """Streams collaboration record changes from all worktrees of a repository."""
+
+    def __init__(self, target_dir: Path, interval: float = DEFAULT_INTERVAL, notify: bool = True):
+        """
+        Initialize collaboration watcher.
+
+        Args:
+            target_dir: Project root (any worktree of the repository)
+            interval: Poll interval in seconds when notifications are unavailable
+            notify: Use filesystem notifications where supported (False = always poll)
+        """
+        self.target_dir = Path(target_dir).resolve()
+        self.interval = max(interval, 0.05)
+        self.notify = notify
+        self.mode: str | None = None
+        self._known: dict[Key, tuple[int, int]] = {}
+        self._roots: list[str] = []
+        self._inotify: _Inotify | None = None
+        self._watches: dict[int, tuple[str, str]] = {}
+
+    def worktrees(self) -> list[str]:
+        """Checked-out worktrees of the repository (just the target outside git)."""
+        try:
+            paths = [
+                wt["path"] for wt in list_worktrees(self.target_dir)
+                if not wt["bare"] and not wt["prunable"]
+            ]
+        except GitError:
+            paths = []
+        return paths or [str(self.target_dir)]
+
+    def watch(
+        self,
+        kinds: list[str] | None = None,
+        agent: str | None = None,
+        replay: bool = False,
+        timeout: float | None = None,
+    ) -> Iterator[dict]:
+        """
+        Yield record events until timeout (or forever).
+
+        The first event is always {'event': 'ready', ...} with the mode
+        ('inotify' or 'poll'), the watched worktrees and the number of
+        existing records; after that one event per record change.
+
+        Args:
+            kinds: Record kinds to report (None = all)
+            agent: Only records by or for this agent (substring match)
+            replay: Also report every existing record as 'created' at start
+            timeout: Stop after this many seconds (None = run until interrupted)
+
+        Yields:
+            Event dicts: 'event' (created, modified, deleted), 'time',
+            'worktree', 'path', 'kind', 'state', 'feature' and the parsed
+            fields 'agent', 'to_agent', 'date', 'status', 'title'
+
+        Raises:
+            ValueError: If a record kind is unknown
+        """
+        for kind in kinds or []:
+            if kind not in KINDS:
+                raise ValueError(f"Unknown record kind: '{kind}'. Valid: {', '.join(KINDS)}")
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        self._known, self._roots, self._watches = {}, [], {}
+        self._inotify = _open_inotify() if self.notify else None
+        self.mode = "inotify" if self._inotify else "poll"
+        try:
+            initial = []
+            for root in self.worktrees():
+                initial.extend(self._add_root(root))
+            yield {
+                "event": "ready",
+                "time": _now(),
+                "mode": self.mode,
+                "worktrees": list(self._roots),
+                "records": len(self._known),
+            }
+            for event in initial if replay else []:
+                if _matches(event, kinds, agent):
+                    yield event
+            for batch in self._loop(deadline):
+                for event in batch:
+                    if _matches(event, kinds, agent):
+                        yield event
+        finally:
+            if self._inotify:
+                self._inotify.close()
+                self._inotify = None
+
+    def _loop(self, deadline: float | None) -> Iterator[list[dict]]:
+        """Batches of events from notifications or polling."""
+        next_refresh = time.monotonic() + WORKTREE_REFRESH
+        while True:
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                return
+            poll = self.interval if self._inotify is None else WORKTREE_REFRESH
+            wait = min(next_refresh - now, poll)
+            if deadline is not None:
+                wait = min(wait, deadline - now)
+
+            if self._inotify is not None:
+                try:
+                    batch = self._read_notifications(wait)
+                except WatchLimitError:
+                    self._fall_back_to_poll()
+                    batch = []
+            else:
+                time.sleep(max(wait, 0))
+                batch = [event for root in list(self._roots) for event in self._sync(root)]
+
+            if time.monotonic() >= next_refresh:
+                self._refresh_worktrees()
+                next_refresh = time.monotonic() + WORKTREE_REFRESH
+            yield batch
+
+    def _refresh_worktrees(self):
+        """Start watching new worktrees and forget removed ones."""
+        current = self.worktrees()
+        for root in [r for r in self._roots if r not in current]:
+            self._roots.remove(root)
+            self._known = {key: fp for key, fp in self._known.items() if key[0] != root}
+            self._watches = {wd: entry for wd, entry in self._watches.items() if entry[0] != root}
+        for root in current:
+            if root not in self._roots:
+                # Records a new worktree checks out are not news; only later changes are
+                self._add_root(root)
+
+    def _add_root(self, root: str) -> list[dict]:
+        """Start tracking a worktree; returns its existing records as 'created' events."""
+        self._roots.append(root)
+        if self._inotify is not None:
+            try:
+                self._watch_tree(root)
+            except WatchLimitError:
+                self._fall_back_to_poll()
+        return self._sync(root)
+
+    def _fall_back_to_poll(self):
+        """Too many directories for inotify: poll from here on."""
+        self._inotify.close()
+        self._inotify = None
+        self._watches.clear()
+        self.mode = "poll"
+
+    def _watch_tree(self, root: str):
+        """Add watches for the fixed collaboration layout of one worktree."""
+        add = self._add_watch
+        add(root, "", _IN_CREATE | _IN_MOVED_TO | _IN_ONLYDIR)
+        specs = Path(root) / "specs"
+        if not add(root, "specs", _DIR_MASK | _IN_ONLYDIR):
+            return
+        for feature in _subdirs(specs):
+            base = f"specs/{feature}"
+            if not add(root, base, _DIR_MASK | _IN_ONLYDIR):
+                continue
+            if not add(root, f"{base}/collaboration", _DIR_MASK | _IN_ONLYDIR):
+                continue
+            for state in STATES:
+                if not add(root, f"{base}/collaboration/{state}", _DIR_MASK | _IN_ONLYDIR):
+                    continue
+                for subdir in ("sessions", "decisions"):
+                    add(root, f"{base}/collaboration/{state}/{subdir}", _FILE_MASK | _IN_ONLYDIR)
+
+    def _add_watch(self, root: str, rel_dir: str, mask: int) -> bool:
+        wd = self._inotify.add(Path(root) / rel_dir, mask)
+        if wd is None:
+            return False
+        self._watches[wd] = (root, rel_dir)
+        return True
+
+    def _read_notifications(self, wait: float) -> list[dict]:
+        """Turn one read of inotify events into record events."""
+        events: list[dict] = []
+        resync: set[str] = set()
+        for wd, mask, name in self._inotify.read(wait):
+            if mask & _IN_Q_OVERFLOW:
+                resync.update(self._roots)
+                continue
+            if mask & _IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            entry = self._watches.get(wd)
+            if entry is None or not name:
+                continue
+            root, rel_dir = entry
+            if mask & _IN_ISDIR:
+                # New feature/collaboration/state directory: watch it and pick up
+                # records written before the watch existed
+                if rel_dir or name == "specs":
+                    resync.add(root)
+                continue
+            if mask & _IN_CREATE:
+                # Wait for the close that follows, so the record is complete
+                continue
+            rel_path = f"{rel_dir}/{name}"
+            event = self._update(root, rel_path)
+            if event:
+                events.append(event)
+
+        for root in resync:
+            if root in self._roots:
+                self._watch_tree(root)
+                events.extend(self._sync(root))
+        return events
+
+    def _sync(self, root: str) -> list[dict]:
+        """Diff one worktree's records against what is known (one pass over the layout)."""
+        seen = set()
+        events = []
+        for rel_path, kind, _, _, stat in iter_record_files(Path(root) / "specs"):
+            if kind == "bundle":
+                continue
+            seen.add(rel_path)
+            event = self._update(root, rel_path, fingerprint(stat))
+            if event:
+                events.append(event)
+        for key in [key for key in self._known if key[0] == root and key[1] not in seen]:
+            event = self._update(root, key[1])
+            if event:
+                events.append(event)
+        return events
+
+    def _update(
+        self, root: str, rel_path: str, fp: tuple[int, int] | None = None
+    ) -> dict | None:
+        """Compare one record with its last known fingerprint and build its event."""
+        classified = classify_path(rel_path)
+        if classified is None:
+            return None
+        key = (root, rel_path)
+        if fp is None:
+            try:
+                fp = fingerprint(os.stat(Path(root) / rel_path))
+            except OSError:
+                fp = None
+
+        previous = self._known.get(key)
+        if fp == previous:
+            return None
+        if fp is None:
+            del self._known[key]
+            change = EVENT_DELETED
+        else:
+            self._known[key] = fp
+            change = EVENT_CREATED if previous is None else EVENT_MODIFIED
+        return _build_event(change, root, rel_path, *classified)
+
+
+def _build_event(
+    change: str, root: str, rel_path: str, kind: str, state: str, feature: str
+) -> dict:
+    """Event dict for a record, parsing the file unless it was deleted."""
+    text = ""
+    if change != EVENT_DELETED:
+        try:
+            text = (Path(root) / rel_path).read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            pass
+    fields = record_fields(rel_path, kind, text)
+    return {
+        "event": change,
+        "time": _now(),
+        "worktree": root,
+        "path": rel_path,
+        "kind": kind,
+        "state": state,
+        "feature": feature,
+        "agent": fields.get("agent"),
+        "to_agent": fields.get("to_agent"),
+        "date": fields.get("date"),
+        "status": fields.get("status"),
+        "title": fields.get("title", Path(rel_path).stem),
+    }
+
+
+def _matches(event: dict, kinds: list[str] | None, agent: str | None) -> bool:
+    if kinds and event["kind"] not in kinds:
+        return False
+    if agent:
+        needle = agent.lower()
+        return any(needle in (event[field] or "").lower() for field in ("agent", "to_agent"))
+    return True
+
+
+def _subdirs(directory: Path) -> list[str]:
+    try:
+        return sorted(entry.name for entry in os.scandir(directory) if entry.is_dir())
+    except OSError:
+        return []
+
+
+def _now() -> str:
+    return datetime.now().astimezone().isoformat(timespec="milliseconds")
@@ -0,0 +1,496 @@
+"""
+Worktree-aware installs backed by one kit store per repository.
+
+The multiagent kit suggests one git worktree per agent. Instead of copying
+and validating the kits again in every worktree, installed files are kept
+once in a content-addressed store under the git common dir
+(<common-dir>/lite-kits/objects/, read-only) and cloned into each worktree:
+a reflink where the filesystem supports it (shared blocks, copy-on-write),
+otherwise a kernel-side copy. Every worktree gets its own inode, so an edit
+in one agent's worktree never shows up in another's or in the store.
+<common-dir>/lite-kits/state.json records what every worktree got, so
+status can report on all worktrees with a stat per file and a new worktree
+only needs clones of objects that already exist.
+
+provision_worktree() builds an agent workspace on top of this: a worktree
+(optionally sparse, limited to the feature), kit files cloned from the
+store, content-addressed caches seeded from the current worktree, and a
+session log ready to fill in.
+"""
+
+import hashlib
+import os
+import re
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+from .cache import CACHE_DIR, read_json, replace_file, write_json_atomic
+from .collab import KIND_SESSION
+from .feature import resolve_feature
+from .git import GitError, common_dir, list_worktrees, run_git
+from .lock import ProjectLock
+from .records import new_record
+
+STORE_DIR = "lite-kits"
+STATE_FILE = "state.json"
+STATE_VERSION = 1
+
+# Caches keyed by content (blob / tree hashes), so valid in any worktree
+SHARED_CACHES = ["audit.json", "hooks.json"]
+
+SESSION_TEMPLATE = Path(".specify") / "templates" / "session-log.md"
+
+# ioctl(FICLONE) from linux/fs.h: share the source's blocks copy-on-write
+_FICLONE = 0x40049409
+
+
+class KitStore:
+    """Content-addressed kit files shared by all worktrees of a repository."""
+
+    def __init__(self, root: Path):
+        """
+        Initialize kit store.
+
+        Args:
+            root: Store directory (<git-common-dir>/lite-kits)
+        """
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.state_path = self.root / STATE_FILE
+
+    @classmethod
+    def for_project(cls, target_dir: Path) -> Optional["KitStore"]:
+        """
+        Store for the repository containing a project.
+
+        Args:
+            target_dir: Project (worktree) directory
+
+        Returns:
+            KitStore, or None if the project is not in a git repository
+        """
+        common = common_dir(target_dir)
+        return cls(common / STORE_DIR) if common else None
+
+    def put(self, data: bytes) -> str:
+        """
+        Add content to the store (written once, however many worktrees use it).
+
+        Args:
+            data: File content
+
+        Returns:
+            Content digest (object name)
+        """
+        digest = hashlib.sha1(data).hexdigest()
+        path = self.object_path(digest)
+        if not path.is_file():
+            replace_file(path, lambda tmp: _write_object(data, tmp))
+        return digest
+
+    def object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def place(self, target: Path, data: bytes) -> dict:
+        """
+        Put content in the store and clone it to a worktree file.
+
+        The target is replaced atomically, so lock-free readers never see a
+        partial file.
+
+        Args:
+            target: File to create or replace
+            data: File content
+
+        Returns:
+            Dict with 'hash', 'mode' ('clone' or 'copy'), 'mtime' and 'size'
+            (of the placed file, so verify() can trust it without reading)
+        """
+        return self.link(target, {"hash": self.put(data)})
+
+    def link(self, target: Path, info: dict) -> dict:
+        """
+        Clone an object already in the store to a worktree file.
+
+        The file is a reflink of the object where the filesystem supports it
+        and a copy otherwise; never a hard link, so it can be edited freely.
+
+        Args:
+            target: File to create or replace
+            info: File record ('hash') from another worktree's state
+
+        Returns:
+            Dict with 'hash', 'mode' and 'mtime' like place()
+
+        Raises:
+            FileNotFoundError: If the object is not in the store
+        """
+        source = self.object_path(info["hash"])
+        if not source.is_file():
+            raise FileNotFoundError(f"Not in kit store: {info['hash']}")
+        modes = []
+        replace_file(target, lambda tmp: modes.append(_clone(source, tmp)))
+        stat = target.stat()
+        return {
+            "hash": info["hash"],
+            "mode": modes[0],
+            "mtime": stat.st_mtime_ns,
+            "size": stat.st_size,
+        }
+
+    def state(self) -> dict:
+        """
+        Load the install record of every worktree.
+
+        Returns:
+            Dict of worktree path -> entry ('kits', 'agents', 'shells',
+            'compaction', 'files' (path -> {hash, mode}) and 'updated')
+        """
+        data = read_json(self.state_path)
+        if not isinstance(data, dict) or data.get("version") != STATE_VERSION:
+            return {}
+        return data.get("worktrees") or {}
+
+    def record(self, worktree: Path, entry: dict, removed: list[str] | None = None):
+        """
+        Merge an install (or removal) into a worktree's record.
+
+        Args:
+            worktree: Worktree directory
+            entry: 'kits', 'agents', 'shells', 'compaction' and 'files' to merge
+            removed: Paths no longer installed in the worktree
+        """
+        with ProjectLock(self.root, "state", lock_dir=Path(".")):
+            worktrees = self.state()
+            key = str(Path(worktree).resolve())
+            current = worktrees.get(key) or {"kits": [], "files": {}}
+
+            files = dict(current.get("files") or {})
+            files.update(entry.get("files") or {})
+            for path in removed or []:
+                files.pop(path, None)
+
+            kits = sorted(set(current.get("kits") or []) | set(entry.get("kits") or []))
+            current.update({k: v for k, v in entry.items() if k not in ("files", "kits")})
+            current.update(kits=kits, files=files, updated=time.time())
+            if files:
+                worktrees[key] = current
+            else:
+                worktrees.pop(key, None)
+            write_json_atomic(self.state_path, {"version": STATE_VERSION, "worktrees": worktrees})
+
+    def forget_kits(self, worktree: Path, kits: list[str]):
+        """
+        Drop kits from a worktree's record (after their files were removed).
+
+        Args:
+            worktree: Worktree directory
+            kits: Removed kit names
+        """
+        with ProjectLock(self.root, "state", lock_dir=Path(".")):
+            worktrees = self.state()
+            key = str(Path(worktree).resolve())
+            if key in worktrees:
+                remaining = [kit for kit in worktrees[key].get("kits", []) if kit not in kits]
+                worktrees[key]["kits"] = remaining
+                write_json_atomic(
+                    self.state_path, {"version": STATE_VERSION, "worktrees": worktrees}
+                )
+
+    def verify(self, worktree: Path, entry: dict) -> dict:
+        """
+        Check a worktree's files against the store.
+
+        A file with the recorded mtime and size is intact from one stat;
+        anything else is hashed.
+
+        Args:
+            worktree: Worktree directory
+            entry: The worktree's record from state()
+
+        Returns:
+            Dict with 'files', 'cloned', 'copied', 'missing' and 'modified'
+            (lists of paths for the last two)
+        """
+        result = {"files": 0, "cloned": 0, "copied": 0, "missing": [], "modified": []}
+        for relative, info in sorted((entry.get("files") or {}).items()):
+            result["files"] += 1
+            path = Path(worktree) / relative
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                result["missing"].append(relative)
+                continue
+            kind = "cloned" if info.get("mode") == "clone" else "copied"
+            if stat.st_mtime_ns == info.get("mtime") and stat.st_size == info.get("size"):
+                result[kind] += 1
+                continue
+            try:
+                same = hashlib.sha1(path.read_bytes()).hexdigest() == info["hash"]
+            except OSError:
+                same = False
+            if same:
+                result[kind] += 1
+            else:
+                result["modified"].append(relative)
+        return result
+
+    def report(self, target_dir: Path) -> list[dict]:
+        """
+        Per-worktree install status from the shared state.
+
+        Args:
+            target_dir: Any worktree of the repository
+
+        Returns:
+            One dict per worktree ('path', 'branch', 'current', 'kits' and
+            the verify() keys; 'kits' is empty for worktrees without kits)
+        """
+        state = self.state()
+        current = Path(run_git(["rev-parse", "--show-toplevel"], target_dir).strip()).resolve()
+        rows = []
+        for worktree in list_worktrees(target_dir):
+            if worktree["bare"]:
+                continue
+            path = Path(worktree["path"]).resolve()
+            entry = state.get(str(path)) or {}
+            row = {
+                "path": str(path),
+                "branch": worktree["branch"],
+                "current": path == current,
+                "kits": entry.get("kits", []),
+                "prunable": worktree["prunable"],
+            }
+            row.update(self.verify(path, entry))
+            rows.append(row)
+        return rows
+
+
+def install_worktrees(target_dir: Path, **options) -> list[dict]:
+    """
+    Install kits into every worktree of the project's repository.
+
+    Kit files are rendered once and written to the store once; each
+    worktree then only gets links. The first installed worktree is fully
+    validated; the others are verified against the store.
+
+    Args:
+        target_dir: Any worktree of the repository
+        **options: Installer arguments (kits, force, agents, shells, compaction)
+
+    Returns:
+        One dict per worktree with 'path', 'branch', and either 'result'
+        (Installer.install() result) or 'skipped' (reason)
+
+    Raises:
+        ValueError: If the project is not in a git repository
+    """
+    from .installer import Installer
+
+    store = KitStore.for_project(target_dir)
+    if store is None:
+        raise ValueError(f"Not a git repository: {target_dir}")
+
+    templates = None
+    validated = False
+    results = []
+    for worktree in list_worktrees(target_dir):
+        row = {"path": worktree["path"], "branch": worktree["branch"]}
+        results.append(row)
+        path = Path(worktree["path"])
+        if worktree["bare"] or worktree["prunable"] or not path.is_dir():
+            row["skipped"] = "no working directory"
+            continue
+
+        installer = Installer(path, store=store, templates=templates, **options)
+        if not installer.is_spec_kit_project():
+            row["skipped"] = "not a spec-kit project"
+            continue
+        templates = installer.templates
+        installer.validate_on_install = not validated
+        row["result"] = installer.install()
+        validated = validated or row["result"]["success"]
+        if row["result"]["success"] and not installer.validate_on_install:
+            entry = store.state().get(str(path.resolve())) or {}
+            row["result"]["store"] = store.verify(path, entry)
+    return results
+
+
+def provision_worktree(
+    target_dir: Path,
+    agent: str,
+    feature: str,
+    path: Path | None = None,
+    branch: str | None = None,
+    start: str | None = None,
+    sparse: bool = False,
+    include: list[str] | None = None,
+) -> dict:
+    """
+    Create a ready-to-use worktree for one agent working on one feature.
+
+    Args:
+        target_dir: Any worktree of the repository
+        agent: Agent name (e.g. 'claude')
+        feature: Feature name or number ('003', '003-user-auth')
+        path: Worktree directory (None = '<repo>-<feature>-<agent>' next to the main worktree)
+        branch: Branch to create (None = '<feature>-<agent>'; git allows a branch
+            in only one worktree, so agents get their own)
+        start: Start point (None = the feature branch if it exists, else HEAD)
+        sparse: Check out only the feature's spec directory, .specify/, agent
+            directories and root files (cone-mode sparse checkout)
+        include: Extra directories for a sparse checkout
+
+    Returns:
+        Dict with 'path', 'branch', 'feature', 'agent', 'start', 'sparse'
+        (checked-out directories or None), 'kits' (files cloned from the store),
+        'caches' (seeded cache files), 'session_log' and 'seconds'
+
+    Raises:
+        ValueError: If the repository, feature or agent name is invalid
+        GitError: If git cannot create the worktree
+    """
+    started = time.monotonic()
+    target_dir = Path(target_dir).resolve()
+    store = KitStore.for_project(target_dir)
+    if store is None:
+        raise ValueError(f"Not a git repository: {target_dir}")
+    if not re.fullmatch(r"[A-Za-z0-9][A-Za-z0-9._-]*", agent):
+        raise ValueError(f"Invalid agent name: {agent!r}")
+
+    toplevel = Path(run_git(["rev-parse", "--show-toplevel"], target_dir).strip()).resolve()
+    main = Path(list_worktrees(target_dir)[0]["path"])
+    feature = resolve_feature(toplevel, feature)
+    branch = branch or f"{feature}-{agent}"
+    if start is None:
+        has_feature_branch = run_git(
+            ["rev-parse", "-q", "--verify", f"refs/heads/{feature}^{{commit}}"],
+            toplevel,
+            check=False,
+        ).strip()
+        start = feature if has_feature_branch else "HEAD"
+    path = Path(path) if path else main.parent / f"{main.name}-{feature.split('-')[0]}-{agent}"
+    path = path.resolve()
+
+    # Without a checkout the sparse patterns are in place before any file is written
+    run_git(["worktree", "add", "--no-checkout", "-b", branch, str(path), start], toplevel)
+    try:
+        sparse_dirs = None
+        if sparse:
+            sparse_dirs = [f"specs/{feature}", ".specify", *_agent_dirs(toplevel), *(include or [])]
+            run_git(["sparse-checkout", "set", "--cone", *sparse_dirs], path)
+        run_git(["checkout", "-q", branch], path)
+    except GitError:
+        run_git(["worktree", "remove", "--force", str(path)], toplevel, check=False)
+        run_git(["branch", "-D", branch], toplevel, check=False)
+        raise
+
+    return {
+        "path": str(path),
+        "branch": branch,
+        "feature": feature,
+        "agent": agent,
+        "start": start,
+        "sparse": sparse_dirs,
+        "kits": _link_kits(store, toplevel, path),
+        "caches": _seed_caches(toplevel, path),
+        "session_log": _create_session_log(toplevel, path, feature, agent),
+        "seconds": round(time.monotonic() - started, 3),
+    }
+
+
+def has_linked_worktrees(target_dir: Path) -> bool:
+    """True if the project's repository has more than one worktree."""
+    try:
+        return len(list_worktrees(target_dir)) > 1
+    except GitError:
+        return False
+
+
+def _agent_dirs(toplevel: Path) -> list[str]:
+    """Agent directories (.claude, .github, ...) present in the source worktree."""
+    return sorted(
+        entry.name for entry in os.scandir(toplevel)
+        if entry.is_dir() and entry.name.startswith(".") and entry.name not in (".git", ".specify")
+    )
+
+
+def _link_kits(store: KitStore, source: Path, path: Path) -> dict:
+    """Clone the source worktree's store-managed kit files that the checkout lacks."""
+    entry = store.state().get(str(source)) or {}
+    placed = {}
+    for relative, info in sorted((entry.get("files") or {}).items()):
+        target = path / relative
+        if target.exists():
+            continue  # committed kit files come with the checkout
+        try:
+            placed[relative] = store.link(target, info)
+        except FileNotFoundError:
+            continue
+    if placed:
+        store.record(path, {
+            **{key: entry[key] for key in ("kits", "agents", "shells", "compaction")
+               if key in entry},
+            "files": placed,
+        })
+    return {"kits": entry.get("kits", []), "placed": len(placed)}
+
+
+def _seed_caches(source: Path, path: Path) -> list[str]:
+    """Clone content-addressed caches (reflink where possible) into the new worktree."""
+    seeded = []
+    for name in SHARED_CACHES:
+        cache = source / CACHE_DIR / name
+        if not cache.is_file():
+            continue
+        target = path / CACHE_DIR / name
+        if target.exists():
+            continue
+        replace_file(target, lambda tmp: _clone(cache, tmp))  # creates .gitignore too
+        seeded.append(name)
+    return seeded
+
+
+def _create_session_log(source: Path, path: Path, feature: str, agent: str) -> str | None:
+    """Session log from the project's session-log template, if the multiagent kit is installed."""
+    for root in (path, source):
+        template = root / SESSION_TEMPLATE
+        if template.is_file():
+            log, _ = new_record(
+                path / "specs" / feature, KIND_SESSION, template.read_text(encoding='utf-8'),
+                {"agent": agent, "status": "ongoing"}, lock_root=path,
+            )
+            return str(log)
+    return None
+
+
+def _clone(source: Path, tmp: str) -> str:
+    """
+    Fill a temp file with a source file's content.
+
+    Returns:
+        'clone' for a reflink (FICLONE, Linux), 'copy' otherwise
+        (shutil.copyfile uses sendfile/copy_file_range where available)
+    """
+    mode = "copy"
+    if sys.platform.startswith("linux"):
+        import fcntl
+
+        try:
+            with open(source, "rb") as src, open(tmp, "wb") as dst:
+                fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+            mode = "clone"
+        except OSError:
+            pass  # Other filesystem or no reflink support (ext4, tmpfs)
+    if mode == "copy":
+        shutil.copyfile(source, tmp)
+    os.chmod(tmp, 0o644)
+    return mode
+
+
+def _write_object(data: bytes, tmp: str):
+    Path(tmp).write_bytes(data)
+    os.chmod(tmp, 0o444)  # objects are never edited; worktrees get their own clones
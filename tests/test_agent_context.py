@@ -0,0 +1,19 @@
+"""Tests for agent context file updates."""
+
+from lite_kits.core.agent_context import MAX_RECENT_CHANGES, _update_sections
+
+PLAN = {"language": "Python 3.11", "framework": "FastAPI", "storage": "", "project_type": ""}
+
+
+def test_recent_changes_keeps_newest_entries():
+    # Identical entries are trimmed by position
+    old = ["- 001-old: Added Go\n"] * MAX_RECENT_CHANGES
+    text = "## Recent Changes\n" + "".join(old) + "\n## Other\n"
+
+    new, changed = _update_sections(text, PLAN, "002-api", "2026-01-01")
+
+    assert changed == ["Recent Changes"]
+    section = new.split("## Other")[0]
+    entries = [line for line in section.splitlines() if line.startswith("- ")]
+    assert entries[0] == "- 002-api: Added Python 3.11 + FastAPI"
+    assert len(entries) == MAX_RECENT_CHANGES
@@ -0,0 +1,35 @@
+"""Tests for packing archived collaboration records."""
+
+import os
+
+import pytest
+
+from lite_kits.core.archive import CollabArchiver
+
+
+def _record(tmp_path, name, date_field, mtime=None):
+    sessions = tmp_path / "specs" / "001-demo" / "collaboration" / "archive" / "sessions"
+    sessions.mkdir(parents=True, exist_ok=True)
+    path = sessions / name
+    path.write_text(f"# Session\n\n**Date**: {date_field}\n", encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return f"specs/001-demo/collaboration/archive/sessions/{name}"
+
+
+def test_pack_parses_record_dates(tmp_path):
+    old = _record(tmp_path, "a-claude.md", "2025-09-30T09:00")
+    same_day = _record(tmp_path, "b-claude.md", "2025-10-01 09:00")
+    # Not a date: the file's mtime decides (2020 -> packed, today -> kept)
+    old_mtime = _record(tmp_path, "c-claude.md", "Sept 30, 2025", mtime=1_600_000_000)
+    new_mtime = _record(tmp_path, "d-claude.md", "last Tuesday")
+
+    packed = CollabArchiver(tmp_path).pack("2025-10-01", dry_run=True)["packed"]
+
+    assert packed == [old, old_mtime]
+    assert same_day not in packed and new_mtime not in packed
+
+
+def test_pack_rejects_invalid_cutoff(tmp_path):
+    with pytest.raises(ValueError, match="Invalid cutoff date"):
+        CollabArchiver(tmp_path).pack("90 days")
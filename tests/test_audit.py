@@ -0,0 +1,82 @@
+"""Tests for the audit scanner."""
+
+import subprocess
+
+from lite_kits.core.audit import RULE_INFO, AuditScanner, scan_file
+
+GITHUB_TOKEN = "ghp_" + "a1B2c3D4e5F6g7H8i9J0k1L2m3N4o5P6q7R8"
+AWS_KEY = "AKIA" + "IOSFODNN7EXAMPLE"
+
+
+def _findings(tmp_path, text):
+    path = tmp_path / "config.py"
+    path.write_text(text, encoding="utf-8")
+    _, binary, findings = scan_file(str(path))
+    assert not binary
+    return [(f["rule"], RULE_INFO[f["rule"]]["severity"]) for f in findings]
+
+
+def test_github_token_in_assignment_is_high(tmp_path):
+    assert _findings(tmp_path, f'GITHUB_TOKEN = "{GITHUB_TOKEN}"\n') == [("github-token", "high")]
+
+
+def test_aws_key_in_assignment_is_high(tmp_path):
+    assert _findings(tmp_path, f'aws_key = "{AWS_KEY}"\n') == [("aws-access-key", "high")]
+    assert _findings(tmp_path, f'AWS_API_KEY = "{AWS_KEY}"\n') == [("aws-access-key", "high")]
+
+
+def test_generic_secret_stays_medium(tmp_path):
+    findings = _findings(tmp_path, 'db_password = "hunter2hunter2"\n')
+    assert findings == [("hardcoded-secret", "medium")]
+
+
+def test_token_is_redacted_in_snippet(tmp_path):
+    path = tmp_path / "config.py"
+    path.write_text(f'GITHUB_TOKEN = "{GITHUB_TOKEN}"\n', encoding="utf-8")
+    _, _, findings = scan_file(str(path))
+    assert GITHUB_TOKEN not in findings[0]["snippet"]
+    assert findings[0]["column"] == len('GITHUB_TOKEN = "') + 1
+
+
+def _git(cwd, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=cwd, check=True, capture_output=True,
+    )
+
+
+def _staged_repo(tmp_path):
+    """Index holds a key in app.py that the work tree no longer has; lib.py is dirty."""
+    _git(tmp_path, "init", "-q", ".")
+    (tmp_path / "app.py").write_text("x = 1\n", encoding="utf-8")
+    (tmp_path / "lib.py").write_text("y = 2\n", encoding="utf-8")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-qm", "init")
+    (tmp_path / "app.py").write_text(f'aws_key = "{AWS_KEY}"\n', encoding="utf-8")
+    _git(tmp_path, "add", "app.py")
+    (tmp_path / "app.py").write_text("x = 1\n", encoding="utf-8")
+    (tmp_path / "lib.py").write_text('db_password = "hunter2hunter2"\n', encoding="utf-8")
+    return tmp_path
+
+
+def _rules(report):
+    return [(f["path"], f["rule"]) for f in report["findings"]]
+
+
+def test_staged_scan_reads_index_content(tmp_path):
+    repo = _staged_repo(tmp_path)
+    report = AuditScanner(repo, workers=1, use_cache=False).scan(staged=True)
+
+    assert report["files"] == 2
+    assert _rules(report) == [("app.py", "aws-access-key")]
+
+
+def test_paths_limit_the_scan(tmp_path):
+    repo = _staged_repo(tmp_path)
+    scanner = AuditScanner(repo, workers=1, use_cache=False)
+
+    assert _rules(scanner.scan(paths=["app.py"], staged=True)) == [("app.py", "aws-access-key")]
+    assert _rules(scanner.scan(paths=["app.py"])) == []
+    report = scanner.scan(paths=["lib.py"])
+    assert report["files"] == 1
+    assert _rules(report) == [("lib.py", "hardcoded-secret")]
@@ -0,0 +1,89 @@
+"""Tests for working tree checkpoints."""
+
+import subprocess
+
+import pytest
+
+from lite_kits.core.checkpoint import CheckpointStore
+
+
+def _git(cwd, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=cwd, check=True, capture_output=True,
+    )
+
+
+def _repo(path, *init_args):
+    _git(path, "init", "-q", *init_args, ".")
+    (path / "app.py").write_text("x = 1\n", encoding="utf-8")
+    _git(path, "add", ".")
+    _git(path, "commit", "-qm", "init")
+    return path
+
+
+def test_sha256_repository(tmp_path):
+    try:
+        repo = _repo(tmp_path, "--object-format=sha256")
+    except subprocess.CalledProcessError:
+        pytest.skip("git without SHA-256 support")
+    store = CheckpointStore(repo)
+
+    first = store.create("one")
+    (repo / "app.py").write_text("x = 2\n", encoding="utf-8")
+    second = store.create("two")
+
+    assert len(first["commit"]) == 64
+    assert (first["id"], second["id"]) == (1, 2)
+    assert [c["id"] for c in store.list()] == [2, 1]
+
+
+def test_restore_brings_back_edited_deleted_and_new_files(tmp_path):
+    repo = _repo(tmp_path)
+    (repo / "notes.txt").write_text("draft\n", encoding="utf-8")
+    store = CheckpointStore(repo)
+    checkpoint = store.create("before refactor")
+
+    # Racily clean: same size, same second as the snapshot
+    (repo / "app.py").write_text("x = 9\n", encoding="utf-8")
+    (repo / "notes.txt").unlink()
+    (repo / "scratch.py").write_text("tmp\n", encoding="utf-8")
+
+    result = store.restore(checkpoint["id"])
+
+    assert sorted(result["restored"]) == ["app.py", "notes.txt"]
+    assert result["removed"] == ["scratch.py"]
+    assert (repo / "app.py").read_text(encoding="utf-8") == "x = 1\n"
+    assert (repo / "notes.txt").read_text(encoding="utf-8") == "draft\n"
+    assert not (repo / "scratch.py").exists()
+
+    # The pre-restore state was checkpointed and can be restored in turn
+    store.restore(result["backup"], backup=False)
+    assert (repo / "app.py").read_text(encoding="utf-8") == "x = 9\n"
+    assert (repo / "scratch.py").exists()
+
+
+def test_restore_paths_are_literal(tmp_path):
+    repo = _repo(tmp_path)
+    (repo / "a*").write_text("star\n", encoding="utf-8")
+    (repo / "ab").write_text("ab\n", encoding="utf-8")
+    store = CheckpointStore(repo)
+    checkpoint = store.create()
+
+    (repo / "a*").write_text("STAR\n", encoding="utf-8")
+    (repo / "ab").write_text("AB\n", encoding="utf-8")
+    result = store.restore(checkpoint["id"], paths=["a*"])
+
+    assert result["restored"] == ["a*"]
+    assert (repo / "a*").read_text(encoding="utf-8") == "star\n"
+    assert (repo / "ab").read_text(encoding="utf-8") == "AB\n"
+
+
+def test_create_skips_unchanged_tree(tmp_path):
+    store = CheckpointStore(_repo(tmp_path))
+
+    first = store.create()
+    again = store.create()
+
+    assert first["created"] and not again["created"]
+    assert again["id"] == first["id"]
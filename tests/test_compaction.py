@@ -0,0 +1,32 @@
+"""Tests for shell filtering of shipped command prompts."""
+
+import pytest
+
+from lite_kits.core.manifest import KITS_DIR, KitManifest
+from lite_kits.core.templates import TemplateEngine
+
+PROMPTS = [
+    "dev/commands/audit.md",
+    "dev/commands/cleanup.md",
+    "dev/commands/commit.md",
+    "dev/commands/orient.md",
+    "dev/commands/pr.md",
+    "dev/commands/stats.md",
+    "multiagent/commands/sync.md",
+]
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return TemplateEngine(KITS_DIR, KitManifest(KITS_DIR))
+
+
+@pytest.mark.parametrize("source", PROMPTS)
+@pytest.mark.parametrize("shell, other", [("bash", "powershell"), ("powershell", "bash")])
+def test_single_shell_install_drops_other_variants(engine, source, shell, other):
+    every_shell = engine.render(source, "claude", None)
+    one_shell = engine.render(source, "claude", [shell])
+
+    assert len(one_shell.encode("utf-8")) < len(every_shell.encode("utf-8"))
+    assert f"```{other}" not in one_shell
+    assert f"```{shell}" in one_shell
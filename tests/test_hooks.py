@@ -0,0 +1,93 @@
+"""Tests for pre-commit hook file selection."""
+
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import yaml
+
+from lite_kits.core.hooks import HOOKS_CONFIG, HookRunner, load_hooks
+from lite_kits.core.manifest import KITS_DIR
+
+# Prints the filenames the hook was given
+ECHO = f"{Path(sys.executable).as_posix()} -c 'import sys; print(*sys.argv[1:])'"
+
+
+def _git(cwd, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=cwd, check=True, capture_output=True,
+    )
+
+
+def _repo(tmp_path, hooks):
+    _git(tmp_path, "init", "-q", ".")
+    (tmp_path / ".specify").mkdir()
+    (tmp_path / ".specify" / "hooks.yaml").write_text(
+        yaml.safe_dump({"hooks": hooks}), encoding="utf-8"
+    )
+    (tmp_path / "old.py").write_text("x = 1\n", encoding="utf-8")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-qm", "init")
+    return tmp_path
+
+
+def _stage(repo, *names):
+    for name in names:
+        path = repo / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"# {name}\n", encoding="utf-8")
+    _git(repo, "add", *names)
+
+
+def test_hooks_receive_only_matching_staged_files(tmp_path):
+    repo = _repo(tmp_path, [
+        {"id": "py", "entry": ECHO, "files": r"\.py$", "exclude": r"^vendor/"},
+        {"id": "md", "entry": ECHO, "files": r"\.md$"},
+        {"id": "js", "entry": ECHO, "files": r"\.js$"},
+        {"id": "whole", "entry": ECHO, "pass_filenames": False, "always_run": True},
+    ])
+    _stage(repo, "app.py", "vendor/lib.py", "README.md")
+    (repo / "unstaged.py").write_text("y = 2\n", encoding="utf-8")
+
+    report = HookRunner(repo, use_cache=False).run()
+    hooks = {hook["id"]: hook for hook in report["hooks"]}
+
+    assert report["files"] == 3
+    assert hooks["py"]["output"] == "app.py"
+    assert hooks["md"]["output"] == "README.md"
+    assert hooks["js"]["status"] == "skipped"
+    assert (hooks["whole"]["status"], hooks["whole"]["output"]) == ("passed", "")
+
+
+def test_all_files_selects_every_tracked_file(tmp_path):
+    repo = _repo(tmp_path, [{"id": "py", "entry": ECHO, "files": r"\.py$"}])
+    _stage(repo, "app.py")
+
+    report = HookRunner(repo, use_cache=False).run(all_files=True)
+
+    assert report["hooks"][0]["output"] == "app.py old.py"
+
+
+def test_passing_hooks_are_cached_per_staged_tree(tmp_path):
+    repo = _repo(tmp_path, [{"id": "py", "entry": ECHO, "files": r"\.py$"}])
+    _stage(repo, "app.py")
+
+    assert HookRunner(repo).run()["hooks"][0]["status"] == "passed"
+    assert HookRunner(repo).run()["hooks"][0]["status"] == "cached"
+
+    _stage(repo, "other.py")
+    assert HookRunner(repo).run()["hooks"][0]["status"] == "passed"
+
+
+def test_default_audit_hook_gets_staged_filenames(tmp_path):
+    (tmp_path / HOOKS_CONFIG).parent.mkdir()
+    shutil.copy(KITS_DIR / "hooks" / "templates" / "hooks.yaml", tmp_path / HOOKS_CONFIG)
+    audit = next(hook for hook in load_hooks(tmp_path)["hooks"] if hook["id"] == "audit")
+
+    assert "--staged" in audit["entry"].split()
+    assert audit["pass_filenames"] and not audit["always_run"]
+    assert HookRunner._filter(audit, ["src/app.py", "logo.png", "dist/app.tar.gz"]) == [
+        "src/app.py"
+    ]
@@ -0,0 +1,63 @@
+"""Tests for incremental refresh of the collaboration and search indexes."""
+
+import pytest
+
+from lite_kits.core.collab import CollabIndex
+from lite_kits.core.search import SearchIndex
+
+SESSION = "specs/001-demo/collaboration/active/sessions/2025-10-01-claude.md"
+
+
+@pytest.fixture
+def project(tmp_path):
+    # .specify/ keeps the index databases inside the project
+    (tmp_path / ".specify" / "memory").mkdir(parents=True)
+    session = tmp_path / SESSION
+    session.parent.mkdir(parents=True)
+    session.write_text("# Parser work\n\n**Status**: active\n", encoding="utf-8")
+    return tmp_path
+
+
+def test_collab_index_refreshes_changed_and_deleted_records(project):
+    index = CollabIndex(project)
+    try:
+        assert index.refresh()["updated"] == 1
+        assert [r["title"] for r in index.query()] == ["Parser work"]
+
+        # Unchanged fingerprint: nothing is reparsed
+        assert index.refresh() == {"scanned": 1, "bundles": 0, "updated": 0, "removed": 0}
+
+        (project / SESSION).write_text("# Parser rewrite done\n\n**Status**: complete\n")
+        assert index.refresh()["updated"] == 1
+        assert [(r["title"], r["status"]) for r in index.query()] == [
+            ("Parser rewrite done", "complete")
+        ]
+
+        (project / SESSION).unlink()
+        assert index.refresh()["removed"] == 1
+        assert index.query() == []
+    finally:
+        index.close()
+
+
+def test_search_index_reindexes_changed_and_deleted_files(project):
+    notes = project / ".specify" / "memory" / "notes.md"
+    notes.write_text("# Notes\n\nThe zebra parser is slow.\n", encoding="utf-8")
+    index = SearchIndex(project)
+    try:
+        assert index.refresh() == {"files": 2, "updated": 2, "removed": 0}
+        assert [hit["path"] for hit in index.search("zebra")] == [".specify/memory/notes.md"]
+
+        assert index.refresh()["updated"] == 0
+
+        notes.write_text("# Notes\n\nThe giraffe parser is fast now.\n", encoding="utf-8")
+        assert index.refresh()["updated"] == 1
+        assert index.search("zebra") == []
+        assert [hit["line"] for hit in index.search("giraffe")] == [3]
+
+        notes.unlink()
+        assert index.refresh()["removed"] == 1
+        assert index.search("giraffe") == []
+        assert [hit["path"] for hit in index.search("parser")] == [SESSION]
+    finally:
+        index.close()
@@ -0,0 +1,31 @@
+"""Tests for kit packs with broken fragments."""
+
+from lite_kits.core.manifest import KITS_DIR, PACK_PATH_ENV, KitManifest
+from lite_kits.core.orient import OrientBuilder
+
+
+def _broken_pack(tmp_path, monkeypatch):
+    pack = tmp_path / "pack"
+    (pack / "broken").mkdir(parents=True)
+    (pack / "broken" / "kit.yaml").write_text("name: Broken\nmarkers: []\n", encoding="utf-8")
+    monkeypatch.setenv(PACK_PATH_ENV, str(pack))
+
+
+def test_invalid_pack_kit_is_skipped_with_warning(tmp_path, monkeypatch):
+    _broken_pack(tmp_path, monkeypatch)
+    manifest = KitManifest(KITS_DIR)
+
+    assert "broken" in manifest.get_kit_names()
+    names = manifest.get_valid_kit_names()
+    assert "broken" not in names
+    assert "dev" in names
+    assert any("'broken'" in w and "markers" in w for w in manifest.warnings)
+
+
+def test_orient_ignores_invalid_pack_kit(tmp_path, monkeypatch):
+    _broken_pack(tmp_path, monkeypatch)
+    project = tmp_path / "project"
+    (project / ".claude" / "commands").mkdir(parents=True)
+    (project / ".claude" / "commands" / "orient.md").write_text("# orient\n", encoding="utf-8")
+
+    assert OrientBuilder(project)._installed_kits() == ["dev"]